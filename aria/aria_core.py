@@ -1,5 +1,6 @@
 import warnings
 import threading
+import os
 # Suppress pkg_resources deprecation warning from pygame and others
 warnings.filterwarnings("ignore", message=".*pkg_resources is deprecated.*")
 
@@ -9,6 +10,7 @@ from .notion_manager import NotionManager
 from .file_automation import FileAutomator
 from .system_control import SystemControl
 from .command_intent_classifier import CommandIntentClassifier
+from .intent_cache import IntentCache
 from .file_manager import FileManager
 from .weather_manager import WeatherManager
 from .clipboard_screenshot import ClipboardScreenshot
@@ -19,9 +21,11 @@ from .memory_manager import MemoryManager
 from .music_library import MusicManager
 from .wake_word_listener import WakeWordListener
 from .water_manager import WaterManager
+from .scheduler import get_scheduler
 
 # New Modules
 from .tts_manager import TTSManager
+from .tts_cache import TTSAudioCache, COMMON_PHRASES
 from .app_launcher import AppLauncher
 from .speech_input import SpeechInput
 from .greeting_service import GreetingService
@@ -35,33 +39,48 @@ class AriaCore:
         """
         on_speak: Callback function(text) to update GUI or logs when Aria speaks.
         """
+        # One timer thread for all timed work (calendar sync, reminders, health checks)
+        self.scheduler = get_scheduler()
+
         # Initialize Core Components
         self.brain = AriaBrain()
         self.calendar = CalendarManager()
+        self.calendar.start_sync(self.scheduler) # Delta-sync the local event cache in the background
         self.notion = NotionManager()
         self.automator = FileAutomator()
         self.system_control = SystemControl()
-        self.command_classifier = CommandIntentClassifier(self.brain)
         self.file_manager = FileManager()
+        self.file_manager.start_index() # Crawl/refresh the filename index in the background
         self.weather_manager = WeatherManager()
         self.clipboard_screenshot = ClipboardScreenshot()
         self.system_monitor = SystemMonitor()
+        self.system_monitor.start_sampler(history=True) # Readings and health checks never block on psutil
         self.email_manager = EmailManager()
         self.music_manager = MusicManager()
         self.memory_manager = MemoryManager() # Initialize Long-Term Memory
+        self.notion.start_sync(self.scheduler, embed_fn=self.memory_manager.get_embedding) # Local Notion search index
+        self.command_classifier = CommandIntentClassifier(
+            self.brain,
+            cache=IntentCache(embed_fn=self.memory_manager.get_embedding)
+        )
         
         # Alias for backward compatibility
         self.email = self.email_manager
 
         # Initialize New Modules
-        self.tts_manager = TTSManager(on_speak=on_speak)
+        self.tts_manager = TTSManager(
+            on_speak=on_speak,
+            audio_cache=TTSAudioCache(max_bytes=int(os.getenv("TTS_CACHE_MAX_MB", "50")) * 1024 * 1024),
+            warm_phrases=COMMON_PHRASES
+        )
         self.app_launcher = AppLauncher(self.tts_manager)
         self.speech_input = SpeechInput(self.tts_manager)
         self.water_manager = WaterManager(
             tts_manager=self.tts_manager, 
             notification_manager=notification_manager,
             weather_manager=self.weather_manager,
-            system_control=self.system_control
+            system_control=self.system_control,
+            scheduler=self.scheduler
         )
         
         self.greeting_service = GreetingService(
@@ -77,7 +96,8 @@ class AriaCore:
             app_launcher=self.app_launcher,
             brain=self.brain,
             weather_manager=self.weather_manager,
-            notification_manager=notification_manager
+            notification_manager=notification_manager,
+            scheduler=self.scheduler
         )
         self.notification_manager = notification_manager
         self.proactive_manager.start_monitoring()
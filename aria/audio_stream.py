@@ -0,0 +1,245 @@
+"""
+In-memory streaming of synthesized speech.
+
+edge-tts delivers MP3 in small chunks. `AudioStream` collects them in memory
+while the synthesis stage is still receiving, and hands the playback stage
+segments that end on MPEG frame boundaries.
+
+Frame-aligned segments still can't be decoded one by one: Layer III frames
+borrow bits from earlier frames (the bit reservoir), and every decode starts
+with the decoder's warm-up, so separately decoded segments click or leave a
+gap at each join. `PCMSegmenter` decodes everything received so far and
+hands out only the PCM past what it handed out before, so the pieces queued
+on a mixer channel join sample-exactly. To keep long sentences from being
+re-decoded over and over, it restarts decoding a few frames before the end
+once the decoded stretch passes a size limit.
+"""
+
+import threading
+
+import numpy as np
+
+# Layer III bitrates (kbps) by bitrate index
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def mp3_frame_length(header: bytes) -> int:
+    """Length in bytes of the Layer III frame starting with `header`, or 0 if it isn't one."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return 0
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    padding = (header[2] >> 1) & 0x01
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return 0
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        return 144000 * _BITRATES_V1[bitrate_index] // sample_rate + padding
+    return 72000 * _BITRATES_V2[bitrate_index] // sample_rate + padding
+
+
+def last_frame_boundary(data: bytes, start: int = 0) -> int:
+    """Walks frames from `start` and returns the offset just past the last complete one."""
+    offset = start
+    end = len(data)
+    while offset + 4 <= end:
+        length = mp3_frame_length(data[offset:offset + 4])
+        if not length:
+            # Lost sync (e.g. a leading ID3 tag): scan for the next frame header
+            next_sync = data.find(b"\xff", offset + 1)
+            if next_sync == -1:
+                break
+            offset = next_sync
+            continue
+        if offset + length > end:
+            break
+        offset += length
+    return offset if offset > start else start
+
+
+class AudioStream:
+    """Growing MP3 buffer written by synthesis and read segment by segment by playback."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.finished = False
+        self.aborted = False
+        self.cond = threading.Condition()
+
+    def write(self, data: bytes):
+        with self.cond:
+            self.buffer.extend(data)
+            self.cond.notify_all()
+
+    def close(self):
+        with self.cond:
+            self.finished = True
+            self.cond.notify_all()
+
+    def abort(self):
+        with self.cond:
+            self.aborted = True
+            self.finished = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def getvalue(self, end: int = None) -> bytes:
+        """The audio received so far, or its first `end` bytes."""
+        with self.cond:
+            return bytes(self.buffer[:end])
+
+    def wait_first_chunk(self, timeout: float = None) -> bool:
+        with self.cond:
+            self.cond.wait_for(lambda: self.buffer or self.finished, timeout=timeout)
+            return bool(self.buffer)
+
+    def next_segment(self, offset: int, min_bytes: int, timeout: float = 0.05):
+        """
+        Returns (segment, new_offset, done). Waits up to `timeout` for `min_bytes` of new
+        audio; the segment always ends on a frame boundary unless the stream is finished.
+        `done` is True once everything has been handed out.
+        """
+        with self.cond:
+            self.cond.wait_for(lambda: len(self.buffer) - offset >= min_bytes or self.finished, timeout=timeout)
+            if self.aborted:
+                return b"", offset, True
+            if self.finished:
+                return bytes(self.buffer[offset:]), len(self.buffer), True
+            if len(self.buffer) - offset < min_bytes:
+                return b"", offset, False
+            data = bytes(self.buffer)
+        boundary = last_frame_boundary(data, offset)
+        return data[offset:boundary], boundary, False
+
+
+class PCMSegmenter:
+    """
+    Cuts a growing MP3 stream on decoded PCM. `decode(mp3) -> pcm` must decode a whole
+    buffer from its start. The last `holdback` bytes of each decode are kept back until
+    the stream is finished: the decoder and the mixer's resampler may still change the
+    tail once more audio follows.
+
+    Each feed decodes the current run, from its start to everything received. Once a run
+    is longer than `max_decode_bytes`, a new one starts `HANDOVER_FRAMES` frames before
+    the end of the last decode, so the decoder refills its bit reservoir before the
+    hand-over point. A new run isn't sample-aligned with the old one (the resampler
+    starts over too), so the hand-over point is found by matching the last samples
+    handed out, and the held-back tail of the old run is crossfaded into the new one.
+    `dtype` is the numpy type of one sample and `rate` the sample rate `decode` returns
+    (by default the MP3's own).
+    """
+
+    HANDOVER_FRAMES = 12  # MP3 frames a new run decodes before the hand-over point
+    MATCH_FRAMES = 256    # sample frames matched to find the hand-over point
+    SEARCH_FRAMES = 256   # how far either side of the estimate the match is searched
+    FADE_FRAMES = 256     # sample frames crossfaded from the old run into the new one
+
+    def __init__(self, decode, frame_bytes: int = 1, holdback: int = 0, max_decode_bytes: int = None,
+                 dtype=np.int16, rate: int = None):
+        self.decode = decode
+        self.frame_bytes = max(1, frame_bytes)  # bytes per sample frame (all channels)
+        self.holdback = holdback
+        self.max_decode_bytes = max_decode_bytes
+        self.dtype = np.dtype(dtype)
+        self.channels = max(1, self.frame_bytes // self.dtype.itemsize)
+        self.rate = rate
+        self.start = 0      # MP3 offset the current run starts at
+        self.end = 0        # MP3 offset the last decode reached
+        self.pcm = b""      # last decode of the current run
+        self.emitted = 0    # PCM bytes of the current run already handed out
+        self.fade = None    # old run's held-back samples, crossfaded into the new run
+        self.faded = 0      # samples of `fade` already used
+        self.stats = {"runs": 1, "decoded_bytes": 0}
+
+    def feed(self, data: bytes, final: bool = False) -> bytes:
+        """PCM for `data` (all MP3 received so far) past what earlier calls returned."""
+        handover = None
+        if (not final and self.max_decode_bytes and self.emitted
+                and len(data) - self.start > self.max_decode_bytes):
+            handover = self._start_run(data)
+        pcm = self.decode(data[self.start:])
+        self.stats["decoded_bytes"] += len(data) - self.start
+        if handover is not None:
+            self.emitted = self._hand_over_point(pcm, *handover)
+        self.pcm, self.end = pcm, len(data)
+        end = len(pcm) if final else len(pcm) - self.holdback
+        end -= end % self.frame_bytes
+        if end <= self.emitted:
+            return b""
+        piece = pcm[self.emitted:end]
+        self.emitted = end
+        if self.fade is not None:
+            piece = self._crossfade(piece)
+        return piece
+
+    def _start_run(self, data: bytes):
+        """Moves the run start a few frames before the last decode's end; returns what the hand-over needs."""
+        offsets = []
+        offset = self.start
+        while offset + 4 <= self.end:
+            length = mp3_frame_length(data[offset:offset + 4])
+            if not length:
+                next_sync = data.find(b"\xff", offset + 1, self.end)
+                if next_sync == -1:
+                    break
+                offset = next_sync
+                continue
+            offsets.append(offset)
+            offset += length
+        if len(offsets) <= self.HANDOVER_FRAMES:
+            return None
+        start = offsets[-self.HANDOVER_FRAMES]
+        version = (data[start + 1] >> 3) & 0x03
+        mp3_rate = _SAMPLE_RATES[version][(data[start + 2] >> 2) & 0x03]
+        # Sample frames the decoder returns per MP3 frame
+        per_frame = (1152 if version == 3 else 576) * (self.rate or mp3_rate) / mp3_rate
+        skipped = len(offsets) - self.HANDOVER_FRAMES
+        channels = self.channels
+        old = np.frombuffer(self.pcm, dtype=self.dtype)
+        emitted = self.emitted // self.dtype.itemsize
+        reference = old[max(0, emitted - self.MATCH_FRAMES * channels):emitted]
+        tail = old[emitted:emitted + self.FADE_FRAMES * channels]
+        self.start = start
+        self.stats["runs"] += 1
+        return reference, tail, emitted - round(skipped * per_frame) * channels
+
+    def _hand_over_point(self, pcm: bytes, reference, tail, estimate: int) -> int:
+        """Byte offset in the new run's `pcm` that follows the samples already handed out."""
+        channels = self.channels
+        new = np.frombuffer(pcm, dtype=self.dtype).astype(np.float32)
+        size = len(reference)
+        low = max(size, estimate - self.SEARCH_FRAMES * channels)
+        high = min(len(new), estimate + self.SEARCH_FRAMES * channels)
+        if size and high > low:
+            windows = np.lib.stride_tricks.sliding_window_view(new[low - size:high], size)[::channels]
+            distance = np.abs(windows - reference.astype(np.float32)).sum(axis=1)
+            position = low + int(np.argmin(distance)) * channels
+        else:
+            position = min(max(estimate, 0), len(new))
+            position -= position % channels
+        self.fade = tail.astype(np.float32) if len(tail) else None
+        self.faded = 0
+        return position * self.dtype.itemsize
+
+    def _crossfade(self, piece: bytes) -> bytes:
+        """Blends the start of `piece` from the old run's held-back tail into the new run."""
+        samples = np.frombuffer(piece, dtype=self.dtype).astype(np.float32)
+        count = min(len(samples), len(self.fade) - self.faded)
+        frames = np.arange(self.faded, self.faded + count) // self.channels
+        weight = (frames + 1) / (len(self.fade) // self.channels + 1)
+        old = self.fade[self.faded:self.faded + count]
+        samples[:count] = old * (1 - weight) + samples[:count] * weight
+        self.faded += count
+        if self.faded >= len(self.fade):
+            self.fade = None
+        if np.issubdtype(self.dtype, np.integer):
+            info = np.iinfo(self.dtype)
+            samples = np.clip(np.rint(samples), info.min, info.max)
+        return samples.astype(self.dtype).tobytes()
@@ -1,10 +1,10 @@
 import os
 import json
 import datetime
-import socket
 from dotenv import load_dotenv
 
 from langchain_core.prompts import PromptTemplate
+from .connectivity_monitor import ConnectivityMonitor
 
 
 load_dotenv()
@@ -42,6 +42,11 @@ class AriaBrain:
         # Active Mode (normal, coder, study, jarvis)
         self.active_mode = "normal"
 
+        # Cached connectivity state, refreshed in the background
+        self.connectivity = ConnectivityMonitor(
+            interval=float(os.getenv("CONNECTIVITY_CHECK_INTERVAL", "30"))
+        )
+
         # Note: We do NOT initialize models here anymore. They are lazy loaded.
         if not self.api_key:
             print("Warning: OPEN_AI_API_KEY not found.")
@@ -51,13 +56,15 @@ class AriaBrain:
             print("Info: GOOGLE_API_KEY not found. Gemini will not be available.")
 
     def _is_online(self):
-        """Checks for internet connectivity."""
-        try:
-            # Connect to a public DNS server (Google's 8.8.8.8)
-            socket.create_connection(("8.8.8.8", 53), timeout=3)
+        """Returns the cached connectivity state (no network I/O on the hot path)."""
+        return self.connectivity.is_online
+
+    def report_provider_error(self, error: Exception) -> bool:
+        """Marks the brain offline at once if a provider call failed with a network error."""
+        if self.connectivity.report_failure(error):
+            print("Warning: Network error from provider. Switching to Local Ollama until connectivity returns.")
             return True
-        except OSError:
-            return False
+        return False
 
     # --- Lazy Loading Properties ---
 
@@ -384,6 +391,7 @@ CORE INSTRUCTIONS:
             response = llm.invoke(messages)
             return response.content
         except Exception as e:
+            self.report_provider_error(e)
             return f"I encountered an error thinking about that with {model_name}: {e}"
 
     def ask_vision(self, user_input: str, image_base64: str, model_name: str = "local-vision") -> str:
@@ -509,11 +517,15 @@ CORE INSTRUCTIONS:
                         return
                     
                     print(f"\n⚠️ Runtime Error with {active_model_name}: {e}")
-                    print(f"🔄 Switching to Fallback: gpt-4o-mini\n")
                     
                     fallback_attempted = True
-                    active_model_name = "gpt-4o-mini"
-                    active_llm = self.get_llm("gpt-4o-mini")
+                    if self.report_provider_error(e):
+                        # get_llm now resolves to the local model
+                        active_model_name = "local"
+                    else:
+                        active_model_name = "gpt-4o-mini"
+                    print(f"🔄 Switching to Fallback: {active_model_name}\n")
+                    active_llm = self.get_llm(active_model_name)
                     
                     if not active_llm:
                         yield f"Fallback model not available."
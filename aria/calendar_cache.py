@@ -0,0 +1,327 @@
+"""
+Local cache of Google Calendar events, kept current with incremental sync.
+
+The first sync lists each calendar once (expanded recurring instances from
+PAST_DAYS ago to HORIZON_DAYS ahead) and keeps the returned nextSyncToken.
+Later syncs send only that token and receive just the events created,
+changed or cancelled since, which is usually an empty page. A 410 Gone
+(expired token) falls back to a full sync, as does a daily re-sync that
+moves the window forward.
+
+Events live in backend/data/calendar_cache.json and in an in-memory
+IntervalIndex, so "what's on today", free-slot and proactive checks are
+answered without any network call. Reads start a background delta sync when
+the cache is older than SYNC_INTERVAL; only a cold start (nothing synced
+yet) waits for the network.
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from . import config
+from .interval_index import IntervalIndex
+from .logger import setup_logger
+from .scheduler import get_scheduler
+
+logger = setup_logger(__name__)
+
+CACHE_VERSION = 1
+SYNC_INTERVAL = float(os.getenv("CALENDAR_SYNC_SECONDS", "60"))
+FULL_SYNC_INTERVAL = 24 * 3600
+CALENDAR_IDS = [c.strip() for c in os.getenv("CALENDAR_IDS", "primary").split(",") if c.strip()]
+PAST_DAYS = 30
+HORIZON_DAYS = 365
+PAGE_SIZE = 2500
+
+
+def _parse_time(value: dict) -> tuple:
+    """Google start/end object -> (timestamp, all_day). All-day dates use the configured timezone."""
+    if value.get("dateTime"):
+        return datetime.datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).timestamp(), False
+    day = datetime.date.fromisoformat(value["date"])
+    return datetime.datetime(day.year, day.month, day.day, tzinfo=config.TIMEZONE).timestamp(), True
+
+
+def event_bounds(event: dict) -> tuple:
+    """(start timestamp, end timestamp, all_day) of a Google Calendar event."""
+    start, all_day = _parse_time(event["start"])
+    end = _parse_time(event["end"])[0] if event.get("end") else start
+    return start, max(start, end), all_day
+
+
+def _is_gone(error: Exception) -> bool:
+    """True for googleapiclient's HttpError 410, raised when a sync token has expired."""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return str(status) == "410"
+
+
+def _timestamp(value) -> float:
+    return value.timestamp() if isinstance(value, datetime.datetime) else float(value)
+
+
+class CalendarCache:
+    def __init__(self, get_service, storage_path: str = None, calendar_ids=None,
+                 sync_interval: float = SYNC_INTERVAL):
+        """`get_service` returns the Calendar API service, or None while unavailable."""
+        if storage_path:
+            self.storage_path = storage_path
+        else:
+            # Default to backend/data/calendar_cache.json
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.storage_path = os.path.join(data_dir, "calendar_cache.json")
+
+        self.get_service = get_service
+        self.calendar_ids = list(calendar_ids or CALENDAR_IDS)
+        self.sync_interval = sync_interval
+
+        # calendar id -> {"sync_token", "full_sync", "events": {event id: event}}
+        self.calendars = {}
+        self.index = IntervalIndex()
+        self.last_sync = 0.0
+        self.stale = False
+
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.scheduler = None
+        # Called with no arguments whenever the cached events change
+        self.listeners = []
+        self.stats = {"syncs": 0, "full_syncs": 0, "requests": 0, "changes": 0, "reads": 0}
+
+        self._load()
+
+    # --- Persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.storage_path):
+            return
+        try:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                return
+            calendars = {cid: state for cid, state in data.get("calendars", {}).items() if cid in self.calendar_ids}
+            self._install(calendars)
+            if calendars:
+                self.ready.set()
+            logger.info(f"Loaded calendar cache: {len(self.index)} events")
+        except Exception as e:
+            logger.error(f"Error loading calendar cache: {e}")
+
+    def _save(self):
+        try:
+            with self.lock:
+                data = {"version": CACHE_VERSION, "calendars": self.calendars}
+                tmp_path = self.storage_path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.storage_path)
+        except Exception as e:
+            logger.error(f"Error saving calendar cache: {e}")
+
+    def _install(self, calendars: dict):
+        """Rebuilds the interval index for `calendars` and swaps both in."""
+        intervals = []
+        for calendar_id, state in calendars.items():
+            for event in state["events"].values():
+                try:
+                    start, end, all_day = event_bounds(event)
+                except (KeyError, ValueError):
+                    continue
+                intervals.append((start, end, (calendar_id, all_day, event)))
+        index = IntervalIndex(intervals)
+        with self.lock:
+            self.calendars, self.index = calendars, index
+
+    # --- Syncing ---
+
+    def _list(self, service, calendar_id: str, state: dict) -> bool:
+        """
+        Pulls changes for one calendar into `state`. Returns False if the sync token
+        has expired and a full sync is needed.
+        """
+        token = state.get("sync_token")
+        params = {"calendarId": calendar_id, "singleEvents": True, "maxResults": PAGE_SIZE, "showDeleted": bool(token)}
+        if token:
+            params["syncToken"] = token
+        else:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            params["timeMin"] = (now - datetime.timedelta(days=PAST_DAYS)).isoformat()
+            params["timeMax"] = (now + datetime.timedelta(days=HORIZON_DAYS)).isoformat()
+
+        events = state["events"]
+        while True:
+            try:
+                self.stats["requests"] += 1
+                result = service.events().list(**params).execute()
+            except Exception as e:
+                if token and _is_gone(e):
+                    return False
+                raise
+            for event in result.get("items", []):
+                if event.get("status") == "cancelled":
+                    events.pop(event.get("id"), None)
+                elif event.get("id"):
+                    events[event["id"]] = event
+                self.stats["changes"] += 1
+            if result.get("nextPageToken"):
+                params["pageToken"] = result["nextPageToken"]
+                continue
+            state["sync_token"] = result.get("nextSyncToken")
+            return True
+
+    def sync(self, full: bool = False) -> bool:
+        """
+        Brings every calendar up to date: a delta pull with the stored sync token, or a full
+        listing when there is none, it expired, or the last full sync is a day old.
+        Returns False if the service is unavailable or a request failed.
+        """
+        with self.sync_lock:
+            service = self.get_service()
+            if service is None:
+                return False
+
+            with self.lock:
+                calendars = {cid: dict(state, events=dict(state["events"])) for cid, state in self.calendars.items()}
+            tokens = {cid: state.get("sync_token") for cid, state in calendars.items()}
+            changes = self.stats["changes"]
+            now = time.time()
+            ok = True
+            for calendar_id in self.calendar_ids:
+                state = calendars.get(calendar_id)
+                if full or state is None or now - state.get("full_sync", 0) >= FULL_SYNC_INTERVAL:
+                    state = None
+                try:
+                    if state is not None and self._list(service, calendar_id, state):
+                        continue
+                    # Full sync into a fresh state, so a failure halfway keeps the old events
+                    fresh = {"sync_token": None, "full_sync": now, "events": {}}
+                    self._list(service, calendar_id, fresh)
+                    calendars[calendar_id] = fresh
+                    self.stats["full_syncs"] += 1
+                except Exception as e:
+                    logger.error(f"Calendar sync failed for {calendar_id}: {e}")
+                    ok = False
+
+            # An empty delta page (the common case) leaves the index and listeners alone
+            changed = self.stats["changes"] != changes or calendars.keys() != tokens.keys()
+            if changed:
+                self._install(calendars)
+            else:
+                with self.lock:
+                    self.calendars = calendars
+            if changed or any(state.get("sync_token") != tokens.get(cid) for cid, state in calendars.items()):
+                self._save()
+            self.last_sync = time.monotonic()
+            self.stats["syncs"] += 1
+            if ok:
+                self.stale = False
+                self.ready.set()
+            if changed:
+                self._notify()
+            return ok
+
+    def ensure_fresh(self) -> bool:
+        """
+        Makes sure reads have data. Only a cold cache syncs in the foreground; a stale one
+        keeps answering while a background delta sync runs. Returns False if nothing is cached.
+        """
+        if not self.ready.is_set():
+            return self.sync()
+        stale = self.stale or time.monotonic() - self.last_sync >= self.sync_interval
+        if stale and not self.sync_lock.locked():
+            # Pushed forward now so concurrent reads don't each start a sync
+            self.last_sync = time.monotonic()
+            self._sync_soon()
+        return True
+
+    def _sync_soon(self):
+        if self.scheduler:
+            self.scheduler.schedule_in(0, self._background_sync, name="calendar:refresh", owner="calendar")
+        else:
+            threading.Thread(target=self._background_sync, daemon=True, name="aria-calendar-sync").start()
+
+    def _background_sync(self):
+        try:
+            self.sync()
+        except Exception as e:
+            logger.error(f"Error syncing calendar cache: {e}")
+
+    def start(self, scheduler=None):
+        """Syncs now and then every `sync_interval` seconds as a scheduler job."""
+        self.scheduler = scheduler or get_scheduler()
+        self.scheduler.every(self.sync_interval, self._background_sync, name="calendar:sync",
+                             first_delay=0, owner="calendar")
+
+    def stop(self):
+        if self.scheduler:
+            self.scheduler.cancel_owner("calendar")
+            self.scheduler = None
+
+    def add_listener(self, callback):
+        """Registers `callback()` to run after a sync or upsert changes the cached events."""
+        self.listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self.listeners):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Calendar cache listener failed: {e}")
+
+    def invalidate(self):
+        """Marks the cache stale; the latest changes are pulled right away when a scheduler runs syncs."""
+        self.stale = True
+        if self.scheduler:
+            self._sync_soon()
+
+    def upsert(self, event: dict, calendar_id: str = "primary"):
+        """Adds an event we just created or changed, so reads see it before the next sync."""
+        with self.lock:
+            calendars = dict(self.calendars)
+        state = calendars.get(calendar_id)
+        if state is None or not event.get("id"):
+            return
+        events = dict(state["events"])
+        events[event["id"]] = event
+        calendars[calendar_id] = dict(state, events=events)
+        self._install(calendars)
+        self._notify()
+
+    # --- Queries ---
+
+    def events_between(self, start, end=None, calendar_ids=None) -> list:
+        """
+        Events overlapping [start, end) ordered by start time, like events().list with
+        timeMin/timeMax, singleEvents and orderBy=startTime. `start`/`end` are aware datetimes
+        or timestamps.
+        """
+        return [event for _, _, _, event in self.intervals_between(start, end, calendar_ids)]
+
+    def intervals_between(self, start, end=None, calendar_ids=None) -> list:
+        """[(start timestamp, end timestamp, all_day, event)] overlapping [start, end), ordered by start."""
+        self.stats["reads"] += 1
+        end = float("inf") if end is None else _timestamp(end)
+        return [
+            (event_start, event_end, all_day, event)
+            for event_start, event_end, (calendar_id, all_day, event) in self.index.overlapping_items(_timestamp(start), end)
+            if calendar_ids is None or calendar_id in calendar_ids
+        ]
+
+    def upcoming(self, max_results: int = 10, now=None) -> list:
+        """Events that haven't ended yet, soonest first."""
+        now = time.time() if now is None else now
+        return self.events_between(now)[:max_results]
+
+    def get_stats(self) -> dict:
+        return {
+            "events": len(self.index),
+            "calendars": len(self.calendars),
+            "ready": self.ready.is_set(),
+            "stale": self.stale,
+            **self.stats,
+        }
@@ -6,12 +6,48 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from . import config
+from .calendar_cache import CalendarCache
+from .free_busy import FreeBusy, SCOPE_HOURS
+
+# Padding kept free around existing events when looking for free time
+BUFFER_MINUTES = int(os.getenv("CALENDAR_BUFFER_MINUTES", "0"))
+# Days searched by find_free_time when no end date is given
+SEARCH_DAYS = 7
+
+
+def _format_duration(minutes):
+    hours, minutes = divmod(int(minutes), 60)
+    parts = []
+    if hours:
+        parts.append(f"{hours} hour" + ("s" if hours != 1 else ""))
+    if minutes or not hours:
+        parts.append(f"{minutes} minute" + ("s" if minutes != 1 else ""))
+    return " ".join(parts)
 
 class CalendarManager:
     def __init__(self):
         self.creds = None
         self.service = None
         self.authenticate()
+        # Read paths are served from a local, incrementally synced copy of the calendar
+        self.cache = CalendarCache(lambda: self.service)
+        self.free_busy = FreeBusy(self.cache)
+
+    def start_sync(self, scheduler=None):
+        """Keeps the local event cache in sync as a background scheduler job."""
+        self.cache.start(scheduler)
+
+    def _cache_ready(self):
+        """True once the local cache can answer reads (syncing it first on a cold start)."""
+        if not self.cache.ready.is_set() and not self.service:
+            self.authenticate()
+        return self.cache.ensure_fresh()
+
+    def _cached_events(self, start, end=None):
+        """Events overlapping [start, end) from the local cache, or None if the calendar is unavailable."""
+        if not self._cache_ready():
+            return None
+        return self.cache.events_between(start, end)
 
     def authenticate(self):
         """Shows basic usage of the Google Calendar API."""
@@ -111,6 +147,9 @@ class CalendarManager:
             }
 
             event = self.service.events().insert(calendarId='primary', body=event).execute()
+            if isinstance(event, dict):
+                self.cache.upsert(event)
+            self.cache.invalidate()
             
             # Format time for friendly display using the ORIGINAL start_time (not from Google's response)
             try:
@@ -134,38 +173,21 @@ class CalendarManager:
         If start_date and end_date are provided (datetime objects), filters by that range.
         Otherwise, defaults to 'now' onwards.
         """
-        if not self.service:
-            self.authenticate()
-
-        if not self.service:
-            return "Calendar service not available."
-
         try:
+            # Naive datetimes are UTC, as before
             if start_date:
-                if start_date.tzinfo:
-                    time_min = start_date.isoformat()
-                else:
-                    time_min = start_date.isoformat() + 'Z'
+                time_min = start_date if start_date.tzinfo else start_date.replace(tzinfo=datetime.timezone.utc)
             else:
-                time_min = datetime.datetime.utcnow().isoformat() + 'Z'
-            
+                time_min = datetime.datetime.now(datetime.timezone.utc)
+
             time_max = None
             if end_date:
-                if end_date.tzinfo:
-                    time_max = end_date.isoformat()
-                else:
-                    time_max = end_date.isoformat() + 'Z'
-
-            events_result = self.service.events().list(
-                calendarId='primary', 
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results, 
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+                time_max = end_date if end_date.tzinfo else end_date.replace(tzinfo=datetime.timezone.utc)
+
+            events = self._cached_events(time_min, time_max)
+            if events is None:
+                return "Calendar service not available."
+            events = events[:max_results]
 
             if not events:
                 return "No upcoming events found for this period."
@@ -238,42 +260,28 @@ class CalendarManager:
         
         return self.get_upcoming_events(max_results=9, start_date=start_utc, end_date=end_utc)
 
+    def _resolve_date(self, target_date_str, now):
+        """'today', 'tomorrow' or YYYY-MM-DD -> datetime in the configured timezone (None if unparseable)."""
+        if target_date_str == 'today':
+            return now
+        if target_date_str == 'tomorrow':
+            return now + datetime.timedelta(days=1)
+        try:
+            return datetime.datetime.strptime(target_date_str, "%Y-%m-%d").replace(tzinfo=config.TIMEZONE)
+        except (TypeError, ValueError):
+            return None
+
     def get_free_slots(self, target_date_str, time_scope="all_day"):
         """
         Calculates free time slots for a specific date and time scope.
         """
-        if not self.service:
-            self.authenticate()
-            
         now = datetime.datetime.now(config.TIMEZONE)
-        
-        # Determine base date range
-        if target_date_str == 'today':
-            base_date = now
-        elif target_date_str == 'tomorrow':
-            base_date = now + datetime.timedelta(days=1)
-        else:
-            try:
-                base_date = datetime.datetime.strptime(target_date_str, "%Y-%m-%d").replace(tzinfo=config.TIMEZONE)
-            except:
-                base_date = now
+        base_date = self._resolve_date(target_date_str, now) or now
 
-        # Define working hours / scope boundaries
-        day_start_hour = 9 # 9 AM
-        day_end_hour = 21 # 9 PM
-        
-        start_dt = base_date.replace(hour=day_start_hour, minute=0, second=0, microsecond=0)
-        end_dt = base_date.replace(hour=day_end_hour, minute=0, second=0, microsecond=0)
-
-        if time_scope == "morning":
-            start_dt = base_date.replace(hour=6, minute=0)
-            end_dt = base_date.replace(hour=12, minute=0)
-        elif time_scope == "afternoon":
-            start_dt = base_date.replace(hour=12, minute=0)
-            end_dt = base_date.replace(hour=17, minute=0)
-        elif time_scope == "evening":
-            start_dt = base_date.replace(hour=17, minute=0)
-            end_dt = base_date.replace(hour=21, minute=0)
+        # Scope boundaries (9 AM - 9 PM for the whole day)
+        start_hour, end_hour = SCOPE_HOURS.get(time_scope, SCOPE_HOURS["all_day"])
+        start_dt = base_date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+        end_dt = base_date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
 
         # Ensure we don't look in the past if it's today
         if target_date_str == 'today' and start_dt < now:
@@ -281,55 +289,14 @@ class CalendarManager:
             if start_dt >= end_dt:
                 return "That time has already passed."
 
-        # Fetch events for this range
-        start_utc = start_dt.astimezone(datetime.timezone.utc)
-        end_utc = end_dt.astimezone(datetime.timezone.utc)
-        
         try:
-            events_result = self.service.events().list(
-                calendarId='primary', 
-                timeMin=start_utc.isoformat(),
-                timeMax=end_utc.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
+            if not self._cache_ready():
+                return "Calendar service not available."
+            free_slots = self.free_busy.free_slots(start_dt, end_dt, min_minutes=15, hours=(start_hour, end_hour),
+                                                   buffer_minutes=BUFFER_MINUTES)
         except Exception as e:
             return f"Error checking calendar: {e}"
 
-        # Calculate gaps
-        free_slots = []
-        current_pointer = start_dt
-        
-        for event in events:
-            # Parse event start/end
-            start_str = event['start'].get('dateTime')
-            end_str = event['end'].get('dateTime')
-            if not start_str or not end_str: continue # Skip all-day events for gap calc (simplified)
-            
-            if 'Z' in start_str:
-                ev_start = datetime.datetime.fromisoformat(start_str.replace('Z', '+00:00')).astimezone(config.TIMEZONE)
-                ev_end = datetime.datetime.fromisoformat(end_str.replace('Z', '+00:00')).astimezone(config.TIMEZONE)
-            else:
-                ev_start = datetime.datetime.fromisoformat(start_str).astimezone(config.TIMEZONE)
-                ev_end = datetime.datetime.fromisoformat(end_str).astimezone(config.TIMEZONE)
-
-            # Check for gap
-            if ev_start > current_pointer:
-                gap_duration = (ev_start - current_pointer).total_seconds() / 60
-                if gap_duration >= 15: # Minimum 15 min slot
-                    free_slots.append((current_pointer, ev_start))
-            
-            # Move pointer
-            if ev_end > current_pointer:
-                current_pointer = ev_end
-
-        # Check final gap
-        if current_pointer < end_dt:
-            gap_duration = (end_dt - current_pointer).total_seconds() / 60
-            if gap_duration >= 15:
-                free_slots.append((current_pointer, end_dt))
-
         if not free_slots:
             return f"You are fully booked during the {time_scope}."
         
@@ -340,38 +307,55 @@ class CalendarManager:
             
         return response
 
+    def find_free_time(self, duration_minutes=30, start_date=None, end_date=None, time_scope="all_day",
+                       max_results=5):
+        """
+        Finds free slots of at least `duration_minutes` across several days, e.g. "when am I free
+        for 2 hours this week" or "a 30 min slot before Friday". Dates are 'today', 'tomorrow' or
+        YYYY-MM-DD; `end_date` is the last day searched (default: a week from `start_date`).
+        """
+        now = datetime.datetime.now(config.TIMEZONE)
+        first_day = self._resolve_date(start_date or 'today', now) or now
+        last_day = self._resolve_date(end_date, now) if end_date else first_day + datetime.timedelta(days=SEARCH_DAYS - 1)
+        if last_day is None or last_day.date() < first_day.date():
+            last_day = first_day
+
+        start_dt = max(now, first_day.replace(hour=0, minute=0, second=0, microsecond=0))
+        end_dt = last_day.replace(hour=23, minute=59, second=59, microsecond=999999)
+        if start_dt >= end_dt:
+            return "That time has already passed."
+
+        duration = _format_duration(duration_minutes)
+        try:
+            if not self._cache_ready():
+                return "Calendar service not available."
+            free_slots = self.free_busy.free_slots(
+                start_dt, end_dt, min_minutes=duration_minutes,
+                hours=SCOPE_HOURS.get(time_scope, SCOPE_HOURS["all_day"]),
+                buffer_minutes=BUFFER_MINUTES, limit=max_results,
+            )
+        except Exception as e:
+            print(f"Calendar Free Time Error: {e}")
+            return "I couldn't check your calendar right now."
+
+        if not free_slots:
+            return (f"I couldn't find a free {duration} slot between "
+                    f"{start_dt.strftime('%a, %b %d')} and {end_dt.strftime('%a, %b %d')}.")
+
+        response = f"Here are times you're free for {duration}:\n"
+        for start, end in free_slots:
+            response += f"- {start.strftime('%a, %b %d')}: {start.strftime('%I:%M %p')} to {end.strftime('%I:%M %p')}\n"
+        return response
+
     def get_upcoming_events_raw(self, max_results=5):
         """
         Gets upcoming events as a list of dictionaries (raw data).
         Used for background scheduling checks.
         """
-        if not self.service:
-            self.authenticate()
-
-        if not self.service:
-            return []
-
         try:
-            # Retry logic for fetching events
-            max_retries = 3
-            import time
-            for attempt in range(max_retries):
-                try:
-                    now = datetime.datetime.utcnow().isoformat() + 'Z'
-                    events_result = self.service.events().list(
-                        calendarId='primary', 
-                        timeMin=now,
-                        maxResults=max_results, 
-                        singleEvents=True,
-                        orderBy='startTime'
-                    ).execute()
-                    
-                    return events_result.get('items', [])
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        time.sleep(1)
-                    else:
-                        raise e
+            # Served from the local cache, so frequent background checks cost no API calls
+            events = self._cached_events(datetime.datetime.now(datetime.timezone.utc))
+            return (events or [])[:max_results]
         except Exception as e:
             print(f"Calendar Raw Fetch Error: {e}")
             return []
@@ -380,30 +364,15 @@ class CalendarManager:
         """
         Gets the event happening right now.
         """
-        if not self.service:
-            self.authenticate()
-
-        if not self.service:
-            return None
-
         try:
             now = datetime.datetime.now(config.TIMEZONE)
             
             start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
             end_of_day = now.replace(hour=23, minute=59, second=59, microsecond=999999)
             
-            start_utc = start_of_day.astimezone(datetime.timezone.utc)
-            end_utc = end_of_day.astimezone(datetime.timezone.utc)
-            
-            events_result = self.service.events().list(
-                calendarId='primary', 
-                timeMin=start_utc.isoformat(),
-                timeMax=end_utc.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            events = self._cached_events(start_of_day, end_of_day)
+            if events is None:
+                return None
             
             for event in events:
                 start_str = event['start'].get('dateTime')
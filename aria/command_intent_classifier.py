@@ -6,7 +6,10 @@ Uses LLM to understand user intent and map to specific system commands
 from typing import Dict, Any
 import json
 import re
+import time
 from .brain import AriaBrain
+from .intent_cache import IntentCache
+from .fast_path_matcher import FastPathMatcher, normalize_command, trie_regex
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -259,92 +262,75 @@ class CommandIntentClassifier:
         "unread emails": "email_check"
     }
 
-    def __init__(self, brain: AriaBrain):
-        """Initialize with an AriaBrain instance."""
+    # Substring keywords that mark a shopping request
+    SHOPPING_KEYWORDS = ["buy ", "purchase ", "price of ", "shop for ", "how much is ", "cost of ", "deal on "]
+
+    # Parameterized fast paths, in priority order: (intent, pattern, confidence, build_parameters).
+    # A pattern may capture one (?P<value>...) group; build_parameters gets (value, clean_text, user_text).
+    REGEX_FAST_PATHS = [
+        # Volume Set ("set volume to 50")
+        ("volume_set", r'(?:set|change|turn|vset) (?:the )?volume (?:to )?(?P<value>\d+)', 1.0,
+         lambda value, clean_text, user_text: {"level": int(value)}),
+        # Volume Set (Alternative: "volume 50")
+        ("volume_set", r'^volume (?P<value>\d+)$', 1.0,
+         lambda value, clean_text, user_text: {"level": int(value)}),
+        # Brightness Set
+        ("brightness_set", r'(?:set|change|turn) (?:the )?brightness (?:to )?(?P<value>\d+)', 1.0,
+         lambda value, clean_text, user_text: {"level": int(value)}),
+        # Web Search: Updates, News, Trends
+        ("web_search", r'(?:check|get|find|show|what are|any)?\s*(?:upcoming|latest|recent|new)\s+(?:updates|news|trends|developments)\s*(?:in|on|about)?', 1.0,
+         lambda value, clean_text, user_text: {"query": user_text}),
+        # Email Send - CRITICAL: Catch all email send patterns
+        ("email_send", r'(?:send|write|compose|draft)\s+(?:an?\s+)?(?:email|mail)\s+to'
+                       r'|(?:email|mail)\s+to\s+\S+'
+                       r'|(?:send|write)\s+(?:a\s+)?(?:quick\s+)?(?:email|mail)\s+to', 1.0,
+         lambda value, clean_text, user_text: {}),
+        # Shopping
+        ("shopping_task", trie_regex(SHOPPING_KEYWORDS), 0.95,
+         lambda value, clean_text, user_text: {}),
+        # Desktop Typing/Clicking: catch "type ..." or "click ..." to avoid LLM misclassification
+        ("desktop_task", r'^(?:type|click)\b', 1.0,
+         lambda value, clean_text, user_text: {"action": clean_text}),
+    ]
+
+    def __init__(self, brain: AriaBrain, cache: IntentCache = None):
+        """Initialize with an AriaBrain instance and an optional result cache for the LLM path."""
         self.brain = brain
+        self.cache = cache
+        self.fast_path_matcher = FastPathMatcher(self.FAST_PATH_INTENTS, self.REGEX_FAST_PATHS)
 
     def classify_intent(self, user_text: str, conversation_history: list = None) -> list:
         """Classify the user's command into one or more intents.
         Returns a list of dicts, each with keys: intent, confidence, parameters.
         """
-        # 1. FAST PATH: Check for exact keyword matches
-        clean_text = user_text.lower().strip().replace("please", "").strip()
-        # Remove punctuation
-        clean_text = re.sub(r'[^\w\s]', '', clean_text)
-        
-        if clean_text in self.FAST_PATH_INTENTS:
-            logger.info(f"FAST PATH TRIGGERED: {clean_text} -> {self.FAST_PATH_INTENTS[clean_text]}")
-            return [{
-                "intent": self.FAST_PATH_INTENTS[clean_text],
-                "confidence": 1.0,
-                "parameters": {}
-            }]
-
-        # 2. REGEX FAST PATH: Check for patterns (e.g. "set volume to 50")
-        # Volume Set
-        vol_match = re.search(r'(?:set|change|turn|vset) (?:the )?volume (?:to )?(\d+)', clean_text)
-        if vol_match:
-            level = int(vol_match.group(1))
-            logger.info(f"REGEX PATH TRIGGERED: volume_set -> {level}")
-            return [{
-                "intent": "volume_set",
-                "confidence": 1.0,
-                "parameters": {"level": level}
-            }]
-        
-        # Volume Set (Alternative: "volume 50")
-        if re.match(r'^volume \d+$', clean_text):
-             level = int(re.findall(r'\d+', clean_text)[0])
-             logger.info(f"REGEX PATH TRIGGERED: volume_set -> {level}")
-             return [{
-                "intent": "volume_set",
-                "confidence": 1.0,
-                "parameters": {"level": level}
-            }]
-
-        # Brightness Set
-        bright_match = re.search(r'(?:set|change|turn) (?:the )?brightness (?:to )?(\d+)', clean_text)
-        if bright_match:
-            level = int(bright_match.group(1))
-            logger.info(f"REGEX PATH TRIGGERED: brightness_set -> {level}")
+        # 1. FAST PATH: exact keyword matches, then the parameterized regex rules,
+        # resolved in one pass by the precompiled matcher
+        clean_text = normalize_command(user_text)
+        fast_match = self.fast_path_matcher.match(clean_text, user_text)
+        if fast_match:
+            source, intent, confidence, parameters = fast_match
+            if source == "exact":
+                logger.info(f"FAST PATH TRIGGERED: {clean_text} -> {intent}")
+            else:
+                logger.info(f"REGEX PATH TRIGGERED: {intent} -> {parameters or user_text}")
             return [{
-                "intent": "brightness_set",
-                "confidence": 1.0,
-                "parameters": {"level": level}
-            }]
-
-        # Web Search Fast Path: Updates, News, Trends
-        if re.search(r'(?:check|get|find|show|what are|any)?\s*(?:upcoming|latest|recent|new)\s+(?:updates|news|trends|developments)\s*(?:in|on|about)?', clean_text):
-             logger.info(f"REGEX PATH TRIGGERED: web_search (updates/news)")
-             return [{
-                "intent": "web_search",
-                "confidence": 1.0,
-                "parameters": {"query": user_text}
+                "intent": intent,
+                "confidence": confidence,
+                "parameters": parameters
             }]
 
-        # Email Send Fast Path - CRITICAL: Catch all email send patterns
-        email_patterns = [
-            r'(?:send|write|compose|draft)\s+(?:an?\s+)?(?:email|mail)\s+to',
-            r'(?:email|mail)\s+to\s+\S+',
-            r'(?:send|write)\s+(?:a\s+)?(?:quick\s+)?(?:email|mail)\s+to'
-        ]
-        for pattern in email_patterns:
-            if re.search(pattern, clean_text, re.IGNORECASE):
-                logger.info(f"REGEX PATH TRIGGERED: email_send (pattern: {pattern})")
-                return [{
-                    "intent": "email_send",
-                    "confidence": 1.0,
-                    "parameters": {}
-                }]
-
-        # Shopping Fast Path
-        if any(x in clean_text for x in ["buy ", "purchase ", "price of ", "shop for ", "how much is ", "cost of ", "deal on "]):
-            logger.info(f"REGEX PATH TRIGGERED: shopping_task -> {user_text}")
-            return [{"intent": "shopping_task", "confidence": 0.95, "parameters": {}}]
+        # 2. CACHE: Reuse an earlier LLM result for the same (or a near-identical) phrasing
+        query_embedding = None
+        if self.cache:
+            cached, query_embedding = self.cache.lookup(user_text)
+            if cached is not None:
+                logger.info(f"CACHE PATH TRIGGERED: {clean_text} -> {[item['intent'] for item in cached]}")
+                return cached
 
         if not self.brain.is_available():
             return [{"intent": "none", "confidence": 0.0, "parameters": {}}]
 
+        llm_start = time.time()
         prompt = self._build_classification_prompt(user_text, conversation_history)
         try:
             # Use Fast LLM for critical latency path
@@ -375,22 +361,13 @@ class CommandIntentClassifier:
                 results = []
         except Exception as e:
             logger.error(f"Error classifying intent: {e}")
+            self.brain.report_provider_error(e)
             try:
                 logger.debug(f"Raw response was: {content[:100].encode('utf-8', errors='ignore').decode('utf-8') if 'content' in locals() else 'No response'}")
             except Exception:
                 logger.debug("Raw response was: [Content with unicode]")
             return [{"intent": "general_chat", "confidence": 0.0, "parameters": {}}]
 
-        # 3. REGEX FAST PATH for Desktop Typing/Clicking
-        # Catch "type ..." or "click ..." early to avoid LLM misclassification
-        if re.match(r'^(type|click)\b', clean_text, re.IGNORECASE):
-            logger.info(f"REGEX PATH TRIGGERED: desktop_task -> {clean_text}")
-            return [{
-                "intent": "desktop_task",
-                "confidence": 1.0,
-                "parameters": {"action": clean_text}
-            }]
-
         final_intents = []
         
         # If no results or empty list, default to general_chat
@@ -435,6 +412,9 @@ class CommandIntentClassifier:
             
             final_intents.append({"intent": intent, "confidence": result.get("confidence", 0.0), "parameters": parameters})
 
+        if self.cache:
+            self.cache.store(user_text, final_intents, llm_latency=time.time() - llm_start, embedding=query_embedding)
+
         return final_intents
 
     def _build_classification_prompt(self, user_text: str, conversation_history: list = None) -> str:
@@ -492,6 +472,7 @@ CLASSIFICATION RULES:
    - Extract 'target_date' in YYYY-MM-DD format if possible (resolve "today", "tomorrow", "next friday" based on CURRENT DATE).
    - Extract 'query_type': "events" (default) or "free_time" (if asking for empty slots/availability).
    - Extract 'time_scope': "morning" (5AM-12PM), "afternoon" (12PM-5PM), "evening" (5PM-9PM), or "all_day" (default).
+   - For "free_time" over several days or for a given length, also extract 'duration_minutes' (e.g. 120 for "2 hours") and 'end_date' (YYYY-MM-DD, the last day to search; "this week" -> Sunday, "before Friday" -> Thursday).
 
 7. **CONTEXTUAL CORRECTIONS (Review History):**
    - If the user says "no, schedule it today" or "actually, make it 5 PM", look at the **RECENT CONVERSATION HISTORY** to find the previous user command and intent.
@@ -509,6 +490,7 @@ EXAMPLES:
 - "what's the weather in London" -> intent: "weather_check", parameters: {{"city": "London"}}
 - "what do I have on Friday?" -> intent: "calendar_query", parameters: {{"target_date": "2023-10-27", "query_type": "events", "time_scope": "all_day"}}
 - "when am I free tomorrow morning?" -> intent: "calendar_query", parameters: {{"target_date": "2023-10-28", "query_type": "free_time", "time_scope": "morning"}}
+- "find a 30 min slot before Friday" -> intent: "calendar_query", parameters: {{"target_date": "2023-10-25", "query_type": "free_time", "time_scope": "all_day", "duration_minutes": 30, "end_date": "2023-10-26"}}
 - "search for aria_logo.png" -> intent: "file_search", parameters: {{"pattern": "aria_logo.png", "location": "root"}}
 - "find the budget report" -> intent: "file_search", parameters: {{"pattern": "budget report", "location": "documents"}}
 - "search for python tutorials" -> intent: "web_search", parameters: {{"query": "python tutorials"}}
@@ -522,6 +504,7 @@ EXAMPLES:
 - "write a python script to sort a list" -> intent: "general_chat", parameters: {{}}
 - "how do I center a div" -> intent: "general_chat", parameters: {{}}
 - "summarize this notion page" -> intent: "notion_query", parameters: {{"query": "summarize this page"}}
+- "find my notion notes that mention the budget" -> intent: "notion_query", parameters: {{"query": "budget"}}
 
 - "send email to john@example.com to say hello" -> intent: "email_send", parameters: {{"to": "john@example.com", "subject": "Hello", "context": "greeting"}}
 - "write mail to boss about project update" -> intent: "email_send", parameters: {{"to": "boss", "subject": "Project Update", "context": "project update"}}
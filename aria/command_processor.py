@@ -5,6 +5,8 @@ import difflib
 import webbrowser
 from langchain_core.messages import HumanMessage, SystemMessage
 import random
+import threading
+import uuid
 from .search_manager import SearchManager
 from .handlers.music_handler import MusicHandler
 from .handlers.system_handler import SystemHandler
@@ -20,6 +22,7 @@ from .brains.learning_manager import LearningManager
 from .brains.shopping_agent import ShoppingAgent
 
 from .intent_dispatcher import IntentDispatcher
+from .sentence_segmenter import SentenceSegmenter
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -58,6 +61,9 @@ class CommandProcessor:
         self.shopping_agent = ShoppingAgent(self.brain, self.executor)
 
         
+        # Per-thread side channels so concurrent backend requests don't read each other's results
+        self._request_state = threading.local()
+
         self.wake_word = "aria"
         self.last_ui_action = None
         self.last_search_context = None # Store search results for follow-up questions
@@ -807,8 +813,7 @@ class CommandProcessor:
             
             logger.info(f"Starting Streaming Response with {model_name} (Actual: {self.last_used_model_name})...")
 
-            full_response = ""
-            sentence_buffer = ""
+            segmenter = SentenceSegmenter()
 
             # Use stream_ask
             stream = self.brain.stream_ask(
@@ -819,8 +824,6 @@ class CommandProcessor:
                 search_context=self.last_search_context
             )
             
-            import re
-            
             # Reset flag before starting
             self.stop_processing_flag = False
             
@@ -830,29 +833,27 @@ class CommandProcessor:
                     logger.info("Command processing interrupted by new wake word.")
                     return "Interrupted."
 
-                full_response += token
-                sentence_buffer += token
-                
-                # Check for sentence delimiters
-                if re.search(r'[.!?\n]\s*$', sentence_buffer):
-                    chunk_to_speak = sentence_buffer.strip()
-                    if chunk_to_speak:
-                        self.tts_manager.speak(chunk_to_speak)
-                        sentence_buffer = ""
+                # Speak each sentence as soon as it is complete
+                for chunk_to_speak in segmenter.feed(token):
+                    self.tts_manager.speak(chunk_to_speak)
             
             # Speak any remaining text
-            if sentence_buffer.strip() and not self.stop_processing_flag:
-                self.tts_manager.speak(sentence_buffer.strip())
+            if not self.stop_processing_flag:
+                for chunk_to_speak in segmenter.flush():
+                    self.tts_manager.speak(chunk_to_speak)
+            full_response = segmenter.text
             
             # Add assistant response to internal history if not using external
             if conversation_history is None:
                 self.conversation_history.append({"role": "assistant", "content": full_response})
             
             # --- SAVE TO LONG TERM MEMORY ---
-            if self.memory_manager:
+            # Callers that pass their own history (the backend) persist messages themselves
+            if self.memory_manager and conversation_history is None:
                 conversation_id = "default_session" 
-                self.memory_manager.add_message(conversation_id, text, "user")
-                self.memory_manager.add_message(conversation_id, full_response, "assistant")
+                turn_id = uuid.uuid4().hex
+                self.memory_manager.add_message(conversation_id, text, "user", message_id=turn_id)
+                self.memory_manager.add_message(conversation_id, full_response, "assistant", message_id=turn_id)
             
             return full_response
         except Exception as e:
@@ -879,6 +880,22 @@ class CommandProcessor:
         
         return text
 
+    @property
+    def last_ui_action(self):
+        return getattr(self._request_state, "last_ui_action", None)
+
+    @last_ui_action.setter
+    def last_ui_action(self, value):
+        self._request_state.last_ui_action = value
+
+    @property
+    def last_used_model_name(self):
+        return getattr(self._request_state, "last_used_model_name", None)
+
+    @last_used_model_name.setter
+    def last_used_model_name(self, value):
+        self._request_state.last_used_model_name = value
+
     @property
     def pending_email(self):
         return self.email_handler.pending_email
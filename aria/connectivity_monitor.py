@@ -0,0 +1,157 @@
+import socket
+import threading
+import time
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Exception class names raised by httpx/openai/anthropic/google clients for transport failures
+NETWORK_ERROR_NAMES = (
+    "APIConnectionError",
+    "APITimeoutError",
+    "ConnectError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "NetworkError",
+    "TimeoutException",
+    "ServiceUnavailable",
+)
+
+
+def is_network_error(error: BaseException) -> bool:
+    """Returns True if the exception (or anything in its cause chain) is a transport failure."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (ConnectionError, TimeoutError, socket.gaierror, socket.timeout)):
+            return True
+        if type(error).__name__ in NETWORK_ERROR_NAMES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class ConnectivityMonitor:
+    """
+    Keeps a cached online/offline flag refreshed by a background probe.
+
+    Callers read `is_online` in O(1). While online the probe runs every `interval`
+    seconds; while offline it retries with exponential backoff so reconnection is
+    noticed quickly without hammering the network. A failed provider call can
+    flip the state to offline immediately via `report_failure`.
+    """
+
+    def __init__(self, host="8.8.8.8", port=53, timeout=3.0, interval=30.0,
+                 min_backoff=1.0, max_backoff=60.0, probe=None, autostart=True):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.interval = interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._probe_fn = probe or self._probe
+
+        # Optimistic until the first probe says otherwise
+        self._online = True
+        self._backoff = min_backoff
+        self.last_probe_time = None
+        self.last_change_time = time.time()
+        self.consecutive_failures = 0
+
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stopped = False
+        self.thread = None
+
+        if autostart:
+            self.start()
+
+    @property
+    def is_online(self) -> bool:
+        return self._online
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self._stopped = False
+        self.thread = threading.Thread(target=self._monitor_loop, daemon=True, name="aria-connectivity")
+        self.thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wake_event.set()
+
+    def _probe(self) -> bool:
+        try:
+            # Connect to a public DNS server (Google's 8.8.8.8)
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+    def check_now(self) -> bool:
+        """Runs one probe synchronously, updates the cached state and returns it."""
+        self._update(self._probe_fn())
+        return self._online
+
+    def report_failure(self, error: BaseException = None) -> bool:
+        """
+        Called when a provider request fails. Network errors flip the state to offline
+        at once and schedule an immediate re-probe. Returns True if the error was treated
+        as a connectivity failure.
+        """
+        if error is not None and not is_network_error(error):
+            return False
+        with self._lock:
+            self._backoff = self.min_backoff
+        self._set_online(False)
+        self._wake_event.set()
+        return True
+
+    def _set_online(self, online: bool):
+        if online != self._online:
+            self._online = online
+            self.last_change_time = time.time()
+            logger.info(f"Connectivity changed: {'online' if online else 'offline'}")
+
+    def _update(self, online: bool):
+        with self._lock:
+            self.last_probe_time = time.time()
+            if online:
+                self.consecutive_failures = 0
+                self._backoff = self.min_backoff
+            else:
+                self.consecutive_failures += 1
+        self._set_online(online)
+
+    def _next_delay(self) -> float:
+        """Seconds until the next probe: steady interval when online, doubling backoff when offline."""
+        with self._lock:
+            if self._online:
+                return self.interval
+            delay = self._backoff
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            return delay
+
+    def _monitor_loop(self):
+        delay = 0
+        while not self._stopped:
+            self._wake_event.wait(delay)
+            self._wake_event.clear()
+            if self._stopped:
+                break
+            try:
+                self._update(self._probe_fn())
+            except Exception as e:
+                logger.error(f"Connectivity probe error: {e}")
+                self._update(False)
+            delay = self._next_delay()
+
+    def get_status(self) -> dict:
+        return {
+            "online": self._online,
+            "last_probe_time": self.last_probe_time,
+            "last_change_time": self.last_change_time,
+            "consecutive_failures": self.consecutive_failures,
+            "next_backoff": self._backoff,
+        }
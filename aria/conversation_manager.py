@@ -1,180 +1,85 @@
-import os
-from datetime import datetime
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
-from dotenv import load_dotenv
-import uuid
+import asyncio
+import threading
+from .conversation_store import AsyncConversationStore, HISTORY_WINDOW
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """Event loop thread used when no running loop is handed in (voice/CLI path)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True, name="aria-conversations").start()
+        return _loop
 
-load_dotenv()
 
 class ConversationManager:
-    def __init__(self):
-        """Initialize MongoDB connection for conversation storage."""
-        self.mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
-        self.db_name = "aria_conversations"
-        self.client = None
-        self.db = None
-        self.current_conversation_id = None
-        
-        # Connection is now lazy - verified on first use
-    
-    def _ensure_connection(self):
-        """Establish MongoDB connection if not already connected."""
-        if self.client and self.db:
-            return True
-            
+    def __init__(self, store: AsyncConversationStore = None, loop: asyncio.AbstractEventLoop = None):
+        """
+        Blocking facade over AsyncConversationStore. Each call runs the store coroutine on `loop`
+        (the backend passes its own so one Motor client serves both) and waits for the result.
+        """
+        self.store = store or AsyncConversationStore()
+        self.loop = loop or _background_loop()
+
+    def _run(self, coro):
         try:
-            self.client = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=2000) # Reduced timeout
-            # Test connection
-            self.client.admin.command('ismaster')
-            self.db = self.client[self.db_name]
-            # print(f"[OK] MongoDB connected: {self.db_name}")
-            return True
-        except ConnectionFailure as e:
-            # print(f"[WARNING] MongoDB connection failed: {e}")
-            return False
-        except Exception as e:
-            # print(f"[ERROR] MongoDB initialization error: {e}")
-            return False
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            # Blocking here would deadlock the loop the coroutine needs
+            coro.close()
+            raise RuntimeError("ConversationManager called on its own event loop; await the store instead")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def submit(self, coro):
+        """Schedules a store coroutine without waiting; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def get_stats(self):
+        """Pool and circuit-breaker statistics for the MongoDB connection."""
+        return self.store.get_stats()
 
     def is_connected(self):
-        """Check if MongoDB is connected (attempts connection if needed)."""
-        return self._ensure_connection()
-    
+        """Check if MongoDB is available (no I/O; uses the cached health state)."""
+        return self.store.is_connected()
+
     def create_conversation(self):
         """Create a new conversation session and return its ID."""
-        if not self.is_connected():
-            return None
-        
-        try:
-            conversation_id = str(uuid.uuid4())
-            conversation = {
-                "_id": conversation_id,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-                "messages": [],
-                "title": "New Conversation"  # Will be updated based on first message
-            }
-            self.db.conversations.insert_one(conversation)
-            self.current_conversation_id = conversation_id
-            print(f"[OK] Created conversation: {conversation_id}")
-            return conversation_id
-        except Exception as e:
-            print(f"[ERROR] Error creating conversation: {e}")
-            return None
-    
+        return self._run(self.store.create_conversation())
+
     def add_message(self, conversation_id, role, content):
         """Add a message to a conversation. Role is 'user' or 'assistant'."""
-        if not self.is_connected():
-            return False
-        
-        try:
-            message = {
-                "role": role,
-                "content": content,
-                "timestamp": datetime.utcnow()
-            }
-            
-            result = self.db.conversations.update_one(
-                {"_id": conversation_id},
-                {
-                    "$push": {"messages": message},
-                    "$set": {"updated_at": datetime.utcnow()}
-                }
-            )
-            
-            # Update title based on first user message
-            conversation = self.db.conversations.find_one({"_id": conversation_id})
-            if conversation and len(conversation.get("messages", [])) == 1 and role == "user":
-                # Use first 50 chars of first message as title
-                title = content[:50] + "..." if len(content) > 50 else content
-                self.db.conversations.update_one(
-                    {"_id": conversation_id},
-                    {"$set": {"title": title}}
-                )
-            
-            return result.modified_count > 0
-        except Exception as e:
-            print(f"[ERROR] Error adding message: {e}")
-            return False
-    
-    def get_conversation(self, conversation_id):
-        """Retrieve a specific conversation with all messages."""
-        if not self.is_connected():
-            return None
-        
-        try:
-            conversation = self.db.conversations.find_one({"_id": conversation_id})
-            if conversation:
-                # Convert datetime objects to ISO strings for JSON serialization
-                conversation["created_at"] = conversation["created_at"].isoformat()
-                conversation["updated_at"] = conversation["updated_at"].isoformat()
-                for msg in conversation.get("messages", []):
-                    msg["timestamp"] = msg["timestamp"].isoformat()
-            return conversation
-        except Exception as e:
-            print(f"[ERROR] Error retrieving conversation: {e}")
-            return None
-    
+        return self._run(self.store.add_message(conversation_id, role, content))
+
+    def get_conversation(self, conversation_id, message_limit=None):
+        """Retrieve a specific conversation with all messages (or only the last `message_limit`)."""
+        return self._run(self.store.get_conversation(conversation_id, message_limit))
+
+    def get_recent_messages(self, conversation_id, limit=HISTORY_WINDOW):
+        """Returns the last `limit` messages as [{"role", "content"}] for LLM context."""
+        return self._run(self.store.get_recent_messages(conversation_id, limit))
+
     def list_conversations(self, limit=20):
         """Get recent conversations with metadata (excluding messages for performance)."""
-        if not self.is_connected():
-            return []
-        
-        try:
-            conversations = list(
-                self.db.conversations.find(
-                    {},
-                    {"_id": 1, "title": 1, "created_at": 1, "updated_at": 1, "messages": {"$slice": 1}}
-                )
-                .sort("updated_at", -1)
-                .limit(limit)
-            )
-            
-            # Format for JSON
-            for conv in conversations:
-                conv["created_at"] = conv["created_at"].isoformat()
-                conv["updated_at"] = conv["updated_at"].isoformat()
-                # Count messages
-                full_conv = self.db.conversations.find_one({"_id": conv["_id"]}, {"messages": 1})
-                conv["message_count"] = len(full_conv.get("messages", []))
-            
-            return conversations
-        except Exception as e:
-            print(f"[ERROR] Error listing conversations: {e}")
-            return []
-    
+        return self._run(self.store.list_conversations(limit))
+
     def delete_conversation(self, conversation_id):
         """Delete a conversation."""
-        if not self.is_connected():
-            return False
-        
-        try:
-            result = self.db.conversations.delete_one({"_id": conversation_id})
-            return result.deleted_count > 0
-        except Exception as e:
-            print(f"[ERROR] Error deleting conversation: {e}")
-            return False
-    
+        return self._run(self.store.delete_conversation(conversation_id))
+
     def rename_conversation(self, conversation_id, new_title):
         """Rename a conversation."""
-        if not self.is_connected():
-            return False
-        
-        try:
-            result = self.db.conversations.update_one(
-                {"_id": conversation_id},
-                {"$set": {"title": new_title}}
-            )
-            return result.modified_count > 0
-        except Exception as e:
-            print(f"[ERROR] Error renaming conversation: {e}")
-            return False
-    
+        return self._run(self.store.rename_conversation(conversation_id, new_title))
+
     def get_current_conversation_id(self):
         """Get the current active conversation ID."""
-        return self.current_conversation_id
-    
+        return self.store.get_current_conversation_id()
+
     def set_current_conversation_id(self, conversation_id):
         """Set the current active conversation ID."""
-        self.current_conversation_id = conversation_id
+        self.store.set_current_conversation_id(conversation_id)
@@ -0,0 +1,267 @@
+"""
+Async conversation storage on the Motor driver.
+
+`AsyncConversationStore` has the same API as `ConversationManager` with
+coroutines instead of blocking calls, so FastAPI routes await it directly on
+the event loop. Health comes from the shared `MongoPool` breaker, which is
+checked without I/O; while MongoDB is down every call returns its empty value
+immediately.
+
+Motor clients are bound to the event loop that first uses them. The backend
+runs everything on its own loop; `ConversationManager` is the blocking adapter
+that submits coroutines to that same loop from worker threads.
+"""
+
+import os
+import uuid
+from datetime import datetime
+from dotenv import load_dotenv
+from .mongo_pool import MongoPool
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    AsyncIOMotorClient = None
+
+load_dotenv()
+
+# Messages of context sent to the LLM on each turn
+HISTORY_WINDOW = 25
+TITLE_MAX_CHARS = 50
+
+
+class AsyncConversationStore:
+    def __init__(self, mongo_uri: str = None, db_name: str = "aria_conversations", client=None, pool: MongoPool = None):
+        """
+        By default the Motor client of the shared `MongoPool` for `mongo_uri` is used, so
+        traffic goes through the pool its health probe and statistics watch. An injected
+        `client` (any Motor-compatible client) has no breaker unless `pool` is given too.
+        """
+        self.mongo_uri = mongo_uri or os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
+        self.db_name = db_name
+        self.pool = pool if (pool is not None or client is not None) else MongoPool.shared(self.mongo_uri)
+        self.client = client
+        self.current_conversation_id = None
+        self._prepared = False
+
+        if self.client is None:
+            if AsyncIOMotorClient is None:
+                print("[WARNING] motor not installed - conversation history disabled")
+            else:
+                self.client = self.pool.client
+        self.db = self.client[self.db_name] if self.client is not None else None
+
+    @property
+    def conversations(self):
+        return self.db.conversations
+
+    def is_connected(self) -> bool:
+        """O(1): False while the client is missing or the breaker is open."""
+        if self.db is None:
+            return False
+        return self.pool is None or self.pool.is_available
+
+    def _report_error(self, action, error):
+        print(f"[ERROR] Error {action}: {error}")
+        if self.pool is not None:
+            self.pool.report_failure(error)
+
+    def get_stats(self) -> dict:
+        """Pool and circuit-breaker statistics for the MongoDB connection."""
+        if self.pool is None:
+            return {"available": self.db is not None}
+        return self.pool.get_stats()
+
+    async def _ensure_connection(self) -> bool:
+        if not self.is_connected():
+            return False
+        if not self._prepared:
+            self._prepared = await self._prepare_collection()
+        return True
+
+    async def _prepare_collection(self) -> bool:
+        """Creates the listing index and backfills message_count on documents written before it existed."""
+        try:
+            await self.conversations.create_index([("updated_at", -1)])
+            await self.conversations.update_many(
+                {"message_count": {"$exists": False}},
+                [{"$set": {"message_count": {"$size": {"$ifNull": ["$messages", []]}}}}]
+            )
+            return True
+        except Exception as e:
+            print(f"[WARNING] Could not prepare conversations collection: {e}")
+            if self.pool is not None:
+                self.pool.report_failure(e)
+            return False
+
+    @staticmethod
+    def _make_title(content):
+        # Use first 50 chars of first message as title
+        return content[:TITLE_MAX_CHARS] + "..." if len(content) > TITLE_MAX_CHARS else content
+
+    async def create_conversation(self):
+        """Create a new conversation session and return its ID."""
+        if not await self._ensure_connection():
+            return None
+
+        try:
+            conversation_id = str(uuid.uuid4())
+            conversation = {
+                "_id": conversation_id,
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "messages": [],
+                "message_count": 0,
+                "title": "New Conversation"  # Will be updated based on first message
+            }
+            await self.conversations.insert_one(conversation)
+            self.current_conversation_id = conversation_id
+            print(f"[OK] Created conversation: {conversation_id}")
+            return conversation_id
+        except Exception as e:
+            self._report_error("creating conversation", e)
+            return None
+
+    async def add_message(self, conversation_id, role, content):
+        """Add a message to a conversation. Role is 'user' or 'assistant'."""
+        return await self.add_messages(conversation_id, [(role, content)])
+
+    async def add_messages(self, conversation_id, messages):
+        """Appends [(role, content), ...] in a single update."""
+        if not messages or not await self._ensure_connection():
+            return False
+
+        try:
+            now = datetime.utcnow()
+            update = {
+                "$push": {"messages": {"$each": [
+                    {"role": role, "content": content, "timestamp": now} for role, content in messages
+                ]}},
+                "$inc": {"message_count": len(messages)},
+                "$set": {"updated_at": now}
+            }
+
+            first_role, first_content = messages[0]
+            if first_role != "user":
+                result = await self.conversations.update_one({"_id": conversation_id}, update)
+                return result.modified_count > 0
+
+            # Common case: the conversation already has messages, so no title change
+            result = await self.conversations.update_one(
+                {"_id": conversation_id, "message_count": {"$gt": 0}}, update
+            )
+            if result.matched_count == 0:
+                # First message: set the title in the same write
+                update["$set"]["title"] = self._make_title(first_content)
+                result = await self.conversations.update_one({"_id": conversation_id}, update)
+
+            return result.modified_count > 0
+        except Exception as e:
+            self._report_error("adding message", e)
+            return False
+
+    async def get_conversation(self, conversation_id, message_limit=None):
+        """Retrieve a specific conversation with all messages (or only the last `message_limit`)."""
+        if not await self._ensure_connection():
+            return None
+
+        try:
+            projection = None
+            if message_limit:
+                projection = {
+                    "title": 1, "created_at": 1, "updated_at": 1, "message_count": 1,
+                    "messages": {"$slice": -message_limit}
+                }
+            conversation = await self.conversations.find_one({"_id": conversation_id}, projection)
+            if conversation:
+                # Convert datetime objects to ISO strings for JSON serialization
+                conversation["created_at"] = conversation["created_at"].isoformat()
+                conversation["updated_at"] = conversation["updated_at"].isoformat()
+                for msg in conversation.get("messages", []):
+                    msg["timestamp"] = msg["timestamp"].isoformat()
+            return conversation
+        except Exception as e:
+            self._report_error("retrieving conversation", e)
+            return None
+
+    async def get_recent_messages(self, conversation_id, limit=HISTORY_WINDOW):
+        """Returns the last `limit` messages as [{"role", "content"}] for LLM context."""
+        if not await self._ensure_connection():
+            return []
+
+        try:
+            conversation = await self.conversations.find_one(
+                {"_id": conversation_id},
+                {"_id": 1, "messages": {"$slice": -limit}}
+            )
+            if not conversation:
+                return []
+            return [
+                {"role": msg["role"], "content": msg["content"]}
+                for msg in conversation.get("messages", [])
+            ]
+        except Exception as e:
+            self._report_error("retrieving recent messages", e)
+            return []
+
+    async def list_conversations(self, limit=20):
+        """Get recent conversations with metadata (excluding messages for performance)."""
+        if not await self._ensure_connection():
+            return []
+
+        try:
+            cursor = (
+                self.conversations.find(
+                    {},
+                    {"_id": 1, "title": 1, "created_at": 1, "updated_at": 1, "message_count": 1, "messages": {"$slice": 1}}
+                )
+                .sort("updated_at", -1)
+                .limit(limit)
+            )
+            conversations = await cursor.to_list(length=limit)
+
+            # Format for JSON
+            for conv in conversations:
+                conv["created_at"] = conv["created_at"].isoformat()
+                conv["updated_at"] = conv["updated_at"].isoformat()
+                conv.setdefault("message_count", 0)
+
+            return conversations
+        except Exception as e:
+            self._report_error("listing conversations", e)
+            return []
+
+    async def delete_conversation(self, conversation_id):
+        """Delete a conversation."""
+        if not await self._ensure_connection():
+            return False
+
+        try:
+            result = await self.conversations.delete_one({"_id": conversation_id})
+            return result.deleted_count > 0
+        except Exception as e:
+            self._report_error("deleting conversation", e)
+            return False
+
+    async def rename_conversation(self, conversation_id, new_title):
+        """Rename a conversation."""
+        if not await self._ensure_connection():
+            return False
+
+        try:
+            result = await self.conversations.update_one(
+                {"_id": conversation_id},
+                {"$set": {"title": new_title}}
+            )
+            return result.modified_count > 0
+        except Exception as e:
+            self._report_error("renaming conversation", e)
+            return False
+
+    def get_current_conversation_id(self):
+        """Get the current active conversation ID."""
+        return self.current_conversation_id
+
+    def set_current_conversation_id(self, conversation_id):
+        """Set the current active conversation ID."""
+        self.current_conversation_id = conversation_id
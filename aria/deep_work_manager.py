@@ -2,46 +2,64 @@ import datetime
 import time
 import ctypes
 import winreg
-import threading
 from typing import List
+from .scheduler import get_scheduler
+
+OWNER = "deep_work"
+# Focus Time edges are recomputed on calendar changes and at least this often
+REPLAN_INTERVAL = 30 * 60
+TRIGGER_PHRASES = ["focus time", "deep work", "focus session"]
 
 class DeepWorkManager:
-    def __init__(self, calendar_manager, tts_manager=None):
+    def __init__(self, calendar_manager, tts_manager=None, scheduler=None):
         self.calendar = calendar_manager
         self.tts = tts_manager
         self.is_deep_work_active = False
-        self.check_interval = 60  # Check every minute
-        self.stop_event = threading.Event()
-        self.thread = None
+        self.scheduler = scheduler
+        self.listening = False
 
     def start_monitoring(self):
-        """Starts the background monitoring thread."""
-        if self.thread and self.thread.is_alive():
+        """Schedules a check at the start and end of every upcoming Focus Time event."""
+        if self.scheduler is None:
+            self.scheduler = get_scheduler()
+        if self.scheduler.get(f"{OWNER}:plan"):
             return
-        
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        cache = getattr(self.calendar, "cache", None)
+        if cache is not None and not self.listening:
+            cache.add_listener(self._replan_soon)
+            self.listening = True
+        self.scheduler.every(REPLAN_INTERVAL, self.plan, name=f"{OWNER}:plan", first_delay=0, owner=OWNER)
         print("Deep Work Monitor started.")
 
     def stop_monitoring(self):
-        """Stops the background monitoring thread."""
-        self.stop_event.set()
-        if self.thread:
-            self.thread.join()
+        """Cancels the Focus Time jobs."""
+        if self.scheduler:
+            self.scheduler.cancel_owner(OWNER)
         print("Deep Work Monitor stopped.")
 
-    def _monitor_loop(self):
-        """Background loop to check for Focus Time."""
-        while not self.stop_event.is_set():
-            try:
-                self.check_and_activate()
-            except Exception as e:
-                print(f"Error in Deep Work Monitor: {e}")
-            
-            # Wait for check_interval or stop_event
-            if self.stop_event.wait(self.check_interval):
-                break
+    def _replan_soon(self):
+        if self.scheduler and self.scheduler.get(f"{OWNER}:plan"):
+            self.scheduler.schedule_in(0, self.plan, name=f"{OWNER}:replan", owner=OWNER)
+
+    def plan(self):
+        """Replaces the scheduled checks with the start/end times of the upcoming Focus Time events."""
+        now = time.time()
+        planned = {f"{OWNER}:plan", f"{OWNER}:replan"}
+        for event in self.calendar.get_upcoming_events_raw(max_results=10):
+            summary = event.get('summary', '').lower()
+            if not event.get('id') or not any(phrase in summary for phrase in TRIGGER_PHRASES):
+                continue
+            for edge in ('start', 'end'):
+                value = event[edge].get('dateTime')
+                if not value:
+                    continue
+                when = datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+                if when >= now:
+                    name = f"{OWNER}:{edge}:{event['id']}"
+                    self.scheduler.schedule_at(when, self.check_and_activate, name=name, owner=OWNER)
+                    planned.add(name)
+        self.scheduler.cancel_owner(OWNER, keep=planned)
+        self.check_and_activate()
 
     def check_and_activate(self):
         """Checks calendar for 'Focus Time' and toggles Deep Work mode."""
@@ -59,8 +77,7 @@ class DeepWorkManager:
         for event in events:
             summary = event.get('summary', '').lower()
             # Check for various trigger phrases
-            trigger_phrases = ["focus time", "deep work", "focus session"]
-            if any(phrase in summary for phrase in trigger_phrases):
+            if any(phrase in summary for phrase in TRIGGER_PHRASES):
                 start = event['start'].get('dateTime')
                 end = event['end'].get('dateTime')
                 
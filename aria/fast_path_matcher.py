@@ -0,0 +1,92 @@
+"""
+Precompiled fast-path engine for the intent classifier.
+
+Exact phrases resolve through a single hash lookup on the normalized text.
+Parameterized patterns are compiled into ONE regex: each rule becomes an
+optional lookahead anchored at the start of the string, so a single
+`match()` call evaluates every rule and records which ones hit. The result is
+then picked by rule order, which keeps priority deterministic regardless of
+where in the utterance each pattern occurs. Keyword lists are folded into a
+trie-shaped alternation so the regex engine never backtracks across phrases
+that share a prefix.
+"""
+
+import re
+
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+VALUE_GROUP = "(?P<value>"
+
+
+def normalize_command(user_text: str) -> str:
+    """Same normalization the classifier has always applied before fast-path checks."""
+    clean_text = user_text.lower().strip().replace("please", "").strip()
+    return PUNCTUATION_PATTERN.sub('', clean_text)
+
+
+def trie_regex(phrases) -> str:
+    """Builds a regex alternation shaped like a trie of the given literal phrases."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        optional = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 and not optional else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body = (body if body.startswith("(?:") else "(?:" + body + ")") + "?"
+        return body
+
+    return build(trie)
+
+
+class FastPathMatcher:
+    """
+    Resolves a command in a single pass over precompiled structures.
+
+    exact_intents: {normalized phrase: intent}
+    rules: ordered list of (intent, pattern, confidence, build_parameters). A pattern may
+           capture one `(?P<value>...)` group; build_parameters(value, clean_text, user_text)
+           returns the parameters dict.
+    """
+
+    def __init__(self, exact_intents: dict, rules: list):
+        self.exact_intents = dict(exact_intents)
+        self.rules = []
+        lookaheads = []
+        alternatives = []
+        for index, (intent, pattern, confidence, build_parameters) in enumerate(rules):
+            hit_group = f"r{index}"
+            value_group = f"r{index}_value" if VALUE_GROUP in pattern else None
+            if value_group:
+                pattern = pattern.replace(VALUE_GROUP, f"(?P<{value_group}>")
+            # Rules anchored with ^ must not be preceded by the lazy scan
+            scan = "" if pattern.startswith("^") else ".*?"
+            lookaheads.append(f"(?:(?={scan}(?P<{hit_group}>{pattern})))?")
+            alternatives.append(f"(?:{re.sub(r'[(][?]P<[^>]+>', '(?:', pattern)})")
+            self.rules.append((hit_group, value_group, intent, confidence, build_parameters))
+        self.combined = re.compile("".join(lookaheads), re.DOTALL)
+        # Cheap single-scan screen: most utterances match no rule at all
+        self.screen = re.compile("|".join(alternatives), re.DOTALL)
+
+    def match(self, clean_text: str, user_text: str = None):
+        """Returns (source, intent, confidence, parameters) or None."""
+        intent = self.exact_intents.get(clean_text)
+        if intent:
+            return "exact", intent, 1.0, {}
+
+        if not self.screen.search(clean_text):
+            return None
+
+        groups = self.combined.match(clean_text).groupdict()
+        for hit_group, value_group, intent, confidence, build_parameters in self.rules:
+            if groups[hit_group] is not None:
+                value = groups[value_group] if value_group else None
+                parameters = build_parameters(value, clean_text, user_text if user_text is not None else clean_text)
+                return "regex", intent, confidence, parameters
+        return None
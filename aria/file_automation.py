@@ -1,8 +1,7 @@
 import os
-import shutil
-import time
-import datetime
+from collections import Counter
 from pathlib import Path
+from .folder_organizer import FolderOrganizer
 
 class FileAutomator:
     def __init__(self):
@@ -15,6 +14,8 @@ class FileAutomator:
             "Executables": [".exe", ".msi", ".bat", ".sh", ".apk"],
             "Code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".h", ".json", ".xml", ".sql"]
         }
+        # Plans moves in one pass and runs them in parallel, with an undo journal
+        self.organizer = FolderOrganizer(self.extensions)
 
     def get_downloads_folder(self):
         """Returns the path to the user's Downloads folder."""
@@ -35,74 +36,23 @@ class FileAutomator:
         """Returns the path to the user's Desktop folder."""
         return Path.home() / 'Desktop'
 
-    def organize_folder(self, folder_path):
+    def organize_folder(self, folder_path, dry_run=False):
         """
         Organizes files in the specified folder into subfolders based on their extensions.
+        With dry_run, only describes the moves it would make.
         """
         folder = Path(folder_path)
         if not folder.exists():
             return f"Error: The folder '{folder_path}' does not exist."
 
+        moves = self.organizer.plan_by_type(str(folder))
+        if dry_run:
+            return self._describe_plan(folder, moves)
 
-        moved_count = 0
-        
-        # Create category folders if they don't exist
-        for category in self.extensions.keys():
-            (folder / category).mkdir(exist_ok=True)
-        
-        # Create 'Others' folder
-        (folder / "Others").mkdir(exist_ok=True)
-
-        for file_path in folder.iterdir():
-            if file_path.is_dir():
-                continue
-            
-            # Skip hidden files
-            if file_path.name.startswith('.'):
-                continue
-
-            # Find category
-            file_ext = file_path.suffix.lower()
-            destination_category = "Others"
-            
-            for category, exts in self.extensions.items():
-                if file_ext in exts:
-                    destination_category = category
-                    break
-            
-            # Move file
-            try:
-                destination = folder / destination_category / file_path.name
-                
-                # Handle duplicates by renaming
-                if destination.exists():
-                    base = destination.stem
-                    ext = destination.suffix
-                    counter = 1
-                    while destination.exists():
-                        destination = folder / destination_category / f"{base}_{counter}{ext}"
-                        counter += 1
-                
-                shutil.move(str(file_path), str(destination))
-                moved_count += 1
-            except Exception as e:
-                print(f"Error moving {file_path.name}: {e}")
-
-        # Cleanup empty folders (optional, maybe too aggressive for now)
-        # for category in self.extensions.keys():
-        #     cat_path = folder / category
-        #     if cat_path.exists() and not any(cat_path.iterdir()):
-        #         cat_path.rmdir()
-        #     
-        # others_path = folder / "Others"
-        # if others_path.exists() and not any(others_path.iterdir()):
-        #     others_path.rmdir()
-
-        # ... (existing code) ...
+        result = self.organizer.execute(str(folder), moves, action="organize")
+        return f"Organized {result['moved']} files in {folder_path}."
 
-        return f"Organized {moved_count} files in {folder_path}."
-
-    def archive_old_files(self, folder_path, days=30):
+    def archive_old_files(self, folder_path, days=30, dry_run=False):
         """
         Moves files older than 'days' to an 'Archive' subfolder, organized by Year/Month.
         """
@@ -110,49 +60,23 @@ class FileAutomator:
         if not folder.exists():
             return f"Error: The folder '{folder_path}' does not exist."
 
-
-        archive_root = folder / "Archive"
-        archive_root.mkdir(exist_ok=True)
-        
-        moved_count = 0
-        cutoff_time = time.time() - (days * 86400) # 86400 seconds in a day
-
-        for file_path in folder.iterdir():
-            if file_path.is_dir():
-                continue
-            
-            # Skip hidden files
-            if file_path.name.startswith('.'):
-                continue
-
-            try:
-                # Check modification time
-                mtime = file_path.stat().st_mtime
-                if mtime < cutoff_time:
-                    # Get Year and Month
-                    date_obj = datetime.datetime.fromtimestamp(mtime)
-                    year_str = date_obj.strftime("%Y")
-                    month_str = date_obj.strftime("%B") # e.g., "November"
-                    
-                    # Create target folder: Archive/2024/November
-                    target_dir = archive_root / year_str / month_str
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Move file
-                    destination = target_dir / file_path.name
-                    
-                    # Handle duplicates
-                    if destination.exists():
-                        base = destination.stem
-                        ext = destination.suffix
-                        counter = 1
-                        while destination.exists():
-                            destination = target_dir / f"{base}_{counter}{ext}"
-                            counter += 1
-                    
-                    shutil.move(str(file_path), str(destination))
-                    moved_count += 1
-            except Exception as e:
-                print(f"Error archiving {file_path.name}: {e}")
-
-        return f"Archived {moved_count} files older than {days} days."
+        moves = self.organizer.plan_archive(str(folder), days)
+        if dry_run:
+            return self._describe_plan(folder, moves)
+
+        result = self.organizer.execute(str(folder), moves, action="archive")
+        return f"Archived {result['moved']} files older than {days} days."
+
+    def undo_last_organize(self):
+        """Puts the files from the most recent organize/archive run back."""
+        result = self.organizer.undo()
+        if result.get("error"):
+            return result["error"]
+        return f"Moved {result['restored']} files back where they were."
+
+    def _describe_plan(self, folder, moves):
+        if not moves:
+            return f"Nothing to move in {folder}."
+        counts = Counter(Path(destination).parent.relative_to(folder).as_posix() for _, destination in moves)
+        summary = ", ".join(f"{count} to {target}" for target, count in counts.most_common())
+        return f"I would move {len(moves)} files in {folder}: {summary}."
@@ -0,0 +1,230 @@
+"""
+Persistent filename index for fast local file search.
+
+An initial crawl records every file under the index roots (name, size, mtime,
+grouped by directory) in backend/data/file_index.json. Later refreshes only
+rescan directories whose mtime changed, which covers files being added,
+removed or renamed; an optional watchdog observer also flags in-place edits.
+Queries are answered from an in-memory trigram index (see file_search) and
+ranked by name similarity and recency, instead of walking the disk on every
+request.
+"""
+
+import json
+import os
+import threading
+import time
+from .file_search import FilenameIndex
+from .logger import setup_logger
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+logger = setup_logger(__name__)
+
+INDEX_VERSION = 1
+# Searches trigger an incremental rescan when the index is older than this
+REFRESH_INTERVAL = float(os.getenv("FILE_INDEX_REFRESH_SECONDS", "30"))
+EXCLUDED_DIRS = {'node_modules', '.git', '.venv', '__pycache__', 'dist', 'build'}
+
+
+class _DirtyHandler:
+    """watchdog event handler that flags the touched directories for rescanning."""
+
+    def __init__(self, index):
+        self.index = index
+
+    def dispatch(self, event):
+        for path in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+            if path:
+                self.index.mark_dirty(path if event.is_directory else os.path.dirname(path))
+
+
+class FileIndex:
+    def __init__(self, roots, storage_path: str = None, excluded_dirs=EXCLUDED_DIRS,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        if storage_path:
+            self.storage_path = storage_path
+        else:
+            # Default to backend/data/file_index.json
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.storage_path = os.path.join(data_dir, "file_index.json")
+
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.excluded_dirs = set(excluded_dirs)
+        self.refresh_interval = refresh_interval
+
+        # dirpath -> {"mtime": float, "files": [[name, size, mtime]], "subdirs": [name]}
+        self.dirs = {}
+        # Search structures derived from `dirs`, swapped whole after each change
+        self.search_index = FilenameIndex({})
+
+        self.lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.dirty = set()
+        self.last_refresh = 0.0
+        self.observer = None
+        self.stats = {"searches": 0, "refreshes": 0, "rescanned_dirs": 0}
+
+        self._load()
+
+    # --- Persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.storage_path):
+            return
+        try:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION or data.get("roots") != self.roots:
+                return
+            self._install(data["dirs"])
+            # A saved index answers immediately; the first refresh catches up with the disk
+            self.ready.set()
+            logger.info(f"Loaded file index: {len(self.search_index)} files in {len(self.dirs)} folders")
+        except Exception as e:
+            logger.error(f"Error loading file index: {e}")
+
+    def _save(self):
+        try:
+            tmp_path = self.storage_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": INDEX_VERSION, "roots": self.roots, "dirs": self.dirs}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.storage_path)
+        except Exception as e:
+            logger.error(f"Error saving file index: {e}")
+
+    # --- Crawling ---
+
+    def _scan_dir(self, path: str, mtime: float) -> dict:
+        files, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.excluded_dirs:
+                            subdirs.append(entry.name)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files.append([entry.name, stat.st_size, stat.st_mtime])
+                except OSError:
+                    continue
+        return {"mtime": mtime, "files": files, "subdirs": subdirs}
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Brings the index up to date and returns the number of folders rescanned or dropped.
+        Only folders whose mtime changed (or that the watcher flagged) are read again.
+        """
+        with self.refresh_lock:
+            with self.lock:
+                old_dirs, dirty = self.dirs, self.dirty
+                self.dirty = set()
+
+            new_dirs, changed = {}, 0
+            pending = [root for root in reversed(self.roots)]
+            while pending:
+                path = pending.pop()
+                if path in new_dirs:
+                    continue
+                known = old_dirs.get(path)
+                try:
+                    # Read the mtime first so a change during the scan is caught next time
+                    mtime = os.stat(path).st_mtime
+                    if full or known is None or known["mtime"] != mtime or path in dirty:
+                        known = self._scan_dir(path, mtime)
+                        changed += 1
+                except OSError:
+                    continue
+                new_dirs[path] = known
+                pending.extend(os.path.join(path, name) for name in known["subdirs"])
+
+            removed = len(old_dirs.keys() - new_dirs.keys())
+            if changed or removed:
+                self._install(new_dirs)
+                self._save()
+            self.last_refresh = time.monotonic()
+            self.stats["refreshes"] += 1
+            self.stats["rescanned_dirs"] += changed
+            self.ready.set()
+            return changed + removed
+
+    def _install(self, dirs: dict):
+        """Rebuilds the search index for `dirs` and swaps it in."""
+        search_index = FilenameIndex(dirs, self.roots)
+        with self.lock:
+            self.dirs, self.search_index = dirs, search_index
+
+    def start(self, watch: bool = True):
+        """Refreshes in the background and, if watchdog is installed, watches the roots."""
+        threading.Thread(target=self._initial_refresh, daemon=True, name="aria-file-index").start()
+        if watch and Observer is not None and self.observer is None:
+            try:
+                observer = Observer()
+                handler = _DirtyHandler(self)
+                for root in self.roots:
+                    if os.path.isdir(root):
+                        observer.schedule(handler, root, recursive=True)
+                observer.daemon = True
+                observer.start()
+                self.observer = observer
+            except Exception as e:
+                logger.error(f"File watcher unavailable, relying on periodic rescans: {e}")
+
+    def _initial_refresh(self):
+        try:
+            started = time.perf_counter()
+            self.refresh()
+            logger.info(f"File index ready: {len(self.search_index)} files in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logger.error(f"Error building file index: {e}")
+
+    def stop(self):
+        if self.observer:
+            self.observer.stop()
+            self.observer = None
+
+    def mark_dirty(self, directory: str):
+        with self.lock:
+            self.dirty.add(os.path.abspath(directory))
+
+    def ensure_fresh(self):
+        """
+        Starts a background refresh when the index is stale. The current snapshot keeps
+        answering meanwhile, so a search never waits on a crawl or an index rebuild.
+        """
+        stale = self.dirty or time.monotonic() - self.last_refresh >= self.refresh_interval
+        if stale and not self.refresh_lock.locked():
+            # Pushed forward now so concurrent searches don't each start a thread
+            self.last_refresh = time.monotonic()
+            threading.Thread(target=self._background_refresh, daemon=True, name="aria-file-index").start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Error refreshing file index: {e}")
+
+    # --- Queries ---
+
+    def search(self, query: str = "", extensions=None, root: str = None, recursive: bool = True,
+               limit: int = 50, now: float = None) -> list:
+        """Ranked, typo-tolerant matches; see FilenameIndex.search."""
+        self.ensure_fresh()
+        self.stats["searches"] += 1
+        return self.search_index.search(query, extensions, root, recursive, limit, now)
+
+    def get_stats(self) -> dict:
+        return {
+            "files": len(self.search_index),
+            "folders": len(self.dirs),
+            "tokens": len(self.search_index.vocabulary),
+            "ready": self.ready.is_set(),
+            "watching": self.observer is not None,
+            **self.stats,
+        }
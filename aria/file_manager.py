@@ -8,6 +8,7 @@ import shutil
 import glob
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from .file_index import FileIndex
 
 
 class FileManager:
@@ -33,6 +34,15 @@ class FileManager:
             "music": os.path.expanduser("~/Music"),
             "videos": os.path.expanduser("~/Videos"),
         }
+        
+        # Persistent filename index; search falls back to walking the disk until it is ready
+        self.file_index: Optional[FileIndex] = None
+    
+    def start_index(self, watch: bool = True):
+        """Builds/refreshes the filename index for all location shortcuts in the background."""
+        if self.file_index is None:
+            self.file_index = FileIndex(list(self.location_shortcuts.values()))
+        self.file_index.start(watch=watch)
     
     def _resolve_path(self, path: str, location: Optional[str] = None) -> Path:
         """Resolve file path, defaulting to Desktop if no location specified."""
@@ -255,45 +265,30 @@ class FileManager:
             if not search_path.exists():
                 return f"I couldn't find the {location} folder"
             
-            # Safe Search Implementation
-            matches = []
-            max_results = 50
-            excluded_dirs = {'node_modules', '.git', '.venv', '__pycache__', 'dist', 'build'}
-            
-            # Normalize pattern for flexible matching
             pattern = pattern.lower()
-
-            if not search_subdirs:
-                 # Simple flat search
-                 for file_path in search_path.glob("*"):
-                     if pattern in file_path.name.lower() or Path(pattern).name == file_path.name:
-                         matches.append(file_path)
+            if self.file_index and self.file_index.ready.is_set():
+                matches = [
+                    (Path(hit["path"]), hit["size"])
+                    for hit in self.file_index.search(pattern, root=str(search_path), recursive=search_subdirs)
+                ]
             else:
-                # Deep search with limits
-                for root, dirs, files in os.walk(search_path):
-                    # Prune excluded directories
-                    dirs[:] = [d for d in dirs if d not in excluded_dirs]
-                    
-                    for name in files:
-                        if pattern in name.lower():
-                            matches.append(Path(root) / name)
-                            if len(matches) >= max_results:
-                                break
-                    if len(matches) >= max_results:
-                        break
+                matches = [
+                    (match, match.stat().st_size if match.is_file() else None)
+                    for match in self._walk_search(pattern, search_path, search_subdirs)
+                ]
             
             if not matches:
                 return f"I couldn't find any files matching '{pattern}' in {search_path.name}"
             
             # Conversational output
             if len(matches) == 1:
-                match = matches[0]
-                size = self._format_file_size(match.stat().st_size) if match.is_file() else "folder"
+                match, size = matches[0]
+                size = self._format_file_size(size) if size is not None else "folder"
                 return f"I found 1 file: {match.name} ({size})\nPath: {match.parent}"
             else:
                 result = [f"I found {len(matches)} files in {search_path.name} (showing top {min(len(matches), 10)}):"]
-                for i, match in enumerate(matches[:10], 1):
-                    size = self._format_file_size(match.stat().st_size) if match.is_file() else "folder"
+                for i, (match, size) in enumerate(matches[:10], 1):
+                    size = self._format_file_size(size) if size is not None else "folder"
                     result.append(f"{i}. {match.name} ({size})")
                 
                 if len(matches) > 10:
@@ -302,3 +297,29 @@ class FileManager:
                 return '\n'.join(result)
         except Exception as e:
             return f"I had trouble searching: {str(e)}"
+    
+    def _walk_search(self, pattern: str, search_path: Path, search_subdirs: bool) -> List[Path]:
+        """Substring search straight from disk (used until the file index is built)."""
+        matches = []
+        max_results = 50
+        excluded_dirs = {'node_modules', '.git', '.venv', '__pycache__', 'dist', 'build'}
+        
+        if not search_subdirs:
+             # Simple flat search
+             for file_path in search_path.glob("*"):
+                 if pattern in file_path.name.lower() or Path(pattern).name == file_path.name:
+                     matches.append(file_path)
+        else:
+            # Deep search with limits
+            for root, dirs, files in os.walk(search_path):
+                # Prune excluded directories
+                dirs[:] = [d for d in dirs if d not in excluded_dirs]
+                
+                for name in files:
+                    if pattern in name.lower():
+                        matches.append(Path(root) / name)
+                        if len(matches) >= max_results:
+                            break
+                if len(matches) >= max_results:
+                    break
+        return matches
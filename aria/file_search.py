@@ -0,0 +1,337 @@
+"""
+Typo-tolerant ranked filename search over a FileIndex snapshot.
+
+Names and folder names (relative to their index root) are split into word
+tokens. Each distinct token is indexed by its character trigrams
+("$resume$" -> "$re", "res", ..., "me$"), so a misspelled query word finds
+its candidates by trigram overlap instead of comparing against every name.
+
+A query word finds files through their names and through their folders: a
+matching folder word expands to every file below that folder, so "invoices"
+finds Invoices/jan.pdf.
+
+A file's score combines:
+  - similarity: per query word, the best match against the file's name tokens
+    (exact = 1, prefix = 0.9, one or two typos by edit distance, else trigram
+    Jaccard), or against its folder tokens at a discount
+  - overlap:    the share of query words that matched at all
+  - coverage:   how much of the name the query words found in it account for
+  - recency:    exponential decay by modification time
+
+File columns are packed into arrays and postings into array('I') so a
+500k-file corpus stays compact.
+"""
+
+import heapq
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+RECENCY_HALF_LIFE_DAYS = 30
+
+EXACT, PREFIX = 1.0, 0.9
+# Trigram Jaccard below this is not considered a match for a query word
+MIN_SIMILARITY = 0.25
+# A word in the folder path counts for less than one in the file name
+PATH_WEIGHT = 0.7
+# Per query word, only the most similar vocabulary words are expanded into files
+MAX_WORD_MATCHES = 16
+MAX_SIMILARITY_GAP = 0.3
+# Vocabulary words per query word checked by edit distance
+EDIT_CANDIDATES = 32
+
+SIMILARITY_WEIGHT, OVERLAP_WEIGHT, COVERAGE_WEIGHT, RECENCY_WEIGHT = 1.0, 0.25, 0.15, 0.3
+
+_CAMEL_BOUNDARY = re.compile(r"([a-z])([A-Z])")
+_TOKEN = re.compile(r"[a-z]+|\d+")
+_EXTENSION = re.compile(r"(?:^|\s)\*?\.([a-z0-9]+)(?=\s|$)")
+
+
+def tokenize(text: str) -> list:
+    """'Shreyas_ResumeFinal2024.pdf' -> ['shreyas', 'resume', 'final', '2024', 'pdf']"""
+    return _TOKEN.findall(_CAMEL_BOUNDARY.sub(r"\1 \2", text).lower())
+
+
+def parse_query(query: str):
+    """Splits '*.pdf resume' into (['resume'], {'.pdf'})."""
+    query = query.lower()
+    extensions = {"." + ext for ext in _EXTENSION.findall(query)}
+    return tokenize(_EXTENSION.sub(" ", query)), extensions
+
+
+def trigrams(word: str) -> set:
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Linear check for one insertion, deletion, substitution or adjacent transposition."""
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return (a[i + 1:] == b[i + 1:]
+                or (i + 1 < len(a) and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]))
+    return len(b) - len(a) == 1 and a[i:] == b[i + 1:]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if a == b:
+        return 0
+    if limit == 1:
+        return 1 if _within_one_edit(a, b) else 2
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FilenameIndex:
+    """Immutable search structures built from FileIndex.dirs; rebuilt when the crawl changes."""
+
+    def __init__(self, dirs: dict, roots=()):
+        # Files are numbered folder by folder, so folder d owns ids dir_start[d]:dir_start[d + 1]
+        self.dir_paths = list(dirs)
+        self.dir_start = array('I', [0])
+        self.dir_words = []            # dir id -> word ids of its path below the root
+        self.names = []
+        self.name_chars = array('I')   # letters/digits in the name stem, for coverage
+        self.sizes = array('d')
+        self.mtimes = array('d')
+        # Word ids of each file's name: file_words[word_start[f]:word_start[f + 1]]
+        self.file_words = array('I')
+        self.word_start = array('I', [0])
+
+        self.vocabulary = []           # word id -> word
+        word_ids = {}
+        name_postings = []             # word id -> [file id]
+        dir_postings = []              # word id -> [dir id] of folders whose path below the root has it
+        ext_postings = defaultdict(list)
+
+        def word_id(word):
+            if word not in word_ids:
+                word_ids[word] = len(self.vocabulary)
+                self.vocabulary.append(word)
+                name_postings.append([])
+                dir_postings.append([])
+            return word_ids[word]
+
+        roots = [os.path.abspath(root) for root in roots]
+        for directory in self.dir_paths:
+            root = next((r for r in roots if directory == r or directory.startswith(r + os.sep)), None)
+            relative = directory[len(root):] if root else directory
+            dir_id = len(self.dir_words)
+            self.dir_words.append(tuple({word_id(word) for word in tokenize(relative)}))
+            for ids in self.dir_words[-1]:
+                dir_postings[ids].append(dir_id)
+
+            for name, size, mtime in dirs[directory]["files"]:
+                file_id = len(self.names)
+                stem, ext = os.path.splitext(name)
+                words = tokenize(stem)
+                self.names.append(name)
+                self.name_chars.append(sum(len(word) for word in words))
+                self.sizes.append(size)
+                self.mtimes.append(mtime)
+                for word in set(words + tokenize(ext)):
+                    ids = word_id(word)
+                    name_postings[ids].append(file_id)
+                    self.file_words.append(ids)
+                self.word_start.append(len(self.file_words))
+                if ext:
+                    ext_postings[ext.lower()].append(file_id)
+            self.dir_start.append(len(self.names))
+
+        self.name_postings = [array('I', ids) for ids in name_postings]
+        self.dir_postings = [array('I', ids) for ids in dir_postings]
+        # word id -> files reached through its name postings and its folders, to order expansion
+        self.word_reach = array('I', (
+            len(name_postings[w]) + sum(self.dir_start[d + 1] - self.dir_start[d] for d in dir_postings[w])
+            for w in range(len(self.vocabulary))
+        ))
+        self.ext_postings = {ext: array('I', ids) for ext, ids in ext_postings.items()}
+        # Sorted view of the vocabulary for prefix lookups
+        self.sorted_words = sorted(self.vocabulary)
+        self.sorted_ids = array('I', (word_ids[word] for word in self.sorted_words))
+
+        grams = defaultdict(list)
+        self.gram_counts = array('H')
+        for i, word in enumerate(self.vocabulary):
+            word_grams = trigrams(word)
+            self.gram_counts.append(len(word_grams))
+            for gram in word_grams:
+                grams[gram].append(i)
+        self.gram_postings = {gram: array('I', ids) for gram, ids in grams.items()}
+
+        # file id -> dir id, for path lookups
+        self.file_dirs = array('I', bytes(4 * len(self.names)))
+        for dir_id in range(len(self.dir_paths)):
+            for file_id in range(self.dir_start[dir_id], self.dir_start[dir_id + 1]):
+                self.file_dirs[file_id] = dir_id
+
+    def __len__(self):
+        return len(self.names)
+
+    def path(self, file_id: int) -> str:
+        return os.path.join(self.dir_paths[self.file_dirs[file_id]], self.names[file_id])
+
+    def similar_words(self, word: str) -> dict:
+        """
+        word id -> similarity for vocabulary words matching `word`: exact, by prefix, within one
+        or two typos (edit distance), or by trigram Jaccard.
+        """
+        query_grams = trigrams(word)
+        shared = Counter()
+        for gram in query_grams:
+            postings = self.gram_postings.get(gram)
+            if postings:
+                shared.update(postings)
+
+        # One edit changes at most 3 trigrams (4 for a transposition), so anything sharing
+        # fewer can't be within `max_edits` and skips the edit-distance check
+        max_edits = 1 if len(word) <= 7 else 2
+        min_shared = max(1, len(query_grams) - 4 * max_edits)
+        matches, jaccard = {}, []
+        for word_id, count in shared.items():
+            similarity = count / (len(query_grams) + self.gram_counts[word_id] - count)
+            if similarity >= MIN_SIMILARITY:
+                matches[word_id] = similarity
+            if count >= min_shared and abs(len(self.vocabulary[word_id]) - len(word)) <= max_edits:
+                jaccard.append((similarity, word_id))
+        # Typo check only for the closest words by trigram overlap
+        for _, word_id in heapq.nlargest(EDIT_CANDIDATES, jaccard):
+            candidate = self.vocabulary[word_id]
+            edits = edit_distance(word, candidate, max_edits)
+            if edits <= max_edits:
+                matches[word_id] = max(matches.get(word_id, 0), 1 - edits / max(len(word), len(candidate)))
+
+        i = bisect_left(self.sorted_words, word)
+        while i < len(self.sorted_words) and self.sorted_words[i].startswith(word):
+            word_id = self.sorted_ids[i]
+            if self.sorted_words[i] == word:
+                matches[word_id] = EXACT
+            elif len(word) >= 3:
+                matches[word_id] = max(PREFIX, matches.get(word_id, 0))
+            i += 1
+
+        if matches:
+            # Drop fuzzy matches far below the best one ("report" shouldn't expand to "sport")
+            floor = max(matches.values()) - MAX_SIMILARITY_GAP
+            matches = {word_id: sim for word_id, sim in matches.items() if sim >= floor}
+        if len(matches) > MAX_WORD_MATCHES:
+            matches = dict(heapq.nlargest(MAX_WORD_MATCHES, matches.items(), key=lambda item: item[1]))
+        return matches
+
+    def search(self, query: str = "", extensions=None, root: str = None, recursive: bool = True,
+               limit: int = 50, now: float = None) -> list:
+        """
+        Ranked matches for `query` ('resume', 'resme final', '*.pdf invoice'); query words may be
+        misspelled or in any order. `extensions` ({'.pdf'}) and `root` narrow the results.
+        Returns [{"path", "name", "size", "mtime", "score"}], best first.
+        """
+        words, query_extensions = parse_query(query or "")
+        extensions = {e.lower() if e.startswith(".") else "." + e.lower() for e in (extensions or ())} | query_extensions
+        root = os.path.abspath(root) if root else None
+        now = time.time() if now is None else now
+
+        allowed = None
+        if extensions:
+            allowed = set()
+            for ext in extensions:
+                allowed.update(self.ext_postings.get(ext, ()))
+
+        if not words:
+            if allowed is None:
+                return []
+            # Extension-only listing: most recent first
+            ranked = (file_id for file_id in allowed if self._under(file_id, root, recursive))
+            top = heapq.nlargest(limit, ranked, key=self.mtimes.__getitem__)
+            return [self._result(file_id, self._recency(file_id, now) * RECENCY_WEIGHT) for file_id in top]
+
+        word_matches = [self.similar_words(word) for word in words]
+
+        # Expand the rarest word first. Only files matching the most query words are kept, and a
+        # file not reached after k words misses all k of them (by name and by folder), so once
+        # some file matches len(words) - k words the remaining (commoner) words are never walked.
+        order = sorted(word_matches, key=lambda matches: sum(self.word_reach[w] for w in matches))
+        seen, scored, best_matched = set(), [], 0
+        for expanded, matches in enumerate(order, 1):
+            candidates = set()
+            for word_id in matches:
+                candidates.update(self.name_postings[word_id])
+                for dir_id in self.dir_postings[word_id]:
+                    candidates.update(range(self.dir_start[dir_id], self.dir_start[dir_id + 1]))
+            candidates -= seen
+            if allowed is not None:
+                candidates &= allowed
+            seen |= candidates
+
+            for file_id in candidates:
+                if not self._under(file_id, root, recursive):
+                    continue
+                file_words = self.file_words[self.word_start[file_id]:self.word_start[file_id + 1]]
+                dir_words = self.dir_words[self.file_dirs[file_id]]
+                similarity, matched, covered = 0.0, 0, 0
+                for word, per_word in zip(words, word_matches):
+                    best = 0.0
+                    for w in file_words:
+                        if w in per_word and per_word[w] > best:
+                            best = per_word[w]
+                    if best:
+                        covered += len(word)
+                    else:
+                        for w in dir_words:
+                            if w in per_word and PATH_WEIGHT * per_word[w] > best:
+                                best = PATH_WEIGHT * per_word[w]
+                    if best:
+                        similarity += best
+                        matched += 1
+                if matched < best_matched:
+                    continue
+                if matched > best_matched:
+                    scored, best_matched = [], matched
+
+                # Only words found in the name account for it; a folder match covers none of it
+                coverage = min(1.0, covered / (self.name_chars[file_id] or 1))
+                score = (SIMILARITY_WEIGHT * similarity / len(words) + OVERLAP_WEIGHT * matched / len(words)
+                         + COVERAGE_WEIGHT * coverage + RECENCY_WEIGHT * self._recency(file_id, now))
+                scored.append((score, file_id))
+            if best_matched >= len(words) - expanded:
+                break
+
+        return [self._result(file_id, score) for score, file_id in heapq.nlargest(limit, scored)]
+
+    def _under(self, file_id: int, root: str, recursive: bool) -> bool:
+        if not root:
+            return True
+        directory = self.dir_paths[self.file_dirs[file_id]]
+        return directory == root or (recursive and directory.startswith(root + os.sep))
+
+    def _recency(self, file_id: int, now: float) -> float:
+        age_days = max(0.0, now - self.mtimes[file_id]) / 86400
+        return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    def _result(self, file_id: int, score: float) -> dict:
+        return {
+            "path": self.path(file_id),
+            "name": self.names[file_id],
+            "size": int(self.sizes[file_id]),
+            "mtime": self.mtimes[file_id],
+            "score": round(score, 3),
+        }
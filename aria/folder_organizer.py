@@ -0,0 +1,238 @@
+"""
+Plans and runs bulk file moves for FileAutomator (organize by type, archive old files).
+
+A plan is built in a single os.scandir pass: categories come from an
+extension -> category dict, and name collisions are resolved in memory
+against one listing of each destination folder, instead of stat/exists
+calls per file. Moves then run in batches on a small thread pool, using
+os.rename when source and destination share a device.
+
+Each run is appended to a JSON-lines undo journal (backend/data/
+organizer_journal.jsonl) before any file moves, so even an interrupted run
+can be rolled back with `undo()`.
+"""
+
+import datetime
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MAX_WORKERS = int(os.getenv("ORGANIZER_MAX_WORKERS", "8"))
+# Moves handed to a worker at a time
+BATCH_SIZE = 256
+OTHERS = "Others"
+ARCHIVE = "Archive"
+
+
+def _name_key(name: str) -> str:
+    """Collision key: names differing only in case collide on Windows and macOS."""
+    return name.lower()
+
+
+class FolderOrganizer:
+    def __init__(self, extensions: dict, journal_path: str = None, max_workers: int = MAX_WORKERS):
+        if journal_path:
+            self.journal_path = journal_path
+        else:
+            # Default to backend/data/organizer_journal.jsonl
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.journal_path = os.path.join(data_dir, "organizer_journal.jsonl")
+
+        self.category_by_extension = {
+            ext.lower(): category for category, exts in extensions.items() for ext in exts
+        }
+        self.max_workers = max_workers
+        self.journal_lock = threading.Lock()
+
+    # --- Planning ---
+
+    def _files(self, folder: str):
+        """Visible regular files directly inside `folder`, as os.DirEntry."""
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    continue
+
+    def _resolve(self, folder: str, targets) -> list:
+        """
+        Turns [(source, relative target dir)] into [(source, destination)] with collisions
+        renamed 'name_1.ext', 'name_2.ext', ... against existing and already planned names.
+        """
+        taken = {}  # target dir -> set of name keys
+        moves = []
+        for source, target_dir in targets:
+            names = taken.get(target_dir)
+            if names is None:
+                try:
+                    with os.scandir(os.path.join(folder, target_dir)) as entries:
+                        names = {_name_key(entry.name) for entry in entries}
+                except OSError:
+                    names = set()
+                taken[target_dir] = names
+
+            name = os.path.basename(source)
+            base, ext = os.path.splitext(name)
+            counter = 1
+            while _name_key(name) in names:
+                name = f"{base}_{counter}{ext}"
+                counter += 1
+            names.add(_name_key(name))
+            moves.append((source, os.path.join(folder, target_dir, name)))
+        return moves
+
+    def plan_by_type(self, folder: str) -> list:
+        """[(source, destination)] sorting each file into its category subfolder."""
+        folder = os.path.abspath(folder)
+        targets = []
+        for entry in self._files(folder):
+            ext = os.path.splitext(entry.name)[1].lower()
+            targets.append((entry.path, self.category_by_extension.get(ext, OTHERS)))
+        return self._resolve(folder, targets)
+
+    def plan_archive(self, folder: str, days: int = 30, now: float = None) -> list:
+        """[(source, destination)] moving files older than `days` into Archive/<Year>/<Month>."""
+        folder = os.path.abspath(folder)
+        cutoff = (time.time() if now is None else now) - days * 86400
+        targets = []
+        for entry in self._files(folder):
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue
+            if mtime < cutoff:
+                date_obj = datetime.datetime.fromtimestamp(mtime)
+                targets.append((entry.path, os.path.join(ARCHIVE, date_obj.strftime("%Y"), date_obj.strftime("%B"))))
+        return self._resolve(folder, targets)
+
+    # --- Execution ---
+
+    @staticmethod
+    def _move(source: str, destination: str, same_device: bool):
+        if os.path.lexists(destination):
+            # Appeared after planning; never overwrite
+            raise FileExistsError(destination)
+        if same_device:
+            try:
+                os.rename(source, destination)
+                return
+            except OSError:
+                pass
+        shutil.move(source, destination)
+
+    def _run_batch(self, batch, same_device: bool) -> list:
+        failed = []
+        for source, destination in batch:
+            try:
+                self._move(source, destination, same_device)
+            except Exception as e:
+                failed.append((source, destination, str(e)))
+        return failed
+
+    def _run_moves(self, moves: list, same_device: bool) -> list:
+        batches = [moves[i:i + BATCH_SIZE] for i in range(0, len(moves), BATCH_SIZE)]
+        if len(batches) <= 1 or self.max_workers <= 1:
+            return [failure for batch in batches for failure in self._run_batch(batch, same_device)]
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aria-organizer") as executor:
+            for batch_failed in executor.map(lambda batch: self._run_batch(batch, same_device), batches):
+                failed.extend(batch_failed)
+        return failed
+
+    def execute(self, folder: str, moves: list, dry_run: bool = False, action: str = "organize") -> dict:
+        """
+        Runs `moves` (from a plan_* method) and journals them for undo. With `dry_run`
+        nothing is touched and the plan is returned as-is.
+        Returns {"id", "moved", "failed": [(source, destination, error)], "moves"}.
+        """
+        folder = os.path.abspath(folder)
+        if dry_run or not moves:
+            return {"id": None, "dry_run": dry_run, "moved": 0, "failed": [], "moves": moves}
+
+        new_dirs = sorted({os.path.dirname(destination) for _, destination in moves})
+        # Remember every folder this run creates (Archive, Archive/2024, ...) so undo can remove them
+        created = set()
+        for directory in new_dirs:
+            while directory != folder and directory not in created and not os.path.isdir(directory):
+                created.add(directory)
+                directory = os.path.dirname(directory)
+        for directory in new_dirs:
+            os.makedirs(directory, exist_ok=True)
+
+        run_id = uuid.uuid4().hex[:12]
+        self._journal({
+            "id": run_id, "action": action, "folder": folder, "time": time.time(),
+            "created_dirs": sorted(created), "moves": moves,
+        })
+
+        same_device = all(os.stat(folder).st_dev == os.stat(directory).st_dev for directory in new_dirs)
+        started = time.perf_counter()
+        failed = self._run_moves(moves, same_device)
+        for source, _, error in failed[:5]:
+            logger.error(f"Error moving {os.path.basename(source)}: {error}")
+        logger.info(f"{action}: moved {len(moves) - len(failed)} files in {folder} "
+                    f"({time.perf_counter() - started:.2f}s, {len(failed)} failed)")
+        return {"id": run_id, "dry_run": False, "moved": len(moves) - len(failed), "failed": failed, "moves": moves}
+
+    # --- Journal / undo ---
+
+    def _journal(self, record: dict):
+        with self.journal_lock:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _runs(self) -> list:
+        """Journaled runs that haven't been undone, oldest first."""
+        if not os.path.exists(self.journal_path):
+            return []
+        runs, undone = {}, set()
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line after a crash
+                if "undo" in record:
+                    undone.add(record["undo"])
+                else:
+                    runs[record["id"]] = record
+        return [run for run_id, run in runs.items() if run_id not in undone]
+
+    def history(self, limit: int = 10) -> list:
+        return [
+            {"id": run["id"], "action": run["action"], "folder": run["folder"], "time": run["time"], "files": len(run["moves"])}
+            for run in self._runs()[-limit:]
+        ]
+
+    def undo(self, run_id: str = None) -> dict:
+        """
+        Moves the files of a run (default: the latest) back where they came from. Files that
+        were moved or deleted since, or whose original name is taken again, are left alone.
+        """
+        runs = self._runs()
+        run = next((r for r in reversed(runs) if r["id"] == run_id), None) if run_id else (runs[-1] if runs else None)
+        if run is None:
+            return {"id": run_id, "restored": 0, "failed": [], "error": "Nothing to undo"}
+
+        back = [(destination, source) for source, destination in run["moves"] if os.path.lexists(destination)]
+        failed = self._run_moves(back, same_device=True)
+        for directory in sorted(run.get("created_dirs", []), key=len, reverse=True):
+            try:
+                os.rmdir(directory)  # Only succeeds if empty again
+            except OSError:
+                pass
+        self._journal({"undo": run["id"], "time": time.time()})
+        return {"id": run["id"], "restored": len(back) - len(failed), "failed": failed}
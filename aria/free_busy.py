@@ -0,0 +1,127 @@
+"""
+Free/busy computation over the local calendar cache.
+
+A query fetches every event in its date range with one interval-index lookup
+(across all synced calendars). The busy intervals, padded by an optional
+buffer, are merged after one sort: O(n log n). A single sweep then
+subtracts them from the working-hours windows of every day in the range.
+So "when am I free for 2 hours this week" costs one pass, not one API call
+per day.
+
+Events marked "show as free" (transparency: transparent) and invitations
+the user declined don't block time. All-day events are ignored unless
+`include_all_day` is set, as before.
+"""
+
+import datetime
+from . import config
+
+# (start hour, end hour) of the searched window for each time scope
+SCOPE_HOURS = {
+    "all_day": (9, 21),
+    "morning": (6, 12),
+    "afternoon": (12, 17),
+    "evening": (17, 21),
+}
+
+
+def is_busy(event: dict) -> bool:
+    """False for events that don't block time: 'show as free', cancelled, or declined by the user."""
+    if event.get("transparency") == "transparent" or event.get("status") == "cancelled":
+        return False
+    for attendee in event.get("attendees", []):
+        if attendee.get("self") and attendee.get("responseStatus") == "declined":
+            return False
+    return True
+
+
+def merge_intervals(intervals, buffer: float = 0.0) -> list:
+    """Sorted, non-overlapping [start, end] list covering `intervals`, each padded by `buffer` seconds."""
+    merged = []
+    for start, end in sorted(intervals):
+        start, end = start - buffer, end + buffer
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def working_windows(start: datetime.datetime, end: datetime.datetime, hours=SCOPE_HOURS["all_day"],
+                    workdays=None, tz=None) -> list:
+    """
+    [(start, end)] timestamps of the daily `hours` (start hour, end hour; end may be 24) for each
+    day from `start` to `end` in `tz`, clipped to the range. `workdays`: weekday numbers to keep
+    (Monday is 0); None keeps every day.
+    """
+    tz = tz or config.TIMEZONE
+    range_start, range_end = start.timestamp(), end.timestamp()
+    windows = []
+    day = start.astimezone(tz).date()
+    last = end.astimezone(tz).date()
+    while day <= last:
+        if workdays is None or day.weekday() in workdays:
+            midnight = datetime.datetime(day.year, day.month, day.day, tzinfo=tz)
+            window_start = max(range_start, (midnight + datetime.timedelta(hours=hours[0])).timestamp())
+            window_end = min(range_end, (midnight + datetime.timedelta(hours=hours[1])).timestamp())
+            if window_end > window_start:
+                windows.append((window_start, window_end))
+        day += datetime.timedelta(days=1)
+    return windows
+
+
+def subtract(windows: list, busy: list, min_duration: float = 0.0, limit: int = None) -> list:
+    """
+    Free (start, end) gaps of at least `min_duration` seconds in `windows` not covered by
+    `busy`. Both must be sorted and non-overlapping; they are walked together once.
+    """
+    free = []
+    i = 0
+    for window_start, window_end in windows:
+        while i < len(busy) and busy[i][1] <= window_start:
+            i += 1
+        cursor = window_start
+        j = i
+        while j < len(busy) and busy[j][0] < window_end:
+            if busy[j][0] - cursor >= min_duration:
+                free.append((cursor, busy[j][0]))
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if window_end - cursor >= min_duration:
+            free.append((cursor, window_end))
+        if limit and len(free) >= limit:
+            return free[:limit]
+        # The last busy interval may run into the next window
+        i = max(i, j - 1)
+    return free
+
+
+class FreeBusy:
+    def __init__(self, source, tz=None):
+        """`source`: anything with intervals_between(start, end, calendar_ids), e.g. CalendarCache."""
+        self.source = source
+        self.tz = tz or config.TIMEZONE
+
+    def busy(self, start: datetime.datetime, end: datetime.datetime, buffer_minutes: float = 0,
+             include_all_day: bool = False, calendar_ids=None) -> list:
+        """Merged busy intervals (timestamps) overlapping the range, across calendars."""
+        buffer = buffer_minutes * 60
+        # Widen the lookup so a buffer around an event just outside the range still counts
+        matches = self.source.intervals_between(start.timestamp() - buffer, end.timestamp() + buffer, calendar_ids)
+        intervals = [
+            (event_start, event_end) for event_start, event_end, all_day, event in matches
+            if (include_all_day or not all_day) and is_busy(event)
+        ]
+        return merge_intervals(intervals, buffer)
+
+    def free_slots(self, start: datetime.datetime, end: datetime.datetime, min_minutes: float = 15,
+                   hours=SCOPE_HOURS["all_day"], workdays=None, buffer_minutes: float = 0,
+                   include_all_day: bool = False, calendar_ids=None, limit: int = None) -> list:
+        """[(start, end)] aware datetimes of free time within working `hours` between `start` and `end`."""
+        busy = self.busy(start, end, buffer_minutes, include_all_day, calendar_ids)
+        windows = working_windows(start, end, hours, workdays, self.tz)
+        return [
+            (datetime.datetime.fromtimestamp(slot_start, self.tz), datetime.datetime.fromtimestamp(slot_end, self.tz))
+            for slot_start, slot_end in subtract(windows, busy, min_minutes * 60, limit)
+        ]
@@ -2,11 +2,30 @@ from typing import Dict, Any, Optional
 from .base_handler import BaseHandler
 import datetime
 import difflib
+import re
 from langchain_core.messages import HumanMessage, SystemMessage
 from ..logger import setup_logger
 
 logger = setup_logger(__name__)
 
+DEFAULT_DURATION_MINUTES = 30
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)\s*(h|hr|hrs|hours?|m|mins?|minutes?)?\b")
+
+
+def parse_duration_minutes(value, default: int = DEFAULT_DURATION_MINUTES) -> int:
+    """Minutes from an LLM-extracted duration (90, "90", "2 hours", "1.5h", "30 min"); `default` if unreadable."""
+    try:
+        return max(1, int(value)) if not isinstance(value, bool) else default
+    except (TypeError, ValueError):
+        pass
+    match = _DURATION.search(str(value or "").lower())
+    if not match:
+        return default
+    amount = float(match.group(1))
+    if (match.group(2) or "m").startswith("h"):
+        amount *= 60
+    return max(1, int(round(amount)))
+
 class CalendarHandler(BaseHandler):
     def __init__(self, tts_manager, calendar_manager, brain):
         super().__init__(tts_manager)
@@ -66,6 +85,16 @@ class CalendarHandler(BaseHandler):
             
             # 3. Handle Free Time Query
             if query_type == "free_time":
+                if parameters.get("duration_minutes") or parameters.get("end_date"):
+                    # Multi-day search, e.g. "when am I free for 2 hours this week"
+                    response = self.calendar.find_free_time(
+                        duration_minutes=parse_duration_minutes(parameters.get("duration_minutes")),
+                        start_date=target_date or "today",
+                        end_date=parameters.get("end_date"),
+                        time_scope=time_scope,
+                    )
+                    self.tts_manager.speak(response)
+                    return response
                 if not target_date: target_date = "today"
                 response = self.calendar.get_free_slots(target_date, time_scope)
                 self.tts_manager.speak(response)
@@ -1,9 +1,16 @@
+import re
 from typing import Dict, Any, Optional, List
 from .base_handler import BaseHandler
 from ..logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Command words around a content search ("search my notion notes that mention the budget")
+SEARCH_FILLER = re.compile(
+    r"\b(?:search|find|look(?: up| for)?|show(?: me)?|my|in|on|for|notion|notes?|pages?|that|which|mentions?|mentioning|about)\b",
+    re.IGNORECASE,
+)
+
 class NotionHandler(BaseHandler):
     def __init__(self, tts_manager, notion_manager, brain):
         super().__init__(tts_manager)
@@ -133,7 +140,30 @@ class NotionHandler(BaseHandler):
                         return message
                 else:
                     self.tts_manager.speak("What page should I summarize?")
-            return None
+                return None
+
+            # Content search over the local index (titles, properties and page text)
+            query = SEARCH_FILLER.sub(" ", (parameters or {}).get("query") or text)
+            query = " ".join(query.split())
+            if not query:
+                self.tts_manager.speak("What should I look for in Notion?")
+                return None
+
+            results = self.notion.search_content(query)
+            if not results:
+                results = self.notion.search_pages_raw(query)
+            if not results:
+                self.tts_manager.speak(f"I couldn't find anything in Notion about '{query}'.")
+                return "No pages found."
+
+            self.pending_notion_pages = results
+            message = f"I found {len(results)} pages about '{query}'. Say a number to summarize one.\n\n"
+            for i, page in enumerate(results):
+                message += f"{i+1}. {page['title']}\n"
+                if page.get("snippet"):
+                    message += f"   {page['snippet']}\n"
+            self.tts_manager.speak(message)
+            return message
 
         elif intent == "notion_create":
             self.tts_manager.speak("Analyzing your request...")
@@ -0,0 +1,331 @@
+"""
+Two-tier cache for LLM intent classification results.
+
+Tier 1 is an exact-match LRU keyed on normalized text with a TTL.
+Tier 2 compares the utterance embedding against cached entries and reuses the
+stored intents when cosine similarity clears a threshold. Embeddings are
+kept as unit-length float32 rows of one numpy matrix, so a lookup is a single
+matrix-vector product. It is scored on a snapshot of that matrix outside the
+lock.
+
+Entries are written to backend/data/intent_cache.json and the vectors to a
+.npy file beside it. Saves are debounced: a burst of stores is written once,
+`SAVE_DELAY` seconds after the first of them, on a timer thread.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SAVE_DELAY = float(os.getenv("INTENT_CACHE_SAVE_SECONDS", "5"))
+
+# Utterances whose meaning depends on the clock; the LLM resolves these to concrete dates
+RELATIVE_TIME_PATTERN = re.compile(
+    r"\b(?:today|tonight|tomorrow|yesterday|now|later|this (?:morning|afternoon|evening|week|weekend|month)"
+    r"|next (?:week|month|year|\w+day)|last (?:week|month|year|\w+day)"
+    r"|monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+    r"|in \d+ (?:minutes?|mins?|hours?|days?|weeks?)|\d+ (?:minutes?|hours?|days?) ago)\b"
+)
+
+# Utterances that refer back to earlier turns ("no, make it 80", "do that again")
+CONTEXT_REFERENCE_PATTERN = re.compile(
+    r"^(?:no|nope|actually|instead|also|and|then)\b|\b(?:it|that|this|them|those|these|him|her|again|same|instead)\b"
+)
+
+ISO_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercases, strips punctuation and filler, and collapses whitespace."""
+    text = text.lower().replace("please", " ")
+    text = re.sub(r"[^\w\s]", "", text)
+    return " ".join(text.split())
+
+
+def _unit(vector):
+    """`vector` as a unit-length float32 array, or None if it is empty or zero."""
+    if vector is None or len(vector) == 0:
+        return None
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else None
+
+
+class IntentCache:
+    """
+    Caches classifier output so repeated phrasings skip the LLM.
+
+    Entries are persisted to a JSON file and reloaded on startup. Results that
+    depend on the current date or on conversation history are never stored.
+    """
+
+    def __init__(self, storage_path: str = None, embed_fn=None, max_entries: int = 1000,
+                 ttl_seconds: float = 7 * 24 * 3600, similarity_threshold: float = 0.93,
+                 save_delay: float = SAVE_DELAY):
+        if storage_path:
+            self.storage_path = storage_path
+        else:
+            # Default to backend/data/intent_cache.json
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.storage_path = os.path.join(data_dir, "intent_cache.json")
+        self.vectors_path = os.path.splitext(self.storage_path)[0] + ".npy"
+
+        self.embed_fn = embed_fn
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.save_delay = save_delay
+
+        self.entries = OrderedDict()
+        self.vectors = {}           # key -> unit float32 embedding
+        self._matrix = None         # (keys, created_at, matrix) built from `vectors`, None when stale
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.save_timer = None
+        self.dirty = False
+        self.stats = {
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "skipped": 0,
+            "stores": 0,
+            "latency_saved_seconds": 0.0,
+            "saves": 0,
+        }
+        self._load()
+        atexit.register(self.flush)
+
+    # --- Persistence ---
+
+    def _load(self):
+        if not os.path.exists(self.storage_path):
+            return
+        try:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            rows = None
+            if data.get("vectors") and os.path.exists(self.vectors_path):
+                rows = np.load(self.vectors_path)
+                # A crash between the two replaces leaves files from different saves
+                if len(rows) != data["vectors"]:
+                    logger.warning("Intent cache vectors don't match the entries; semantic matches start empty")
+                    rows = None
+            now = time.time()
+            for key, entry in data.get("entries", []):
+                row = entry.pop("row", None)
+                # Files written before vectors moved out of the JSON carry them inline
+                vector = _unit(entry.pop("embedding", None))
+                if now - entry.get("created_at", 0) >= self.ttl_seconds:
+                    continue
+                self.entries[key] = entry
+                if row is not None and rows is not None:
+                    vector = rows[row]
+                self._put_vector(key, vector)
+            logger.info(f"Intent cache loaded: {len(self.entries)} entries")
+        except Exception as e:
+            logger.error(f"Failed to load intent cache: {e}")
+
+    def _schedule_save(self):
+        """Marks the cache changed and starts the save timer if none is pending. Caller holds the lock."""
+        self.dirty = True
+        if self.save_timer is None:
+            self.save_timer = threading.Timer(self.save_delay, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+
+    def flush(self):
+        """Writes pending changes now (also run by the save timer and at exit)."""
+        with self.save_lock:
+            with self.lock:
+                if self.save_timer is not None:
+                    self.save_timer.cancel()
+                    self.save_timer = None
+                if not self.dirty:
+                    return
+                self.dirty = False
+                entries = list(self.entries.items())
+                vectors = [self.vectors[key] for key, _ in entries if key in self.vectors]
+                keys = [key for key, _ in entries if key in self.vectors]
+            # Serialized outside the lock; entries are replaced on store, never mutated
+            self._save(entries, keys, vectors)
+
+    def _save(self, entries, keys, vectors):
+        rows = {key: row for row, key in enumerate(keys)}
+        try:
+            if vectors:
+                tmp_vectors = self.vectors_path + ".tmp"
+                with open(tmp_vectors, 'wb') as f:
+                    np.save(f, np.stack(vectors))
+                os.replace(tmp_vectors, self.vectors_path)
+            tmp_path = self.storage_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"entries": [(key, dict(entry, row=rows.get(key))) for key, entry in entries],
+                           "vectors": len(vectors)}, f)
+            os.replace(tmp_path, self.storage_path)
+            self.stats["saves"] += 1
+        except Exception as e:
+            logger.error(f"Failed to save intent cache: {e}")
+
+    def _put_vector(self, key: str, vector):
+        """Caller holds the lock (or is loading)."""
+        if vector is None:
+            return
+        if self.vectors and len(next(iter(self.vectors.values()))) != len(vector):
+            # The embedding model changed; old vectors can't be compared with new ones
+            logger.info("Intent cache embedding size changed; dropping old vectors")
+            self.vectors.clear()
+        self.vectors[key] = vector
+        self._matrix = None
+
+    def _forget(self, key: str):
+        """Drops the entry and its vector. Caller holds the lock."""
+        self.entries.pop(key, None)
+        if self.vectors.pop(key, None) is not None:
+            self._matrix = None
+
+    def _vector_snapshot(self):
+        """(keys, created_at, matrix) of every entry with an embedding. Caller holds the lock."""
+        if self._matrix is None:
+            keys = list(self.vectors)
+            created = np.array([self.entries[key]["created_at"] for key in keys], dtype=np.float64)
+            matrix = np.stack([self.vectors[key] for key in keys]) if keys else None
+            self._matrix = (keys, created, matrix)
+        return self._matrix
+
+    # --- Eligibility ---
+
+    def is_cacheable_text(self, text: str) -> bool:
+        """Rejects utterances that depend on the clock or on earlier turns."""
+        normalized = normalize_text(text)
+        if not normalized:
+            return False
+        return not (RELATIVE_TIME_PATTERN.search(normalized) or CONTEXT_REFERENCE_PATTERN.search(normalized))
+
+    @staticmethod
+    def _is_cacheable_result(intents: list) -> bool:
+        if not intents:
+            return False
+        for item in intents:
+            if item.get("confidence", 0.0) <= 0.0:
+                return False # Error fallbacks carry zero confidence
+            if ISO_DATE_PATTERN.search(json.dumps(item.get("parameters", {}), default=str)):
+                return False
+        return True
+
+    @staticmethod
+    def _parameters_grounded(intents: list, normalized_text: str) -> bool:
+        """A semantic hit is only reused if every parameter value literally occurs in the new utterance."""
+        for item in intents:
+            for value in item.get("parameters", {}).values():
+                if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                    if normalize_text(str(value)) not in normalized_text:
+                        return False
+        return True
+
+    # --- Lookup / Store ---
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return now - entry["created_at"] >= self.ttl_seconds
+
+    def lookup(self, text: str):
+        """
+        Returns (intents, embedding). `intents` is None on a miss; `embedding` is the
+        query embedding (if computed) so the caller can pass it back to `store`.
+        """
+        if not self.is_cacheable_text(text):
+            with self.lock:
+                self.stats["skipped"] += 1
+            return None, None
+
+        key = normalize_text(text)
+        now = time.time()
+
+        # Tier 1: exact normalized match
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not self._expired(entry, now):
+                self.entries.move_to_end(key)
+                self.stats["exact_hits"] += 1
+                self.stats["latency_saved_seconds"] += entry.get("llm_latency", 0.0)
+                return json.loads(json.dumps(entry["intents"])), None
+            if entry:
+                self._forget(key)
+                self._schedule_save()
+            keys, created, matrix = self._vector_snapshot()
+
+        # Tier 2: embedding similarity, scored on the snapshot without holding the lock
+        embedding = None
+        if self.embed_fn:
+            try:
+                embedding = self.embed_fn(key)
+            except Exception as e:
+                logger.error(f"Intent cache embedding failed: {e}")
+            query = _unit(embedding)
+            if query is not None and matrix is not None and len(query) == matrix.shape[1]:
+                scores = matrix @ query
+                scores[now - created >= self.ttl_seconds] = -1.0
+                best = int(np.argmax(scores))
+                best_key, best_score = keys[best], float(scores[best])
+
+                if best_score >= self.similarity_threshold:
+                    with self.lock:
+                        candidate = self.entries.get(best_key)
+                        # Evicted or replaced since the snapshot
+                        if candidate and not self._expired(candidate, now) and \
+                                self._parameters_grounded(candidate["intents"], key):
+                            self.entries.move_to_end(best_key)
+                            self.stats["semantic_hits"] += 1
+                            self.stats["latency_saved_seconds"] += candidate.get("llm_latency", 0.0)
+                            logger.info(f"Intent cache semantic hit ({best_score:.3f}): '{key}' ~ '{best_key}'")
+                            return json.loads(json.dumps(candidate["intents"])), embedding
+
+        with self.lock:
+            self.stats["misses"] += 1
+        return None, embedding
+
+    def store(self, text: str, intents: list, llm_latency: float = 0.0, embedding: list = None):
+        if not self.is_cacheable_text(text) or not self._is_cacheable_result(intents):
+            return False
+
+        key = normalize_text(text)
+        vector = _unit(embedding)
+        with self.lock:
+            self._forget(key)
+            self.entries[key] = {
+                "intents": intents,
+                "created_at": time.time(),
+                "llm_latency": round(llm_latency, 4),
+            }
+            self._put_vector(key, vector)
+            while len(self.entries) > self.max_entries:
+                self._forget(next(iter(self.entries)))
+            self.stats["stores"] += 1
+            self._schedule_save()
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.vectors.clear()
+            self._matrix = None
+            self.dirty = True
+        self.flush()
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self.entries)
+        lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["exact_hits"] + stats["semantic_hits"]) / lookups, 3) if lookups else 0.0
+        stats["latency_saved_seconds"] = round(stats["latency_saved_seconds"], 3)
+        return stats
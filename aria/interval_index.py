@@ -0,0 +1,83 @@
+"""
+Static interval index for time-range queries.
+
+Intervals are kept sorted by start in parallel lists and treated as an
+implicit balanced binary tree (the middle element of each range is its
+root). Each node stores the largest end in its subtree, so an overlap query
+skips whole subtrees that end before the range or start after it:
+O(log n + k) per query. It is rebuilt on change, in O(n log n).
+"""
+
+from bisect import bisect_left
+
+
+class IntervalIndex:
+    def __init__(self, intervals=()):
+        """`intervals`: iterable of (start, end, value) with numeric start <= end."""
+        items = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self.starts = [item[0] for item in items]
+        self.ends = [item[1] for item in items]
+        self.values = [item[2] for item in items]
+        self.max_end = list(self.ends)
+        self._build(0, len(items))
+
+    def _build(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self.max_end[mid]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends, self.values))
+
+    def overlapping(self, start: float, end: float = float("inf")) -> list:
+        """Values of intervals overlapping [start, end), ordered by start."""
+        return [self.values[i] for i in self._overlapping_ids(start, end)]
+
+    def overlapping_items(self, start: float, end: float = float("inf")) -> list:
+        """(start, end, value) of intervals overlapping [start, end), ordered by start."""
+        return [(self.starts[i], self.ends[i], self.values[i]) for i in self._overlapping_ids(start, end)]
+
+    def _overlapping_ids(self, start: float, end: float) -> list:
+        result = []
+        self._query(0, len(self.starts), start, end, result)
+        return result
+
+    def _query(self, lo: int, hi: int, start: float, end: float, result: list):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self.max_end[mid] < start:
+            return
+        self._query(lo, mid, start, end, result)
+        if self.starts[mid] < end:
+            # Zero-length intervals count when they sit inside the range
+            if self.ends[mid] > start or self.starts[mid] >= start:
+                result.append(mid)
+            self._query(mid + 1, hi, start, end, result)
+
+    def containing(self, point: float) -> list:
+        """Values of intervals with start <= point < end."""
+        result = []
+        self._stab(0, len(self.starts), point, result)
+        return result
+
+    def _stab(self, lo: int, hi: int, point: float, result: list):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self.max_end[mid] <= point:
+            return
+        self._stab(lo, mid, point, result)
+        if self.starts[mid] <= point:
+            if self.ends[mid] > point:
+                result.append(self.values[mid])
+            self._stab(mid + 1, hi, point, result)
+
+    def starting_between(self, start: float, end: float = float("inf")) -> list:
+        """Values of intervals with start <= interval start < end, ordered by start."""
+        return self.values[bisect_left(self.starts, start):bisect_left(self.starts, end)]
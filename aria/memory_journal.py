@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+
+
+class MemoryJournal:
+    """
+    Append-only on-disk journal for long-term memory ingestion.
+
+    Every queued message is written as an "add" record before it is acknowledged
+    to the caller; once its batch reaches ChromaDB an "ack" record follows.
+    Replaying the journal on startup yields the messages that were queued but
+    never stored (e.g. the app was closed or the network was down).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, record: dict):
+        with self.lock:
+            self._write({"op": "add", **record})
+
+    def ack(self, ids: list):
+        with self.lock:
+            self._write({"op": "ack", "ids": list(ids)})
+
+    def replay(self) -> list:
+        """Returns the records that were added but never acknowledged, in journal order."""
+        pending = {}
+        with self.lock:
+            if not os.path.exists(self.path):
+                return []
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue # Torn write from a crash mid-append
+                    if record.get("op") == "add":
+                        record.pop("op")
+                        pending[record["id"]] = record
+                    elif record.get("op") == "ack":
+                        for message_id in record.get("ids", []):
+                            pending.pop(message_id, None)
+        return list(pending.values())
+
+    def compact(self, pending: list):
+        """Rewrites the journal so it only holds the given pending records."""
+        with self.lock:
+            self._file.close()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in pending:
+                    f.write(json.dumps({"op": "add", **record}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def close(self):
+        with self.lock:
+            self._file.close()
@@ -1,16 +1,60 @@
 import os
+import queue
+import hashlib
+import threading
+import time
+import atexit
 try:
     import chromadb
     from chromadb.config import Settings
 except ImportError:
     chromadb = None
 
-from datetime import datetime
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import openai
+from .memory_journal import MemoryJournal
 
 load_dotenv()
 
+# Collection used by the OpenAI backend (keeps existing memories readable)
+DEFAULT_COLLECTION_NAME = "aria_conversations_v2"
+
+
+class OpenAIEmbeddingBackend:
+    """Embeds text with the OpenAI embeddings API (one request per batch)."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.name = f"openai:{model}"
+        self.collection_name = DEFAULT_COLLECTION_NAME
+
+    def embed(self, texts: list) -> list:
+        response = openai.embeddings.create(model=self.model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class LocalEmbeddingBackend:
+    """Embeds text on the CPU with a sentence-transformers model; works offline."""
+
+    def __init__(self, model: str):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is not installed")
+        self.model = SentenceTransformer(model, device="cpu")
+        self.name = f"local:{model}"
+        # Vectors from different models are not comparable, so each model gets its own collection
+        slug = "".join(ch if ch.isalnum() else "_" for ch in model.split("/")[-1].lower())
+        self.collection_name = f"aria_conversations_local_{slug}"[:63]
+
+    def embed(self, texts: list) -> list:
+        vectors = self.model.encode(texts, batch_size=32, normalize_embeddings=True, show_progress_bar=False)
+        return [vector.tolist() for vector in vectors]
+
 class MemoryManager:
     """
     Manages long-term memory using ChromaDB for semantic search across all conversations.
@@ -18,29 +62,56 @@ class MemoryManager:
     """
     
     def __init__(self):
-        """Initialize ChromaDB and OpenAI for embeddings."""
+        """Initialize ChromaDB and the configured embedding backend."""
         self.openai_api_key = os.getenv("OPEN_AI_API_KEY")
-        
-        # Initialize OpenAI client
-        if self.openai_api_key:
-            openai.api_key = self.openai_api_key
-        else:
-            print("[WARNING] OPEN_AI_API_KEY not found. Long-term memory disabled.")
-            self.client = None
-            self.collection = None
-            return
+        self.client = None
+        self.collection = None
+        self.embedder = None
         
         # Configuration
         self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+        self.local_embedding_model = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+        self.embedding_backend = os.getenv("EMBEDDING_BACKEND", "auto").lower() # auto, openai, local
         self.similarity_threshold = float(os.getenv("SIMILARITY_THRESHOLD", "0.35"))
         self.max_results = int(os.getenv("MAX_LONG_TERM_RESULTS", "5"))
         
+        # Write-behind ingestion: add_message only journals and enqueues; the batcher
+        # embeds and upserts pending messages off the response path
+        self.batch_size = int(os.getenv("MEMORY_BATCH_SIZE", "32"))
+        self.batch_wait = float(os.getenv("MEMORY_BATCH_WAIT", "0.25"))
+        self.dedup_window = float(os.getenv("MEMORY_DEDUP_WINDOW", "120"))
+        self.max_retry_delay = float(os.getenv("MEMORY_MAX_RETRY_DELAY", "60"))
+        self.journal_compact_bytes = int(os.getenv("MEMORY_JOURNAL_COMPACT_BYTES", str(1024 * 1024)))
+        self._pending = queue.Queue()
+        self._worker = None
+        self.journal = None
+        self._id_lock = threading.Lock()
+        self._last_id_time = None
+        
+        # Ingestion bookkeeping (guarded by _ingest_lock)
+        self._ingest_lock = threading.Lock()
+        self._inflight = {}       # message id -> enqueue time, in enqueue order
+        self._recent_keys = {}    # dedup key of a caller-supplied message id -> enqueue time
+        self.ingest_stats = {
+            "enqueued": 0,
+            "written": 0,
+            "deduplicated": 0,
+            "replayed": 0,
+            "failed_batches": 0,
+            "last_batch_size": 0,
+            "last_batch_seconds": 0.0,
+            "last_write_time": None,
+        }
+        
+        self.embedder = self._create_embedder()
+        if self.embedder is None:
+            print("[WARNING] No embedding backend available. Long-term memory disabled.")
+            return
+        
         # Initialize ChromaDB
         db_path = os.getenv("CHROMADB_PATH", "./vector_db")
         if chromadb is None:
             print("[WARNING] ChromaDB module not found. Long-term memory disabled.")
-            self.client = None
-            self.collection = None
             return
 
         try:
@@ -48,78 +119,262 @@ class MemoryManager:
             
             # Get or create collection with Cosine similarity
             self.collection = self.client.get_or_create_collection(
-                name="aria_conversations_v2",
+                name=self.embedder.collection_name,
                 metadata={"hnsw:space": "cosine", "description": "Long-term conversation memory for Aria"}
             )
             
-            print(f"[OK] ChromaDB initialized at {db_path}")
+            print(f"[OK] ChromaDB initialized at {db_path} ({self.embedder.name})")
             print(f"[INFO] Collection contains {self.collection.count()} messages")
         except Exception as e:
             print(f"[ERROR] Failed to initialize ChromaDB: {e}")
             self.client = None
             self.collection = None
+            return
+
+        journal_path = os.getenv("MEMORY_JOURNAL_PATH", os.path.join(db_path, "ingest_journal.jsonl"))
+        try:
+            self.journal = MemoryJournal(journal_path)
+            self._replay_journal()
+        except Exception as e:
+            print(f"[WARNING] Memory journal unavailable, ingestion is not crash-safe: {e}")
+            self.journal = None
+
+        self._worker = threading.Thread(target=self._batch_worker, daemon=True, name="aria-memory-batcher")
+        self._worker.start()
+        atexit.register(self.flush)
+
+    def _create_embedder(self):
+        """Picks the embedding backend from EMBEDDING_BACKEND (auto prefers OpenAI when a key is set)."""
+        backend = self.embedding_backend
+        if backend in ("openai", "auto") and self.openai_api_key:
+            openai.api_key = self.openai_api_key
+            return OpenAIEmbeddingBackend(self.embedding_model)
+        if backend == "openai":
+            print("[WARNING] OPEN_AI_API_KEY not found.")
+            return None
+        try:
+            return LocalEmbeddingBackend(self.local_embedding_model)
+        except Exception as e:
+            print(f"[WARNING] Local embedding model unavailable: {e}")
+            return None
+    
+    @property
+    def collection_name(self) -> str:
+        return self.embedder.collection_name if self.embedder else DEFAULT_COLLECTION_NAME
     
     def is_available(self) -> bool:
         """Check if memory manager is available."""
         return self.client is not None and self.collection is not None
     
+    def _get_embeddings(self, texts: list) -> list:
+        """Generate embeddings for a batch of texts with the active backend."""
+        try:
+            return self.embedder.embed(texts)
+        except Exception as e:
+            print(f"[ERROR] Failed to generate embeddings: {e}")
+            return None
+    
     def _get_embedding(self, text: str) -> list:
-        """Generate embedding for text using OpenAI."""
+        """Generate embedding for a single text."""
         if not text or not text.strip():
             print("[WARN] Empty text passed to _get_embedding")
             return None
-            
-        try:
-            response = openai.embeddings.create(
-                model=self.embedding_model,
-                input=text
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"[ERROR] Failed to generate embedding: {e}")
+        if not self.embedder:
             return None
+        embeddings = self._get_embeddings([text])
+        return embeddings[0] if embeddings else None
+    
+    def get_embedding(self, text: str) -> list:
+        """Public embedding helper for other components (e.g. the intent cache)."""
+        return self._get_embedding(text)
     
-    def add_message(self, conversation_id: str, message: str, role: str, timestamp: str = None):
+    def _next_timestamp(self) -> str:
+        """UTC ISO timestamp, nudged forward so batched messages never share an ID."""
+        with self._id_lock:
+            now = datetime.utcnow()
+            if self._last_id_time and now <= self._last_id_time:
+                now = self._last_id_time + timedelta(microseconds=1)
+            self._last_id_time = now
+            return now.isoformat()
+    
+    @staticmethod
+    def dedup_key(conversation_id: str, role: str, message_id: str) -> str:
+        """Identifies one message write, so a retried or repeated write of it is collapsed."""
+        return hashlib.sha1(f"{conversation_id}\x00{role}\x00{message_id}".encode("utf-8")).hexdigest()
+    
+    def _replay_journal(self):
+        """Re-queues messages that were journaled but never stored, then compacts the journal."""
+        records = self.journal.replay()
+        self.journal.compact(records)
+        now = time.time()
+        with self._ingest_lock:
+            for record in records:
+                self._inflight[record["id"]] = record.get("enqueued_at", now)
+                if record.get("hash"):
+                    self._recent_keys[record["hash"]] = now
+                self.ingest_stats["replayed"] += 1
+        for record in records:
+            self._pending.put(record)
+        if records:
+            print(f"[INFO] Replaying {len(records)} unsaved messages from the memory journal")
+    
+    def add_message(self, conversation_id: str, message: str, role: str, timestamp: str = None,
+                    message_id: str = None):
         """
-        Add a message to the vector database.
+        Queue a message for the vector database.
+        
+        The message is appended to the on-disk journal and returns immediately; the
+        background batcher embeds and upserts it together with any other messages that
+        arrive within MEMORY_BATCH_WAIT seconds. Messages are never dropped for matching
+        content; only a write with the same conversation, role and message_id seen within
+        MEMORY_DEDUP_WINDOW seconds is collapsed (and returns False).
         
         Args:
             conversation_id: UUID of the conversation
             message: The message content
             role: 'user' or 'assistant'
             timestamp: ISO timestamp (optional, defaults to now)
+            message_id: Caller's ID for this message (optional); makes repeated writes idempotent
         """
         if not self.is_available():
             return False
+        if not message or not message.strip():
+            return False
         
-        try:
-            # Generate embedding
-            embedding = self._get_embedding(message)
-            if not embedding:
-                return False
-            
-            # Create unique ID for this message
-            message_id = f"{conversation_id}_{timestamp or datetime.utcnow().isoformat()}"
-            
-            # Prepare metadata
-            metadata = {
+        key = self.dedup_key(conversation_id, role, message_id) if message_id else None
+        now = time.time()
+        if key:
+            with self._ingest_lock:
+                self._recent_keys = {k: t for k, t in self._recent_keys.items() if now - t < self.dedup_window}
+                if key in self._recent_keys:
+                    self.ingest_stats["deduplicated"] += 1
+                    return False
+                self._recent_keys[key] = now
+        
+        timestamp = timestamp or self._next_timestamp()
+        record = {
+            # Unique ID for this message; a caller-supplied ID keeps the upsert idempotent
+            "id": f"{conversation_id}_{role}_{message_id}" if message_id else f"{conversation_id}_{timestamp}",
+            "hash": key,
+            "enqueued_at": now,
+            "document": message,
+            "metadata": {
                 "conversation_id": conversation_id,
                 "role": role,
-                "timestamp": timestamp or datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
+        }
+        with self._ingest_lock:
+            # Journaled under the same lock compaction takes, so a truncate can't drop it
+            if self.journal:
+                try:
+                    self.journal.append(record)
+                except Exception as e:
+                    print(f"[WARNING] Failed to journal memory message: {e}")
+            self._inflight[record["id"]] = now
+            self.ingest_stats["enqueued"] += 1
+        self._pending.put(record)
+        return True
+    
+    def _batch_worker(self):
+        """Drains the pending queue in batches: one embedding call and one collection.upsert per batch."""
+        retry_delay = 1.0
+        while True:
+            item = self._pending.get()
+            batch = [item]
+            deadline = time.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                written = self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
             
-            # Add to collection
-            self.collection.add(
-                ids=[message_id],
-                embeddings=[embedding],
-                documents=[message],
-                metadatas=[metadata]
-            )
+            if written:
+                retry_delay = 1.0
+                self._maybe_compact_journal()
+            else:
+                # Keep the messages (they are still in the journal) and back off, e.g. while offline
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, self.max_retry_delay)
+                for record in batch:
+                    self._pending.put(record)
+    
+    def _write_batch(self, batch: list) -> bool:
+        started = time.time()
+        try:
+            embeddings = self._get_embeddings([item["document"] for item in batch])
+            if not embeddings:
+                raise RuntimeError("no embeddings returned")
             
-            return True
+            # Upsert keeps journal replays idempotent
+            self.collection.upsert(
+                ids=[item["id"] for item in batch],
+                embeddings=embeddings,
+                documents=[item["document"] for item in batch],
+                metadatas=[item["metadata"] for item in batch]
+            )
         except Exception as e:
-            print(f"[ERROR] Failed to add message to memory: {e}")
+            print(f"[ERROR] Failed to add {len(batch)} messages to memory: {e}")
+            with self._ingest_lock:
+                self.ingest_stats["failed_batches"] += 1
             return False
+        
+        ids = [item["id"] for item in batch]
+        if self.journal:
+            try:
+                self.journal.ack(ids)
+            except Exception as e:
+                print(f"[WARNING] Failed to acknowledge memory journal entries: {e}")
+        with self._ingest_lock:
+            for message_id in ids:
+                self._inflight.pop(message_id, None)
+            self.ingest_stats["written"] += len(batch)
+            self.ingest_stats["last_batch_size"] = len(batch)
+            self.ingest_stats["last_batch_seconds"] = round(time.time() - started, 4)
+            self.ingest_stats["last_write_time"] = time.time()
+        return True
+    
+    def _maybe_compact_journal(self):
+        """Truncates the journal once everything in it has been stored and it has grown large."""
+        if not self.journal or self.journal.size() < self.journal_compact_bytes:
+            return
+        with self._ingest_lock:
+            if self._inflight:
+                return
+            try:
+                self.journal.compact([])
+            except Exception as e:
+                print(f"[WARNING] Failed to compact memory journal: {e}")
+    
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Blocks until every queued message has been written (or the timeout expires)."""
+        if not self._worker:
+            return True
+        deadline = time.time() + timeout
+        while self._inflight:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def get_ingestion_stats(self) -> dict:
+        """Queue depth and lag of the write-behind pipeline."""
+        now = time.time()
+        with self._ingest_lock:
+            stats = dict(self.ingest_stats)
+            stats["queue_depth"] = len(self._inflight)
+            oldest = min(self._inflight.values()) if self._inflight else None
+        stats["lag_seconds"] = round(now - oldest, 3) if oldest is not None else 0.0
+        stats["journal_bytes"] = self.journal.size() if self.journal else 0
+        return stats
     
     def search_relevant_context(self, query: str, top_k: int = None, exclude_conversation: str = None) -> list:
         """
@@ -192,7 +447,9 @@ class MemoryManager:
             return {
                 "available": True,
                 "total_messages": count,
-                "embedding_model": self.embedding_model,
+                "pending_messages": len(self._inflight),
+                "ingestion": self.get_ingestion_stats(),
+                "embedding_model": self.embedder.name,
                 "similarity_threshold": self.similarity_threshold
             }
         except Exception as e:
@@ -207,12 +464,12 @@ class MemoryManager:
         try:
             # Delete and recreate collection
             try:
-                self.client.delete_collection("aria_conversations_v2")
+                self.client.delete_collection(self.collection_name)
             except ValueError:
                 pass # Collection might not exist
                 
             self.collection = self.client.create_collection(
-                name="aria_conversations_v2",
+                name=self.collection_name,
                 metadata={"hnsw:space": "cosine", "description": "Long-term conversation memory for Aria"}
             )
             print("[OK] Memory cleared")
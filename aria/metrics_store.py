@@ -0,0 +1,208 @@
+"""
+Compact, memory-mapped time-series store for system metrics.
+
+Every sample is folded into three resolution tiers as it arrives:
+
+    1 s buckets for 1 hour, 1 min buckets for 1 day, 15 min buckets for 30 days
+
+Each tier is a ring of fixed-size float64 columns (bucket start time, then
+min / max / sum / count per metric) laid out in one memory-mapped file, so
+history survives restarts, memory use is constant (~2 MB) and a query reads
+pre-aggregated buckets from the coarsest tier that still satisfies the
+requested step instead of scanning raw samples.
+"""
+
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (bucket seconds, number of buckets)
+TIERS = ((1, 3600), (60, 1440), (900, 2880))
+METRICS = ("cpu", "ram", "swap", "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps", "battery")
+FIELDS = ("min", "max", "sum", "count")
+
+MAGIC = b"ARIAMTS1"
+HEADER_BYTES = 64
+# Dirty pages are written back by the OS anyway; this bounds loss on a crash
+FLUSH_INTERVAL = 60
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(text) -> float:
+    """'90s', '5m', '24h', '30d' (or plain seconds) -> seconds."""
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = _DURATION.match(str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {text!r}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+class MetricsStore:
+    def __init__(self, path: str = None, metrics=METRICS, tiers=TIERS):
+        if path:
+            self.path = path
+        else:
+            # Default to backend/data/metrics.mmap
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.path = os.path.join(base_dir, "backend", "data", "metrics.mmap")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.metrics = tuple(metrics)
+        self.metric_index = {name: i for i, name in enumerate(self.metrics)}
+        self.tiers = tuple(tiers)
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+
+        # Column layout in float64 units after the header: per tier, a time column then
+        # FIELDS columns per metric, each `slots` long
+        self.columns_per_tier = 1 + len(FIELDS) * len(self.metrics)
+        self.tier_offsets = []
+        offset = 0
+        for _, slots in self.tiers:
+            self.tier_offsets.append(offset)
+            offset += self.columns_per_tier * slots
+        self.size = HEADER_BYTES + offset * 8
+        self.signature = zlib.crc32(repr((self.metrics, self.tiers, FIELDS)).encode("utf-8"))
+
+        self._open()
+
+    def _open(self):
+        fresh = not os.path.exists(self.path) or os.path.getsize(self.path) != self.size
+        if not fresh:
+            with open(self.path, "rb") as f:
+                header = f.read(12)
+            fresh = header[:8] != MAGIC or struct.unpack("<I", header[8:12])[0] != self.signature
+        if fresh:
+            # Zero-filled columns are valid: bucket time 0 never matches a real bucket
+            with open(self.path, "wb") as f:
+                f.truncate(self.size)
+            logger.info(f"Created metrics store at {self.path} ({self.size // 1024} KB)")
+
+        self.file = open(self.path, "r+b")
+        self.mm = mmap.mmap(self.file.fileno(), self.size)
+        if fresh:
+            self.mm[0:8] = MAGIC
+            struct.pack_into("<I", self.mm, 8, self.signature)
+        self.data = memoryview(self.mm)[HEADER_BYTES:].cast("d")
+
+    def _column(self, tier: int, metric: int = None, field: int = None) -> int:
+        """Start index in `data` of a column (the time column when metric is None)."""
+        slots = self.tiers[tier][1]
+        column = 0 if metric is None else 1 + metric * len(FIELDS) + field
+        return self.tier_offsets[tier] + column * slots
+
+    def record(self, timestamp: float, values: dict):
+        """Folds one sample into every tier; None/NaN values are skipped."""
+        readings = []
+        for name, value in values.items():
+            index = self.metric_index.get(name)
+            if index is None or value is None:
+                continue
+            value = float(value)
+            if not math.isnan(value):
+                readings.append((index, value))
+
+        with self.lock:
+            data = self.data
+            for tier, (resolution, slots) in enumerate(self.tiers):
+                bucket = math.floor(timestamp / resolution) * resolution
+                slot = int(bucket // resolution) % slots
+                time_col = self._column(tier)
+                if data[time_col + slot] != bucket:
+                    # Slot still holds an expired bucket: reset it
+                    data[time_col + slot] = bucket
+                    for metric in range(len(self.metrics)):
+                        for field in range(len(FIELDS)):
+                            data[self._column(tier, metric, field) + slot] = 0.0
+                for metric, value in readings:
+                    mn, mx, total, count = (self._column(tier, metric, f) + slot for f in range(len(FIELDS)))
+                    if data[count] == 0 or value < data[mn]:
+                        data[mn] = value
+                    if data[count] == 0 or value > data[mx]:
+                        data[mx] = value
+                    data[total] += value
+                    data[count] += 1
+
+            if time.monotonic() - self.last_flush >= FLUSH_INTERVAL:
+                self.mm.flush()
+                self.last_flush = time.monotonic()
+
+    def pick_tier(self, range_seconds: float, step_seconds: float = None) -> int:
+        """Coarsest tier that is no coarser than the step and still covers the range."""
+        candidates = [
+            i for i, (resolution, slots) in enumerate(self.tiers)
+            if resolution * slots >= range_seconds and (step_seconds is None or resolution <= step_seconds)
+        ]
+        if candidates:
+            return candidates[-1] if step_seconds is not None else candidates[0]
+        # Range beyond all retention: use the longest tier
+        return max(range(len(self.tiers)), key=lambda i: self.tiers[i][0] * self.tiers[i][1])
+
+    def query(self, metric: str, range_seconds: float, step_seconds: float = None, now: float = None) -> dict:
+        """
+        Returns {"resolution", "step", "points": [{"t", "min", "avg", "max"}]} covering the last
+        `range_seconds`, one point per step (None values where there was no data).
+        """
+        index = self.metric_index.get(metric)
+        if index is None:
+            raise ValueError(f"Unknown metric: {metric}")
+        if range_seconds <= 0:
+            raise ValueError("Range must be positive")
+        tier = self.pick_tier(range_seconds, step_seconds)
+        resolution, slots = self.tiers[tier]
+        step = max(resolution, (int(step_seconds or resolution) // resolution) * resolution)
+        now = time.time() if now is None else now
+
+        end_bucket = math.floor(now / resolution) * resolution
+        buckets = min(slots, int(math.ceil(range_seconds / resolution)))
+        start_bucket = end_bucket - (buckets - 1) * resolution
+        first_step = math.floor(start_bucket / step) * step
+        points = [
+            {"t": first_step + i * step, "min": None, "avg": None, "max": None, "_sum": 0.0, "_count": 0.0}
+            for i in range(int((end_bucket - first_step) // step) + 1)
+        ]
+
+        time_col = self._column(tier)
+        mn_col, mx_col, sum_col, count_col = (self._column(tier, index, f) for f in range(len(FIELDS)))
+        with self.lock:
+            data = self.data
+            for i in range(buckets):
+                bucket = start_bucket + i * resolution
+                slot = int(bucket // resolution) % slots
+                if data[time_col + slot] != bucket or data[count_col + slot] == 0:
+                    continue
+                point = points[int((bucket - first_step) // step)]
+                mn, mx = data[mn_col + slot], data[mx_col + slot]
+                point["min"] = mn if point["min"] is None else min(point["min"], mn)
+                point["max"] = mx if point["max"] is None else max(point["max"], mx)
+                point["_sum"] += data[sum_col + slot]
+                point["_count"] += data[count_col + slot]
+
+        for point in points:
+            total, count = point.pop("_sum"), point.pop("_count")
+            if count:
+                point["avg"] = round(total / count, 3)
+        return {"metric": metric, "resolution": resolution, "step": step, "points": points}
+
+    def flush(self):
+        with self.lock:
+            self.mm.flush()
+            self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            self.data.release()
+            self.mm.flush()
+            self.mm.close()
+            self.file.close()
@@ -0,0 +1,153 @@
+"""
+Process-wide pooled MongoDB client with a cached health state.
+
+One client per URI is shared by every component, so connections are pooled
+instead of re-created. It is a Motor client when motor is installed: the
+conversation store awaits it, and the health probe pings through the
+synchronous pymongo client Motor wraps, so traffic, pings and the pool
+statistics all use the same connection pool. Health is tracked by a ConnectivityMonitor that
+pings the server in the background; it doubles as a circuit breaker: once a
+ping or a real operation fails with a connection error the breaker opens,
+`is_available` turns False at once and callers skip persistence instead of
+waiting out serverSelectionTimeoutMS. The background ping (with exponential
+backoff) closes it again when the server returns.
+"""
+
+import os
+import threading
+from pymongo import MongoClient, monitoring
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from .connectivity_monitor import ConnectivityMonitor
+from .logger import setup_logger
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    AsyncIOMotorClient = None
+
+logger = setup_logger(__name__)
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events for `MongoPool.get_stats()`."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {"created": 0, "closed": 0, "checked_out": 0, "checked_in": 0, "checkout_failed": 0}
+
+    def _bump(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            counts = dict(self.counts)
+        counts["open"] = counts["created"] - counts["closed"]
+        counts["in_use"] = counts["checked_out"] - counts["checked_in"]
+        return counts
+
+    def connection_created(self, event):
+        self._bump("created")
+
+    def connection_closed(self, event):
+        self._bump("closed")
+
+    def connection_checked_out(self, event):
+        self._bump("checked_out")
+
+    def connection_checked_in(self, event):
+        self._bump("checked_in")
+
+    def connection_check_out_failed(self, event):
+        self._bump("checkout_failed")
+
+    # Remaining pool events are not tracked
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+
+
+class MongoPool:
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, uri: str) -> "MongoPool":
+        """Returns the process-wide pool for `uri`, creating it on first use."""
+        with cls._shared_lock:
+            pool = cls._shared.get(uri)
+            if pool is None:
+                pool = cls(uri)
+                cls._shared[uri] = pool
+            return pool
+
+    def __init__(self, uri: str, max_pool_size: int = None, min_pool_size: int = None,
+                 server_selection_timeout_ms: int = None, health_interval: float = None,
+                 client_factory=None, autostart: bool = True):
+        self.uri = uri
+        self.max_pool_size = max_pool_size or int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+        self.min_pool_size = min_pool_size if min_pool_size is not None else int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+        self.server_selection_timeout_ms = server_selection_timeout_ms or int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "2000"))
+        health_interval = health_interval or float(os.getenv("MONGO_HEALTH_INTERVAL", "15"))
+
+        self.pool_listener = PoolStatsListener()
+        # connect=False: creating the client never blocks; the health probe does the first round trip
+        self.client = (client_factory or AsyncIOMotorClient or MongoClient)(
+            uri,
+            maxPoolSize=self.max_pool_size,
+            minPoolSize=self.min_pool_size,
+            serverSelectionTimeoutMS=self.server_selection_timeout_ms,
+            connect=False,
+            event_listeners=[self.pool_listener]
+        )
+        self.rejected_calls = 0
+        self.stats_lock = threading.Lock()
+        self.breaker = ConnectivityMonitor(
+            interval=health_interval, min_backoff=1.0, max_backoff=30.0,
+            probe=self._ping, autostart=autostart
+        )
+
+    def _ping(self) -> bool:
+        try:
+            # Motor's `delegate` is the blocking client over the same pool; no event loop needed
+            getattr(self.client, "delegate", self.client).admin.command('ping')
+            return True
+        except Exception as e:
+            logger.debug(f"MongoDB ping failed: {e}")
+            return False
+
+    @property
+    def is_available(self) -> bool:
+        """O(1) health check; False while the breaker is open."""
+        if self.breaker.is_online:
+            return True
+        with self.stats_lock:
+            self.rejected_calls += 1
+        return False
+
+    def report_failure(self, error: BaseException) -> bool:
+        """Opens the breaker if `error` means the server is unreachable."""
+        if isinstance(error, (ConnectionFailure, ServerSelectionTimeoutError)):
+            if self.breaker.is_online:
+                logger.warning(f"MongoDB unavailable, skipping persistence until it recovers: {error}")
+            self.breaker.report_failure()
+            return True
+        return False
+
+    def get_stats(self) -> dict:
+        status = self.breaker.get_status()
+        return {
+            "available": status["online"],
+            "breaker": "closed" if status["online"] else "open",
+            "consecutive_failures": status["consecutive_failures"],
+            "last_check": status["last_probe_time"],
+            "last_change": status["last_change_time"],
+            "next_retry_seconds": None if status["online"] else status["next_backoff"],
+            "rejected_calls": self.rejected_calls,
+            "max_pool_size": self.max_pool_size,
+            "min_pool_size": self.min_pool_size,
+            "pool": self.pool_listener.snapshot(),
+        }
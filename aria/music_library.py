@@ -36,12 +36,15 @@ class MusicManager:
             'source_address': '0.0.0.0'
         }
 
+        # Called with get_status() whenever playback may have changed (wired to server push)
+        self.status_listener = None
+
         # Start background monitor
         self.monitor_thread = threading.Thread(target=self._monitor_playback, daemon=True)
         self.monitor_thread.start()
 
     def _monitor_playback(self):
-        """Monitors playback status and auto-advances to next track."""
+        """Monitors playback status, auto-advances to next track and reports status changes."""
         while True:
             try:
                 if self.is_playing_status:
@@ -51,10 +54,19 @@ class MusicManager:
                         self.next_track()
                         # Give it a moment to start playing effectively
                         time.sleep(2)
+                self._publish_status()
             except Exception as e:
                 logger.error(f"Error in playback monitor: {e}")
             time.sleep(1)
 
+    def _publish_status(self):
+        """Hands the current status to the listener; unchanged fields are filtered out downstream."""
+        if self.status_listener:
+            try:
+                self.status_listener(self.get_status())
+            except Exception as e:
+                logger.error(f"Error publishing music status: {e}")
+
     def _play_track(self, track_info):
         """Internal method to play a specific track info object."""
         try:
@@ -78,6 +90,7 @@ class MusicManager:
             
             # Update explicit state
             self.is_playing_status = True
+            self._publish_status()
             
             return f"Playing {title}"
         except Exception as e:
@@ -303,6 +316,7 @@ class MusicManager:
         try:
             self.player.set_pause(1)
             self.is_playing_status = False
+            self._publish_status()
             return {"success": True, "message": "Music paused.", "is_playing": False}
         except Exception as e:
             return {"success": False, "message": f"Error pausing: {str(e)}", "is_playing": False}
@@ -317,6 +331,7 @@ class MusicManager:
                 self.player.set_pause(0)
             
             self.is_playing_status = True
+            self._publish_status()
             return {"success": True, "message": "Resuming music.", "is_playing": True}
         except Exception as e:
             return {"success": False, "message": f"Error resuming: {str(e)}", "is_playing": False}
@@ -325,6 +340,7 @@ class MusicManager:
         """Stops playback."""
         self.player.stop()
         self.is_playing_status = False
+        self._publish_status()
         return "Music stopped."
 
     def set_volume(self, level: int):
@@ -332,6 +348,7 @@ class MusicManager:
         self.volume = max(0, min(100, level))
         if self.player:
             self.player.audio_set_volume(self.volume)
+        self._publish_status()
         return f"Music volume set to {self.volume}."
 
     def get_status(self):
@@ -348,6 +365,7 @@ class MusicManager:
             'track': self.current_track_info.get('title', "Unknown Track"),
             'artist': self.current_track_info.get('artist', "Unknown Artist"),
             'duration': self.current_track_info.get('duration', 0),
+            'volume': self.volume,
             'current_time': self.player.get_time() / 1000.0 if self.player.get_time() >= 0 else 0
         }
 
@@ -0,0 +1,589 @@
+"""
+Local search index of the Notion workspace.
+
+Notion's search endpoint matches titles only, needs a network round trip,
+and is rate limited. This module mirrors every page and database the
+integration can see (title, property values, block text) into a local
+BM25 index, so notion_query lookups and full-text content search run in
+milliseconds.
+
+Syncing is incremental. The search endpoint is paged newest-edit-first and
+enumeration stops at the previous sync's high-water last_edited_time, so a
+sync with no edits costs one request. Only pages whose last_edited_time
+changed have their block trees refetched (through NotionPageLoader). Once a
+day a full enumeration also drops pages that were deleted or unshared.
+Titles and properties become searchable as soon as a page is listed; its
+text follows when its blocks arrive.
+
+Fields are weighted in BM25: title terms count 3x, property values 1.5x,
+block text 1x. With an `embed_fn` (e.g. MemoryManager.get_embedding),
+pages are embedded too. The vectors are unit-length float32 rows of one
+numpy matrix, so scoring every page is one matrix-vector product.
+`search(semantic=True)` then fuses the BM25 and cosine rankings by
+reciprocal rank; lexical search falls back to it when no words match.
+
+Syncs run on the index's own thread, not the shared scheduler pool: a first
+sync of a large workspace takes minutes of rate-limited requests and would
+otherwise hold a job worker that reminders and calendar sync need. The
+scheduler job only hands a request to that thread. A request that arrives
+while a sync is running is not queued behind the lock; it makes the running
+sync go once more when it finishes.
+
+State persists in backend/data/notion_index.json, with the vectors in
+notion_index.npy beside it. The first sync reads them back, so a large
+index doesn't slow startup. Until then, NotionManager falls back to
+Notion's search.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .logger import setup_logger
+from .notion_loader import NotionPageLoader, tree_text, is_settled
+from .scheduler import get_scheduler
+
+logger = setup_logger(__name__)
+
+INDEX_VERSION = 1
+SYNC_INTERVAL = int(os.getenv("NOTION_SYNC_SECONDS", "300"))
+FULL_SYNC_INTERVAL = 24 * 3600
+SEARCH_PAGE_SIZE = 100
+# Block text kept per page; longer pages are indexed up to this length
+MAX_TEXT_CHARS = 100_000
+# Seconds between progress saves during a long (first) sync
+SAVE_INTERVAL = 30
+
+TITLE_WEIGHT, PROPERTY_WEIGHT, TEXT_WEIGHT = 3.0, 1.5, 1.0
+BM25_K1, BM25_B = 1.2, 0.75
+# Reciprocal rank fusion constant
+RRF_K = 60
+# Characters of block text embedded with the title
+EMBED_CHARS = 2000
+SNIPPET_CHARS = 160
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or the to with my me i about page pages notion".split()
+)
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens without stopwords; plural 's' stripped ('meetings' -> 'meeting')."""
+    return [
+        token[:-1] if token[-1] == "s" and len(token) > 3 and token[-2] != "s" else token
+        for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS
+    ]
+
+
+def _plain(rich_text) -> str:
+    return "".join(rt.get("plain_text", "") for rt in rich_text or [])
+
+
+def object_title(obj: dict) -> str:
+    """Title of a page (its title property) or database (its title field)."""
+    if obj.get("object") == "database":
+        return _plain(obj.get("title")) or "Untitled"
+    for prop in (obj.get("properties") or {}).values():
+        if prop.get("type") == "title":
+            return _plain(prop.get("title")) or "Untitled"
+    return "Untitled"
+
+
+def property_text(prop: dict) -> str:
+    """Searchable text of one property value (select names, rich text, dates, ...)."""
+    prop_type = prop.get("type")
+    value = prop.get(prop_type)
+    if value is None:
+        return ""
+    if prop_type in ("rich_text", "title"):
+        return _plain(value)
+    if prop_type in ("select", "status"):
+        return value.get("name", "")
+    if prop_type == "multi_select":
+        return " ".join(option.get("name", "") for option in value)
+    if prop_type == "people":
+        return " ".join(person.get("name", "") for person in value)
+    if prop_type == "date":
+        return value.get("start", "")
+    if prop_type in ("url", "email", "phone_number", "number"):
+        return str(value)
+    if prop_type == "formula":
+        return str(value.get(value.get("type")) or "")
+    return ""
+
+
+def _unit(vector):
+    """`vector` as a unit-length float32 array, or None if it is empty or zero."""
+    if vector is None or len(vector) == 0:
+        return None
+    array = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(array))
+    return array / norm if norm else None
+
+
+class BM25Index:
+    """Inverted index with in-place document updates, scored by BM25 over weighted fields."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)   # term -> {doc id: weighted term frequency}
+        self.doc_terms = {}                 # doc id -> terms, for removal
+        self.lengths = {}                   # doc id -> weighted length
+        self.total_length = 0.0
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def add(self, doc_id: str, fields):
+        """Indexes `fields` [(text, weight)] as `doc_id`, replacing any earlier version."""
+        self.remove(doc_id)
+        counts = {}
+        for text, weight in fields:
+            for token, count in Counter(tokenize(text)).items():
+                counts[token] = counts.get(token, 0.0) + count * weight
+        postings = self.postings
+        for term, frequency in counts.items():
+            postings[term][doc_id] = frequency
+        self.doc_terms[doc_id] = list(counts)
+        self.lengths[doc_id] = length = sum(counts.values())
+        self.total_length += length
+
+    def remove(self, doc_id: str):
+        for term in self.doc_terms.pop(doc_id, ()):
+            postings = self.postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(doc_id, 0.0)
+
+    def search(self, terms, limit: int = 10, accept=None) -> list:
+        """[(score, doc id)] best first. `accept(doc_id)` filters candidates."""
+        if not self.lengths:
+            return []
+        count = len(self.lengths)
+        average = self.total_length / count or 1.0
+        scores = defaultdict(float)
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        candidates = ((score, doc_id) for doc_id, score in scores.items() if accept is None or accept(doc_id))
+        return heapq.nlargest(limit, candidates)
+
+
+class NotionIndex:
+    def __init__(self, client, loader: NotionPageLoader = None, storage_path: str = None, embed_fn=None,
+                 sync_interval: float = SYNC_INTERVAL):
+        if storage_path:
+            self.storage_path = storage_path
+        else:
+            # Default to backend/data/notion_index.json
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.storage_path = os.path.join(data_dir, "notion_index.json")
+        self.vectors_path = os.path.splitext(self.storage_path)[0] + ".npy"
+
+        self.client = client
+        self.loader = loader or NotionPageLoader(client)
+        self.embed_fn = embed_fn
+        self.sync_interval = sync_interval
+
+        # page/database id -> {"id", "object", "title", "url", "icon", "properties", "text",
+        #                       "last_edited_time", "text_version", "fetched"}
+        self.docs = {}
+        self.vectors = {}       # page id -> unit float32 embedding
+        self._matrix = None     # (ids, object types, matrix) built from `vectors`, None when stale
+        self.bm25 = BM25Index()
+        self.title_index = BM25Index()
+        self.watermark = None
+        self.last_full_sync = 0.0
+
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.ready = threading.Event()
+        self.scheduler = None
+        self.executor = None
+        # Set by request_sync; cleared when a sync picks it up
+        self.sync_requested = False
+        self.loaded = False
+        # Set when docs change, cleared by _save
+        self.dirty = False
+        self.stats = {"syncs": 0, "full_syncs": 0, "pages_fetched": 0, "queries": 0, "coalesced": 0,
+                      "last_sync_seconds": 0.0}
+
+    # --- Persistence ---
+
+    def load(self):
+        """Reads the saved index (tokenizing every page, so it runs off the startup path)."""
+        with self.sync_lock:
+            self._load()
+
+    def _load(self):
+        """Caller holds sync_lock."""
+        if self.loaded:
+            return
+        self.loaded = True
+        if not os.path.exists(self.storage_path):
+            return
+        try:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return
+            self.watermark = data.get("watermark")
+            self.last_full_sync = data.get("last_full_sync", 0.0)
+            for doc in data.get("docs", {}).values():
+                # Files written before vectors moved out of the JSON carry them inline
+                self._put(doc, _unit(doc.pop("embedding", None)))
+            self._load_vectors(data.get("vectors") or [])
+            self.dirty = False
+            if self.docs:
+                self.ready.set()
+            logger.info(f"Loaded Notion index: {len(self.docs)} pages")
+        except Exception as e:
+            logger.error(f"Error loading Notion index: {e}")
+
+    def _load_vectors(self, ids: list):
+        if not ids or not os.path.exists(self.vectors_path):
+            return
+        rows = np.load(self.vectors_path)
+        # A crash between the two replaces leaves files from different saves
+        if len(rows) != len(ids):
+            logger.warning("Notion index vectors don't match the saved ids; pages are re-embedded as they change")
+            return
+        with self.lock:
+            for doc_id, row in zip(ids, rows):
+                if doc_id in self.docs:
+                    self._put_vector(doc_id, row)
+
+    def _save(self):
+        try:
+            with self.lock:
+                ids = list(self.vectors)
+                if ids:
+                    tmp_vectors = self.vectors_path + ".tmp"
+                    with open(tmp_vectors, 'wb') as f:
+                        np.save(f, np.stack([self.vectors[doc_id] for doc_id in ids]))
+                    os.replace(tmp_vectors, self.vectors_path)
+                data = {"version": INDEX_VERSION, "watermark": self.watermark,
+                        "last_full_sync": self.last_full_sync, "docs": self.docs, "vectors": ids}
+                tmp_path = self.storage_path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                self.dirty = False
+            os.replace(tmp_path, self.storage_path)
+        except Exception as e:
+            logger.error(f"Error saving Notion index: {e}")
+
+    def _put(self, doc: dict, vector=None):
+        """Indexes `doc`; `vector` replaces its embedding (None keeps the current one)."""
+        with self.lock:
+            self.docs[doc["id"]] = doc
+            self._put_vector(doc["id"], vector)
+            self.bm25.add(doc["id"], [(doc["title"], TITLE_WEIGHT), (doc["properties"], PROPERTY_WEIGHT),
+                                      (doc["text"], TEXT_WEIGHT)])
+            self.title_index.add(doc["id"], [(doc["title"], 1.0)])
+            self.dirty = True
+
+    def _put_vector(self, doc_id: str, vector):
+        """Caller holds the lock."""
+        if vector is None:
+            return
+        if self.vectors and len(next(iter(self.vectors.values()))) != len(vector):
+            # The embedding model changed; old vectors can't be compared with new ones
+            logger.info("Notion index embedding size changed; dropping old vectors")
+            self.vectors.clear()
+        self.vectors[doc_id] = vector
+        self._matrix = None
+
+    def _drop(self, doc_id: str):
+        with self.lock:
+            if self.docs.pop(doc_id, None) is not None:
+                self.dirty = True
+            if self.vectors.pop(doc_id, None) is not None:
+                self._matrix = None
+            self.bm25.remove(doc_id)
+            self.title_index.remove(doc_id)
+
+    # --- Syncing ---
+
+    def _document(self, obj: dict, previous: dict = None) -> dict:
+        """Index entry for a search result, keeping the previous text until it is refetched."""
+        previous = previous or {}
+        icon = obj.get("icon") or {}
+        properties = obj.get("properties") or {}
+        return {
+            "id": obj["id"],
+            "object": obj.get("object", "page"),
+            "title": object_title(obj),
+            "url": obj.get("url"),
+            "icon": icon.get("emoji") if icon.get("type") == "emoji" else None,
+            "properties": " ".join(filter(None, (property_text(p) for p in properties.values() if p.get("type") != "title"))),
+            "text": previous.get("text", ""),
+            "last_edited_time": obj.get("last_edited_time"),
+            "text_version": previous.get("text_version"),
+            "fetched": previous.get("fetched", 0.0),
+        }
+
+    def _needs_text(self, doc: dict) -> bool:
+        if doc["object"] != "page":
+            return False
+        return doc["text_version"] != doc["last_edited_time"] or not is_settled(doc["last_edited_time"], doc["fetched"])
+
+    def _enumerate(self, full: bool):
+        """Search results newest-edit-first; stops at the watermark unless `full`."""
+        cursor = None
+        while True:
+            params = {"page_size": SEARCH_PAGE_SIZE, "sort": {"direction": "descending", "timestamp": "last_edited_time"}}
+            if cursor:
+                params["start_cursor"] = cursor
+            response = self.loader.call(self.client.search, **params)
+            for obj in response.get("results", []):
+                # Equal stamps are rechecked: several edits can share a minute
+                if not full and self.watermark and (obj.get("last_edited_time") or "") < self.watermark:
+                    return
+                yield obj
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+    def sync(self, full: bool = False) -> bool:
+        """
+        Pulls pages edited since the last sync (or everything, on a full sync) and refetches
+        the text of changed pages. Returns False if Notion is unavailable or a request failed.
+        """
+        if self.client is None:
+            return False
+        with self.sync_lock:
+            return self._sync(full)
+
+    def _sync(self, full: bool) -> bool:
+        """Caller holds sync_lock."""
+        self._load()
+        started = time.perf_counter()
+        full = full or self.watermark is None or time.time() - self.last_full_sync >= FULL_SYNC_INTERVAL
+        seen, newest = set(), self.watermark
+        try:
+            for obj in self._enumerate(full):
+                doc_id = obj.get("id")
+                if not doc_id or obj.get("object") not in ("page", "database"):
+                    continue
+                if obj.get("archived") or obj.get("in_trash"):
+                    self._drop(doc_id)
+                    continue
+                seen.add(doc_id)
+                edited = obj.get("last_edited_time")
+                if edited and (newest is None or edited > newest):
+                    newest = edited
+                previous = self.docs.get(doc_id)
+                if previous is None or previous["last_edited_time"] != edited:
+                    self._put(self._document(obj, previous))
+        except Exception as e:
+            logger.error(f"Notion index sync failed: {e}")
+            return False
+
+        if full:
+            for doc_id in [doc_id for doc_id in self.docs if doc_id not in seen]:
+                self._drop(doc_id)
+            self.last_full_sync = time.time()
+            self.stats["full_syncs"] += 1
+        # Listed titles are searchable now; text follows
+        self.ready.set()
+        ok = self._fetch_texts()
+        if ok and newest != self.watermark:
+            self.watermark, self.dirty = newest, True
+        # A sync with no edits (the common case) doesn't rewrite the file
+        if self.dirty or full:
+            self._save()
+        self.stats["syncs"] += 1
+        self.stats["last_sync_seconds"] = round(time.perf_counter() - started, 3)
+        return ok
+
+    def _fetch_texts(self) -> bool:
+        """Refetches block text for pages whose content changed, newest edit first."""
+        pending = sorted((doc for doc in list(self.docs.values()) if self._needs_text(doc)),
+                         key=lambda doc: doc["last_edited_time"] or "", reverse=True)
+        ok = True
+        last_save = time.monotonic()
+        for doc in pending:
+            fetched = time.time()
+            try:
+                blocks, _ = self.loader.load(doc["id"], page={"last_edited_time": doc["last_edited_time"]}, cache=False)
+            except Exception as e:
+                logger.error(f"Error fetching Notion page {doc['id']} for the index: {e}")
+                ok = False
+                continue
+            doc = dict(doc, text="\n".join(tree_text(blocks))[:MAX_TEXT_CHARS],
+                       text_version=doc["last_edited_time"], fetched=fetched)
+            vector = None
+            if self.embed_fn:
+                try:
+                    vector = _unit(self.embed_fn(f"{doc['title']}\n{doc['text'][:EMBED_CHARS]}"))
+                except Exception as e:
+                    logger.error(f"Notion index embedding failed: {e}")
+            if doc["id"] in self.docs:
+                self._put(doc, vector)
+            self.stats["pages_fetched"] += 1
+            if time.monotonic() - last_save >= SAVE_INTERVAL:
+                self._save()
+                last_save = time.monotonic()
+        return ok
+
+    def _background_sync(self):
+        """Runs requested syncs until none is pending; returns at once if another sync is running."""
+        while self.sync_requested:
+            # The running sync sees the request when it finishes and goes again
+            if not self.sync_lock.acquire(blocking=False):
+                self.stats["coalesced"] += 1
+                return
+            try:
+                self.sync_requested = False
+                self._sync(False)
+            except Exception as e:
+                logger.error(f"Error syncing Notion index: {e}")
+            finally:
+                self.sync_lock.release()
+
+    def request_sync(self):
+        """Hands a sync to the index's own thread and returns immediately."""
+        self.sync_requested = True
+        executor = self.executor
+        if executor is None:
+            return
+        try:
+            executor.submit(self._background_sync)
+        except RuntimeError:
+            # Shut down by stop()
+            pass
+
+    def start(self, scheduler=None):
+        """Syncs now and then every `sync_interval` seconds, triggered by a scheduler job."""
+        self.scheduler = scheduler or get_scheduler()
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aria-notion-sync")
+        self.scheduler.every(self.sync_interval, self.request_sync, name="notion:sync",
+                             first_delay=0, owner="notion")
+
+    def stop(self):
+        if self.scheduler:
+            self.scheduler.cancel_owner("notion")
+            self.scheduler = None
+        if self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def refresh_soon(self):
+        """Picks up an edit we just made (e.g. a created page) without waiting for the next interval."""
+        if self.executor:
+            self.request_sync()
+
+    # --- Queries ---
+
+    def _result(self, doc: dict, score: float, terms=()) -> dict:
+        return {
+            "id": doc["id"],
+            "title": doc["title"],
+            "url": doc["url"],
+            "object": doc["object"],
+            "icon": doc["icon"],
+            "last_edited_time": doc["last_edited_time"],
+            "score": round(score, 4),
+            "snippet": self._snippet(doc["text"], terms),
+        }
+
+    @staticmethod
+    def _snippet(text: str, terms) -> str:
+        """A window of `text` around the first query term, or its opening."""
+        if not text:
+            return ""
+        position = 0
+        if terms:
+            pattern = re.compile(r"\b(?:" + "|".join(re.escape(term) for term in terms) + r")", re.IGNORECASE)
+            match = pattern.search(text)
+            if match:
+                position = max(0, match.start() - SNIPPET_CHARS // 3)
+        snippet = " ".join(text[position:position + SNIPPET_CHARS].split())
+        return ("..." if position else "") + snippet + ("..." if position + SNIPPET_CHARS < len(text) else "")
+
+    def search(self, query: str, limit: int = 5, object_type: str = None, titles_only: bool = False,
+               semantic: bool = False) -> list:
+        """
+        Ranked [{"id", "title", "url", "object", "icon", "last_edited_time", "score", "snippet"}].
+        titles_only matches page titles only (like Notion's search); semantic fuses in embedding
+        similarity when embeddings are available.
+        """
+        self.stats["queries"] += 1
+        terms = tokenize(query)
+        accept = (lambda doc_id: self.docs[doc_id]["object"] == object_type) if object_type else None
+        with self.lock:
+            lexical = (self.title_index if titles_only else self.bm25).search(terms, max(limit, RRF_K) if semantic else limit, accept)
+            if not semantic and (lexical or titles_only or not self.embed_fn):
+                return [self._result(self.docs[doc_id], score, terms) for score, doc_id in lexical]
+            docs = dict(self.docs)
+            ids, objects, matrix = self._vector_snapshot()
+
+        vector = _unit(self._embed_query(query))
+        if vector is None or matrix is None or len(vector) != matrix.shape[1]:
+            return [self._result(docs[doc_id], score, terms) for score, doc_id in lexical[:limit]]
+        # Scored on the snapshot, outside the lock
+        scores = matrix @ vector
+        if object_type:
+            scores[objects != object_type] = -np.inf
+        top = min(max(limit, RRF_K), len(ids))
+        best_rows = np.argpartition(-scores, top - 1)[:top]
+        similar = sorted(((float(scores[row]), ids[row]) for row in best_rows if scores[row] > -np.inf), reverse=True)
+        fused = defaultdict(float)
+        for ranking in (lexical, similar):
+            for rank, (_, doc_id) in enumerate(ranking):
+                fused[doc_id] += 1.0 / (RRF_K + rank + 1)
+        best = heapq.nlargest(limit, ((score, doc_id) for doc_id, score in fused.items()))
+        return [self._result(docs[doc_id], score, terms) for score, doc_id in best]
+
+    def _vector_snapshot(self):
+        """(ids, object types, matrix) of every embedded page. Caller holds the lock."""
+        if self._matrix is None:
+            ids = list(self.vectors)
+            objects = np.array([self.docs[doc_id]["object"] for doc_id in ids])
+            matrix = np.stack([self.vectors[doc_id] for doc_id in ids]) if ids else None
+            self._matrix = (ids, objects, matrix)
+        return self._matrix
+
+    def _embed_query(self, query: str):
+        if not self.embed_fn or not query.strip():
+            return None
+        try:
+            return self.embed_fn(query)
+        except Exception as e:
+            logger.error(f"Notion query embedding failed: {e}")
+            return None
+
+    def recent(self, limit: int = 5, object_type: str = None) -> list:
+        """Most recently edited pages, like Notion's search with an empty query."""
+        with self.lock:
+            docs = [doc for doc in self.docs.values() if object_type is None or doc["object"] == object_type]
+        newest = heapq.nlargest(limit, docs, key=lambda doc: doc["last_edited_time"] or "")
+        return [self._result(doc, 0.0) for doc in newest]
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "pages": len(self.docs),
+                "terms": len(self.bm25.postings),
+                "embedded": len(self.vectors),
+                "watermark": self.watermark,
+                "ready": self.ready.is_set(),
+                **self.stats,
+            }
@@ -0,0 +1,324 @@
+"""
+Loads the full block tree of a Notion page.
+
+blocks.children.list returns at most 100 blocks per call and only one level
+of the tree. The loader follows next_cursor until has_more is false. It also
+descends into every block with children (toggles, columns, lists, tables,
+callouts, synced blocks, ...). Synced copies are read from their original
+block. Child pages and databases are left out: they are separate pages.
+
+Sibling subtrees are fetched in parallel on a small thread pool. All
+requests go through one rate limiter that stays under Notion's limit
+(about 3 requests/second) and backs off on 429 responses. Text is handed to
+`on_text` in document order as soon as everything before it has arrived,
+so callers can start working before the whole tree is in.
+
+Trees are cached in backend/data/notion_blocks.json, keyed by the page's
+last_edited_time. Loading an unchanged page again costs one pages.retrieve
+call. Notion rounds last_edited_time to the minute, so a tree fetched within
+a minute of the edit isn't trusted until it is fetched again.
+"""
+
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MAX_WORKERS = int(os.getenv("NOTION_MAX_WORKERS", "3"))
+REQUESTS_PER_SECOND = float(os.getenv("NOTION_REQUESTS_PER_SECOND", "3"))
+PAGE_SIZE = 100
+MAX_RETRIES = 4
+MAX_CACHED_PAGES = 200
+CACHE_VERSION = 1
+# Children of these are other pages, not content of this one
+SEPARATE_PAGES = {"child_page", "child_database"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# last_edited_time has minute precision; later edits in the same minute don't change it
+EDIT_PRECISION = 60
+
+
+def edited_timestamp(value: str) -> float:
+    """Epoch seconds of a Notion timestamp ('2026-01-01T09:30:00.000Z')."""
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def is_settled(edited: str, fetched: float) -> bool:
+    """True if content fetched at `fetched` can't have missed an edit stamped `edited`."""
+    try:
+        return fetched - edited_timestamp(edited) >= EDIT_PRECISION
+    except (AttributeError, ValueError):
+        return False
+
+
+def block_text(block: dict):
+    """Plain text of one block (table rows joined with ' | '), or None."""
+    block_type = block.get("type")
+    data = block.get(block_type) or {}
+    if "rich_text" in data:
+        text = "".join(rt.get("plain_text", "") for rt in data["rich_text"])
+    elif block_type == "table_row":
+        text = " | ".join("".join(rt.get("plain_text", "") for rt in cell) for cell in data.get("cells", []))
+    else:
+        return None
+    return text if text.strip() else None
+
+
+def tree_text(blocks: list) -> list:
+    """Text of every block in the tree, in document order."""
+    parts = []
+    for block in blocks:
+        text = block_text(block)
+        if text:
+            parts.append(text)
+        parts.extend(tree_text(block.get("children") or []))
+    return parts
+
+
+def count_blocks(blocks: list) -> int:
+    return sum(1 + count_blocks(block.get("children") or []) for block in blocks)
+
+
+def _has_content_children(block: dict) -> bool:
+    return bool(block.get("has_children")) and block.get("type") not in SEPARATE_PAGES
+
+
+def _children_source(block: dict) -> str:
+    """Block id to list children from; synced copies point at their original."""
+    if block.get("type") == "synced_block":
+        synced_from = (block.get("synced_block") or {}).get("synced_from")
+        if synced_from and synced_from.get("block_id"):
+            return synced_from["block_id"]
+    return block["id"]
+
+
+class RateLimiter:
+    """Spaces requests `1 / rate` seconds apart across threads."""
+
+    def __init__(self, rate: float = REQUESTS_PER_SECOND):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def back_off(self, seconds: float):
+        """Holds every caller for `seconds` (after a 429)."""
+        with self.lock:
+            self.next_slot = max(self.next_slot, time.monotonic() + seconds)
+
+
+class NotionPageLoader:
+    def __init__(self, client, cache_path: str = None, max_workers: int = MAX_WORKERS,
+                 rate_limiter: RateLimiter = None):
+        if cache_path:
+            self.cache_path = cache_path
+        else:
+            # Default to backend/data/notion_blocks.json
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            data_dir = os.path.join(base_dir, "backend", "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.cache_path = os.path.join(data_dir, "notion_blocks.json")
+
+        self.client = client
+        self.max_workers = max_workers
+        self.limiter = rate_limiter or RateLimiter()
+        # page id -> {"last_edited_time", "fetched", "blocks"}
+        self.cache = {}
+        self.cache_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "cache_hits": 0, "pages_loaded": 0}
+        self._load_cache()
+
+    # --- Cache ---
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.cache = data.get("pages", {})
+        except Exception as e:
+            logger.error(f"Error loading Notion block cache: {e}")
+
+    def _save_cache(self):
+        try:
+            with self.cache_lock:
+                if len(self.cache) > MAX_CACHED_PAGES:
+                    for page_id in sorted(self.cache, key=lambda p: self.cache[p]["fetched"])[:len(self.cache) - MAX_CACHED_PAGES]:
+                        del self.cache[page_id]
+                tmp_path = self.cache_path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": CACHE_VERSION, "pages": self.cache}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error(f"Error saving Notion block cache: {e}")
+
+    # --- Requests ---
+
+    def call(self, fn, **kwargs):
+        """
+        Runs one API call through the rate limiter, retrying rate limits and 5xx errors.
+        NotionIndex sends its search requests through here to share the limit.
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.acquire()
+            self.stats["requests"] += 1
+            try:
+                return fn(**kwargs)
+            except Exception as e:
+                status = getattr(e, "status", None)
+                code = getattr(getattr(e, "code", None), "value", getattr(e, "code", None))
+                if attempt == MAX_RETRIES or not (status in RETRYABLE_STATUS or code == "rate_limited"):
+                    raise
+                headers = getattr(e, "headers", None) or {}
+                try:
+                    delay = float(headers.get("retry-after"))
+                except (TypeError, ValueError):
+                    delay = 0.5 * 2 ** attempt
+                self.stats["retries"] += 1
+                logger.warning(f"Notion request throttled ({status or code}), retrying in {delay:.1f}s")
+                self.limiter.back_off(delay)
+
+    def _child_pages(self, block_id: str):
+        """Yields the children of `block_id` one API page at a time, following next_cursor."""
+        cursor = None
+        while True:
+            params = {"block_id": block_id, "page_size": PAGE_SIZE}
+            if cursor:
+                params["start_cursor"] = cursor
+            response = self.call(self.client.blocks.children.list, **params)
+            yield response.get("results", [])
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return
+
+    # --- Tree loading ---
+
+    def retrieve_page(self, page_id: str) -> dict:
+        return self.call(self.client.pages.retrieve, page_id=page_id)
+
+    def load(self, page_id: str, page: dict = None, on_text=None, cache: bool = True) -> tuple:
+        """
+        Returns (blocks, cached): the page's block tree, each block with a "children" list
+        where it has content children. `page` is the pages.retrieve result if the caller
+        already has it. `on_text(text)` is called for every block's text in document order.
+        cache=False skips the tree cache (for callers that keep their own copy).
+        """
+        page = page or self.retrieve_page(page_id)
+        edited = page.get("last_edited_time")
+        entry = self.cache.get(page_id) if cache else None
+        if entry and edited and entry["last_edited_time"] == edited and is_settled(edited, entry["fetched"]):
+            self.stats["cache_hits"] += 1
+            if on_text:
+                for text in tree_text(entry["blocks"]):
+                    on_text(text)
+            return entry["blocks"], True
+
+        # Content is as of the start of the fetch; edits during it may be missed
+        fetched = time.time()
+        started = time.perf_counter()
+        blocks = self._load_tree(page_id, on_text)
+        self.stats["pages_loaded"] += 1
+        logger.info(f"Loaded Notion page {page_id}: {count_blocks(blocks)} blocks in {time.perf_counter() - started:.2f}s")
+        if cache and edited:
+            with self.cache_lock:
+                self.cache[page_id] = {"last_edited_time": edited, "fetched": fetched, "blocks": blocks}
+            self._save_cache()
+        return blocks, False
+
+    def _load_tree(self, page_id: str, on_text=None) -> list:
+        root = {"id": page_id, "type": "page", "has_children": True}
+        lock = threading.Lock()
+        done = threading.Event()
+        # loading: id() of blocks whose children are still arriving
+        state = {"outstanding": 1, "error": None, "stack": [[root, 0]], "loading": {id(root)}}
+
+        def fetch(block):
+            try:
+                for page in self._child_pages(_children_source(block)):
+                    with lock:
+                        block.setdefault("children", []).extend(page)
+                        for child in page:
+                            if _has_content_children(child):
+                                state["outstanding"] += 1
+                                state["loading"].add(id(child))
+                                executor.submit(fetch, child)
+                        self._drain(state, on_text)
+            except Exception as e:
+                if block is root:
+                    state["error"] = e
+                else:
+                    # e.g. a synced block whose original isn't shared with the integration
+                    logger.warning(f"Skipping children of Notion block {block.get('id')}: {e}")
+            with lock:
+                block.setdefault("children", [])
+                state["loading"].discard(id(block))
+                self._drain(state, on_text)
+                state["outstanding"] -= 1
+                if state["outstanding"] == 0:
+                    done.set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="aria-notion") as executor:
+            executor.submit(fetch, root)
+            done.wait()
+        if state["error"] is not None:
+            raise state["error"]
+        return root["children"]
+
+    @staticmethod
+    def _drain(state, on_text):
+        """Emits text in document order up to the first block whose children haven't arrived yet."""
+        stack = state["stack"]
+        while stack:
+            top = stack[-1]
+            parent, index = top
+            children = parent.get("children", [])
+            if index >= len(children):
+                if id(parent) in state["loading"]:
+                    return
+                stack.pop()
+                continue
+            top[1] += 1
+            block = children[index]
+            text = block_text(block)
+            if text and on_text:
+                on_text(text)
+            if _has_content_children(block):
+                stack.append([block, 0])
+
+    def stream_text(self, page_id: str, page: dict = None):
+        """Yields the page's text block by block while the tree is still loading."""
+        chunks = queue.Queue()
+        end = object()
+
+        def run():
+            try:
+                self.load(page_id, page, on_text=chunks.put)
+            except Exception as e:
+                chunks.put(e)
+            chunks.put(end)
+
+        threading.Thread(target=run, daemon=True, name="aria-notion-stream").start()
+        while True:
+            chunk = chunks.get()
+            if chunk is end:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+
+    def get_stats(self) -> dict:
+        return {"cached_pages": len(self.cache), **self.stats}
@@ -1,6 +1,8 @@
 import os
 from notion_client import Client
 from dotenv import load_dotenv
+from .notion_loader import NotionPageLoader, tree_text, count_blocks
+from .notion_index import NotionIndex
 
 load_dotenv()
 
@@ -9,10 +11,14 @@ class NotionManager:
         self.api_key = os.getenv("NOTION_API_KEY")
         self.database_id = os.getenv("NOTION_DATABASE_ID")
         self.client = None
+        self.loader = None
+        self.index = None
         
         if self.api_key:
             try:
                 self.client = Client(auth=self.api_key)
+                self.loader = NotionPageLoader(self.client)
+                self.index = NotionIndex(self.client, loader=self.loader)
             except Exception as e:
                 print(f"Error initializing Notion client: {e}")
         else:
@@ -26,6 +32,12 @@ class NotionManager:
         if not self.client:
             return None
 
+        # Local title match first; Notion's search only sees titles too
+        if self._index_ready():
+            results = self.index.search(query, limit=1, object_type=filter_type, titles_only=True)
+            if results:
+                return results[0]
+
         try:
             params = {
                 "query": query,
@@ -53,6 +65,30 @@ class NotionManager:
             print(f"Search error: {e}")
             return None
 
+    def start_sync(self, scheduler=None, embed_fn=None):
+        """
+        Mirrors the workspace into the local search index in the background.
+        embed_fn enables semantic search when NOTION_INDEX_EMBEDDINGS=1.
+        """
+        if not self.index:
+            return
+        if os.getenv("NOTION_INDEX_EMBEDDINGS", "0") == "1":
+            self.index.embed_fn = embed_fn
+        self.index.start(scheduler)
+
+    def _index_ready(self) -> bool:
+        return self.index is not None and self.index.ready.is_set()
+
+    def search_content(self, query: str, limit: int = 5) -> list:
+        """
+        Full-text search over page titles, properties and content from the local index
+        (semantic matching too, when embeddings are enabled).
+        Returns [{"id", "title", "url", "object", "snippet", ...}], best match first.
+        """
+        if not self._index_ready():
+            return []
+        return self.index.search(query, limit=limit, semantic=self.index.embed_fn is not None)
+
     def create_page(self, title, content=None, target_name=None):
         """
         Creates a page (task) in Notion.
@@ -107,6 +143,8 @@ class NotionManager:
                 properties=properties,
                 children=children
             )
+            if self.index:
+                self.index.refresh_soon()
             target_display = target_name if target_name else "Notion"
             target_display = target_name if target_name else "Notion"
             return f"Successfully added '{title}' to {target_display}."
@@ -122,6 +160,18 @@ class NotionManager:
         if not self.client:
             return "Notion client not initialized."
 
+        if self._index_ready():
+            if query:
+                results = self.index.search(query, limit=num_pages)
+                intro = f"Here are results for '{query}':\n"
+            else:
+                results = self.index.recent(limit=num_pages)
+                intro = "Here are your recent Notion pages:\n"
+            if results:
+                return intro + "".join(
+                    f"- {page['icon'] + ' ' if page['icon'] else ''}{page['title']} ({page['object']})\n" for page in results
+                )
+
         try:
             if query:
                 # Search mode
@@ -170,6 +220,12 @@ class NotionManager:
         if not self.client:
             return []
 
+        if self._index_ready():
+            results = self.index.search(query, limit=limit) if query else self.index.recent(limit=limit)
+            if results:
+                return [{"id": page["id"], "title": page["title"], "url": page["url"], "object": page["object"]}
+                        for page in results]
+
         try:
             params = {"page_size": limit}
             if query:
@@ -203,10 +259,11 @@ class NotionManager:
             print(f"Notion Raw Search Error: {e}")
             return []
 
-    def get_page_content(self, page_id: str) -> dict:
+    def get_page_content(self, page_id: str, on_text=None) -> dict:
         """
-        Fetches the full content of a Notion page.
+        Fetches the full content of a Notion page, including nested blocks.
         Returns a dict with title, content, and status.
+        on_text: optional callback that receives each block's text in order as it is loaded.
         """
         if not self.client:
             return {
@@ -219,7 +276,7 @@ class NotionManager:
             page_id = page_id.replace("-", "")
             
             # Retrieve page metadata
-            page = self.client.pages.retrieve(page_id=page_id)
+            page = self.loader.retrieve_page(page_id)
             
             # Extract title
             title = "Untitled"
@@ -231,44 +288,23 @@ class NotionManager:
                         title = title_list[0].get("text", {}).get("content", "Untitled")
                     break
             
-            # Fetch all child blocks (the actual content)
-            blocks_response = self.client.blocks.children.list(block_id=page_id)
-            blocks = blocks_response.get("results", [])
-            
-            # Extract text from blocks
-            content_parts = []
-            for block in blocks:
-                block_type = block.get("type")
-                block_data = block.get(block_type, {})
-                
-                # Extract rich text from various block types
-                if "rich_text" in block_data:
-                    rich_text_array = block_data["rich_text"]
-                    text = "".join([rt.get("plain_text", "") for rt in rich_text_array])
-                    if text.strip():
-                        content_parts.append(text)
-                
-                # Handle special block types
-                elif block_type == "child_page":
-                    # Skip child pages (we only want this page's content)
-                    continue
-                elif block_type == "code":
-                    rich_text_array = block_data.get("rich_text", [])
-                    code_text = "".join([rt.get("plain_text", "") for rt in rich_text_array])
-                    if code_text.strip():
-                        content_parts.append(f"[Code Block]: {code_text}")
+            # Fetch the whole block tree (paginated, nested blocks included); cached by last_edited_time
+            blocks, cached = self.loader.load(page_id, page=page, on_text=on_text)
+            content_parts = tree_text(blocks)
             
             # Combine all content
             full_content = "\n\n".join(content_parts)
             
             if not full_content.strip():
-                full_content = "(This page appears to be empty or contains only nested content)"
+                full_content = "(This page appears to be empty)"
             
             return {
                 "status": "success",
                 "title": title,
                 "content": full_content,
-                "word_count": len(full_content.split())
+                "word_count": len(full_content.split()),
+                "block_count": count_blocks(blocks),
+                "cached": cached
             }
             
         except Exception as e:
@@ -1,16 +1,24 @@
 import datetime
+import functools
 import time
 import ctypes
-import threading
 import webbrowser
 import json
 from typing import List
 from .logger import setup_logger
+from .scheduler import get_scheduler
 
 logger = setup_logger(__name__)
 
+OWNER = "proactive"
+# Upcoming events turned into reminder / Focus Time jobs on each plan
+PLAN_EVENTS = 20
+# The cache triggers a replan whenever events change; this also picks up events further out
+REPLAN_INTERVAL = 30 * 60
+FOCUS_PHRASES = ["focus time", "deep work", "focus session"]
+
 class ProactiveManager:
-    def __init__(self, calendar_manager, system_control, tts_manager=None, app_launcher=None, brain=None, weather_manager=None, notification_manager=None):
+    def __init__(self, calendar_manager, system_control, tts_manager=None, app_launcher=None, brain=None, weather_manager=None, notification_manager=None, scheduler=None):
         self.calendar = calendar_manager
         self.system_control = system_control
         self.tts = tts_manager
@@ -20,9 +28,8 @@ class ProactiveManager:
         self.notification_manager = notification_manager
         
         self.is_deep_work_active = False
-        self.check_interval = 60  # Check every minute
-        self.stop_event = threading.Event()
-        self.thread = None
+        self.scheduler = scheduler
+        self.listening = False
         self.handled_30min = set() 
         self.handled_5min = set()
         
@@ -30,40 +37,114 @@ class ProactiveManager:
         self.last_weather_date = None
 
     def start_monitoring(self):
-        """Starts the background monitoring thread."""
-        if self.thread and self.thread.is_alive():
+        """
+        Registers scheduler jobs instead of polling: a morning briefing at 5 AM, and reminders
+        and Focus Time switches at the exact times computed from the cached calendar.
+        """
+        if self.scheduler is None:
+            self.scheduler = get_scheduler()
+        if self.scheduler.get(f"{OWNER}:plan"):
             return
-        
-        self.stop_event.clear()
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        cache = getattr(self.calendar, "cache", None)
+        if cache is not None and not self.listening:
+            cache.add_listener(self._replan_soon)
+            self.listening = True
+        self.scheduler.every(REPLAN_INTERVAL, self.plan, name=f"{OWNER}:plan", first_delay=0, owner=OWNER)
+        self._schedule_briefing()
         logger.info("Proactive Monitor started.")
 
     def stop_monitoring(self):
-        """Stops the background monitoring thread."""
-        self.stop_event.set()
-        if self.thread:
-            self.thread.join()
+        """Cancels the proactive jobs."""
+        if self.scheduler:
+            self.scheduler.cancel_owner(OWNER)
         logger.info("Proactive Monitor stopped.")
 
-    def _monitor_loop(self):
-        """Background loop to check for events."""
-        while not self.stop_event.is_set():
-            try:
-                self.check_and_act()
-            except Exception as e:
-                logger.error(f"Error in Proactive Monitor: {e}")
-            
-            # Wait for check_interval or stop_event
-            if self.stop_event.wait(self.check_interval):
-                break
+    def _replan_soon(self):
+        """Calendar cache listener: recompute triggers after the events changed."""
+        if self.scheduler and self.scheduler.get(f"{OWNER}:plan"):
+            self.scheduler.schedule_in(0, self.plan, name=f"{OWNER}:replan", owner=OWNER)
+
+    def _active_hours(self, now):
+        """Proactive speech only between 5 AM and 11 PM."""
+        return 5 <= now.hour < 23
+
+    def plan(self):
+        """
+        Turns the upcoming events into absolute-time jobs (30 / 5 minute reminders, Focus Time
+        start and end) and drops jobs of events that moved or were deleted.
+        """
+        events = self.calendar.get_upcoming_events_raw(max_results=PLAN_EVENTS)
+        now = time.time()
+        planned = {f"{OWNER}:plan", f"{OWNER}:replan", f"{OWNER}:morning_briefing"}
+        for event in events:
+            event_id = event.get('id')
+            start_dt = self._parse_dt(event['start'].get('dateTime'))
+            if not event_id or not start_dt:
+                continue
+            start_ts = start_dt.timestamp()
+
+            # Same windows as before: 30-minute warning 25-30 min ahead, 5-minute one 0-5 min ahead
+            for minutes, earliest, handled in ((30, 25, self.handled_30min), (5, 0, self.handled_5min)):
+                if event_id in handled or start_ts - now < earliest * 60:
+                    continue
+                name = f"{OWNER}:{minutes}min:{event_id}"
+                self.scheduler.schedule_at(max(now, start_ts - minutes * 60), functools.partial(self._remind, event, minutes),
+                                           name=name, owner=OWNER)
+                planned.add(name)
+
+            end_dt = self._parse_dt(event['end'].get('dateTime'))
+            if end_dt and self._is_focus_event(event):
+                for edge, when in (("start", start_ts), ("end", end_dt.timestamp())):
+                    if when >= now:
+                        name = f"{OWNER}:focus_{edge}:{event_id}"
+                        self.scheduler.schedule_at(when, self._update_deep_work, name=name, owner=OWNER)
+                        planned.add(name)
+
+        self.scheduler.cancel_owner(OWNER, keep=planned)
+        self._update_deep_work(events)
+
+    def _remind(self, event, minutes):
+        """Runs a planned 30- or 5-minute reminder."""
+        now = datetime.datetime.now()
+        start_dt = self._parse_dt(event['start'].get('dateTime'))
+        if not start_dt or not self._active_hours(now):
+            return
+        event_id = event.get('id')
+        time_until_start = self._minutes_until(start_dt, now)
+        if minutes == 30 and event_id not in self.handled_30min:
+            self._trigger_30min_warning(event, time_until_start)
+            self.handled_30min.add(event_id)
+        elif minutes == 5 and event_id not in self.handled_5min:
+            self._analyze_and_trigger(event, time_until_start)
+            self.handled_5min.add(event_id)
+
+    def _update_deep_work(self, events=None):
+        """Turns Deep Work on or off to match the Focus Time event happening now, if any."""
+        if events is None:
+            events = self.calendar.get_upcoming_events_raw(max_results=PLAN_EVENTS)
+        self._handle_deep_work_state(events, datetime.datetime.now())
+
+    def _schedule_briefing(self):
+        """Schedules the morning briefing for 5 AM (or now, if it is morning and it hasn't run today)."""
+        now = datetime.datetime.now()
+        due = now.replace(hour=5, minute=0, second=0, microsecond=0)
+        if now.hour >= 11 or self.last_weather_date == now.strftime("%Y-%m-%d"):
+            due += datetime.timedelta(days=1)
+        self.scheduler.schedule_at(max(due.timestamp(), time.time()), self._morning_briefing,
+                                   name=f"{OWNER}:morning_briefing", owner=OWNER)
+
+    def _morning_briefing(self):
+        now = datetime.datetime.now()
+        if self._active_hours(now):
+            self._handle_morning_briefing(now)
+        self._schedule_briefing()
 
     def check_and_act(self):
-        """Checks calendar and time to trigger actions."""
+        """Checks calendar and time to trigger actions (all at once, without the scheduler)."""
         now = datetime.datetime.now()
         
         # 1. TIME RESTRICTION: Run between 5 AM and 11 PM
-        if not (5 <= now.hour < 23):
+        if not self._active_hours(now):
             # If it's outside the window, just return.
             return
 
@@ -110,9 +191,8 @@ class ProactiveManager:
         
         found_focus_time = False
         for event in events:
-            summary = event.get('summary', '').lower()
             # Still use keywords for Focus Time as it's a specific mode
-            if any(phrase in summary for phrase in ["focus time", "deep work", "focus session"]):
+            if self._is_focus_event(event):
                 if self._is_happening_now(event, now):
                     found_focus_time = True
                     break
@@ -132,12 +212,7 @@ class ProactiveManager:
                 continue
 
             # Check if event is starting within 5 minutes
-            # Ensure start_dt is timezone aware/naive compatible with now
-            if start_dt.tzinfo:
-                now_aware = datetime.datetime.now(start_dt.tzinfo)
-                time_until_start = (start_dt - now_aware).total_seconds() / 60
-            else:
-                time_until_start = (start_dt - now).total_seconds() / 60
+            time_until_start = self._minutes_until(start_dt, now)
             
             # 1. 30-Minute Warning (Window: 25 to 30 mins)
             if 25 <= time_until_start <= 30:
@@ -253,6 +328,16 @@ class ProactiveManager:
                 self.notification_manager.add_notification(f"Coding Session: {summary}", msg, type="action")
             self.app_launcher.open_desktop_app("code")
 
+    def _minutes_until(self, start_dt, now):
+        # Ensure start_dt is timezone aware/naive compatible with now
+        if start_dt.tzinfo:
+            now = datetime.datetime.now(start_dt.tzinfo)
+        return (start_dt - now).total_seconds() / 60
+
+    def _is_focus_event(self, event):
+        summary = event.get('summary', '').lower()
+        return any(phrase in summary for phrase in FOCUS_PHRASES)
+
     def _is_happening_now(self, event, now):
         start = self._parse_dt(event['start'].get('dateTime'))
         end = self._parse_dt(event['end'].get('dateTime'))
@@ -0,0 +1,210 @@
+"""
+Single background scheduler for timed work.
+
+Managers register jobs instead of running their own polling threads:
+one-shot jobs at an absolute time ("event X starts in 30 min", computed once
+from cached calendar data) and periodic jobs. The jobs sit in a heap keyed
+by due time. One timer thread sleeps on a condition variable until the
+earliest deadline, or until a new job moves that deadline earlier, so an
+idle assistant wakes only when something is due. Job bodies run on a small
+worker pool, so a slow one (an LLM call, TTS) doesn't delay the others.
+
+Jobs have unique names. Scheduling a name that exists replaces the old
+job, which is how triggers get recomputed when the calendar changes.
+`jobs()` returns the job table for introspection (GET /system/scheduler).
+"""
+
+import datetime
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+# Upper bound on one sleep, so wall-clock jumps (suspend, clock changes) are noticed
+MAX_SLEEP = 900
+
+
+class Job:
+    __slots__ = ("name", "callback", "due", "interval", "owner", "runs", "skipped", "last_run",
+                 "last_error", "running", "cancelled")
+
+    def __init__(self, name, callback, due, interval=None, owner=None):
+        self.name = name
+        self.callback = callback
+        self.due = due
+        self.interval = interval
+        self.owner = owner
+        self.runs = 0
+        self.skipped = 0
+        self.last_run = None
+        self.last_error = None
+        self.running = False
+        self.cancelled = False
+
+    def describe(self) -> dict:
+        return {
+            "name": self.name,
+            "next_run": datetime.datetime.fromtimestamp(self.due).isoformat(timespec="seconds"),
+            "due_in": round(self.due - time.time(), 1),
+            "interval": self.interval,
+            "owner": self.owner,
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "last_run": datetime.datetime.fromtimestamp(self.last_run).isoformat(timespec="seconds") if self.last_run else None,
+            "last_error": self.last_error,
+            "running": self.running,
+        }
+
+
+class Scheduler:
+    def __init__(self, workers: int = WORKERS):
+        self.heap = []          # (due, sequence, job)
+        self.jobs_by_name = {}
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.workers = workers
+        self.executor = None
+        self.thread = None
+        self.stopping = False
+        self.stats = {"wakeups": 0, "runs": 0, "errors": 0}
+
+    # --- Registration ---
+
+    def schedule_at(self, when, callback, name: str, interval: float = None, owner: str = None) -> Job:
+        """
+        Runs `callback()` at `when` (epoch seconds or an aware datetime), then every `interval`
+        seconds if given. Replaces any job with the same name.
+        """
+        if isinstance(when, datetime.datetime):
+            when = when.timestamp()
+        job = Job(name, callback, when, interval, owner)
+        with self.condition:
+            old = self.jobs_by_name.get(name)
+            if old is not None:
+                old.cancelled = True
+            self.jobs_by_name[name] = job
+            heapq.heappush(self.heap, (when, next(self.sequence), job))
+            # Only wake the timer thread if this job is now the earliest
+            if self.heap[0][2] is job:
+                self.condition.notify()
+        return job
+
+    def schedule_in(self, delay: float, callback, name: str, interval: float = None, owner: str = None) -> Job:
+        return self.schedule_at(time.time() + delay, callback, name, interval, owner)
+
+    def every(self, interval: float, callback, name: str, first_delay: float = None, owner: str = None) -> Job:
+        """Runs `callback()` every `interval` seconds, first after `first_delay` (default: one interval)."""
+        return self.schedule_in(interval if first_delay is None else first_delay, callback, name, interval, owner)
+
+    def cancel(self, name: str) -> bool:
+        with self.condition:
+            job = self.jobs_by_name.pop(name, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            return True
+
+    def cancel_owner(self, owner: str, keep=()) -> int:
+        """Cancels every job registered by `owner` except the names in `keep`."""
+        keep = set(keep)
+        with self.condition:
+            names = [name for name, job in self.jobs_by_name.items() if job.owner == owner and name not in keep]
+            for name in names:
+                self.jobs_by_name.pop(name).cancelled = True
+        return len(names)
+
+    def get(self, name: str):
+        return self.jobs_by_name.get(name)
+
+    def jobs(self, owner: str = None) -> list:
+        """The job table, soonest first."""
+        with self.condition:
+            jobs = [job for job in self.jobs_by_name.values() if owner is None or job.owner == owner]
+        return [job.describe() for job in sorted(jobs, key=lambda job: job.due)]
+
+    # --- Timer thread ---
+
+    def start(self):
+        with self.condition:
+            if self.thread and self.thread.is_alive():
+                return self
+            self.stopping = False
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="aria-job")
+            self.thread = threading.Thread(target=self._run, daemon=True, name="aria-scheduler")
+            self.thread.start()
+        logger.info("Scheduler started")
+        return self
+
+    def stop(self, wait: bool = False):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        if self.executor:
+            self.executor.shutdown(wait=wait)
+
+    def _next_due(self):
+        """Pops cancelled entries; returns the earliest live job or None. Caller holds the lock."""
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+        return self.heap[0][2] if self.heap else None
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.stopping:
+                    job = self._next_due()
+                    delay = None if job is None else job.due - time.time()
+                    if delay is not None and delay <= 0:
+                        break
+                    self.condition.wait(MAX_SLEEP if delay is None else min(delay, MAX_SLEEP))
+                    self.stats["wakeups"] += 1
+                if self.stopping:
+                    return
+                heapq.heappop(self.heap)
+                if job.interval:
+                    # Fixed rate; runs missed while asleep collapse into this one
+                    now = time.time()
+                    job.due += job.interval * max(1, -(-(now - job.due) // job.interval))
+                    heapq.heappush(self.heap, (job.due, next(self.sequence), job))
+                else:
+                    self.jobs_by_name.pop(job.name, None)
+                if job.running:
+                    job.skipped += 1
+                    continue
+                job.running = True
+            self.executor.submit(self._execute, job)
+
+    def _execute(self, job: Job):
+        try:
+            job.callback()
+            job.last_error = None
+        except Exception as e:
+            job.last_error = str(e)
+            self.stats["errors"] += 1
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+        finally:
+            job.runs += 1
+            job.last_run = time.time()
+            job.running = False
+            self.stats["runs"] += 1
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    """The process-wide scheduler, started on first use."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Scheduler().start()
+        return _default
@@ -0,0 +1,164 @@
+"""
+Incremental sentence segmentation for streamed LLM output.
+
+`SentenceSegmenter.feed(token)` looks only at the characters of the new token
+and returns the chunks that became complete. A '.', '!' or '?' is treated as a
+boundary only once the next character is whitespace, so decimals ("3.14"),
+abbreviations ("Dr. Smith", "e.g. this"), initials and numbered list markers
+("1. Milk") don't split. Line breaks end a chunk (markdown headings and list
+items). Code fences are kept whole. Chunks shorter than `min_chars` are merged
+with the next sentence, and a run of text longer than `max_chars` is split at
+the last comma/semicolon/space so TTS gets well-sized pieces early.
+"""
+
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "approx", "no", "fig", "inc", "ltd", "co", "dept", "est", "min", "max", "a.m", "p.m",
+}
+TERMINATORS = ".!?"
+CLOSERS = "\"')]}*_”’"
+SOFT_BREAKS = ",;:"
+
+
+class SentenceSegmenter:
+    """Stateful splitter; feed it tokens in order and call `flush()` at the end."""
+
+    def __init__(self, min_chars: int = 12, max_chars: int = 220):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._parts = []           # every token fed, for `text`
+        self._chunk = []           # characters of the chunk being built
+        self._word = []            # characters since the last whitespace
+        self._word_at_line_start = True
+        self._line_empty = True
+        self._pending = False      # saw a terminator, waiting for the next character
+        self._soft_break = -1      # index in _chunk just after the last , ; :
+        self._last_space = -1      # index in _chunk of the last whitespace
+        self._backticks = 0
+        self._in_code = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._parts)
+
+    def feed(self, token: str) -> list:
+        """Consumes a token and returns the chunks it completed (possibly none)."""
+        if not token:
+            return []
+        self._parts.append(token)
+        ready = []
+        for ch in token:
+            self._consume(ch, ready)
+        return ready
+
+    def flush(self) -> list:
+        """Returns whatever is left as a final chunk."""
+        ready = []
+        self._emit(ready, force=True)
+        return ready
+
+    # --- Internals ---
+
+    def _emit(self, ready: list, force: bool = False) -> bool:
+        chunk = "".join(self._chunk).strip()
+        if not chunk or (not force and len(chunk) < self.min_chars):
+            return False
+        ready.append(chunk)
+        self._chunk = []
+        self._soft_break = -1
+        self._last_space = -1
+        return True
+
+    def _is_boundary_word(self) -> bool:
+        """Decides whether the word ending in '.' can end a sentence."""
+        word = "".join(self._word).lstrip("([\"'*_").lower()
+        stem = word[:-1] if word.endswith(".") else word
+        if stem in ABBREVIATIONS:
+            return False
+        if len(stem) == 1 and stem.isalpha():
+            return False # Initials: "J. K. Rowling"
+        if "." in stem and all(len(part) == 1 for part in stem.split(".")):
+            return False # Dotted acronyms: "U.S.", "e.g."
+        if stem.isdigit() and self._word_at_line_start:
+            return False # Numbered list marker: "1. Milk"
+        return True
+
+    def _consume(self, ch: str, ready: list):
+        if self._pending:
+            if ch in CLOSERS or ch in TERMINATORS:
+                self._append(ch)
+                return
+            self._pending = False
+            if ch.isspace():
+                self._emit(ready)
+            # Anything else ("3.14", "node.js") means it wasn't a boundary
+
+        if self._track_fence(ch) and self._in_code:
+            # Speak the prose before a code block on its own
+            fence = self._chunk[-2:]
+            self._chunk = self._chunk[:-2]
+            self._emit(ready, force=True)
+            self._chunk.extend(fence)
+        self._append(ch)
+
+        if self._in_code:
+            if ch == "\n" and len(self._chunk) >= self.max_chars:
+                self._emit(ready, force=True)
+            return
+
+        if ch == "\n":
+            self._emit(ready)
+        elif ch in TERMINATORS:
+            if ch != "." or self._is_boundary_word():
+                self._pending = True
+        elif ch in SOFT_BREAKS:
+            self._soft_break = len(self._chunk)
+
+        if len(self._chunk) >= self.max_chars:
+            self._split_long(ready)
+
+    def _append(self, ch: str):
+        self._chunk.append(ch)
+        if ch.isspace():
+            if self._word:
+                self._line_empty = False
+            self._word = []
+            self._last_space = len(self._chunk) - 1
+            if ch == "\n":
+                self._line_empty = True
+            self._word_at_line_start = self._line_empty
+        else:
+            self._word.append(ch)
+
+    def _track_fence(self, ch: str) -> bool:
+        """Counts backticks; returns True when `ch` completes a ``` fence."""
+        if ch != "`":
+            self._backticks = 0
+            return False
+        self._backticks += 1
+        if self._backticks < 3:
+            return False
+        self._in_code = not self._in_code
+        self._backticks = 0
+        return True
+
+    def _split_long(self, ready: list):
+        """Breaks an over-long run at the last soft break, else the last space, else hard."""
+        cut = self._soft_break if self._soft_break > 0 else self._last_space + 1
+        if cut <= 0:
+            cut = len(self._chunk)
+        head, tail = self._chunk[:cut], self._chunk[cut:]
+        self._chunk = head
+        self._emit(ready, force=True)
+        self._chunk = tail
+        self._soft_break = -1
+        self._last_space = max((i for i, c in enumerate(tail) if c.isspace()), default=-1)
+
+
+def iter_sentences(stream, **kwargs):
+    """Wraps a token stream (e.g. AriaBrain.stream_ask) and yields speakable chunks."""
+    segmenter = SentenceSegmenter(**kwargs)
+    for token in stream:
+        yield from segmenter.feed(token)
+    yield from segmenter.flush()
@@ -0,0 +1,105 @@
+"""
+Debounced, delta-encoded status updates for server push.
+
+Producers (the music monitor thread, the system sampler) call
+`update(topic, state)` with their full current state as often as they like.
+Only fields that changed since the last published message are sent, and
+bursts are debounced to at most one message per `min_interval` per topic.
+
+Each message is `{"type": "<topic>_status", "data": {"seq", "base", "delta"}}`.
+A client applies a delta only if `base` equals the last `seq` it applied;
+otherwise (first connect, or a dropped message) it reloads the snapshot from
+the REST endpoint, which answers from `snapshot(topic)` and includes `seq`.
+"""
+
+import threading
+import time
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class StatusPublisher:
+    def __init__(self, publish, min_interval: float = 0.25):
+        """`publish(message)` must be thread-safe and non-blocking (e.g. ConnectionManager.publish)."""
+        self.publish = publish
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.snapshots = {}   # topic -> latest full state
+        self.published = {}   # topic -> state as last sent to clients
+        self.pending = {}     # topic -> changed fields not yet sent
+        self.seq = {}         # topic -> seq of the last message
+        self.last_emit = {}   # topic -> monotonic time of the last message
+        self.timers = {}      # topic -> trailing debounce timer
+
+    def snapshot(self, topic: str):
+        """Latest full state plus the seq a client should continue from, or None."""
+        with self.lock:
+            state = self.snapshots.get(topic)
+            if state is None:
+                return None
+            return dict(state, seq=self.seq.get(topic, 0))
+
+    def update(self, topic: str, state: dict, tolerance: dict = None):
+        """
+        Records `state` and schedules a delta for fields that changed. Numeric fields listed in
+        `tolerance` only count as changed once they move by at least that much.
+        """
+        with self.lock:
+            self.snapshots[topic] = dict(state)
+            published = self.published.get(topic, {})
+            pending = self.pending.setdefault(topic, {})
+            for key, value in state.items():
+                if key in published and self._same(published[key], value, (tolerance or {}).get(key)):
+                    pending.pop(key, None)
+                    continue
+                pending[key] = value
+            if not pending:
+                return
+
+            wait = self.last_emit.get(topic, 0) + self.min_interval - time.monotonic()
+            if wait > 0:
+                # Trailing edge: one message at the end of the burst
+                if topic not in self.timers:
+                    timer = threading.Timer(wait, self._flush, args=(topic,))
+                    timer.daemon = True
+                    self.timers[topic] = timer
+                    timer.start()
+                return
+            message = self._take(topic)
+        self._send(message)
+
+    @staticmethod
+    def _same(old, new, tolerance) -> bool:
+        if tolerance is not None and isinstance(old, (int, float)) and isinstance(new, (int, float)):
+            return abs(new - old) < tolerance
+        return old == new
+
+    def _take(self, topic: str) -> dict:
+        """Builds the next message and marks its fields published (caller holds the lock)."""
+        delta = self.pending.pop(topic, {})
+        base = self.seq.get(topic, 0)
+        self.seq[topic] = base + 1
+        self.published.setdefault(topic, {}).update(delta)
+        self.last_emit[topic] = time.monotonic()
+        return {"type": f"{topic}_status", "data": {"seq": base + 1, "base": base, "delta": delta}}
+
+    def _flush(self, topic: str):
+        with self.lock:
+            self.timers.pop(topic, None)
+            if not self.pending.get(topic):
+                return
+            message = self._take(topic)
+        self._send(message)
+
+    def _send(self, message: dict):
+        try:
+            self.publish(message)
+        except Exception as e:
+            logger.error(f"Error publishing {message['type']}: {e}")
+
+    def stop(self):
+        with self.lock:
+            for timer in self.timers.values():
+                timer.cancel()
+            self.timers.clear()
@@ -1,9 +1,14 @@
 import psutil
 import time
+from .system_sampler import SystemSampler, SAMPLE_INTERVAL
+from .metrics_store import MetricsStore
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Health alerts look at the average over this window, so one busy sample isn't an overload
+HEALTH_WINDOW_SECONDS = 60
+
 class SystemMonitor:
     def __init__(self):
         self.battery_threshold = 25
@@ -11,6 +16,49 @@ class SystemMonitor:
         self.last_alert_time = 0
         self.alert_cooldown = 300  # 5 minutes cooldown between alerts
 
+        # While the background sampler runs, readings come from its latest sample
+        self.sampler = None
+        self.metrics_store = None
+
+    def start_sampler(self, interval: float = SAMPLE_INTERVAL, on_sample=None, history: bool = False):
+        """
+        Starts (or re-targets) the background sampler so readers never block. With `history`,
+        samples are also kept in the persistent MetricsStore for the dashboard.
+        """
+        if history and self.metrics_store is None:
+            try:
+                self.metrics_store = MetricsStore()
+            except OSError as e:
+                logger.error(f"Metrics history disabled: {e}")
+        if self.sampler is None:
+            self.sampler = SystemSampler(interval=interval, store=self.metrics_store)
+        if on_sample is not None:
+            self.sampler.on_sample = on_sample
+        self.sampler.start()
+
+    def stop_sampler(self):
+        if self.sampler:
+            self.sampler.stop()
+        if self.metrics_store:
+            self.metrics_store.flush()
+
+    def get_metric_history(self, metric: str, range_seconds: float, step_seconds: float = None):
+        """Pre-aggregated min/avg/max series from the metrics store (None when history is off)."""
+        if self.metrics_store is None:
+            return None
+        return self.metrics_store.query(metric, range_seconds, step_seconds)
+
+    @property
+    def latest(self):
+        """Most recent background sample, or None before the sampler has produced one."""
+        return self.sampler.latest if self.sampler else None
+
+    def get_window_stats(self, metric: str = "cpu", seconds: float = HEALTH_WINDOW_SECONDS):
+        """avg/min/max/p95/trend of a sampled metric over the last `seconds` (None without sampler)."""
+        if self.latest is None:
+            return None
+        return self.sampler.stats(metric, seconds)
+
     def get_battery_status(self):
         """
         Returns battery status: {"percent": int, "power_plugged": bool}
@@ -30,8 +78,10 @@ class SystemMonitor:
 
     def get_cpu_usage(self):
         """
-        Returns CPU usage percentage.
+        Returns CPU usage percentage (from the latest sample when the sampler is running).
         """
+        if self.latest is not None:
+            return self.latest["cpu"]
         try:
             return psutil.cpu_percent(interval=1)
         except Exception as e:
@@ -51,15 +101,23 @@ class SystemMonitor:
             return alerts
 
         # Check Battery
-        battery = self.get_battery_status()
+        latest = self.latest
+        battery = latest["battery"] if latest else self.get_battery_status()
         if battery:
             if not battery["power_plugged"] and battery["percent"] <= self.battery_threshold:
                 alerts.append(f"Heads up, your battery is low at {battery['percent']}%. You might want to plug in.")
 
-        # Check CPU
-        cpu = self.get_cpu_usage()
-        if cpu >= self.cpu_threshold:
-            alerts.append(f"System warning: CPU usage is high at {cpu}%.")
+        # Check CPU: sustained load over the window when sampling, else a single reading
+        window = self.get_window_stats("cpu", HEALTH_WINDOW_SECONDS)
+        if window is not None:
+            # Require the window to be mostly filled so a fresh start can't alert on one spike
+            enough = window["samples"] * self.sampler.interval >= HEALTH_WINDOW_SECONDS / 2
+            if enough and window["avg"] >= self.cpu_threshold:
+                alerts.append(f"System warning: CPU usage has averaged {round(window['avg'])}% over the last minute.")
+        else:
+            cpu = self.get_cpu_usage()
+            if cpu >= self.cpu_threshold:
+                alerts.append(f"System warning: CPU usage is high at {cpu}%.")
 
         if alerts:
             self.last_alert_time = current_time
@@ -70,6 +128,8 @@ class SystemMonitor:
         """
         Returns RAM usage percentage.
         """
+        if self.latest is not None:
+            return self.latest["ram"]
         try:
             return psutil.virtual_memory().percent
         except Exception as e:
@@ -80,6 +140,8 @@ class SystemMonitor:
         """
         Returns a dictionary containing all system statistics.
         """
+        if self.latest is not None:
+            return {key: self.latest[key] for key in ("battery", "cpu", "ram")}
         return {
             "battery": self.get_battery_status(),
             "cpu": self.get_cpu_usage(),
@@ -0,0 +1,205 @@
+"""
+Background sampling of system metrics into a fixed-size ring buffer.
+
+A daemon thread reads CPU (total and per core), RAM, swap, disk I/O, network
+and battery every `interval` seconds with non-blocking psutil calls (counters
+are turned into per-second rates between samples). Samples go into
+preallocated float columns, so memory stays constant and reading the latest
+value is O(1). Windowed aggregates (average, min, max, p95, trend) walk back
+only over the requested window.
+"""
+
+import math
+import os
+import threading
+import time
+from array import array
+import psutil
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Seconds between samples and how much history the ring buffer keeps
+SAMPLE_INTERVAL = float(os.getenv("SYSTEM_SAMPLE_INTERVAL", "1"))
+HISTORY_SECONDS = float(os.getenv("SYSTEM_HISTORY_SECONDS", "600"))
+
+BASE_METRICS = (
+    "cpu", "ram", "swap",
+    "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps",
+    "battery", "power_plugged",
+)
+
+NAN = float("nan")
+
+
+class MetricRing:
+    """Fixed-capacity float columns (one per metric) sharing a timestamp column."""
+
+    def __init__(self, capacity: int, metrics):
+        self.capacity = max(1, capacity)
+        self.metrics = tuple(metrics)
+        self.columns = {name: array('d', [NAN]) * self.capacity for name in self.metrics}
+        self.times = array('d', [0.0]) * self.capacity
+        self.head = 0   # next slot to write
+        self.count = 0
+
+    def append(self, timestamp: float, values: dict):
+        slot = self.head
+        self.times[slot] = timestamp
+        for name, column in self.columns.items():
+            value = values.get(name)
+            column[slot] = NAN if value is None else float(value)
+        self.head = (slot + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, metric: str, seconds: float, now: float = None):
+        """Returns [(timestamp, value)] oldest first for samples newer than `now - seconds`."""
+        column = self.columns[metric]
+        cutoff = (now if now is not None else time.time()) - seconds
+        points = []
+        for i in range(1, self.count + 1):
+            slot = (self.head - i) % self.capacity
+            if self.times[slot] < cutoff:
+                break
+            value = column[slot]
+            if not math.isnan(value):
+                points.append((self.times[slot], value))
+        points.reverse()
+        return points
+
+
+def summarize(points) -> dict:
+    """avg/min/max/p95 and trend (least-squares slope, units per minute) of [(t, v)]."""
+    if not points:
+        return {"samples": 0, "avg": None, "min": None, "max": None, "p95": None, "trend": None}
+    values = sorted(v for _, v in points)
+    n = len(values)
+    mean = sum(values) / n
+    trend = 0.0
+    if n > 1:
+        t0 = points[0][0]
+        mean_t = sum(t - t0 for t, _ in points) / n
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in points)
+        if var_t > 0:
+            cov = sum((t - t0 - mean_t) * (v - mean) for t, v in points)
+            trend = cov / var_t * 60
+    return {
+        "samples": n,
+        "avg": round(mean, 2),
+        "min": values[0],
+        "max": values[-1],
+        "p95": values[min(n - 1, math.ceil(0.95 * n) - 1)],
+        "trend": round(trend, 3),
+    }
+
+
+class SystemSampler:
+    def __init__(self, interval: float = SAMPLE_INTERVAL, history_seconds: float = HISTORY_SECONDS,
+                 on_sample=None, source=psutil, store=None):
+        """`store` (a MetricsStore) additionally receives every sample for long-term history."""
+        self.interval = interval
+        self.on_sample = on_sample
+        self.store = store
+        self.source = source
+        self.cores = source.cpu_count() or 1
+        self.core_metrics = tuple(f"core{i}" for i in range(self.cores))
+        self.ring = MetricRing(int(history_seconds / interval) + 1, BASE_METRICS + self.core_metrics)
+        self.lock = threading.Lock()
+        self.latest = None
+        self._last_counters = None
+        self._stop = threading.Event()
+        self.thread = None
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        # Non-blocking cpu_percent measures since the previous call; prime it, then take a first sample
+        self.source.cpu_percent(interval=None)
+        self.source.cpu_percent(interval=None, percpu=True)
+        self._last_counters = self._read_counters()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="aria-system-sampler")
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample_once()
+            except Exception as e:
+                logger.error(f"Error sampling system stats: {e}")
+
+    def _read_counters(self):
+        try:
+            disk = self.source.disk_io_counters()
+        except Exception:
+            disk = None
+        try:
+            net = self.source.net_io_counters()
+        except Exception:
+            net = None
+        return time.monotonic(), disk, net
+
+    @staticmethod
+    def _rate(new, old, field, elapsed):
+        if new is None or old is None or elapsed <= 0:
+            return None
+        return max(0.0, (getattr(new, field) - getattr(old, field)) / elapsed)
+
+    def sample_once(self) -> dict:
+        """Takes one sample, stores it and notifies `on_sample`; returns the sample."""
+        source = self.source
+        counters = self._read_counters()
+        last = self._last_counters or counters
+        elapsed = counters[0] - last[0]
+        self._last_counters = counters
+
+        per_core = source.cpu_percent(interval=None, percpu=True)
+        try:
+            battery = source.sensors_battery()
+        except Exception:
+            battery = None
+
+        sample = {
+            "timestamp": time.time(),
+            "cpu": source.cpu_percent(interval=None),
+            "per_core": list(per_core),
+            "ram": source.virtual_memory().percent,
+            "swap": source.swap_memory().percent,
+            "disk_read_bps": self._rate(counters[1], last[1], "read_bytes", elapsed),
+            "disk_write_bps": self._rate(counters[1], last[1], "write_bytes", elapsed),
+            "net_sent_bps": self._rate(counters[2], last[2], "bytes_sent", elapsed),
+            "net_recv_bps": self._rate(counters[2], last[2], "bytes_recv", elapsed),
+            "battery": {"percent": battery.percent, "power_plugged": battery.power_plugged} if battery else None,
+        }
+
+        row = dict(sample)
+        row["battery"] = battery.percent if battery else None
+        row["power_plugged"] = (1.0 if battery.power_plugged else 0.0) if battery and battery.power_plugged is not None else None
+        for name, value in zip(self.core_metrics, per_core):
+            row[name] = value
+
+        with self.lock:
+            self.ring.append(sample["timestamp"], row)
+            self.latest = sample
+        if self.store:
+            self.store.record(sample["timestamp"], row)
+        if self.on_sample:
+            self.on_sample(sample)
+        return sample
+
+    def stats(self, metric: str, seconds: float = 60) -> dict:
+        """Aggregates of `metric` over the last `seconds`."""
+        with self.lock:
+            points = self.ring.window(metric, seconds)
+        return summarize(points)
+
+    def series(self, metric: str, seconds: float = 60):
+        with self.lock:
+            return self.ring.window(metric, seconds)
@@ -0,0 +1,187 @@
+"""
+Content-addressed cache of synthesized speech.
+
+Audio is keyed on sha256(voice, normalized text) and stored as
+`<key>.mp3` under the cache directory. The directory is bounded by total size
+with least-recently-used eviction (file mtime records last use, so the order
+survives restarts). Recently used clips are also kept in memory so a hit needs
+no disk read at all.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from .logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Confirmations spoken often enough to synthesize ahead of first use
+COMMON_PHRASES = [
+    "Turning it up.", "Volume increased.", "Got it, louder.", "Boosting the volume.",
+    "Turning it down.", "Volume decreased.", "Got it, quieter.", "Lowering the volume.",
+    "Going to sleep.", "Entering sleep mode.", "Goodnight.", "Sleeping now.",
+    "Taking screenshot.", "Locking screen.", "Minimizing all windows.",
+    "Activating Focus Mode. Minimizing distractions.", "Deactivating Focus Mode.",
+    "What volume level?", "What should I search for?", "What file are you looking for?",
+    "I found some results. Summarizing for you...", "I couldn't find any results for that.",
+    "Let me take a look at your screen...", "Here is what I see.",
+    "Okay, starting fresh. What's on your mind?", "Good morning! Gathering your briefing...",
+    "Organizing Downloads...", "Organizing Desktop...", "Emptying recycle bin...",
+    "Okay, maybe later.", "Executing plan.", "Okay, automation cancelled.",
+]
+
+
+def normalize_phrase(text: str) -> str:
+    # Case is kept on purpose: it changes how acronyms are read out
+    return " ".join(text.split())
+
+
+class TTSAudioCache:
+    """Disk + memory LRU of synthesized audio, safe to share across threads."""
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 50 * 1024 * 1024,
+                 memory_max_bytes: int = 8 * 1024 * 1024, max_phrase_chars: int = 160):
+        if cache_dir:
+            self.cache_dir = cache_dir
+        else:
+            # Default to backend/data/tts_cache
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self.cache_dir = os.path.join(base_dir, "backend", "data", "tts_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self.max_phrase_chars = max_phrase_chars
+
+        self.lock = threading.Lock()
+        self.disk_entries = OrderedDict()   # key -> size, least recently used first
+        self.disk_bytes = 0
+        self.memory_entries = OrderedDict() # key -> audio bytes
+        self.memory_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._load_index()
+
+    def _load_index(self):
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self.disk_entries[key] = size
+            self.disk_bytes += size
+        if files:
+            logger.info(f"TTS cache loaded: {len(files)} clips, {self.disk_bytes // 1024} KB")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".mp3")
+
+    @staticmethod
+    def make_key(voice: str, text: str) -> str:
+        return hashlib.sha256(f"{voice}\x00{normalize_phrase(text)}".encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, text: str) -> bool:
+        """Only short phrases repeat often enough to be worth caching."""
+        return 0 < len(normalize_phrase(text)) <= self.max_phrase_chars
+
+    def contains(self, voice: str, text: str) -> bool:
+        return self.make_key(voice, text) in self.disk_entries
+
+    def get(self, voice: str, text: str):
+        """Returns the cached audio bytes or None."""
+        if not self.is_cacheable(text):
+            return None
+        key = self.make_key(voice, text)
+        with self.lock:
+            audio = self.memory_entries.get(key)
+            if audio is not None:
+                self.memory_entries.move_to_end(key)
+                self.disk_entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return audio
+            if key not in self.disk_entries:
+                self.stats["misses"] += 1
+                return None
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                audio = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            with self.lock:
+                self.disk_bytes -= self.disk_entries.pop(key, 0)
+                self.stats["misses"] += 1
+            return None
+
+        with self.lock:
+            if key in self.disk_entries:
+                self.disk_entries.move_to_end(key)
+            self._remember(key, audio)
+            self.stats["disk_hits"] += 1
+        return audio
+
+    def put(self, voice: str, text: str, audio: bytes) -> bool:
+        if not audio or not self.is_cacheable(text):
+            return False
+        key = self.make_key(voice, text)
+        path = self._path(key)
+        try:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry: {e}")
+            return False
+
+        with self.lock:
+            self.disk_bytes -= self.disk_entries.pop(key, 0)
+            self.disk_entries[key] = len(audio)
+            self.disk_bytes += len(audio)
+            self._remember(key, audio)
+            self.stats["stores"] += 1
+            evicted = self._evict_disk()
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+        return True
+
+    def _remember(self, key: str, audio: bytes):
+        """Adds to the in-memory LRU (caller holds the lock)."""
+        if len(audio) > self.memory_max_bytes:
+            return
+        self.memory_bytes -= len(self.memory_entries.pop(key, b""))
+        self.memory_entries[key] = audio
+        self.memory_bytes += len(audio)
+        while self.memory_bytes > self.memory_max_bytes:
+            _, old = self.memory_entries.popitem(last=False)
+            self.memory_bytes -= len(old)
+
+    def _evict_disk(self) -> list:
+        """Drops least recently used clips until under budget (caller holds the lock)."""
+        evicted = []
+        while self.disk_bytes > self.max_bytes and len(self.disk_entries) > 1:
+            key, size = self.disk_entries.popitem(last=False)
+            self.disk_bytes -= size
+            self.memory_bytes -= len(self.memory_entries.pop(key, b""))
+            self.stats["evictions"] += 1
+            evicted.append(key)
+        return evicted
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["clips"] = len(self.disk_entries)
+            stats["disk_bytes"] = self.disk_bytes
+            stats["memory_bytes"] = self.memory_bytes
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
@@ -9,24 +9,87 @@ import threading
 import queue
 import re
 import asyncio
+import concurrent.futures
+import io
 import edge_tts
+from .audio_stream import AudioStream, PCMSegmenter
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Sentences synthesized ahead of the one currently playing
+DEFAULT_PREFETCH = 2
+
+# Streamed audio is handed to the mixer in frame-aligned segments; the first one is
+# kept small so playback starts quickly (edge-tts sends 48 kbps mp3, ~6 KB per second)
+STREAM_FIRST_SEGMENT_BYTES = 2048
+STREAM_SEGMENT_BYTES = 8192
+# Give up on a stream that delivers nothing new for this long while the channel is idle
+STREAM_STALL_SECONDS = 10.0
+# Decoded audio at the end of the stream so far that may still change when more arrives
+STREAM_PCM_HOLDBACK_SECONDS = 0.05
+# Longest stretch of mp3 re-decoded per segment (~8 s); longer sentences hand over to a new run
+STREAM_MAX_DECODE_BYTES = 48 * 1024
+# numpy sample type for each pygame.mixer sample size
+_SAMPLE_TYPES = {8: "uint8", -8: "int8", 16: "uint16", -16: "int16", 32: "float32"}
+
+
+def _decode_mp3(data: bytes) -> bytes:
+    """Whole MP3 buffer -> PCM in the mixer's format."""
+    return pygame.mixer.Sound(file=io.BytesIO(data)).get_raw()
+
+
 class TTSManager:
-    def __init__(self, on_speak=None):
+    """
+    Two-stage speech pipeline.
+
+    Synthesis runs as coroutines on a dedicated asyncio loop so up to `prefetch`
+    upcoming sentences are synthesized while the current one plays. Playback
+    consumes finished jobs strictly in order. `stop()` bumps a generation counter,
+    cancels queued and in-flight synthesis and stops the mixer.
+
+    Audio never touches the disk: edge-tts chunks stream into an in-memory
+    AudioStream and playback starts on the first decodable frames. With an
+    `audio_cache`, short phrases are served from memory/disk instead of being
+    synthesized again.
+    """
+
+    def __init__(self, on_speak=None, prefetch=None, audio_cache=None, warm_phrases=None):
         """
         on_speak: Callback function(text) to update GUI or logs when Aria speaks.
+        prefetch: Sentences to synthesize ahead of playback (0 = one at a time).
+        audio_cache: Optional TTSAudioCache for repeated phrases.
+        warm_phrases: Phrases to synthesize into the cache in the background at startup.
         """
         self.on_speak = on_speak
         self.tts_enabled = True
-        self.tts_queue = queue.Queue()
-        
-        # Start TTS worker thread
-        self.interrupted_flag = False
-        self.tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+        self.voice = "en-US-AriaNeural"
+        if prefetch is None:
+            prefetch = int(os.getenv("TTS_PREFETCH", str(DEFAULT_PREFETCH)))
+        self.prefetch = max(0, prefetch)
+        self.audio_cache = audio_cache
+
+        self.tts_queue = queue.Queue()       # (text, generation) waiting for a synthesis slot
+        self.playback_queue = queue.Queue()  # synthesis jobs in speaking order
+        self._generation = 0
+        self._state_lock = threading.RLock()
+        self._slots = threading.Semaphore(self.prefetch + 1)
+        self._inflight = set()  # synthesis futures
+        self._streams = set()   # edge-tts tasks still filling an AudioStream
+
+        # Synthesis loop (edge-tts is async)
+        self._loop = asyncio.new_event_loop()
+        self.synth_thread = threading.Thread(target=self._loop.run_forever, daemon=True, name="aria-tts-synth")
+        self.synth_thread.start()
+
+        # Start TTS worker threads
+        self.tts_thread = threading.Thread(target=self._synthesis_dispatcher, daemon=True, name="aria-tts-dispatch")
         self.tts_thread.start()
+        self.playback_thread = threading.Thread(target=self._playback_worker, daemon=True, name="aria-tts-playback")
+        self.playback_thread.start()
+
+        if self.audio_cache and warm_phrases:
+            asyncio.run_coroutine_threadsafe(self._warm_cache(list(warm_phrases)), self._loop)
 
     def set_tts_enabled(self, enabled: bool):
         """Enable or disable TTS output."""
@@ -35,187 +98,268 @@ class TTSManager:
             self.stop()
 
     def stop(self):
-        """Stop current playback and clear queue (Interrupt)."""
-        # 1. Clear Queue
-        with self.tts_queue.mutex:
-            self.tts_queue.queue.clear()
-        
-        self.interrupted_flag = True
-        
-        # 2. Stop Pygame Mixer
+        """Stop current playback, cancel pending synthesis and clear queues (Interrupt)."""
+        with self._state_lock:
+            self._generation += 1
+
+            # 1. Clear Queues
+            with self.tts_queue.mutex:
+                self.tts_queue.queue.clear()
+            while True:
+                try:
+                    job = self.playback_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._discard(job)
+
+            # 2. Cancel in-flight synthesis, including streams that are already playing
+            for future in list(self._inflight):
+                future.cancel()
+            for task in list(self._streams):
+                self._loop.call_soon_threadsafe(task.cancel)
+
+        # 3. Stop Pygame Mixer
         if pygame.mixer.get_init():
-            pygame.mixer.music.stop()
-            # Unload to release file lock
-            try:
-                pygame.mixer.music.unload()
-            except:
-                pass
-        
+            pygame.mixer.stop()
+
         logger.info("TTS Interrupted.")
 
-    def _tts_worker(self):
-        """Worker thread to handle TTS playback sequentially with Edge-TTS and gTTS fallback."""
-        # Create a new event loop for this thread since edge-tts is async
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+    def _is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    def _untrack(self, collection: set, item):
+        with self._state_lock:
+            collection.discard(item)
+
+    # --- Stage 1: Synthesis ---
+
+    def _synthesis_dispatcher(self):
+        """Admits queued sentences into the prefetch window and starts their synthesis."""
         logger.info("TTS Worker started")
-        
         while True:
-            # Check if queue was cleared (interruption)
-            if self.tts_queue.empty():
-                 # Small sleep to prevent tight loop if queue is empty but thread alive
-                 time.sleep(0.1)
+            text, generation = self.tts_queue.get()
+            if text is None:
+                self.playback_queue.put(None)
+                break
 
+            self._slots.acquire()
+            with self._state_lock:
+                if not self._is_current(generation):
+                    self._slots.release()
+                    continue
+                future = asyncio.run_coroutine_threadsafe(self._synthesize(text), self._loop)
+                self._inflight.add(future)
+                future.add_done_callback(lambda f: self._untrack(self._inflight, f))
+                self.playback_queue.put({"text": text, "generation": generation, "future": future})
+
+    async def _synthesize(self, text: str):
+        """
+        Returns audio for `text`: cached or gTTS bytes, a live AudioStream from
+        edge-tts, or None. Cancellation aborts it.
+        """
+        if self.audio_cache:
+            audio = self.audio_cache.get(self.voice, text)
+            if audio:
+                return audio
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            stream = AudioStream()
+            first_audio = asyncio.Event()
+            task = asyncio.ensure_future(self._stream_edge_tts(text, stream, first_audio))
+            waiter = asyncio.ensure_future(first_audio.wait())
             try:
-                text = self.tts_queue.get(timeout=1.0) # wait for 1 sec
-            except queue.Empty:
+                # Hand the stream to playback as soon as the first chunk arrives
+                await asyncio.wait({task, waiter}, timeout=10.0, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                waiter.cancel()
+
+            if first_audio.is_set():
+                with self._state_lock:
+                    self._streams.add(task)
+                task.add_done_callback(lambda t: self._untrack(self._streams, t))
+                return stream
+
+            if task.done():
+                error = task.exception() if not task.cancelled() else None
+                logger.warning(f"Edge-TTS attempt {attempt+1} error: {error or 'no audio received'}")
+            else:
+                task.cancel()
+                logger.warning(f"Edge-TTS attempt {attempt+1} timed out (>10s)")
+
+            # Small delay before retry
+            if attempt < max_retries - 1:
+                await asyncio.sleep(0.5)
+
+        logger.warning("All Edge-TTS attempts failed, falling back to gTTS")
+        try:
+            # Fallback to gTTS
+            logger.info("TTS Worker: Using gTTS fallback...")
+            tts = gTTS(text=text, lang="en", slow=False)
+            buffer = io.BytesIO()
+            await asyncio.get_running_loop().run_in_executor(None, tts.write_to_fp, buffer)
+            return buffer.getvalue() or None
+        except Exception as e:
+            logger.error(f"gTTS error: {e}")
+            return None
+
+    async def _stream_edge_tts(self, text: str, stream: AudioStream, first_audio: asyncio.Event):
+        """Feeds edge-tts audio chunks into `stream`; complete short phrases are cached."""
+        try:
+            communicate = edge_tts.Communicate(text, self.voice)
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    stream.write(chunk["data"])
+                    first_audio.set()
+        except asyncio.CancelledError:
+            stream.abort()
+            raise
+        except Exception as e:
+            stream.close()
+            if not len(stream):
+                raise
+            # Playback already started; speak what we have
+            logger.warning(f"Edge-TTS stream cut short: {e}")
+            return
+        stream.close()
+
+        # Only complete edge-tts output is cached; the gTTS fallback sounds different
+        if self.audio_cache and len(stream):
+            self.audio_cache.put(self.voice, text, stream.getvalue())
+
+    async def _fetch_audio(self, text: str) -> bytes:
+        """Synthesizes `text` with edge-tts straight into memory."""
+        communicate = edge_tts.Communicate(text, self.voice)
+        chunks = []
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+        return b"".join(chunks)
+
+    async def _warm_cache(self, phrases: list):
+        """Fills the cache with known phrases; stops at the first failure (e.g. offline)."""
+        warmed = 0
+        for text in phrases:
+            if self.audio_cache.contains(self.voice, text) or not self.audio_cache.is_cacheable(text):
                 continue
-            
-            # If we just got text but the queue was cleared externally (interruption signal),
-            # we should ignore this text.
-            # *However*, queue.clear() doesn't signal "interruption" explicitly to this thread.
-            # We need a robust flag or just rely on clear+stop.
-            
-            # Since stop() calls clear(), if we are here, we have a text.
-            # But maybe stop() was called while we were waiting in get().
-            # Let's check if mixer is still busy playing previous file, which shouldn't happen if stop() worked.
-            
-            # --- CRITICAL: Check for valid text ---
-            if text is None:
+            try:
+                audio = await asyncio.wait_for(self._fetch_audio(text), timeout=10.0)
+            except Exception as e:
+                logger.info(f"TTS cache warm-up stopped: {e}")
+                break
+            if self.audio_cache.put(self.voice, text, audio):
+                warmed += 1
+        if warmed:
+            logger.info(f"TTS cache warmed with {warmed} phrases")
+
+    # --- Stage 2: Playback ---
+
+    def _playback_worker(self):
+        """Plays synthesized sentences in order, releasing a prefetch slot after each one."""
+        while True:
+            job = self.playback_queue.get()
+            if job is None:
                 break
-            
-            # Re-check queue emptiness as a signal? No, that's flaky.
-            # Better strategy: stop() clears queue AND stops mixer.
-            # If we are starting a NEW playback, we must ensure we haven't been asked to stop.
-            
-            # Let's rely on the fact that stop() kills the mixer music.
-            # We just proceed. If stop() is called MID-generation, the generation might finish
-            # but then we shouldn't play it? 
-            # We need an "interruption_event"
-            
-            # Simplified: Just proceed. stop() handles audio.
-            # But if we have 5 sentences in queue:
-            # stop() clears 4. The 1st is here.
-            # We generate it.
-            # We try to play it.
-            # If stop() was called during generation, we should NOT play it.
-            
-            # We need a timestamp or ID check? 
-            # Or just check mixer status?
-            
-            # Let's add a `is_interrupted` flag
-            if getattr(self, "interrupted_flag", False):
-                 self.interrupted_flag = False
-                 self.tts_queue.task_done()
-                 continue
-            
             try:
-                # logger.debug(f"TTS Worker: Processing text: '{text[:50]}...'")
-                pass
-            except UnicodeEncodeError:
-                pass
-            
-            # Create temp_voice folder if it doesn't exist
-            voice_folder = "temp_voice"
-            os.makedirs(voice_folder, exist_ok=True)
-            
-            filename = os.path.join(voice_folder, f"her_voice_{int(time.time())}_{id(text)}.mp3")
-            
-            edge_tts_success = False
-            max_retries = 3
-            
-            for attempt in range(max_retries):
                 try:
-                    # logger.debug(f"TTS Worker: Trying Edge-TTS (Attempt {attempt+1}/{max_retries})...")
-                    communicate = edge_tts.Communicate(text, "en-US-AriaNeural")
-                    
-                    # Increased timeout to 10 seconds and added retries
-                    loop.run_until_complete(
-                        asyncio.wait_for(communicate.save(filename), timeout=10.0)
-                    )
-                    
-                    # Verify file was actually created and has content
-                    if os.path.exists(filename) and os.path.getsize(filename) > 0:
-                        edge_tts_success = True
-                        break
-                    else:
-                        logger.warning(f"Edge-TTS attempt {attempt+1} failed: File empty or not created")
-                        
-                except asyncio.TimeoutError:
-                    logger.warning(f"Edge-TTS attempt {attempt+1} timed out (>10s)")
+                    audio = job["future"].result()
+                except (concurrent.futures.CancelledError, asyncio.CancelledError):
+                    continue
                 except Exception as e:
-                    logger.warning(f"Edge-TTS attempt {attempt+1} error: {e}")
-                
-                # Small delay before retry
-                if attempt < max_retries - 1:
-                    time.sleep(0.5)
-            
-            if not edge_tts_success:
-                logger.warning("All Edge-TTS attempts failed, falling back to gTTS")
-            
-            if not edge_tts_success:
-                try:
-                    # Fallback to gTTS
-                    logger.info("TTS Worker: Using gTTS fallback...")
-                    tts = gTTS(text=text, lang="en", slow=False)
-                    tts.save(filename)
-                    logger.debug(f"TTS Worker: gTTS saved to {filename}")
-                except Exception as e2:
-                    logger.error(f"gTTS error: {e2}")
-                    self.tts_queue.task_done()
+                    logger.error(f"TTS synthesis error: {e}")
                     continue
-            
-            try:
-                # Play the audio file
-                if os.path.exists(filename):
-                    # print(f"TTS Worker: Playing audio file {filename} (size: {os.path.getsize(filename)} bytes)")
-                    
-                    # Lazy init pygame mixer
-                    if not pygame.mixer.get_init():
-                        try:
-                            pygame.mixer.init()
-                        except Exception as e:
-                            logger.error(f"TTS Worker ERROR: Failed to initialize mixer: {e}")
-                            self.tts_queue.task_done()
-                            continue
-
-                    # CHECK INTERRUPTION BEFORE PLAYING
-                    if getattr(self, "interrupted_flag", False):
-                        logger.info("TTS Worker: Interrupted before playback.")
-                        self.interrupted_flag = False
-                        self.tts_queue.task_done()
-                        continue
 
-                    pygame.mixer.music.load(filename)
-                    pygame.mixer.music.play()
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
-                    # pygame.mixer.quit() # Don't quit, keep it alive
-                    # print("TTS Worker: Audio playback complete")
-                    
-                    # Cleanup
-                    try:
-                        # Unload the file to release the lock on Windows
-                        if pygame.mixer.get_init():
-                            try:
-                                pygame.mixer.music.unload()
-                            except Exception as e:
-                                logger.warning(f"TTS Worker WARNING: Failed to unload audio: {e}")
-                        
-                        # Small delay to ensure OS releases the handle
-                        time.sleep(0.1)
-                        
-                        os.remove(filename)
-                        # logger.debug(f"TTS Worker: Deleted {filename}")
-                    except Exception as e:
-                        logger.warning(f"TTS Worker WARNING: Failed to delete {filename}: {e}")
-                else:
-                    logger.error(f"TTS Worker ERROR: Audio file {filename} does not exist!")
+                if not audio:
+                    continue
+                # CHECK INTERRUPTION BEFORE PLAYING
+                if not self._is_current(job["generation"]):
+                    logger.info("TTS Worker: Interrupted before playback.")
+                    continue
+                self._play_audio(audio, job["generation"])
             except Exception as e:
                 logger.error(f"Audio playback error: {e}")
             finally:
-                self.tts_queue.task_done()
+                self._slots.release()
+
+    def _play_audio(self, audio, generation: int):
+        """Plays mp3 bytes or an AudioStream until done or interrupted."""
+        # Lazy init pygame mixer
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except Exception as e:
+                logger.error(f"TTS Worker ERROR: Failed to initialize mixer: {e}")
+                return
+
+        if isinstance(audio, AudioStream):
+            self._play_stream(audio, generation)
+            return
+
+        channel = pygame.mixer.Sound(file=io.BytesIO(audio)).play()
+        while channel and channel.get_busy() and self._is_current(generation):
+            time.sleep(0.02)
+
+    def _play_stream(self, stream: AudioStream, generation: int):
+        """
+        Plays a stream while it is still being synthesized. Whenever a new
+        frame-aligned segment arrives, everything received so far is decoded
+        and only the new PCM is queued on the channel behind the piece that is
+        playing, so the pieces join without clicks.
+        """
+        frequency, size, channels = pygame.mixer.get_init()
+        frame_bytes = abs(size) // 8 * channels
+        segmenter = PCMSegmenter(_decode_mp3, frame_bytes,
+                                 holdback=int(frequency * STREAM_PCM_HOLDBACK_SECONDS) * frame_bytes,
+                                 max_decode_bytes=STREAM_MAX_DECODE_BYTES,
+                                 dtype=_SAMPLE_TYPES.get(size, "int16"), rate=frequency)
+        channel = None
+        offset = 0
+        done = False
+        last_progress = time.time()
+        while self._is_current(generation):
+            # Queue the next piece once the channel's queue slot is free
+            if not done and (channel is None or channel.get_queue() is None):
+                # Take small segments whenever the channel has run dry, larger ones otherwise
+                idle = channel is None or not channel.get_busy()
+                min_bytes = STREAM_FIRST_SEGMENT_BYTES if idle else STREAM_SEGMENT_BYTES
+                segment, offset, done = stream.next_segment(offset, min_bytes, timeout=0.02)
+                if not segment and not done and idle and time.time() - last_progress > STREAM_STALL_SECONDS:
+                    logger.warning("TTS Worker WARNING: Audio stream stalled, skipping the rest.")
+                    stream.abort()
+                    break
+                if segment or (done and not stream.aborted):
+                    last_progress = time.time()
+                    try:
+                        pcm = segmenter.feed(stream.getvalue(offset), final=done)
+                    except pygame.error as e:
+                        logger.warning(f"TTS Worker WARNING: Undecodable audio skipped: {e}")
+                        continue
+                    if not pcm:
+                        continue
+                    sound = pygame.mixer.Sound(buffer=pcm)
+                    if idle:
+                        channel = sound.play()
+                    else:
+                        channel.queue(sound)
+                continue
+            if done and (channel is None or not channel.get_busy()):
+                break
+            time.sleep(0.02)
+
+    def _discard(self, job: dict):
+        """Drops a queued job: cancels its synthesis and frees its prefetch slot."""
+        job["future"].cancel()
+        if job["future"].done() and not job["future"].cancelled():
+            try:
+                audio = job["future"].result()
+                if isinstance(audio, AudioStream):
+                    audio.abort()
+            except Exception:
+                pass
+        self._slots.release()
 
     def _clean_text_for_audio(self, text):
         """Removes Markdown formatting for smoother TTS playback."""
@@ -251,7 +395,7 @@ class TTSManager:
         
         # Add to queue for background playback only if TTS is enabled
         if self.tts_enabled and clean_text:
-            self.tts_queue.put(clean_text)
+            self.tts_queue.put((clean_text, self._generation))
         else:
             # print(f"TTS: Not adding to queue. Enabled: {self.tts_enabled}, Text: {bool(clean_text)}")
             pass
@@ -1,14 +1,15 @@
 import datetime
-import threading
-import time
 import json
 import os
 from .logger import setup_logger
+from .scheduler import get_scheduler
 
 logger = setup_logger(__name__)
 
+JOB_NAME = "water:reminder"
+
 class WaterManager:
-    def __init__(self, tts_manager=None, notification_manager=None, weather_manager=None, system_control=None):
+    def __init__(self, tts_manager=None, notification_manager=None, weather_manager=None, system_control=None, scheduler=None):
         self.tts = tts_manager
         self.notification_manager = notification_manager
         self.weather_manager = weather_manager
@@ -16,8 +17,7 @@ class WaterManager:
         
         self.interval_minutes = 90  # Default 90 minutes
         self.is_running = False
-        self.thread = None
-        self.stop_event = threading.Event()
+        self.scheduler = scheduler
         self.last_drink_time = datetime.datetime.now()
         
         # Persistence file
@@ -62,12 +62,9 @@ class WaterManager:
             logger.info("Water Monitor already running.")
             return "Water reminder is already active."
             
-        self.stop_event.clear()
         self.is_running = True
         self.last_drink_time = datetime.datetime.now()
-        
-        self.thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.thread.start()
+        self._schedule_reminder()
         
         self._save_state()
         
@@ -81,9 +78,8 @@ class WaterManager:
             self._save_state() # Ensure consistent state
             return "Water reminder is not running."
             
-        self.stop_event.set()
-        if self.thread and self.thread != threading.current_thread():
-            self.thread.join(timeout=2)
+        if self.scheduler:
+            self.scheduler.cancel(JOB_NAME)
             
         self.is_running = False
         self._save_state()
@@ -96,6 +92,8 @@ class WaterManager:
         """Sets the reminder interval."""
         try:
             self.interval_minutes = int(minutes)
+            if self.is_running:
+                self._schedule_reminder()
             self._save_state()
             return f"Water reminder interval set to {self.interval_minutes} minutes."
         except ValueError:
@@ -104,42 +102,23 @@ class WaterManager:
     def reset_timer(self):
         """Resets the timer (user drank water)."""
         self.last_drink_time = datetime.datetime.now()
+        if self.is_running:
+            self._schedule_reminder()
         return "Great! Timer reset."
 
-    def _monitor_loop(self):
-        """Background loop to check time."""
-        logger.info("Water Monitor Loop Started")
-        
-        while not self.stop_event.is_set():
-            # Check every minute
-            if self.stop_event.wait(60):
-                break
-                
-            now = datetime.datetime.now()
-            
-            # ADAPTIVE LOGIC
-            current_interval = self.interval_minutes
-            
-            # 1. Weather Adaptation
-            if self.weather_manager:
-                try:
-                    # We need a way to get cached temp without making API calls every minute
-                    # WeatherManager caches for 10 mins, so calling get_weather is safe-ish,
-                    # but we need a city. Let's assume default city or last known.
-                    # For now, let's just check if we have cached data for "Pimpri, Maharashtra, India" (default)
-                    # Or better, add a method to WeatherManager to get last known temp.
-                    # Since we can't easily modify WeatherManager right now without context, 
-                    # let's skip complex API calls here to avoid rate limits if cache expires.
-                    # Ideally, ProactiveManager updates weather.
-                    pass
-                except Exception:
-                    pass
+    def _schedule_reminder(self):
+        """(Re)schedules the next reminder for one interval after the last drink."""
+        if self.scheduler is None:
+            self.scheduler = get_scheduler()
+        due = self.last_drink_time + datetime.timedelta(minutes=self.interval_minutes)
+        self.scheduler.schedule_at(due.timestamp(), self._reminder_due, name=JOB_NAME, owner="water")
 
-            elapsed = (now - self.last_drink_time).total_seconds() / 60
-            
-            if elapsed >= current_interval:
-                self._trigger_reminder()
-                self.last_drink_time = now
+    def _reminder_due(self):
+        if not self.is_running:
+            return
+        self._trigger_reminder()
+        self.last_drink_time = datetime.datetime.now()
+        self._schedule_reminder()
 
     def _trigger_reminder(self):
         """Triggers the reminder notification."""
@@ -1,4 +1,7 @@
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
 import sys
 import os
 
@@ -7,8 +10,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from aria.aria_core import AriaCore
 from aria.conversation_manager import ConversationManager
+from aria.conversation_store import AsyncConversationStore
 from aria.memory_manager import MemoryManager
 from aria.system_monitor import SystemMonitor
+from aria.status_publisher import StatusPublisher
 from aria.music_library import MusicManager
 from backend.notification_manager import NotificationManager
 from backend.websocket_manager import ConnectionManager
@@ -16,6 +21,7 @@ from backend.websocket_manager import ConnectionManager
 
 # Global instances
 aria_core: Optional[AriaCore] = None
+conversation_store: Optional[AsyncConversationStore] = None
 conversation_mgr: Optional[ConversationManager] = None
 memory_mgr: Optional[MemoryManager] = None
 system_monitor: Optional[SystemMonitor] = None
@@ -23,10 +29,18 @@ music_manager: Optional[MusicManager] = None
 music_manager: Optional[MusicManager] = None
 notification_mgr: Optional[NotificationManager] = None
 connection_mgr: Optional[ConnectionManager] = None
+status_publisher: Optional[StatusPublisher] = None
+blocking_executor: Optional[ThreadPoolExecutor] = None
+
+# System status fields only count as changed once they move this much (percentage points)
+SYSTEM_STATUS_TOLERANCE = {"cpu": 5.0, "ram": 2.0}
+
+# Upper bound on blocking work (LLM calls, Mongo, Chroma) running off the event loop
+BLOCKING_WORKERS = int(os.getenv("ARIA_BLOCKING_WORKERS", "8"))
 
 
 def init_dependencies():
-    global aria_core, conversation_mgr, memory_mgr, system_monitor, music_manager, notification_mgr, connection_mgr
+    global aria_core, conversation_store, conversation_mgr, memory_mgr, system_monitor, music_manager, notification_mgr, connection_mgr, status_publisher
 
     
     print("Initializing Global Dependencies...")
@@ -39,8 +53,14 @@ def init_dependencies():
     # No, conversation_mgr is init at line 33 in original code.
     # Let's reorder everything properly.
     
-    conversation_mgr = ConversationManager()
-    conversation_mgr = ConversationManager()
+    # Async routes await the store directly; worker threads go through the blocking adapter,
+    # which submits to the same loop so a single Motor client serves both
+    conversation_store = AsyncConversationStore()
+    try:
+        server_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        server_loop = None
+    conversation_mgr = ConversationManager(store=conversation_store, loop=server_loop)
     notification_mgr = NotificationManager(conversation_manager=conversation_mgr)
     connection_mgr = ConnectionManager()
 
@@ -51,10 +71,22 @@ def init_dependencies():
         connection_manager=connection_mgr
     )
     
-    memory_mgr = MemoryManager()
-    system_monitor = SystemMonitor()
+    # Share AriaCore's instance so there is one Chroma client and one ingestion worker
+    memory_mgr = aria_core.memory_manager
+    # AriaCore's monitor already runs the background sampler that the system intents read from
+    system_monitor = aria_core.system_monitor
     music_manager = aria_core.music_manager
 
+    # Server push: music and system state changes go out over the WebSocket as debounced deltas,
+    # and the REST status endpoints answer from the same snapshots
+    status_publisher = StatusPublisher(connection_mgr.publish)
+    music_manager.status_listener = lambda status: status_publisher.update("music", status)
+    system_monitor.start_sampler(
+        on_sample=lambda sample: status_publisher.update(
+            "system", system_monitor.get_all_stats(), tolerance=SYSTEM_STATUS_TOLERANCE
+        )
+    )
+
     print("Global Dependencies Initialized.")
 
 def get_notification_manager():
@@ -63,6 +95,9 @@ def get_notification_manager():
 def get_aria_core():
     return aria_core
 
+def get_conversation_store():
+    return conversation_store
+
 def get_conversation_mgr():
     return conversation_mgr
 
@@ -78,3 +113,27 @@ def get_music_manager():
 def get_connection_manager():
     return connection_mgr
 
+def get_status_publisher():
+    return status_publisher
+
+
+def get_blocking_executor():
+    """Returns the bounded thread pool used to keep blocking calls off the event loop."""
+    global blocking_executor
+    if blocking_executor is None:
+        blocking_executor = ThreadPoolExecutor(
+            max_workers=BLOCKING_WORKERS,
+            thread_name_prefix="aria-blocking"
+        )
+    return blocking_executor
+
+def shutdown_blocking_executor():
+    global blocking_executor
+    if blocking_executor is not None:
+        blocking_executor.shutdown(wait=False, cancel_futures=True)
+        blocking_executor = None
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a synchronous callable on the bounded executor and awaits its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_blocking_executor(), functools.partial(func, *args, **kwargs))
@@ -1,6 +1,5 @@
 import sys
 import io
-import asyncio
 import os
 import uvicorn
 from fastapi import FastAPI
@@ -14,73 +13,50 @@ sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.dependencies import init_dependencies, get_system_monitor, get_aria_core
+from backend.dependencies import init_dependencies, get_system_monitor, get_aria_core, shutdown_blocking_executor
 from backend.routers import chat, voice, music, system, notion, general, dashboard, websocket
 
 from aria.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Background Tasks
-async def background_scheduler():
-    """Runs scheduled tasks periodically."""
-    logger.info("Background Scheduler Started")
-    while True:
-        try:
-            # Add your scheduled tasks here
-            # e.g., aria.proactive_manager.check_calendar()
-            # For now, we just sleep
-            await asyncio.sleep(60)
-        except asyncio.CancelledError:
-            logger.info("Scheduler cancelled")
-            break
-        except Exception as e:
-            logger.error(f"Scheduler Error: {e}")
-            await asyncio.sleep(60)
+# Seconds between health checks of the sampled system metrics
+HEALTH_CHECK_INTERVAL = 60
 
-async def background_health_monitor():
-    """Monitors system health periodically."""
-    logger.info("Health Monitor Started")
-    while True:
-        try:
-            monitor = get_system_monitor()
-            aria = get_aria_core()
-            if monitor and aria:
-                alerts = monitor.check_health()
-                for alert in alerts:
-                    logger.warning(f"Health Alert: {alert}")
-                    aria.tts_manager.speak(alert)
-            
-            await asyncio.sleep(60) # Check every 1 minute
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            logger.error(f"Health Monitor Error: {e}")
-            await asyncio.sleep(60)
+def check_system_health():
+    """Scheduler job: speaks any health alerts from the latest system sample."""
+    monitor = get_system_monitor()
+    aria = get_aria_core()
+    if monitor and aria:
+        alerts = monitor.check_health()
+        for alert in alerts:
+            logger.warning(f"Health Alert: {alert}")
+            aria.tts_manager.speak(alert)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     init_dependencies()
     
-    # Start background tasks
-    scheduler_task = asyncio.create_task(background_scheduler())
-    health_task = asyncio.create_task(background_health_monitor())
+    # Periodic work runs as jobs on AriaCore's scheduler instead of polling tasks
+    aria = get_aria_core()
+    if aria:
+        aria.scheduler.every(HEALTH_CHECK_INTERVAL, check_system_health, name="system:health", owner="system")
     
     yield
     
     # Shutdown
-    scheduler_task.cancel()
-    health_task.cancel()
-    
     # Clean up Aria resources
     aria = get_aria_core()
     if aria:
+        aria.scheduler.stop()
         if aria.wake_word_listener:
             aria.wake_word_listener.stop()
         if aria.tts_manager:
             aria.tts_manager.stop()
 
+    shutdown_blocking_executor()
+
 app = FastAPI(lifespan=lifespan)
 
 # CORS
@@ -1,9 +1,19 @@
+import asyncio
 import datetime
+import threading
+
+# Notifications raised within this window are written to the conversation in one update
+NOTIFICATION_BATCH_DELAY = 0.5
 
 class NotificationManager:
-    def __init__(self, conversation_manager=None):
+    def __init__(self, conversation_manager=None, batch_delay: float = NOTIFICATION_BATCH_DELAY):
         self.conversation_manager = conversation_manager
         self.notifications = []
+        self.batch_delay = batch_delay
+        self._pending = [] # (conversation_id, text) awaiting the next batched insert
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._flush_future = None
 
     def add_notification(self, title, message, type="info"):
         """
@@ -25,15 +35,38 @@ class NotificationManager:
             # For now, let's make it look like a bot message but with a distinct prefix
             formatted_msg = f"🔔 **{title}**\n{message}"
             
-            # Add to history directly
+            # Batched with other notifications raised in the same burst
             # FIX: ConversationManager.add_message requires conversation_id
             current_id = self.conversation_manager.get_current_conversation_id()
             if current_id:
-                self.conversation_manager.add_message(current_id, "assistant", formatted_msg)
-                print("Notification injected into conversation.")
+                self._queue_injection(current_id, formatted_msg)
+                print("Notification queued for conversation.")
             else:
                 print("Notification NOT injected: No active conversation.")
 
+    def _queue_injection(self, conversation_id, text):
+        """Buffers the message; the first one in a burst schedules the batched write."""
+        with self._pending_lock:
+            self._pending.append((conversation_id, text))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            # Non-blocking: runs on the conversation store's event loop
+            self._flush_future = self.conversation_manager.submit(self._flush())
+
+    async def _flush(self):
+        await asyncio.sleep(self.batch_delay)
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            self._flush_scheduled = False
+
+        grouped = {}
+        for conversation_id, text in batch:
+            grouped.setdefault(conversation_id, []).append(("assistant", text))
+        for conversation_id, messages in grouped.items():
+            await self.conversation_manager.store.add_messages(conversation_id, messages)
+        print(f"Notifications injected into conversation: {len(batch)}")
+
     def get_notifications(self):
         return self.notifications
 
@@ -1,15 +1,17 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
+import asyncio
 import sys
 import os
+import uuid
 
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from backend.dependencies import get_aria_core, get_conversation_mgr, get_memory_mgr
+from backend.dependencies import get_aria_core, get_conversation_store, get_memory_mgr, run_blocking
 from aria.aria_core import AriaCore
-from aria.conversation_manager import ConversationManager
+from aria.conversation_store import AsyncConversationStore, HISTORY_WINDOW
 from aria.memory_manager import MemoryManager
 
 router = APIRouter()
@@ -18,6 +20,8 @@ router = APIRouter()
 class MessageRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
+    # Client-generated id of this turn; a retried request with the same id isn't stored in memory twice
+    message_id: Optional[str] = None
     model: Optional[str] = "gpt-4o-mini"
     extra_data: Optional[Dict[str, Any]] = None
 
@@ -30,66 +34,101 @@ class MessageResponse(BaseModel):
     ui_action: Optional[Dict[str, Any]] = None
     used_model: Optional[str] = None
 
+class RenameRequest(BaseModel):
+    title: str
+
+
+async def _resolve_conversation_id(store: AsyncConversationStore, conversation_id: Optional[str]) -> Optional[str]:
+    if conversation_id:
+        store.set_current_conversation_id(conversation_id)
+        return conversation_id
+    if not store.get_current_conversation_id():
+        await store.create_conversation()
+    return store.get_current_conversation_id()
+
+async def _load_history(store: AsyncConversationStore, conversation_id: Optional[str]) -> List[Dict[str, Any]]:
+    if not conversation_id:
+        return []
+    return await store.get_recent_messages(conversation_id, HISTORY_WINDOW)
+
+def _search_memory(memory_mgr: MemoryManager, message: str, conversation_id: Optional[str]) -> List[Dict[str, Any]]:
+    if memory_mgr and memory_mgr.is_available():
+        return memory_mgr.search_relevant_context(
+            query=message,
+            top_k=5,
+            exclude_conversation=conversation_id
+        )
+    return []
+
+async def _save_message(store: AsyncConversationStore, memory_mgr: MemoryManager, conversation_id: Optional[str],
+                        role: str, content: str, message_id: str = None):
+    """`message_id` identifies the turn; memory collapses a repeated write of the same turn and role."""
+    if not conversation_id:
+        return
+    writes = [store.add_message(conversation_id, role, content)]
+    if memory_mgr and memory_mgr.is_available():
+        # The memory journal fsyncs, so it stays off the event loop
+        writes.append(run_blocking(memory_mgr.add_message, conversation_id, content, role, message_id=message_id))
+    await asyncio.gather(*writes)
+
+def _classify(aria: AriaCore, message: str, conversation_history: list):
+    # Check for pending email confirmation first
+    if aria.command_processor.pending_email:
+        return {"intent": "email_confirmation", "confidence": 1.0, "parameters": {}}
+    if message.lower().strip() == "aria":
+        return {"intent": "wake_word", "confidence": 1.0, "parameters": {}}
+    return aria.command_classifier.classify_intent(message, conversation_history)
+
+def _execute(aria: AriaCore, request: MessageRequest, intent_data, conversation_history: list, long_term_context: list):
+    """Runs the command and collects its per-request side channels in the same worker thread."""
+    processor = aria.command_processor
+    response_text = processor.process_command(
+        text=request.message,
+        model_name=request.model,
+        intent_data=intent_data,
+        conversation_history=conversation_history,
+        long_term_memory=long_term_context
+    )
+
+    ui_action = processor.last_ui_action
+    if ui_action:
+        processor.last_ui_action = None # Clear it
+
+    used_model = getattr(processor, "last_used_model_name", None)
+    processor.last_used_model_name = None # Reset
+    return response_text, ui_action, used_model
 
 
 @router.post("/message", response_model=MessageResponse)
 async def process_message(
     request: MessageRequest,
     aria: AriaCore = Depends(get_aria_core),
-    conversation_mgr: ConversationManager = Depends(get_conversation_mgr),
+    conversation_store: AsyncConversationStore = Depends(get_conversation_store),
     memory_mgr: MemoryManager = Depends(get_memory_mgr)
 ):
+    # Conversation storage is async (Motor) and awaited on the loop; the blocking stages
+    # (Chroma, embeddings, LLM) run on the bounded executor. Independent stages are awaited together.
     try:
         message = request.message
-        conversation_id = request.conversation_id
         
         if not message:
             raise HTTPException(status_code=400, detail="No message provided")
         
         # 1. Manage Conversation ID
-        if conversation_id:
-            conversation_mgr.set_current_conversation_id(conversation_id)
-        else:
-            if not conversation_mgr.get_current_conversation_id():
-                if conversation_mgr.is_connected():
-                    conversation_mgr.create_conversation()
-            conversation_id = conversation_mgr.get_current_conversation_id()
+        conversation_id = await _resolve_conversation_id(conversation_store, request.conversation_id)
+        turn_id = request.message_id or uuid.uuid4().hex
         
-        # 2. Retrieve History
-        conversation_history = []
-        if conversation_mgr.is_connected() and conversation_id:
-            conversation_data = conversation_mgr.get_conversation(conversation_id)
-            if conversation_data and 'messages' in conversation_data:
-                recent_messages = conversation_data['messages'][-25:]
-                conversation_history = [
-                    {"role": msg["role"], "content": msg["content"]}
-                    for msg in recent_messages
-                ]
-        
-        # 3. Retrieve Long-term Memory (RAG)
-        long_term_context = []
-        if memory_mgr and memory_mgr.is_available():
-            long_term_context = memory_mgr.search_relevant_context(
-                query=message,
-                top_k=5,
-                exclude_conversation=conversation_id
-            )
-        
-        # 4. Save User Message
-        if conversation_mgr.is_connected() and conversation_id:
-            conversation_mgr.add_message(conversation_id, 'user', message)
-            
-        if memory_mgr and memory_mgr.is_available() and conversation_id:
-            memory_mgr.add_message(conversation_id, message, 'user')
+        # 2. Retrieve History + 3. Long-term Memory (RAG)
+        conversation_history, long_term_context = await asyncio.gather(
+            _load_history(conversation_store, conversation_id),
+            run_blocking(_search_memory, memory_mgr, message, conversation_id)
+        )
         
-        # 5. Intent Classification & Processing
-        # Check for pending email confirmation first
-        if aria.command_processor.pending_email:
-            intent_data = {"intent": "email_confirmation", "confidence": 1.0, "parameters": {}}
-        elif message.lower().strip() == "aria":
-            intent_data = {"intent": "wake_word", "confidence": 1.0, "parameters": {}}
-        else:
-            intent_data = aria.command_classifier.classify_intent(message, conversation_history)
+        # 4. Save User Message + 5. Intent Classification
+        _, intent_data = await asyncio.gather(
+            _save_message(conversation_store, memory_mgr, conversation_id, 'user', message, turn_id),
+            run_blocking(_classify, aria, message, conversation_history)
+        )
             
         if isinstance(intent_data, list):
             intent = intent_data[0].get("intent") if intent_data else "none"
@@ -98,33 +137,16 @@ async def process_message(
             
         print(f"DEBUG: Router classified as: {intent}")
         
-        # 6. Execute Command
-        response_text = aria.command_processor.process_command(
-            text=message, 
-            model_name=request.model,
-            intent_data=intent_data, 
-            conversation_history=conversation_history,
-            long_term_memory=long_term_context
+        # 6. Execute Command (+ UI action and used model)
+        response_text, ui_action, used_model = await run_blocking(
+            _execute, aria, request, intent_data, conversation_history, long_term_context
         )
         
         if not response_text:
             response_text = "I'm sorry, I couldn't process that command."
         
         # 7. Save Assistant Response
-        if conversation_mgr.is_connected() and conversation_id:
-            conversation_mgr.add_message(conversation_id, 'assistant', response_text)
-            
-        if memory_mgr and memory_mgr.is_available() and conversation_id:
-            memory_mgr.add_message(conversation_id, response_text, 'assistant')
-            
-        # 8. Get UI Action if any
-        ui_action = aria.command_processor.last_ui_action
-        if ui_action:
-            aria.command_processor.last_ui_action = None # Clear it
-            
-        # Get used model
-        used_model = getattr(aria.command_processor, "last_used_model_name", None)
-        aria.command_processor.last_used_model_name = None # Reset
+        await _save_message(conversation_store, memory_mgr, conversation_id, 'assistant', response_text, turn_id)
             
         return MessageResponse(
             response=response_text,
@@ -153,3 +175,51 @@ def get_available_models(aria: AriaCore = Depends(get_aria_core)):
             "status": "error", 
             "models": []
         }
+
+@router.get("/classifier/cache")
+def get_classifier_cache_stats(aria: AriaCore = Depends(get_aria_core)):
+    """Returns hit-rate and latency-saved counters for the intent classification cache."""
+    cache = aria.command_classifier.cache
+    if not cache:
+        return {"status": "disabled"}
+    return {"status": "success", "stats": cache.get_stats()}
+
+@router.get("/memory/ingestion")
+def get_memory_ingestion_stats(memory_mgr: MemoryManager = Depends(get_memory_mgr)):
+    """Returns queue depth and lag of the long-term memory write-behind queue."""
+    if not memory_mgr or not memory_mgr.is_available():
+        return {"status": "disabled"}
+    return {"status": "success", "stats": memory_mgr.get_ingestion_stats()}
+
+@router.get("/conversations")
+async def list_conversations(limit: int = 20, store: AsyncConversationStore = Depends(get_conversation_store)):
+    """Returns recent conversations (metadata only), newest first."""
+    if not store.is_connected():
+        return {"status": "error", "message": "Conversation history unavailable", "conversations": []}
+    return {"status": "success", "conversations": await store.list_conversations(limit)}
+
+@router.get("/conversations/stats")
+def get_conversation_store_stats(store: AsyncConversationStore = Depends(get_conversation_store)):
+    """Returns MongoDB pool and circuit-breaker state for the conversation store."""
+    return {"status": "success", "stats": store.get_stats()}
+
+@router.get("/conversation/{conversation_id}")
+async def get_conversation(conversation_id: str, store: AsyncConversationStore = Depends(get_conversation_store)):
+    conversation = await store.get_conversation(conversation_id)
+    if not conversation:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return {"status": "success", "conversation": conversation}
+
+@router.put("/conversation/{conversation_id}/rename")
+async def rename_conversation(conversation_id: str, request: RenameRequest, store: AsyncConversationStore = Depends(get_conversation_store)):
+    if not await store.rename_conversation(conversation_id, request.title):
+        return {"status": "error", "message": "Conversation not renamed"}
+    return {"status": "success"}
+
+@router.delete("/conversation/{conversation_id}")
+async def delete_conversation(conversation_id: str, store: AsyncConversationStore = Depends(get_conversation_store)):
+    if not await store.delete_conversation(conversation_id):
+        return {"status": "error", "message": "Conversation not found"}
+    if store.get_current_conversation_id() == conversation_id:
+        store.set_current_conversation_id(None)
+    return {"status": "success"}
@@ -7,8 +7,9 @@ import os
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from backend.dependencies import get_music_manager
+from backend.dependencies import get_music_manager, get_status_publisher
 from aria.music_library import MusicManager
+from aria.status_publisher import StatusPublisher
 
 router = APIRouter()
 
@@ -81,9 +82,11 @@ def control_music(request: MusicControlRequest, music_manager: MusicManager = De
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/music/status")
-def get_music_status(music_manager: MusicManager = Depends(get_music_manager)):
+def get_music_status(music_manager: MusicManager = Depends(get_music_manager), publisher: StatusPublisher = Depends(get_status_publisher)):
     try:
-        return music_manager.get_status()
+        # Last pushed snapshot (with its seq, so WebSocket deltas can continue from it)
+        snapshot = publisher.snapshot("music") if publisher else None
+        return snapshot or music_manager.get_status()
     except Exception as e:
         print(f"Music Status Error: {e}")
         return {"is_playing": False, "track": "Error", "error": str(e)}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 import sys
+import time
 import os
 
 # Add project root to sys.path
@@ -38,3 +39,17 @@ def summarize_notion_page(request: NotionSummaryRequest, aria: AriaCore = Depend
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/notion/search")
+def search_notion(q: str, limit: int = 5, aria: AriaCore = Depends(get_aria_core)):
+    """Full-text search of Notion pages from the local index (titles, properties and content)."""
+    if not aria.notion.index:
+        raise HTTPException(status_code=503, detail="Notion client not initialized.")
+    started = time.perf_counter()
+    results = aria.notion.search_content(q, limit=limit)
+    return {
+        "status": "success",
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        "index": aria.notion.index.get_stats(),
+    }
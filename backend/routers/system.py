@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
 import sys
 import os
 
 # Add project root to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from backend.dependencies import get_system_monitor, get_aria_core
+from backend.dependencies import get_system_monitor, get_aria_core, get_status_publisher
 from aria.system_monitor import SystemMonitor
+from aria.metrics_store import parse_duration
+from aria.status_publisher import StatusPublisher
 from aria.aria_core import AriaCore
 from aria.logger import setup_logger
 import traceback
@@ -16,8 +19,12 @@ logger = setup_logger(__name__)
 router = APIRouter()
 
 @router.get("/system/health")
-def get_system_health(monitor: SystemMonitor = Depends(get_system_monitor)):
+def get_system_health(monitor: SystemMonitor = Depends(get_system_monitor), publisher: StatusPublisher = Depends(get_status_publisher)):
     try:
+        # Last sampled snapshot; the same state is pushed over the WebSocket as system_status
+        snapshot = publisher.snapshot("system") if publisher else None
+        if snapshot:
+            return dict(snapshot, status="healthy")
         battery = monitor.get_battery_status()
         cpu = monitor.get_cpu_usage()
         return {
@@ -28,6 +35,39 @@ def get_system_health(monitor: SystemMonitor = Depends(get_system_monitor)):
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+@router.get("/system/stats")
+def get_system_stats(window: int = 60, monitor: SystemMonitor = Depends(get_system_monitor)):
+    """Latest sample plus avg/min/max/p95/trend of each metric over the last `window` seconds."""
+    latest = monitor.latest
+    if latest is None:
+        return {"status": "error", "message": "System sampler is not running"}
+    metrics = ("cpu", "ram", "swap", "disk_read_bps", "disk_write_bps", "net_sent_bps", "net_recv_bps", "battery")
+    return {
+        "status": "success",
+        "latest": latest,
+        "window_seconds": window,
+        "aggregates": {metric: monitor.get_window_stats(metric, window) for metric in metrics}
+    }
+
+@router.get("/system/metrics")
+def get_system_metrics(metric: str = "cpu", range: str = "1h", step: Optional[str] = None,
+                       monitor: SystemMonitor = Depends(get_system_monitor)):
+    """Historical min/avg/max series, e.g. /system/metrics?metric=cpu&range=24h&step=5m"""
+    try:
+        range_seconds = parse_duration(range)
+        step_seconds = parse_duration(step) if step else None
+        history = monitor.get_metric_history(metric, range_seconds, step_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if history is None:
+        return {"status": "error", "message": "Metrics history is not enabled"}
+    return {"status": "success", "range": range_seconds, **history}
+
+@router.get("/system/scheduler")
+def get_scheduler_jobs(aria: AriaCore = Depends(get_aria_core)):
+    """The scheduler's job table (next run, interval, runs, last error) and wakeup counters."""
+    return {"status": "success", "jobs": aria.scheduler.jobs(), "stats": aria.scheduler.stats}
+
 @router.get("/features")
 def get_features_status(aria: AriaCore = Depends(get_aria_core)):
     return {
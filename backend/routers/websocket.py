@@ -17,4 +17,11 @@ async def websocket_endpoint(websocket: WebSocket, manager: ConnectionManager =
             # await manager.broadcast({"message": f"Client said: {data}"})
             pass
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
+
+@router.get("/ws/stats")
+def get_websocket_stats(manager: ConnectionManager = Depends(get_connection_manager)):
+    """Returns per-client queue depth, drop and coalesce counters for the broadcast subsystem."""
+    return {"status": "success", "stats": manager.get_stats()}
@@ -1,32 +1,185 @@
 from fastapi import WebSocket
-from typing import List
+from collections import deque
+from typing import Dict, List, Optional
+import asyncio
+import json
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Per-client outbound queue bound; beyond it the oldest queued messages are dropped
+CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", "64"))
+# A send that takes longer than this means the client is stalled and is evicted
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5"))
+
+# High-frequency event types where only the latest state matters. A new message replaces
+# a still-queued one with the same coalesce key; the value names a `data` field that splits
+# one type into independent streams (e.g. one entry per automation step).
+COALESCE_TYPES = {
+    "music_status": None,
+    "system_status": None,
+    "shopping_status": None,
+    "desktop_progress": "step_index",
+}
+
+
+def coalesce_key(message: dict):
+    """Returns the key under which `message` may replace a queued one, or None."""
+    msg_type = message.get("type") if isinstance(message, dict) else None
+    if msg_type not in COALESCE_TYPES:
+        return None
+    field = COALESCE_TYPES[msg_type]
+    data = message.get("data")
+    return (msg_type, data.get(field) if field and isinstance(data, dict) else None)
+
+
+def merge_coalesced(old: dict, new: dict) -> dict:
+    """
+    Combines two queued messages for the same key. Plain state replaces; delta-encoded status
+    (see aria.status_publisher) is merged so the result still chains from the older `base`.
+    """
+    old_data, new_data = old.get("data"), new.get("data")
+    if not (isinstance(old_data, dict) and isinstance(new_data, dict) and "delta" in old_data and "delta" in new_data):
+        return new
+    return dict(new, data={
+        "seq": new_data.get("seq"),
+        "base": old_data.get("base"),
+        "delta": {**old_data["delta"], **new_data["delta"]},
+    })
+
+
+def serialize(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ClientQueue:
+    """Bounded outbound queue for one WebSocket, drained by its own writer task."""
+
+    def __init__(self, websocket: WebSocket, max_size: int = CLIENT_QUEUE_SIZE):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.entries = deque()  # [coalesce_key, payload, message]
+        self.index = {}         # coalesce_key -> queued entry
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0}
+
+    def put(self, payload: str, key=None, message: dict = None):
+        if key is not None and key in self.index:
+            entry = self.index[key]
+            merged = merge_coalesced(entry[2], message)
+            entry[1] = payload if merged is message else serialize(merged)
+            entry[2] = merged
+            self.stats["coalesced"] += 1
+            return
+        if len(self.entries) >= self.max_size:
+            self._drop_oldest()
+        entry = [key, payload, message]
+        self.entries.append(entry)
+        if key is not None:
+            self.index[key] = entry
+        self.wakeup.set()
+
+    def _drop_oldest(self):
+        # Prefer dropping coalescable state updates; a fresher one supersedes them anyway
+        victim = next((entry for entry in self.entries if entry[0] is not None), self.entries[0])
+        self.entries.remove(victim)
+        if victim[0] is not None:
+            self.index.pop(victim[0], None)
+        self.stats["dropped"] += 1
+
+    async def get(self) -> str:
+        while not self.entries:
+            self.wakeup.clear()
+            await self.wakeup.wait()
+        key, payload, _ = self.entries.popleft()
+        if key is not None:
+            self.index.pop(key, None)
+        return payload
+
+
 class ConnectionManager:
     """Manages active WebSocket connections and broadcasting."""
-    
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+
+    def __init__(self, max_queue_size: int = CLIENT_QUEUE_SIZE, send_timeout: float = SEND_TIMEOUT):
+        self.clients: Dict[WebSocket, ClientQueue] = {}
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.evicted = 0
+        self.broadcasts = 0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total: {len(self.active_connections)}")
+        self.loop = asyncio.get_running_loop()
+        client = ClientQueue(websocket, self.max_queue_size)
+        client.task = asyncio.create_task(self._writer(client))
+        self.clients[websocket] = client
+        logger.info(f"WebSocket connected. Total: {len(self.clients)}")
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
+        client = self.clients.pop(websocket, None)
+        if client:
+            if client.task and client.task is not asyncio.current_task():
+                client.task.cancel()
+            logger.info(f"WebSocket disconnected. Total: {len(self.clients)}")
 
-    async def broadcast(self, message: dict):
-        """Broadcasts a JSON message to all connected clients."""
-        for connection in self.active_connections:
+    async def _writer(self, client: ClientQueue):
+        try:
+            while True:
+                payload = await client.get()
+                await asyncio.wait_for(client.websocket.send_text(payload), timeout=self.send_timeout)
+                client.stats["sent"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Evicting WebSocket client after failed send: {e!r}")
+            self.evicted += 1
+            self.disconnect(client.websocket)
             try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                # Potentially remove broken connection?
-                # self.disconnect(connection) 
-                # Be careful modifying list while iterating.
+                await client.websocket.close()
+            except Exception:
+                pass
+
+    def _enqueue(self, message: dict):
+        """Serializes once and queues for every client (must run on the server loop)."""
+        if not self.clients:
+            return
+        payload = serialize(message)
+        key = coalesce_key(message)
+        for client in self.clients.values():
+            client.put(payload, key, message)
+        self.broadcasts += 1
+
+    def publish(self, message: dict):
+        """Thread-safe, non-blocking broadcast; usable from worker threads and other loops."""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._enqueue(message)
+        else:
+            self.loop.call_soon_threadsafe(self._enqueue, message)
+
+    async def broadcast(self, message: dict):
+        """Broadcasts a JSON message to all connected clients without waiting on their sockets."""
+        self.publish(message)
+
+    def get_stats(self) -> dict:
+        return {
+            "clients": len(self.clients),
+            "broadcasts": self.broadcasts,
+            "evicted": self.evicted,
+            "queues": [
+                {"depth": len(client.entries), **client.stats}
+                for client in self.clients.values()
+            ],
+        }
@@ -596,5 +596,8 @@ export function handleWebSocketMessage(message) {
             const avatar = card.closest('.message').querySelector('.avatar');
             if (avatar) avatar.classList.remove('active');
         }
+    } else if (message.type === 'music_status') {
+        // Delta-encoded playback state pushed by the backend
+        window.musicPlayer?.onStatusEvent(message.data);
     }
 }
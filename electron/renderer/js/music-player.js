@@ -11,7 +11,9 @@ class MusicPlayer {
         this.currentTime = 0;
         this.duration = 0;
         this.updateInterval = null;
-        this.statusInterval = null;
+        this.trackingStatus = false;
+        this.status = {};
+        this.statusSeq = null;
 
         this.initElements();
         this.attachEventListeners();
@@ -358,65 +360,65 @@ class MusicPlayer {
     }
 
     startProgressTracking() {
-        if (this.statusInterval) {
-            clearInterval(this.statusInterval);
-        }
+        // Status is pushed over the WebSocket (music_status); load the snapshot once to sync
+        this.trackingStatus = true;
+        this.syncStatus();
+    }
+
+    stopProgressTracking() {
+        this.trackingStatus = false;
+    }
 
-        this.statusInterval = setInterval(async () => {
-            // Always poll status even if not "playing" according to local state, 
-            // because backend might have started auto-playing next track.
-
-            try {
-                const response = await fetch('http://localhost:8000/music/status');
-                if (response.ok) {
-                    const status = await response.json();
-
-                    if (status.current_time) {
-                        this.updateProgress(status.current_time);
-                    }
-                    if (status.is_playing !== undefined) {
-                        // Only update if state actually changed to avoid console spam
-                        if (this.isPlaying !== status.is_playing) {
-                            this.updatePlayingState(status.is_playing);
-                        }
-                    }
-
-                    // Check if track changed
-                    if (status.track && (!this.currentTrack || status.track !== this.currentTrack.title)) {
-                        console.log('[Music Player] Track change detected via poll:', status.track);
-
-                        // Construct track info from status (API doesn't return artist separately in status yet?)
-                        // We might need to parse it or request /music/current
-
-                        // For now we assume status.track might be the title
-                        // Inspecting the backend `get_status` returns: 
-                        // {'is_playing': ..., 'track': title, 'duration': ...}
-                        // It does NOT return artist separately. 
-                        // But wait! `get_status` reads `current_track_info`.
-
-                        // Let's rely on the `track` string.
-                        // Ideally we should update backend to return structure. 
-                        // But for now, let's just update the title.
-
-                        const newTrack = {
-                            title: status.track,
-                            artist: status.artist || 'Unknown Artist', // Needs backend update to send artist
-                            duration: status.duration || 0
-                        };
-
-                        this.onTrackChanged(newTrack);
-                    }
-                }
-            } catch (error) {
-                console.error('Error fetching music status:', error);
+    async syncStatus() {
+        try {
+            const response = await fetch('http://localhost:8000/music/status');
+            if (response.ok) {
+                const status = await response.json();
+                this.status = status;
+                this.statusSeq = status.seq ?? null;
+                this.applyStatus(status);
             }
-        }, 1000); // Poll every 1s for better responsiveness
+        } catch (error) {
+            console.error('Error fetching music status:', error);
+        }
     }
 
-    stopProgressTracking() {
-        if (this.statusInterval) {
-            clearInterval(this.statusInterval);
-            this.statusInterval = null;
+    onStatusEvent(data) {
+        if (!this.trackingStatus) {
+            return; // startProgressTracking() resyncs from the snapshot
+        }
+        // Deltas chain by seq; on a gap (first event, dropped message) reload the snapshot
+        if (this.statusSeq === null || data.base !== this.statusSeq) {
+            this.syncStatus();
+            return;
+        }
+        this.status = { ...this.status, ...data.delta };
+        this.statusSeq = data.seq;
+        this.applyStatus(this.status);
+    }
+
+    applyStatus(status) {
+        if (status.current_time) {
+            this.updateProgress(status.current_time);
+        }
+        if (status.is_playing !== undefined) {
+            // Only update if state actually changed to avoid console spam
+            if (this.isPlaying !== status.is_playing) {
+                this.updatePlayingState(status.is_playing);
+            }
+        }
+
+        // Check if track changed
+        if (status.track && (!this.currentTrack || status.track !== this.currentTrack.title)) {
+            console.log('[Music Player] Track change detected:', status.track);
+
+            const newTrack = {
+                title: status.track,
+                artist: status.artist || 'Unknown Artist',
+                duration: status.duration || 0
+            };
+
+            this.onTrackChanged(newTrack);
         }
     }
 
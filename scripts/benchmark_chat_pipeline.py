@@ -0,0 +1,198 @@
+"""
+Load benchmark for POST /message.
+
+Fires concurrent chat requests at the real chat router with stubbed LLM, Mongo
+and Chroma backends (sleeps with realistic latencies) and reports p50/p99
+latency and throughput for:
+
+  - before: the old pipeline, every stage called inline on the event loop
+            with the blocking (pymongo) conversation manager
+  - after:  the current router, conversation storage awaited on the async
+            store and the other stages offloaded to the bounded executor
+
+Usage:
+    python scripts/benchmark_chat_pipeline.py --requests 40 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from backend.dependencies import get_aria_core, get_conversation_store, get_memory_mgr
+from backend.routers import chat
+
+# Simulated backend latencies (seconds)
+MONGO_LATENCY = 0.005
+EMBEDDING_LATENCY = 0.08
+CLASSIFY_LATENCY = 0.3
+GENERATE_LATENCY = 0.6
+
+
+class StubConversationManager:
+    def __init__(self):
+        self.current_conversation_id = "bench"
+
+    def is_connected(self):
+        return True
+
+    def create_conversation(self):
+        return self.current_conversation_id
+
+    def get_current_conversation_id(self):
+        return self.current_conversation_id
+
+    def set_current_conversation_id(self, conversation_id):
+        self.current_conversation_id = conversation_id
+
+    def get_conversation(self, conversation_id):
+        time.sleep(MONGO_LATENCY)
+        return {"messages": [{"role": "user", "content": "hi"}]}
+
+    def add_message(self, conversation_id, role, content):
+        time.sleep(MONGO_LATENCY)
+        return True
+
+
+class StubConversationStore:
+    """Async (Motor-style) conversation storage used by /message."""
+
+    def __init__(self):
+        self.current_conversation_id = "bench"
+
+    def get_current_conversation_id(self):
+        return self.current_conversation_id
+
+    def set_current_conversation_id(self, conversation_id):
+        self.current_conversation_id = conversation_id
+
+    async def create_conversation(self):
+        await asyncio.sleep(MONGO_LATENCY)
+        return self.current_conversation_id
+
+    async def get_recent_messages(self, conversation_id, limit=25):
+        await asyncio.sleep(MONGO_LATENCY)
+        return [{"role": "user", "content": "hi"}]
+
+    async def add_message(self, conversation_id, role, content):
+        await asyncio.sleep(MONGO_LATENCY)
+        return True
+
+
+class StubMemoryManager:
+    def is_available(self):
+        return True
+
+    def search_relevant_context(self, query, top_k=None, exclude_conversation=None):
+        time.sleep(EMBEDDING_LATENCY)
+        return []
+
+    def add_message(self, conversation_id, message, role, timestamp=None, message_id=None):
+        time.sleep(EMBEDDING_LATENCY)
+        return True
+
+
+class StubClassifier:
+    def classify_intent(self, user_text, conversation_history=None):
+        time.sleep(CLASSIFY_LATENCY)
+        return [{"intent": "general_chat", "confidence": 0.9, "parameters": {}}]
+
+
+class StubCommandProcessor:
+    pending_email = None
+    last_ui_action = None
+    last_used_model_name = None
+
+    def process_command(self, text, model_name="openai", intent_data=None, extra_data=None,
+                        conversation_history=None, long_term_memory=None):
+        time.sleep(GENERATE_LATENCY)
+        return f"Echo: {text}"
+
+
+class StubAria:
+    def __init__(self):
+        self.command_classifier = StubClassifier()
+        self.command_processor = StubCommandProcessor()
+
+
+def build_app() -> FastAPI:
+    aria = StubAria()
+    conversation_mgr = StubConversationManager()
+    conversation_store = StubConversationStore()
+    memory_mgr = StubMemoryManager()
+
+    app = FastAPI()
+    app.include_router(chat.router)
+
+    @app.post("/message_legacy")
+    async def legacy_process_message(request: chat.MessageRequest):
+        """The pre-executor pipeline: every blocking stage runs on the event loop."""
+        conversation_id = request.conversation_id or conversation_mgr.get_current_conversation_id()
+        history = conversation_mgr.get_conversation(conversation_id)["messages"][-25:]
+        context = memory_mgr.search_relevant_context(request.message, top_k=5, exclude_conversation=conversation_id)
+        conversation_mgr.add_message(conversation_id, 'user', request.message)
+        memory_mgr.add_message(conversation_id, request.message, 'user')
+        intent_data = aria.command_classifier.classify_intent(request.message, history)
+        response_text = aria.command_processor.process_command(
+            text=request.message, model_name=request.model, intent_data=intent_data,
+            conversation_history=history, long_term_memory=context
+        )
+        conversation_mgr.add_message(conversation_id, 'assistant', response_text)
+        memory_mgr.add_message(conversation_id, response_text, 'assistant')
+        return {"response": response_text, "conversation_id": conversation_id}
+
+    app.dependency_overrides[get_aria_core] = lambda: aria
+    app.dependency_overrides[get_conversation_store] = lambda: conversation_store
+    app.dependency_overrides[get_memory_mgr] = lambda: memory_mgr
+    return app
+
+
+async def run_load(app: FastAPI, path: str, total: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120) as client:
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(path, json={"message": f"hello {i}", "conversation_id": "bench"})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(round(0.99 * (len(latencies) - 1))))],
+        "throughput": total / wall,
+        "wall": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent POST /message requests")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    app = build_app()
+    print(f"Requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"{'pipeline':<10}{'p50 (s)':>10}{'p99 (s)':>10}{'req/s':>10}{'wall (s)':>10}")
+    for label, path in (("before", "/message_legacy"), ("after", "/message")):
+        stats = asyncio.run(run_load(app, path, args.requests, args.concurrency))
+        print(f"{label:<10}{stats['p50']:>10.3f}{stats['p99']:>10.3f}{stats['throughput']:>10.2f}{stats['wall']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
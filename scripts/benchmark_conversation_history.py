@@ -0,0 +1,124 @@
+"""
+Benchmark for conversation history access in ConversationManager.
+
+Seeds one conversation with `--messages` messages plus `--conversations` small
+ones, then compares the previous access patterns with the current ones:
+
+  - history:  full find_one + timestamp conversion + [-25:]  vs  $slice window
+  - add:      $push + full find_one (title check)            vs  $push/$inc in one update
+  - list:     listing + one find_one per conversation (N+1)  vs  stored message_count
+
+The current path goes through ConversationManager (the blocking adapter over
+AsyncConversationStore), so its numbers include the hop to the store's event
+loop. Runs against mongomock/mongomock_motor by default, or a real server with
+--uri (uses a throwaway database that is dropped afterwards).
+
+Usage:
+    python scripts/benchmark_conversation_history.py --messages 10000
+    python scripts/benchmark_conversation_history.py --uri mongodb://localhost:27017/
+"""
+
+import argparse
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.conversation_manager import ConversationManager, HISTORY_WINDOW
+from aria.conversation_store import AsyncConversationStore
+
+
+def legacy_history(db, conversation_id):
+    conversation = db.conversations.find_one({"_id": conversation_id})
+    for msg in conversation.get("messages", []):
+        msg["timestamp"] = msg["timestamp"].isoformat()
+    return [{"role": m["role"], "content": m["content"]} for m in conversation["messages"][-HISTORY_WINDOW:]]
+
+
+def legacy_add_message(db, conversation_id, role, content):
+    db.conversations.update_one(
+        {"_id": conversation_id},
+        {"$push": {"messages": {"role": role, "content": content, "timestamp": datetime.utcnow()}},
+         "$set": {"updated_at": datetime.utcnow()}}
+    )
+    conversation = db.conversations.find_one({"_id": conversation_id})
+    if conversation and len(conversation.get("messages", [])) == 1 and role == "user":
+        db.conversations.update_one({"_id": conversation_id}, {"$set": {"title": content[:50]}})
+
+
+def legacy_list(db, limit):
+    conversations = list(
+        db.conversations.find({}, {"_id": 1, "title": 1, "created_at": 1, "updated_at": 1, "messages": {"$slice": 1}})
+        .sort("updated_at", -1).limit(limit)
+    )
+    for conv in conversations:
+        full_conv = db.conversations.find_one({"_id": conv["_id"]}, {"messages": 1})
+        conv["message_count"] = len(full_conv.get("messages", []))
+    return conversations
+
+
+def timed(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark conversation history access")
+    parser.add_argument("--uri", default=None, help="MongoDB URI (default: mongomock)")
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    db_name = "aria_conversations_benchmark"
+    if args.uri:
+        from pymongo import MongoClient
+        from motor.motor_asyncio import AsyncIOMotorClient
+        sync_client = MongoClient(args.uri)
+        async_client = AsyncIOMotorClient(args.uri)
+    else:
+        import mongomock
+        from mongomock_motor import AsyncMongoMockClient
+        sync_client = mongomock.MongoClient()
+        async_client = AsyncMongoMockClient(mock_mongo_client=sync_client)
+    db = sync_client[db_name]
+    db.conversations.drop()
+    manager = ConversationManager(store=AsyncConversationStore(db_name=db_name, client=async_client))
+
+    big_id = manager.create_conversation()
+    now = datetime.utcnow()
+    messages = [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"message number {i} " * 8, "timestamp": now}
+        for i in range(args.messages)
+    ]
+    db.conversations.update_one({"_id": big_id}, {"$set": {"messages": messages, "message_count": len(messages)}})
+    for _ in range(args.conversations - 1):
+        conversation_id = manager.create_conversation()
+        for i in range(10):
+            manager.add_message(conversation_id, "user" if i % 2 == 0 else "assistant", f"hi {i}")
+
+    print(f"{'mongod' if args.uri else 'mongomock'}: 1 x {args.messages}-message conversation, "
+          f"{args.conversations} conversations, {args.rounds} rounds")
+    rows = [
+        ("history (last 25)", lambda: legacy_history(db, big_id), lambda: manager.get_recent_messages(big_id)),
+        ("add_message", lambda: legacy_add_message(db, big_id, "user", "one more"),
+         lambda: manager.add_message(big_id, "user", "one more")),
+        ("list_conversations", lambda: legacy_list(db, args.conversations),
+         lambda: manager.list_conversations(args.conversations)),
+    ]
+    for label, legacy, current in rows:
+        legacy_ms = timed(legacy, args.rounds)
+        current_ms = timed(current, args.rounds)
+        print(f"{label:>20}: legacy {legacy_ms:9.2f} ms | current {current_ms:9.2f} ms | {legacy_ms / current_ms:6.1f}x")
+
+    if args.uri:
+        sync_client.drop_database(db_name)
+
+
+if __name__ == "__main__":
+    main()
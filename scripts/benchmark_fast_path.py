@@ -0,0 +1,120 @@
+"""
+Micro-benchmark for the classifier fast paths.
+
+Replays every user utterance in fine_tuning_dataset.jsonl through:
+
+  - legacy:  the old sequence (dict lookup, then one re.search/re.match per
+             pattern and a substring scan for shopping keywords)
+  - matcher: the precompiled FastPathMatcher used by CommandIntentClassifier
+
+and prints the per-utterance cost in microseconds. It also checks that both
+paths resolve every utterance to the same intent and parameters.
+
+Usage:
+    python scripts/benchmark_fast_path.py --rounds 200
+"""
+
+import argparse
+import json
+import re
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.command_intent_classifier import CommandIntentClassifier
+from aria.fast_path_matcher import FastPathMatcher, normalize_command
+
+DATASET_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fine_tuning_dataset.jsonl")
+
+
+def load_utterances(path: str) -> list:
+    utterances = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            for message in json.loads(line).get("messages", []):
+                if message.get("role") == "user":
+                    utterances.append(message["content"])
+    return utterances
+
+
+def legacy_fast_path(user_text: str):
+    """The pre-matcher checks, in their original order."""
+    clean_text = user_text.lower().strip().replace("please", "").strip()
+    clean_text = re.sub(r'[^\w\s]', '', clean_text)
+
+    if clean_text in CommandIntentClassifier.FAST_PATH_INTENTS:
+        return CommandIntentClassifier.FAST_PATH_INTENTS[clean_text], {}
+
+    vol_match = re.search(r'(?:set|change|turn|vset) (?:the )?volume (?:to )?(\d+)', clean_text)
+    if vol_match:
+        return "volume_set", {"level": int(vol_match.group(1))}
+    if re.match(r'^volume \d+$', clean_text):
+        return "volume_set", {"level": int(re.findall(r'\d+', clean_text)[0])}
+    bright_match = re.search(r'(?:set|change|turn) (?:the )?brightness (?:to )?(\d+)', clean_text)
+    if bright_match:
+        return "brightness_set", {"level": int(bright_match.group(1))}
+    if re.search(r'(?:check|get|find|show|what are|any)?\s*(?:upcoming|latest|recent|new)\s+(?:updates|news|trends|developments)\s*(?:in|on|about)?', clean_text):
+        return "web_search", {"query": user_text}
+    email_patterns = [
+        r'(?:send|write|compose|draft)\s+(?:an?\s+)?(?:email|mail)\s+to',
+        r'(?:email|mail)\s+to\s+\S+',
+        r'(?:send|write)\s+(?:a\s+)?(?:quick\s+)?(?:email|mail)\s+to'
+    ]
+    for pattern in email_patterns:
+        if re.search(pattern, clean_text, re.IGNORECASE):
+            return "email_send", {}
+    if any(x in clean_text for x in ["buy ", "purchase ", "price of ", "shop for ", "how much is ", "cost of ", "deal on "]):
+        return "shopping_task", {}
+    if re.match(r'^(type|click)\b', clean_text, re.IGNORECASE):
+        return "desktop_task", {"action": clean_text}
+    return None
+
+
+def matcher_fast_path(matcher: FastPathMatcher, user_text: str):
+    result = matcher.match(normalize_command(user_text), user_text)
+    if result:
+        return result[1], result[3]
+    return None
+
+
+def time_per_utterance(func, utterances: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in utterances:
+            func(text)
+    return (time.perf_counter() - start) / (rounds * len(utterances)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark classifier fast paths")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    utterances = load_utterances(DATASET_PATH)
+    matcher = FastPathMatcher(CommandIntentClassifier.FAST_PATH_INTENTS, CommandIntentClassifier.REGEX_FAST_PATHS)
+
+    mismatches = [
+        text for text in utterances
+        if legacy_fast_path(text) != matcher_fast_path(matcher, text)
+    ]
+    hits = sum(1 for text in utterances if matcher_fast_path(matcher, text))
+
+    legacy_us = time_per_utterance(legacy_fast_path, utterances, args.rounds)
+    matcher_us = time_per_utterance(lambda text: matcher_fast_path(matcher, text), utterances, args.rounds)
+
+    print(f"Utterances: {len(utterances)} (fast-path hits: {hits}), rounds: {args.rounds}")
+    print(f"legacy : {legacy_us:8.2f} us/utterance")
+    print(f"matcher: {matcher_us:8.2f} us/utterance  ({legacy_us / matcher_us:.2f}x)")
+    print(f"mismatches: {len(mismatches)}")
+    for text in mismatches[:10]:
+        print(f"  {text!r}: legacy={legacy_fast_path(text)} matcher={matcher_fast_path(matcher, text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark for filename search.
+
+Generates a synthetic directory tree of `--files` files, with names drawn from
+a Zipf-weighted vocabulary of real and made-up words. It plants `--targets`
+known files and queries for each one with reordered words and typos. It
+reports:
+
+  - crawl / index build time, incremental refresh time and index file size
+  - query latency (p50 / p95 / max) of the trigram index
+  - hit@1 / hit@5 for the misspelled queries
+  - the previous substring os.walk search on a few of the same queries
+
+With --in-memory the tree is only simulated (no files are written), which is
+much faster for the 500k-file case; crawl and legacy numbers are skipped.
+
+Usage:
+    python scripts/benchmark_file_search.py --files 500000 --in-memory
+    python scripts/benchmark_file_search.py --files 50000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.file_index import FileIndex
+from aria.file_manager import FileManager
+from aria.file_search import FilenameIndex
+
+COMMON_WORDS = [
+    "report", "final", "draft", "notes", "invoice", "receipt", "resume", "budget", "meeting", "photo",
+    "screenshot", "scan", "project", "summary", "presentation", "lecture", "assignment", "contract",
+    "statement", "bank", "tax", "travel", "ticket", "booking", "design", "mockup", "backup", "export",
+    "data", "analysis", "plan", "proposal", "letter", "application", "form", "certificate", "syllabus",
+    "homework", "chapter", "slides", "minutes", "agenda", "schedule", "portfolio", "profile", "family",
+    "wedding", "birthday", "holiday", "trip", "video", "song", "recording", "podcast", "book", "paper",
+]
+EXTENSIONS = [".pdf", ".docx", ".txt", ".jpg", ".png", ".xlsx", ".pptx", ".mp4", ".zip", ".md"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "ten", "vu", "sha", "pre", "dor", "qui", "zen", "bel", "tor", "nim", "gra", "fel"]
+
+
+def make_vocabulary(rng, size):
+    words = list(COMMON_WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return words
+
+
+def make_name(rng, words, weights):
+    parts = rng.choices(words, weights=weights, k=rng.randint(1, 4))
+    style = rng.random()
+    if style < 0.4:
+        stem = "_".join(parts)
+    elif style < 0.7:
+        stem = "".join(p.capitalize() for p in parts)
+    else:
+        stem = " ".join(parts)
+    if rng.random() < 0.3:
+        stem += f"_{rng.randint(2015, 2025)}"
+    return stem + rng.choice(EXTENSIONS)
+
+
+def misspell(rng, word):
+    if len(word) < 5:
+        return word
+    i = rng.randint(1, len(word) - 2)
+    if rng.random() < 0.5:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]   # Transposition
+    return word[:i] + word[i + 1:]                               # Dropped letter
+
+
+def generate_tree(rng, files, targets, folder_size=200):
+    """Returns {relative folder: [file names]} plus [(target name, query)]."""
+    words = make_vocabulary(rng, 5000)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    folders = {}
+    folder_count = max(1, files // folder_size)
+    for i in range(folder_count):
+        depth = rng.randint(0, 3)
+        parts = [f"{rng.choice(words)}_{i}"] + [rng.choice(words) for _ in range(depth)]
+        folders[os.path.join(*parts)] = []
+    folder_names = list(folders)
+    for _ in range(files - targets):
+        folders[rng.choice(folder_names)].append(make_name(rng, words, weights))
+
+    planted = []
+    rare = words[len(COMMON_WORDS):]
+    for i in range(targets):
+        parts = [rng.choice(COMMON_WORDS), rng.choice(rare), rng.choice(rare)]
+        name = "_".join(p.capitalize() for p in parts) + f"_{i}.pdf"
+        folders[rng.choice(folder_names)].append(name)
+        query_words = [misspell(rng, p) for p in parts]
+        rng.shuffle(query_words)
+        planted.append((name, " ".join(query_words)))
+    return folders, planted
+
+
+def simulated_dirs(root, folders):
+    """FileIndex.dirs equivalent of `folders` without touching the disk."""
+    now = time.time()
+    dirs = {root: {"mtime": now, "files": [], "subdirs": []}}
+    for relative, names in folders.items():
+        path = root
+        for part in Path(relative).parts:
+            child = os.path.join(path, part)
+            if child not in dirs:
+                dirs[child] = {"mtime": now, "files": [], "subdirs": []}
+                dirs[path]["subdirs"].append(part)
+            path = child
+        dirs[path]["files"].extend([name, 1024, now - i * 3600] for i, name in enumerate(names))
+    return dirs
+
+
+def write_tree(root, folders):
+    for relative, names in folders.items():
+        directory = os.path.join(root, relative)
+        os.makedirs(directory, exist_ok=True)
+        for name in names:
+            open(os.path.join(directory, name), "wb").close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_queries(search, planted, rounds):
+    latencies, hit1, hit5 = [], 0, 0
+    for _ in range(rounds):
+        for name, query in planted:
+            started = time.perf_counter()
+            hits = search(query)
+            latencies.append((time.perf_counter() - started) * 1000)
+            names = [hit["name"] for hit in hits[:5]]
+            hit1 += bool(names) and names[0] == name
+            hit5 += name in names
+    total = rounds * len(planted)
+    return latencies, hit1 / total, hit5 / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark filename search")
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--targets", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--legacy-queries", type=int, default=3, help="Queries to time with the old os.walk search")
+    parser.add_argument("--in-memory", action="store_true", help="Simulate the tree instead of writing it")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    folders, planted = generate_tree(rng, args.files, args.targets)
+    workdir = tempfile.mkdtemp(prefix="aria_file_search_")
+    root = os.path.join(workdir, "Documents")
+    try:
+        if args.in_memory:
+            dirs = simulated_dirs(root, folders)
+            started = time.perf_counter()
+            search_index = FilenameIndex(dirs, [root])
+            print(f"Index build:          {time.perf_counter() - started:.2f} s ({len(search_index)} files, "
+                  f"{len(search_index.vocabulary)} words, {len(search_index.gram_postings)} trigrams)")
+            search = lambda query: search_index.search(query, limit=10)
+        else:
+            started = time.perf_counter()
+            write_tree(root, folders)
+            print(f"Generated tree:       {time.perf_counter() - started:.2f} s ({args.files} files)")
+
+            index = FileIndex([root], storage_path=os.path.join(workdir, "file_index.json"), refresh_interval=3600)
+            started = time.perf_counter()
+            index.refresh()
+            print(f"Initial crawl:        {time.perf_counter() - started:.2f} s ({len(index.dirs)} folders)")
+            started = time.perf_counter()
+            index.refresh()
+            print(f"Incremental refresh:  {(time.perf_counter() - started) * 1000:.1f} ms (no changes)")
+            print(f"Index file:           {os.path.getsize(index.storage_path) / 1e6:.1f} MB")
+            search = lambda query: index.search(query, limit=10)
+
+        latencies, hit1, hit5 = run_queries(search, planted, args.rounds)
+        print(f"\nTrigram search ({len(latencies)} misspelled, reordered queries)")
+        print(f"  latency p50 {statistics.median(latencies):.2f} ms  p95 {percentile(latencies, 0.95):.2f} ms  "
+              f"max {max(latencies):.2f} ms")
+        print(f"  hit@1 {hit1:.0%}  hit@5 {hit5:.0%}")
+
+        if not args.in_memory and args.legacy_queries:
+            manager = FileManager()
+            legacy, found = [], 0
+            for name, query in planted[:args.legacy_queries]:
+                started = time.perf_counter()
+                matches = manager._walk_search(query.lower(), Path(root), True)
+                legacy.append((time.perf_counter() - started) * 1000)
+                found += any(match.name == name for match in matches)
+            print(f"\nPrevious substring os.walk search ({len(legacy)} queries)")
+            print(f"  latency avg {statistics.mean(legacy):.0f} ms  found {found}/{len(legacy)}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark for organizing a large Downloads folder.
+
+Creates two identical synthetic folders of `--files` files with mixed
+extensions. A share of the names (`--collisions`) already exist in the
+category folders. One folder is organized with the previous one-file-at-a-time
+loop: is_dir, a linear extension scan, an exists() loop for duplicate names,
+then shutil.move. The other uses FolderOrganizer. It reports plan (dry run),
+execute and undo times.
+
+Usage:
+    python scripts/benchmark_folder_organizer.py --files 50000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.file_automation import FileAutomator
+from aria.folder_organizer import FolderOrganizer
+
+
+def legacy_organize_folder(extensions, folder_path):
+    """The previous FileAutomator.organize_folder loop."""
+    folder = Path(folder_path)
+    moved_count = 0
+    for category in extensions.keys():
+        (folder / category).mkdir(exist_ok=True)
+    (folder / "Others").mkdir(exist_ok=True)
+
+    for file_path in folder.iterdir():
+        if file_path.is_dir() or file_path.name.startswith('.'):
+            continue
+        file_ext = file_path.suffix.lower()
+        destination_category = "Others"
+        for category, exts in extensions.items():
+            if file_ext in exts:
+                destination_category = category
+                break
+        destination = folder / destination_category / file_path.name
+        if destination.exists():
+            base, ext = destination.stem, destination.suffix
+            counter = 1
+            while destination.exists():
+                destination = folder / destination_category / f"{base}_{counter}{ext}"
+                counter += 1
+        shutil.move(str(file_path), str(destination))
+        moved_count += 1
+    return moved_count
+
+
+def make_folder(path, files, collisions, extensions, seed):
+    rng = random.Random(seed)
+    all_exts = [ext for exts in extensions.values() for ext in exts] + [".bin", ".dat"]
+    categories = {ext: category for category, exts in extensions.items() for ext in exts}
+    os.makedirs(path)
+    for i in range(files):
+        ext = rng.choice(all_exts)
+        name = f"download_{i}{ext}"
+        open(os.path.join(path, name), "wb").close()
+        if rng.random() < collisions:
+            # Same name already organized earlier, plus a few numbered copies
+            target = os.path.join(path, categories.get(ext, "Others"))
+            os.makedirs(target, exist_ok=True)
+            open(os.path.join(target, name), "wb").close()
+            for copy in range(1, rng.randint(1, 5)):
+                open(os.path.join(target, f"download_{i}_{copy}{ext}"), "wb").close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark folder organizing")
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--collisions", type=float, default=0.05, help="Share of names already taken")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    extensions = FileAutomator().extensions
+    workdir = tempfile.mkdtemp(prefix="aria_organizer_")
+    try:
+        legacy_dir = os.path.join(workdir, "legacy", "Downloads")
+        new_dir = os.path.join(workdir, "new", "Downloads")
+        started = time.perf_counter()
+        make_folder(legacy_dir, args.files, args.collisions, extensions, seed=1)
+        make_folder(new_dir, args.files, args.collisions, extensions, seed=1)
+        print(f"Generated 2 x {args.files} files in {time.perf_counter() - started:.1f} s\n")
+
+        started = time.perf_counter()
+        moved = legacy_organize_folder(extensions, legacy_dir)
+        legacy_time = time.perf_counter() - started
+        print(f"Previous loop:        {legacy_time:.2f} s ({moved} files)")
+
+        organizer = FolderOrganizer(extensions, journal_path=os.path.join(workdir, "journal.jsonl"),
+                                    max_workers=args.workers)
+        started = time.perf_counter()
+        moves = organizer.plan_by_type(new_dir)
+        plan_time = time.perf_counter() - started
+        started = time.perf_counter()
+        result = organizer.execute(new_dir, moves)
+        execute_time = time.perf_counter() - started
+        print(f"Plan (dry run):       {plan_time:.2f} s ({len(moves)} moves)")
+        print(f"Execute:              {execute_time:.2f} s ({result['moved']} moved, {len(result['failed'])} failed)")
+        print(f"Plan + execute:       {plan_time + execute_time:.2f} s ({legacy_time / (plan_time + execute_time):.1f}x)")
+
+        legacy_names = sorted(os.path.relpath(os.path.join(r, f), legacy_dir) for r, _, fs in os.walk(legacy_dir) for f in fs)
+        new_names = sorted(os.path.relpath(os.path.join(r, f), new_dir) for r, _, fs in os.walk(new_dir) for f in fs)
+        print(f"Same resulting layout: {legacy_names == new_names}")
+
+        started = time.perf_counter()
+        undone = organizer.undo()
+        print(f"Undo:                 {time.perf_counter() - started:.2f} s ({undone['restored']} restored)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
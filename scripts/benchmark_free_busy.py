@@ -0,0 +1,152 @@
+"""
+Benchmark for free/busy availability queries.
+
+Generates `--calendars` synthetic calendars, each with recurring series
+(daily stand-ups, weekly meetings, biweekly 1:1s) expanded into single
+instances over `--days` days, plus one-off events. That is the shape
+events().list(singleEvents=True) returns. The events are loaded into
+CalendarCache and these queries are timed:
+
+  - interval index build
+  - FreeBusy multi-day queries ("2 hours this week", "30 min in the next
+    month", with a buffer and a weekday working-hours mask)
+  - the previous approach: one events().list per day (counted as API
+    calls, filtered here from a flat list) and a gap walk per day
+
+Usage:
+    python scripts/benchmark_free_busy.py --calendars 3 --days 90
+"""
+
+import argparse
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria import config
+from aria.calendar_cache import CalendarCache, event_bounds
+from aria.free_busy import FreeBusy
+
+TZ = config.TIMEZONE
+
+
+def make_event(event_id, start, minutes, summary):
+    end = start + datetime.timedelta(minutes=minutes)
+    return {"id": event_id, "summary": summary,
+            "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+
+
+def generate_calendar(rng, name, first_day, days, series, one_offs):
+    """{event id: event} with `series` recurring series expanded into instances."""
+    events = {}
+    for s in range(series):
+        kind = rng.choice(["daily", "weekly", "biweekly"])
+        step = {"daily": 1, "weekly": 7, "biweekly": 14}[kind]
+        hour, minute = rng.randint(7, 19), rng.choice([0, 15, 30, 45])
+        length = rng.choice([15, 30, 45, 60, 90])
+        offset = rng.randint(0, step - 1)
+        for day in range(offset, days, step):
+            date = first_day + datetime.timedelta(days=day)
+            if kind != "daily" or date.weekday() < 5:
+                start = datetime.datetime(date.year, date.month, date.day, hour, minute, tzinfo=TZ)
+                event_id = f"{name}-s{s}_{start.strftime('%Y%m%dT%H%M')}"
+                events[event_id] = make_event(event_id, start, length, f"{kind} {s}")
+    for i in range(one_offs):
+        date = first_day + datetime.timedelta(days=rng.randrange(days))
+        start = datetime.datetime(date.year, date.month, date.day, rng.randint(6, 21), rng.choice([0, 30]), tzinfo=TZ)
+        event_id = f"{name}-o{i}"
+        events[event_id] = make_event(event_id, start, rng.choice([30, 60, 120]), f"one-off {i}")
+    return events
+
+
+def legacy_free_slots(all_events, day, hours, min_minutes):
+    """The previous get_free_slots: one listing for the day, sorted by start, then a gap walk."""
+    start_dt = datetime.datetime(day.year, day.month, day.day, hours[0], tzinfo=TZ)
+    end_dt = datetime.datetime(day.year, day.month, day.day, hours[1], tzinfo=TZ)
+    start_ts, end_ts = start_dt.timestamp(), end_dt.timestamp()
+    # Stands in for events().list(timeMin, timeMax, orderBy='startTime'): a network call per day
+    events = sorted((bounds for bounds in all_events if bounds[0] < end_ts and bounds[1] > start_ts))
+    free, pointer = [], start_ts
+    for event_start, event_end in events:
+        if event_start > pointer and (event_start - pointer) / 60 >= min_minutes:
+            free.append((pointer, event_start))
+        pointer = max(pointer, event_end)
+    if end_ts - pointer >= min_minutes * 60:
+        free.append((pointer, end_ts))
+    return free
+
+
+def timed(fn, rounds):
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return result, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark free/busy queries")
+    parser.add_argument("--calendars", type=int, default=3)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--series", type=int, default=25, help="Recurring series per calendar")
+    parser.add_argument("--one-offs", type=int, default=300, help="One-off events per calendar")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    today = datetime.datetime.now(TZ).date()
+    first_day = today - datetime.timedelta(days=args.days // 3)
+    calendar_ids = [f"calendar{i}" for i in range(args.calendars)]
+    calendars = {
+        cid: {"sync_token": None, "full_sync": time.time(),
+              "events": generate_calendar(rng, cid, first_day, args.days, args.series, args.one_offs)}
+        for cid in calendar_ids
+    }
+    total = sum(len(state["events"]) for state in calendars.values())
+
+    with tempfile.TemporaryDirectory(prefix="aria_free_busy_") as workdir:
+        cache = CalendarCache(lambda: None, storage_path=os.path.join(workdir, "cache.json"), calendar_ids=calendar_ids)
+        started = time.perf_counter()
+        cache._install(calendars)
+        print(f"Index build:          {(time.perf_counter() - started) * 1000:.1f} ms ({total} events, "
+              f"{args.calendars} calendars)")
+        free_busy = FreeBusy(cache)
+
+        start = datetime.datetime(today.year, today.month, today.day, tzinfo=TZ)
+        queries = [
+            ("2 hours this week", 7, dict(min_minutes=120)),
+            ("30 min, next 30 days, 10 min buffer", 30, dict(min_minutes=30, buffer_minutes=10)),
+            ("1 hour, weekdays 9-17, next 30 days", 30, dict(min_minutes=60, hours=(9, 17), workdays=range(5))),
+        ]
+        all_bounds = [event_bounds(event)[:2] for state in calendars.values() for event in state["events"].values()]
+        print()
+        for label, days, options in queries:
+            end = start + datetime.timedelta(days=days)
+            slots, latencies = timed(lambda: free_busy.free_slots(start, end, **options), args.rounds)
+
+            hours = options.get("hours", (9, 21))
+            workdays = options.get("workdays")
+            day_list = [today + datetime.timedelta(days=d) for d in range(days)]
+            day_list = [day for day in day_list if workdays is None or day.weekday() in workdays]
+            legacy, legacy_latencies = timed(
+                lambda: [slot for day in day_list for slot in legacy_free_slots(all_bounds, day, hours, options["min_minutes"])],
+                max(1, args.rounds // 4),
+            )
+            print(f"{label}")
+            print(f"  FreeBusy:      p50 {statistics.median(latencies):.2f} ms  max {max(latencies):.2f} ms  "
+                  f"({len(slots)} slots, 0 API calls)")
+            # The previous code had no buffers, so its slot count only matches the unbuffered queries
+            print(f"  Per-day walk:  p50 {statistics.median(legacy_latencies):.2f} ms  "
+                  f"({len(legacy)} slots without buffer, {len(day_list)} API calls)")
+
+
+if __name__ == "__main__":
+    main()
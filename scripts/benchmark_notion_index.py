@@ -0,0 +1,165 @@
+"""
+Benchmark for the local Notion search index.
+
+Generates a synthetic workspace of `--pages` pages with `--blocks` paragraphs
+each. The words are drawn from a Zipf-like vocabulary, so common words
+behave like real prose. The workspace is served by a fake client that
+counts API requests. Measured:
+
+  - first (full) sync: requests and wall time (no network latency)
+  - a no-op incremental sync and one after `--edits` pages changed
+  - query latency for title and content searches, against `--remote-ms`
+    per call for Notion's remote search (which only matches titles)
+  - with `--dims` > 0, pages are embedded with a stand-in embedding of that
+    size, and semantic (BM25 + cosine) searches are timed too
+
+Usage:
+    python scripts/benchmark_notion_index.py --pages 2000 --blocks 20
+    python scripts/benchmark_notion_index.py --pages 2000 --dims 1536
+"""
+
+import argparse
+import datetime
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.notion_index import NotionIndex
+from aria.notion_loader import NotionPageLoader, RateLimiter
+
+
+class CountingWorkspace:
+    def __init__(self):
+        self.objects = {}
+        self.block_text = {}
+        self.requests = 0
+        self.blocks = self
+        self.children = self
+        self.pages = self
+
+    def search(self, page_size=100, start_cursor=None, sort=None, **kwargs):
+        self.requests += 1
+        ordered = sorted(self.objects.values(), key=lambda obj: obj["last_edited_time"], reverse=True)
+        offset = int(start_cursor or 0)
+        more = offset + page_size < len(ordered)
+        return {"results": ordered[offset:offset + page_size], "has_more": more,
+                "next_cursor": str(offset + page_size) if more else None}
+
+    def list(self, block_id, page_size=100, start_cursor=None):
+        self.requests += 1
+        results = [{"id": f"{block_id}-{i}", "type": "paragraph", "has_children": False,
+                    "paragraph": {"rich_text": [{"plain_text": text}]}} for i, text in enumerate(self.block_text[block_id])]
+        return {"results": results, "has_more": False, "next_cursor": None}
+
+
+def stamp(minutes_ago):
+    moment = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=minutes_ago)
+    return moment.strftime("%Y-%m-%dT%H:%M:00.000Z")
+
+
+def make_page(rng, vocabulary, weights, page_id, minutes_ago, blocks):
+    title = " ".join(rng.choices(vocabulary[:2000], k=rng.randint(2, 4))).title()
+    page = {"object": "page", "id": page_id, "last_edited_time": stamp(minutes_ago), "url": None,
+            "properties": {"Name": {"type": "title", "title": [{"plain_text": title}]}}}
+    text = [" ".join(rng.choices(vocabulary, cum_weights=weights, k=rng.randint(8, 40))) for _ in range(blocks)]
+    return page, text
+
+
+def stand_in_embedding(dims):
+    """A fixed random vector per text: no meaning, but the size and cost of a real embedding."""
+    def embed(text):
+        return np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(dims).tolist()
+    return embed
+
+
+def timed(fn, rounds):
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local Notion index")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--blocks", type=int, default=20, help="Paragraphs per page")
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--remote-ms", type=float, default=400.0, help="Typical latency of Notion's search API")
+    parser.add_argument("--dims", type=int, default=0, help="Embedding size for semantic search (0 = off)")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"w{i}" for i in range(args.vocabulary)]
+    weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(args.vocabulary)))
+    workspace = CountingWorkspace()
+    for i in range(args.pages):
+        page, text = make_page(rng, vocabulary, weights, f"page{i}", rng.randint(60, 60 * 24 * 365), args.blocks)
+        workspace.objects[page["id"]] = page
+        workspace.block_text[page["id"]] = text
+
+    with tempfile.TemporaryDirectory(prefix="aria_notion_index_") as workdir:
+        loader = NotionPageLoader(workspace, cache_path=os.path.join(workdir, "blocks.json"), rate_limiter=RateLimiter(0))
+        embed_fn = stand_in_embedding(args.dims) if args.dims else None
+        index = NotionIndex(workspace, loader=loader, storage_path=os.path.join(workdir, "index.json"),
+                            embed_fn=embed_fn)
+
+        started = time.perf_counter()
+        index.sync()
+        stats = index.get_stats()
+        print(f"Full sync:         {time.perf_counter() - started:6.2f} s  {workspace.requests} requests, "
+              f"{stats['pages']} pages, {stats['terms']} terms")
+
+        workspace.requests = 0
+        started = time.perf_counter()
+        index.sync()
+        print(f"No-op sync:        {(time.perf_counter() - started) * 1000:6.1f} ms  {workspace.requests} request")
+
+        for i in rng.sample(range(args.pages), args.edits):
+            page, text = make_page(rng, vocabulary, weights, f"page{i}", 2, args.blocks)
+            workspace.objects[page["id"]] = page
+            workspace.block_text[page["id"]] = text
+        workspace.requests = 0
+        started = time.perf_counter()
+        index.sync()
+        print(f"Sync, {args.edits} edits:    {(time.perf_counter() - started) * 1000:6.1f} ms  {workspace.requests} requests")
+
+        started = time.perf_counter()
+        NotionIndex(workspace, loader=loader, storage_path=index.storage_path, embed_fn=embed_fn).load()
+        print(f"Load from disk:    {(time.perf_counter() - started) * 1000:6.1f} ms")
+
+        titles = [doc["title"] for doc in index.docs.values()]
+        queries = [
+            ("title lookup", lambda: index.search(rng.choice(titles), titles_only=True)),
+            ("content, 2 words", lambda: index.search(" ".join(rng.choices(vocabulary[100:5000], k=2)))),
+            ("content, common+rare", lambda: index.search(f"{rng.choice(vocabulary[:20])} {rng.choice(vocabulary[5000:])}")),
+        ]
+        if args.dims:
+            queries += [
+                ("semantic, 2 words", lambda: index.search(" ".join(rng.choices(vocabulary[100:5000], k=2)), semantic=True)),
+                ("no lexical match", lambda: index.search(f"zz{rng.randint(0, 10 ** 6)}")),
+            ]
+        print()
+        for label, query in queries:
+            latencies = timed(query, args.rounds)
+            print(f"{label:22} p50 {statistics.median(latencies):6.2f} ms  "
+                  f"p95 {sorted(latencies)[int(len(latencies) * 0.95)]:6.2f} ms")
+        print(f"{'remote search':22} ~{args.remote_ms:.0f} ms per query (titles only, rate limited)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark for loading Notion page content.
+
+Builds a synthetic page: `--blocks` top-level blocks, of which every
+`--nest-every`-th is a toggle holding `--nested` blocks. It is served by a
+fake client that sleeps `--latency` seconds per request and pages results
+100 at a time, like the API. Compared:
+
+  - the previous fetch: one blocks.children.list call (first 100 top-level
+    blocks only, nothing nested)
+  - a sequential recursive walk (one request at a time)
+  - NotionPageLoader (parallel subtrees under the rate limit), including
+    time to first streamed text
+  - NotionPageLoader on an unchanged page (cache hit)
+
+Usage:
+    python scripts/benchmark_notion_loader.py --blocks 300 --latency 0.3 --rate 3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.notion_loader import NotionPageLoader, RateLimiter, tree_text
+
+
+class SlowNotion:
+    def __init__(self, tree, latency):
+        self.tree = tree
+        self.latency = latency
+        self.requests = 0
+        self.pages = self
+        self.blocks = self
+        self.children = self
+        self.list = self._list_children
+
+    def retrieve(self, page_id):
+        self.requests += 1
+        time.sleep(self.latency)
+        return {"id": page_id, "last_edited_time": "2026-01-01T00:00:00.000Z", "properties": {}}
+
+    def _list_children(self, block_id, page_size=100, start_cursor=None):
+        self.requests += 1
+        time.sleep(self.latency)
+        offset = int(start_cursor or 0)
+        items = self.tree.get(block_id, [])
+        more = offset + page_size < len(items)
+        return {"results": [dict(block) for block in items[offset:offset + page_size]], "has_more": more,
+                "next_cursor": str(offset + page_size) if more else None}
+
+
+def build_page(blocks, nest_every, nested):
+    tree = {"page": []}
+    for i in range(blocks):
+        toggle = nest_every and i % nest_every == 0
+        block_type = "toggle" if toggle else "paragraph"
+        tree["page"].append({"id": f"b{i}", "type": block_type, "has_children": bool(toggle),
+                             block_type: {"rich_text": [{"plain_text": f"Block {i} text"}]}})
+        if toggle:
+            tree[f"b{i}"] = [{"id": f"b{i}n{j}", "type": "paragraph", "has_children": False,
+                              "paragraph": {"rich_text": [{"plain_text": f"Nested {i}.{j}"}]}}
+                             for j in range(nested)]
+    return tree
+
+
+def sequential_walk(client, block_id, limiter):
+    """Recursive fetch, one request at a time."""
+    parts, cursor = [], None
+    while True:
+        limiter.acquire()
+        response = client.blocks.children.list(block_id=block_id, page_size=100, start_cursor=cursor)
+        for block in response["results"]:
+            parts.append(block[block["type"]]["rich_text"][0]["plain_text"])
+            if block.get("has_children"):
+                parts.extend(sequential_walk(client, block["id"], limiter))
+        cursor = response.get("next_cursor")
+        if not response.get("has_more"):
+            return parts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Notion page loading")
+    parser.add_argument("--blocks", type=int, default=300)
+    parser.add_argument("--nest-every", type=int, default=10, help="Every Nth block is a toggle with children")
+    parser.add_argument("--nested", type=int, default=5, help="Blocks inside each toggle")
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per API request")
+    parser.add_argument("--rate", type=float, default=3.0, help="Requests per second allowed")
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    tree = build_page(args.blocks, args.nest_every, args.nested)
+    total = sum(len(children) for children in tree.values())
+    print(f"Page: {total} blocks, {len(tree) - 1} nested containers, "
+          f"{args.latency * 1000:.0f} ms/request, {args.rate:g} req/s limit\n")
+
+    client = SlowNotion(tree, args.latency)
+    started = time.perf_counter()
+    response = client.blocks.children.list(block_id="page")
+    print(f"Single call (previous):  {time.perf_counter() - started:6.2f} s  "
+          f"{len(response['results'])} of {total} blocks, 1 request")
+
+    client = SlowNotion(tree, args.latency)
+    started = time.perf_counter()
+    parts = sequential_walk(client, "page", RateLimiter(args.rate))
+    print(f"Sequential recursion:    {time.perf_counter() - started:6.2f} s  "
+          f"{len(parts)} blocks, {client.requests} requests")
+
+    with tempfile.TemporaryDirectory(prefix="aria_notion_") as workdir:
+        client = SlowNotion(tree, args.latency)
+        loader = NotionPageLoader(client, cache_path=os.path.join(workdir, "cache.json"),
+                                  max_workers=args.workers, rate_limiter=RateLimiter(args.rate))
+        first = []
+        started = time.perf_counter()
+        blocks, _ = loader.load("page", on_text=lambda text: first or first.append(time.perf_counter() - started))
+        elapsed = time.perf_counter() - started
+        print(f"NotionPageLoader:        {elapsed:6.2f} s  {len(tree_text(blocks))} blocks, "
+              f"{client.requests} requests, first text after {first[0]:.2f} s")
+
+        client.requests = 0
+        started = time.perf_counter()
+        _, cached = loader.load("page")
+        print(f"Unchanged page (cache):  {time.perf_counter() - started:6.2f} s  "
+              f"cache hit={cached}, {client.requests} request")
+
+
+if __name__ == "__main__":
+    main()
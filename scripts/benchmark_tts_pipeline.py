@@ -0,0 +1,89 @@
+"""
+Benchmark for the TTS synthesis/playback pipeline.
+
+Uses a stub synthesizer (sleeps `--synth-ms` plus `--synth-ms-per-char` per
+character) and a stub player (sleeps `--play-ms-per-char` per character) so it
+runs without network or audio hardware. Compares one-at-a-time speech
+(prefetch=0, the old behavior) with the pipelined worker and reports:
+
+  - time-to-first-audio: speak() of the first sentence -> its playback start
+  - inter-sentence gap:  end of sentence N -> start of sentence N+1
+
+Usage:
+    python scripts/benchmark_tts_pipeline.py --prefetch 2
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import threading
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.tts_manager import TTSManager
+
+SENTENCES = [
+    "Sure, here is a quick summary of your day.",
+    "You have three meetings, the first one starts at ten.",
+    "The weather looks clear with a high of twenty four degrees.",
+    "Don't forget to drink some water.",
+    "Your package from yesterday is out for delivery.",
+    "Let me know if you want me to reschedule anything.",
+]
+
+
+class StubTTSManager(TTSManager):
+    def __init__(self, args, prefetch):
+        self.args = args
+        self.playback = []
+        self.done = threading.Event()
+        super().__init__(prefetch=prefetch)
+
+    async def _synthesize(self, text):
+        await asyncio.sleep((self.args.synth_ms + self.args.synth_ms_per_char * len(text)) / 1000)
+        return text
+
+    def _play_audio(self, audio, generation):
+        start = time.perf_counter()
+        time.sleep(self.args.play_ms_per_char * len(audio) / 1000)
+        self.playback.append((start, time.perf_counter()))
+        if len(self.playback) == len(SENTENCES):
+            self.done.set()
+
+
+def run(args, prefetch):
+    manager = StubTTSManager(args, prefetch)
+    started = time.perf_counter()
+    for sentence in SENTENCES:
+        manager.speak(sentence, print_text=False)
+    manager.done.wait(timeout=120)
+    total = time.perf_counter() - started
+
+    first_audio = manager.playback[0][0] - started
+    gaps = [manager.playback[i + 1][0] - manager.playback[i][1] for i in range(len(manager.playback) - 1)]
+    return first_audio, gaps, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipelined TTS")
+    parser.add_argument("--prefetch", type=int, default=2)
+    parser.add_argument("--synth-ms", type=float, default=300.0, help="Fixed synthesis latency per sentence")
+    parser.add_argument("--synth-ms-per-char", type=float, default=4.0)
+    parser.add_argument("--play-ms-per-char", type=float, default=20.0)
+    args = parser.parse_args()
+
+    print(f"{len(SENTENCES)} sentences, synth {args.synth_ms:.0f}ms + {args.synth_ms_per_char}ms/char, "
+          f"playback {args.play_ms_per_char}ms/char")
+    for label, prefetch in (("sequential", 0), (f"prefetch={args.prefetch}", args.prefetch)):
+        first_audio, gaps, total = run(args, prefetch)
+        print(f"{label:>12}: first audio {first_audio * 1000:7.1f} ms | "
+              f"gap mean {statistics.mean(gaps) * 1000:7.1f} ms, max {max(gaps) * 1000:7.1f} ms | "
+              f"total {total:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
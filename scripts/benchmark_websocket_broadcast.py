@@ -0,0 +1,131 @@
+"""
+Benchmark for WebSocket broadcast fan-out.
+
+Connects `--clients` fake WebSockets, of which `--slow` take `--slow-ms` per
+send and `--dead` raise on every send, then broadcasts `--messages` status
+updates. Compares the previous sequential `await send_json` loop with the
+per-client queue ConnectionManager and reports:
+
+  - broadcast call latency: how long the producer is held up per broadcast
+  - delivery latency:       broadcast -> received, for the healthy clients
+
+Usage:
+    python scripts/benchmark_websocket_broadcast.py --clients 50 --slow 5 --dead 2
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.received_at = []
+
+    async def accept(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def send_text(self, payload):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionResetError("renderer went away")
+        self.received_at.append(time.perf_counter())
+
+    async def send_json(self, message):
+        await self.send_text(json.dumps(message, separators=(",", ":"), ensure_ascii=False))
+
+
+class LegacyConnectionManager:
+    """The previous broadcast: one send at a time, dead sockets never removed."""
+
+    def __init__(self):
+        self.active_connections = []
+
+    async def connect(self, websocket):
+        await websocket.accept()
+        self.active_connections.append(websocket)
+
+    async def broadcast(self, message):
+        for connection in self.active_connections:
+            try:
+                await connection.send_json(message)
+            except Exception:
+                pass
+
+
+def make_clients(args):
+    healthy = [FakeWebSocket() for _ in range(args.clients - args.slow - args.dead)]
+    slow = [FakeWebSocket(delay=args.slow_ms / 1000) for _ in range(args.slow)]
+    dead = [FakeWebSocket(fail=True) for _ in range(args.dead)]
+    # Slow and dead clients connect first, so the sequential loop hits them before the healthy ones
+    return healthy, slow + dead + healthy
+
+
+async def run(manager, args):
+    healthy, clients = make_clients(args)
+    for websocket in clients:
+        await manager.connect(websocket)
+
+    call_latencies, sent_at = [], []
+    for i in range(args.messages):
+        message = {"type": "music_status", "data": {"position": i, "title": "Song", "playing": True}}
+        started = time.perf_counter()
+        await manager.broadcast(message)
+        call_latencies.append(time.perf_counter() - started)
+        sent_at.append(started)
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    # Let queued writers drain
+    deadline = time.perf_counter() + 5
+    while time.perf_counter() < deadline and any(len(ws.received_at) < args.messages for ws in healthy):
+        await asyncio.sleep(0.01)
+
+    delivery = [
+        ws.received_at[i] - sent_at[i]
+        for ws in healthy for i in range(min(len(ws.received_at), len(sent_at)))
+    ]
+    for websocket in list(getattr(manager, "clients", {})):
+        manager.disconnect(websocket)
+    return call_latencies, delivery
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket broadcast fan-out")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--slow", type=int, default=5)
+    parser.add_argument("--slow-ms", type=float, default=50.0)
+    parser.add_argument("--dead", type=int, default=2)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=20.0, help="Gap between broadcasts")
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients ({args.slow} slow at {args.slow_ms:.0f} ms/send, {args.dead} dead), "
+          f"{args.messages} broadcasts every {args.interval_ms:.0f} ms")
+    for label, manager in (("sequential", LegacyConnectionManager()), ("queued", ConnectionManager())):
+        calls, delivery = asyncio.run(run(manager, args))
+        print(f"{label:>12}: broadcast call mean {statistics.mean(calls) * 1000:8.2f} ms | "
+              f"delivery p50 {percentile(delivery, 0.5):8.2f} ms, p99 {percentile(delivery, 0.99):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import unittest
+import array
+import math
+import sys
+import os
+import threading
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.audio_stream import AudioStream, PCMSegmenter, last_frame_boundary, mp3_frame_length
+
+try:
+    import lameenc
+except ImportError:
+    lameenc = None
+
+# MPEG-2 Layer III, 48 kbps, 24 kHz, mono (what edge-tts sends): 144-byte frames
+FRAME_HEADER = bytes([0xFF, 0xF3, 0x64, 0xC4])
+FRAME = FRAME_HEADER + bytes(140)
+
+
+class TestFrameParsing(unittest.TestCase):
+    def test_frame_length(self):
+        self.assertEqual(mp3_frame_length(FRAME_HEADER), 144)
+        # MPEG-1, 128 kbps, 44.1 kHz, padded
+        self.assertEqual(mp3_frame_length(bytes([0xFF, 0xFB, 0x92, 0x00])), 418)
+        self.assertEqual(mp3_frame_length(b"ID3\x04"), 0)
+
+    def test_boundary_stops_before_partial_frame(self):
+        data = FRAME * 3 + FRAME[:50]
+        self.assertEqual(last_frame_boundary(data), 144 * 3)
+        self.assertEqual(last_frame_boundary(data, 144), 144 * 3)
+        self.assertEqual(last_frame_boundary(FRAME[:50]), 0)
+
+    def test_boundary_skips_leading_tag(self):
+        data = b"ID3" + bytes(7) + FRAME * 2
+        self.assertEqual(last_frame_boundary(data), 10 + 144 * 2)
+
+
+class TestAudioStream(unittest.TestCase):
+    def test_segments_are_frame_aligned_until_finished(self):
+        stream = AudioStream()
+        stream.write(FRAME * 2 + FRAME[:10])
+        segment, offset, done = stream.next_segment(0, min_bytes=100)
+        self.assertEqual((len(segment), offset, done), (288, 288, False))
+
+        # Not enough new audio yet
+        segment, offset, done = stream.next_segment(offset, min_bytes=100, timeout=0.01)
+        self.assertEqual((segment, offset, done), (b"", 288, False))
+
+        stream.write(FRAME[10:])
+        stream.close()
+        segment, offset, done = stream.next_segment(offset, min_bytes=100)
+        self.assertEqual((len(segment), done), (144, True))
+
+    def test_reader_wakes_when_writer_delivers(self):
+        stream = AudioStream()
+
+        def writer():
+            for _ in range(5):
+                time.sleep(0.02)
+                stream.write(FRAME)
+            stream.close()
+
+        threading.Thread(target=writer).start()
+        self.assertTrue(stream.wait_first_chunk(timeout=2))
+        received, offset, done = 0, 0, False
+        while not done:
+            segment, offset, done = stream.next_segment(offset, min_bytes=144, timeout=1)
+            received += len(segment)
+        self.assertEqual(received, 144 * 5)
+
+    def test_abort_ends_stream(self):
+        stream = AudioStream()
+        stream.write(FRAME)
+        stream.abort()
+        self.assertEqual(stream.next_segment(0, min_bytes=1), (b"", 0, True))
+
+
+def reservoir_decode(data):
+    """Toy decoder: each frame's samples depend on the frame before it, like the MP3 bit reservoir."""
+    pcm = bytearray()
+    previous = 0
+    for start in range(0, len(data), 144):
+        value = data[start + 4]
+        pcm.extend(bytes([(previous + value) % 256]) * 8)
+        previous = value
+    return bytes(pcm)
+
+
+def frames(*values):
+    return b"".join(FRAME_HEADER + bytes([value]) * 140 for value in values)
+
+
+class TestPCMSegmenter(unittest.TestCase):
+    def test_pieces_join_into_the_full_decode(self):
+        data = frames(10, 20, 30, 40, 50, 60)
+        segmenter = PCMSegmenter(reservoir_decode, frame_bytes=2)
+        pieces = [segmenter.feed(data[:end]) for end in (144 * 2, 144 * 3, 144 * 5)]
+        pieces.append(segmenter.feed(data, final=True))
+        self.assertEqual(b"".join(pieces), reservoir_decode(data))
+        # Decoding the segments separately loses the carried-over state at each join
+        separate = reservoir_decode(data[:288]) + reservoir_decode(data[288:])
+        self.assertNotEqual(separate, reservoir_decode(data))
+
+    def test_tail_is_held_back_until_final(self):
+        data = frames(1, 2, 3)
+        segmenter = PCMSegmenter(reservoir_decode, frame_bytes=2, holdback=5)
+        # 24 bytes decoded, 5 held back, cut on a sample frame
+        self.assertEqual(len(segmenter.feed(data)), 18)
+        self.assertEqual(segmenter.feed(data), b"")
+        self.assertEqual(len(segmenter.feed(data, final=True)), 6)
+
+    @unittest.skipUnless(lameenc, "lameenc is needed to encode a test MP3")
+    def test_real_mp3_joins_without_a_click(self):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        from aria.tts_manager import _decode_mp3, STREAM_PCM_HOLDBACK_SECONDS
+        try:
+            # 24 kHz mono speech resampled to the mixer rate, as in playback
+            pygame.mixer.init(frequency=44100, size=-16, channels=2)
+        except pygame.error as e:
+            self.skipTest(f"No audio mixer: {e}")
+        self.addCleanup(pygame.mixer.quit)
+
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(48)
+        encoder.set_in_sample_rate(24000)
+        encoder.set_channels(1)
+        tone = array.array("h", (int(8000 * math.sin(2 * math.pi * 440 * i / 24000)) for i in range(24000)))
+        mp3 = encoder.encode(tone.tobytes()) + encoder.flush()
+
+        segmenter = PCMSegmenter(_decode_mp3, frame_bytes=4, holdback=int(44100 * STREAM_PCM_HOLDBACK_SECONDS) * 4)
+        pieces, offset = [], 0
+        while offset < len(mp3):
+            offset = last_frame_boundary(mp3[:offset + 1000], offset) if offset + 1000 < len(mp3) else len(mp3)
+            pieces.append(segmenter.feed(mp3[:offset], final=offset == len(mp3)))
+        self.assertGreater(len([piece for piece in pieces if piece]), 3)
+
+        joined = array.array("h", b"".join(pieces))
+        full = array.array("h", _decode_mp3(mp3))
+        self.assertEqual(joined, full)
+        # No step at a join is larger than the tone's own sample-to-sample steps
+        largest_step = max(abs(full[i] - full[i - 2]) for i in range(2, len(full)))
+        position = 0
+        for piece in pieces[:-1]:
+            position += len(piece) // 2
+            if 2 <= position < len(joined):
+                self.assertLessEqual(abs(joined[position] - joined[position - 2]), largest_step)
+
+    @unittest.skipUnless(lameenc, "lameenc is needed to encode a test MP3")
+    def test_long_stream_is_decoded_in_bounded_runs(self):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        from aria.tts_manager import _decode_mp3, STREAM_PCM_HOLDBACK_SECONDS
+
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(48)
+        encoder.set_in_sample_rate(24000)
+        encoder.set_channels(1)
+        # A rising tone, so no two stretches of it look alike
+        tone = array.array("h", (int(8000 * math.sin(2 * math.pi * (300 * i / 24000 + 100 * (i / 24000) ** 2)))
+                                 for i in range(24000 * 4)))
+        mp3 = encoder.encode(tone.tobytes()) + encoder.flush()
+
+        for frequency in (24000, 44100):
+            with self.subTest(frequency=frequency):
+                try:
+                    pygame.mixer.init(frequency=frequency, size=-16, channels=2)
+                except pygame.error as e:
+                    self.skipTest(f"No audio mixer: {e}")
+                try:
+                    decoded = []
+
+                    def decode(data):
+                        decoded.append(len(data))
+                        return _decode_mp3(data)
+
+                    segmenter = PCMSegmenter(decode, frame_bytes=4, max_decode_bytes=6000, rate=frequency,
+                                             holdback=int(frequency * STREAM_PCM_HOLDBACK_SECONDS) * 4)
+                    pieces, offset = [], 0
+                    while offset < len(mp3):
+                        offset = last_frame_boundary(mp3[:offset + 1000], offset) if offset + 1000 < len(mp3) else len(mp3)
+                        pieces.append(segmenter.feed(mp3[:offset], final=offset == len(mp3)))
+                    full = array.array("h", _decode_mp3(mp3))
+                finally:
+                    pygame.mixer.quit()
+
+                self.assertGreater(segmenter.stats["runs"], 3)
+                self.assertLessEqual(max(decoded), 6000 + 1000)
+                joined = array.array("h", b"".join(pieces))
+                if frequency == 24000:
+                    # Without resampling, a new run decodes the same samples as the old one
+                    self.assertEqual(len(joined), len(full))
+                    self.assertLessEqual(max(abs(a - b) for a, b in zip(joined, full)), 2)
+                else:
+                    self.assertLess(abs(len(joined) - len(full)), frequency // 100 * 2)
+                largest_step = max(abs(full[i] - full[i - 2]) for i in range(2, len(full)))
+                position = 0
+                for piece in pieces[:-1]:
+                    position += len(piece) // 2
+                    if 2 <= position < len(joined):
+                        self.assertLessEqual(abs(joined[position] - joined[position - 2]), largest_step)
+
+
+if __name__ == '__main__':
+    unittest.main()
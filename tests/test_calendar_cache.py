@@ -0,0 +1,200 @@
+import unittest
+import sys
+import os
+import datetime
+import tempfile
+from unittest.mock import patch
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.interval_index import IntervalIndex
+from aria.calendar_cache import CalendarCache, event_bounds
+from aria.calendar_manager import CalendarManager
+
+UTC = datetime.timezone.utc
+
+
+def make_event(event_id, start, minutes=60, summary=None):
+    end = start + datetime.timedelta(minutes=minutes)
+    return {
+        "id": event_id,
+        "summary": summary or event_id,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": end.isoformat()},
+    }
+
+
+class GoneError(Exception):
+    """Stands in for googleapiclient's HttpError 410."""
+
+    class resp:
+        status = 410
+
+
+class _Request:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+class FakeEvents:
+    """Minimal events() resource with sync token semantics and two-item pages."""
+
+    def __init__(self):
+        self.events = {}
+        self.changes = []  # Event dicts changed since the last token
+        self.calls = []
+        self.token_counter = 0
+        self.expired = set()
+
+    def change(self, event):
+        self.changes.append(event)
+        if event.get("status") == "cancelled":
+            self.events.pop(event["id"], None)
+        else:
+            self.events[event["id"]] = event
+
+    def list(self, **params):
+        self.calls.append(params)
+
+        def run():
+            token = params.get("syncToken")
+            if token in self.expired:
+                raise GoneError("Sync token is no longer valid")
+            items = list(self.changes) if token else sorted(self.events.values(), key=lambda e: e["start"]["dateTime"])
+            offset = int(params.get("pageToken", 0))
+            page = items[offset:offset + 2]
+            if offset + 2 < len(items):
+                return {"items": page, "nextPageToken": str(offset + 2)}
+            self.changes = []
+            self.token_counter += 1
+            return {"items": page, "nextSyncToken": f"token-{self.token_counter}"}
+        return _Request(run)
+
+    def insert(self, calendarId, body):
+        def run():
+            event = dict(body, id=f"new-{len(self.events)}")
+            self.change(event)
+            return event
+        return _Request(run)
+
+
+class FakeService:
+    def __init__(self):
+        self.resource = FakeEvents()
+
+    def events(self):
+        return self.resource
+
+
+class TestIntervalIndex(unittest.TestCase):
+    def test_overlapping_and_containing(self):
+        index = IntervalIndex([(0, 10, "a"), (5, 6, "b"), (12, 20, "c"), (15, 15, "point"), (30, 40, "d")])
+        self.assertEqual(index.overlapping(5, 13), ["a", "b", "c"])
+        self.assertEqual(index.overlapping(10, 12), [])
+        self.assertEqual(index.overlapping(14, 16), ["c", "point"])
+        self.assertEqual(index.overlapping(35), ["d"])
+        self.assertEqual(index.containing(5), ["a", "b"])
+        self.assertEqual(index.containing(40), [])
+
+    def test_matches_linear_scan(self):
+        import random
+        rng = random.Random(3)
+        intervals = []
+        for i in range(500):
+            start = rng.uniform(0, 1000)
+            intervals.append((start, start + rng.expovariate(0.05), i))
+        index = IntervalIndex(intervals)
+        for _ in range(200):
+            lo = rng.uniform(0, 1000)
+            hi = lo + rng.uniform(0, 50)
+            expected = [v for s, e, v in sorted(intervals) if s < hi and e > lo]
+            self.assertEqual(index.overlapping(lo, hi), expected)
+
+
+class TestCalendarCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = os.path.join(self.tmp.name, "calendar_cache.json")
+        self.service = FakeService()
+        self.now = datetime.datetime.now(UTC).replace(microsecond=0)
+        for i in range(5):
+            self.service.resource.change(make_event(f"e{i}", self.now + datetime.timedelta(hours=i)))
+        self.service.resource.changes = []
+        self.cache = CalendarCache(lambda: self.service, storage_path=self.storage, sync_interval=3600)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ids(self, events):
+        return [event["id"] for event in events]
+
+    def test_full_then_incremental_sync(self):
+        self.assertTrue(self.cache.sync())
+        calls = self.service.resource.calls
+        self.assertEqual(len(calls), 3)  # Three pages of two
+        self.assertIn("timeMin", calls[0])
+        self.assertEqual(self.ids(self.cache.upcoming(10, now=self.now.timestamp())), ["e0", "e1", "e2", "e3", "e4"])
+
+        self.service.resource.change({"id": "e1", "status": "cancelled"})
+        self.service.resource.change(make_event("e2", self.now + datetime.timedelta(hours=8), summary="Moved"))
+        self.assertTrue(self.cache.sync())
+        self.assertEqual(calls[-1]["syncToken"], "token-1")
+        self.assertNotIn("timeMin", calls[-1])
+        self.assertEqual(self.ids(self.cache.upcoming(10, now=self.now.timestamp())), ["e0", "e3", "e4", "e2"])
+
+    def test_reads_are_served_locally(self):
+        self.assertTrue(self.cache.ensure_fresh())  # Cold start syncs once
+        requests = self.cache.stats["requests"]
+        for _ in range(20):
+            self.cache.ensure_fresh()
+            events = self.cache.events_between(self.now + datetime.timedelta(minutes=90), self.now + datetime.timedelta(hours=3))
+        self.assertEqual(self.ids(events), ["e1", "e2"])
+        self.assertEqual(self.cache.stats["requests"], requests)
+
+    def test_expired_token_triggers_full_sync(self):
+        self.cache.sync()
+        self.service.resource.expired.add("token-1")
+        self.service.resource.events.pop("e4")
+        self.assertTrue(self.cache.sync())
+        self.assertEqual(self.cache.stats["full_syncs"], 2)
+        self.assertEqual(len(self.cache.index), 4)
+
+    def test_cache_persists_across_restarts(self):
+        self.cache.sync()
+        reloaded = CalendarCache(lambda: None, storage_path=self.storage)
+        self.assertTrue(reloaded.ready.is_set())
+        self.assertTrue(reloaded.ensure_fresh())
+        self.assertEqual(len(reloaded.upcoming(10, now=self.now.timestamp())), 5)
+
+    def test_unavailable_service(self):
+        cache = CalendarCache(lambda: None, storage_path=os.path.join(self.tmp.name, "other.json"))
+        self.assertFalse(cache.ensure_fresh())
+
+    def test_all_day_event_bounds(self):
+        start, end, all_day = event_bounds({"start": {"date": "2024-05-01"}, "end": {"date": "2024-05-02"}})
+        self.assertTrue(all_day)
+        self.assertEqual(end - start, 86400)
+
+    def test_manager_reads_from_cache_and_sees_new_events(self):
+        with patch.object(CalendarManager, "authenticate"):
+            manager = CalendarManager()
+        manager.service = self.service
+        manager.cache = self.cache
+        self.assertEqual(self.ids(manager.get_upcoming_events_raw(max_results=2)), ["e0", "e1"])  # e0 is in progress
+
+        start = (self.now + datetime.timedelta(days=2)).astimezone(UTC)
+        result = manager.create_event("Dentist", start.isoformat())
+        self.assertIn("Dentist", result)
+        self.assertTrue(self.cache.stale)
+        self.assertIn("Dentist", [event["summary"] for event in self.cache.upcoming(10)])
+
+        manager.service = None
+        self.assertIn("Dentist", manager.get_upcoming_events(max_results=10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.connectivity_monitor import ConnectivityMonitor, is_network_error
+
+
+class APIConnectionError(Exception):
+    """Stands in for openai.APIConnectionError."""
+
+
+class TestConnectivityMonitor(unittest.TestCase):
+    def setUp(self):
+        self.probe_results = [True]
+        self.monitor = ConnectivityMonitor(
+            probe=lambda: self.probe_results[-1],
+            min_backoff=1.0,
+            max_backoff=8.0,
+            autostart=False
+        )
+
+    def test_check_now_updates_cached_state(self):
+        self.probe_results.append(False)
+        self.assertFalse(self.monitor.check_now())
+        self.assertFalse(self.monitor.is_online)
+        self.assertEqual(self.monitor.consecutive_failures, 1)
+
+        self.probe_results.append(True)
+        self.assertTrue(self.monitor.check_now())
+        self.assertEqual(self.monitor.consecutive_failures, 0)
+
+    def test_report_network_failure_flips_offline(self):
+        self.assertTrue(self.monitor.is_online)
+        handled = self.monitor.report_failure(APIConnectionError("connection refused"))
+        self.assertTrue(handled)
+        self.assertFalse(self.monitor.is_online)
+
+    def test_report_non_network_failure_is_ignored(self):
+        handled = self.monitor.report_failure(ValueError("bad json"))
+        self.assertFalse(handled)
+        self.assertTrue(self.monitor.is_online)
+
+    def test_backoff_doubles_while_offline(self):
+        self.probe_results.append(False)
+        self.monitor.check_now()
+        delays = [self.monitor._next_delay() for _ in range(5)]
+        self.assertEqual(delays, [1.0, 2.0, 4.0, 8.0, 8.0])
+
+        # Recovery resets to the steady interval and the minimum backoff
+        self.probe_results.append(True)
+        self.monitor.check_now()
+        self.assertEqual(self.monitor._next_delay(), self.monitor.interval)
+        self.assertEqual(self.monitor.get_status()["next_backoff"], 1.0)
+
+    def test_is_network_error_follows_cause_chain(self):
+        try:
+            try:
+                raise ConnectionResetError("reset")
+            except ConnectionResetError as inner:
+                raise RuntimeError("wrapped") from inner
+        except RuntimeError as e:
+            self.assertTrue(is_network_error(e))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from mongomock_motor import AsyncMongoMockClient
+except ImportError:
+    AsyncMongoMockClient = None
+
+from aria.conversation_manager import ConversationManager
+from aria.conversation_store import AsyncConversationStore
+from backend.notification_manager import NotificationManager
+
+
+@unittest.skipUnless(AsyncMongoMockClient, "mongomock_motor not installed")
+class TestConversationManager(unittest.TestCase):
+    def setUp(self):
+        self.store = AsyncConversationStore(client=AsyncMongoMockClient())
+        self.manager = ConversationManager(store=self.store)
+
+    def find(self, conversation_id):
+        return self.manager._run(self.store.conversations.find_one({"_id": conversation_id}))
+
+    def test_first_user_message_sets_title_and_count(self):
+        conversation_id = self.manager.create_conversation()
+        self.assertTrue(self.manager.add_message(conversation_id, "user", "What's on my calendar tomorrow?"))
+        self.assertTrue(self.manager.add_message(conversation_id, "assistant", "You have two meetings."))
+        self.assertTrue(self.manager.add_message(conversation_id, "user", "Move the first one"))
+
+        doc = self.find(conversation_id)
+        self.assertEqual(doc["title"], "What's on my calendar tomorrow?")
+        self.assertEqual(doc["message_count"], 3)
+        self.assertEqual(len(doc["messages"]), 3)
+
+    def test_title_only_from_a_leading_user_message(self):
+        conversation_id = self.manager.create_conversation()
+        self.manager.add_message(conversation_id, "assistant", "Reminder: drink water")
+        self.manager.add_message(conversation_id, "user", "Thanks")
+        self.assertEqual(self.find(conversation_id)["title"], "New Conversation")
+
+    def test_recent_messages_window(self):
+        conversation_id = self.manager.create_conversation()
+        for i in range(40):
+            self.manager.add_message(conversation_id, "user" if i % 2 == 0 else "assistant", f"message {i}")
+
+        recent = self.manager.get_recent_messages(conversation_id, limit=25)
+        self.assertEqual(len(recent), 25)
+        self.assertEqual(recent[0], {"role": "assistant", "content": "message 15"})
+        self.assertEqual(recent[-1]["content"], "message 39")
+
+        conversation = self.manager.get_conversation(conversation_id, message_limit=5)
+        self.assertEqual([m["content"] for m in conversation["messages"]], [f"message {i}" for i in range(35, 40)])
+        self.assertEqual(conversation["message_count"], 40)
+        self.assertIsInstance(conversation["messages"][0]["timestamp"], str)
+
+        self.assertEqual(self.manager.get_recent_messages("missing"), [])
+
+    def test_list_uses_stored_count_and_backfills_legacy_documents(self):
+        conversation_id = self.manager.create_conversation()
+        self.manager.add_message(conversation_id, "user", "hello")
+        legacy = dict(self.find(conversation_id), _id="legacy")
+        legacy.pop("message_count")
+        legacy["messages"] = legacy["messages"] * 3
+        self.manager._run(self.store.conversations.insert_one(legacy))
+
+        self.manager._run(self.store._prepare_collection())
+        counts = {c["_id"]: c["message_count"] for c in self.manager.list_conversations()}
+        self.assertEqual(counts, {conversation_id: 1, "legacy": 3})
+
+    def test_rename_and_delete(self):
+        conversation_id = self.manager.create_conversation()
+        self.assertTrue(self.manager.rename_conversation(conversation_id, "Groceries"))
+        self.assertEqual(self.manager.get_conversation(conversation_id)["title"], "Groceries")
+        self.assertTrue(self.manager.delete_conversation(conversation_id))
+        self.assertIsNone(self.manager.get_conversation(conversation_id))
+
+    def test_notifications_are_batched_into_one_write(self):
+        conversation_id = self.manager.create_conversation()
+        self.manager.add_message(conversation_id, "user", "hi")
+        notifications = NotificationManager(conversation_manager=self.manager, batch_delay=0.05)
+
+        calls = []
+        add_messages = self.store.add_messages
+        async def counting_add_messages(cid, messages):
+            calls.append(len(messages))
+            return await add_messages(cid, messages)
+        self.store.add_messages = counting_add_messages
+
+        for i in range(3):
+            notifications.add_notification(f"Reminder {i}", "Drink water")
+        notifications._flush_future.result(timeout=5)
+
+        self.assertEqual(calls, [3])
+        doc = self.find(conversation_id)
+        self.assertEqual(doc["message_count"], 4)
+        self.assertTrue(doc["messages"][-1]["content"].startswith("🔔 **Reminder 2**"))
+
+    def test_adapter_refuses_to_block_its_own_loop(self):
+        async def call_from_loop():
+            self.manager.is_connected() # No I/O, allowed
+            with self.assertRaises(RuntimeError):
+                self.manager.list_conversations()
+        self.manager.submit(call_from_loop()).result(timeout=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
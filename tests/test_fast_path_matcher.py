@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import MagicMock
+import re
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.fast_path_matcher import FastPathMatcher, normalize_command, trie_regex
+from aria.command_intent_classifier import CommandIntentClassifier
+
+
+class TestFastPathMatcher(unittest.TestCase):
+    def setUp(self):
+        self.matcher = FastPathMatcher(CommandIntentClassifier.FAST_PATH_INTENTS, CommandIntentClassifier.REGEX_FAST_PATHS)
+
+    def match(self, text):
+        result = self.matcher.match(normalize_command(text), text)
+        return (result[1], result[3]) if result else None
+
+    def test_trie_regex_matches_exactly_the_phrases(self):
+        pattern = re.compile(trie_regex(["buy ", "bu", "price of "]))
+        for phrase in ["buy ", "bu", "price of "]:
+            self.assertTrue(pattern.fullmatch(phrase))
+        for phrase in ["b", "buy", "price"]:
+            self.assertIsNone(pattern.fullmatch(phrase))
+
+    def test_exact_phrase(self):
+        self.assertEqual(self.match("Please volume up!"), ("volume_up", {}))
+
+    def test_parameterized_rules(self):
+        self.assertEqual(self.match("set the volume to 40"), ("volume_set", {"level": 40}))
+        self.assertEqual(self.match("volume 70"), ("volume_set", {"level": 70}))
+        self.assertEqual(self.match("change brightness to 20"), ("brightness_set", {"level": 20}))
+        self.assertEqual(self.match("type hello world"), ("desktop_task", {"action": "type hello world"}))
+
+    def test_priority_does_not_depend_on_position(self):
+        # Volume outranks brightness even when the brightness phrase comes first
+        self.assertEqual(
+            self.match("set brightness to 10 and set volume to 30"),
+            ("volume_set", {"level": 30})
+        )
+        # Email outranks shopping
+        self.assertEqual(self.match("buy milk and send an email to bob"), ("email_send", {}))
+
+    def test_anchored_rules_only_match_at_start(self):
+        self.assertIsNone(self.match("please do not type anything"))
+        self.assertIsNone(self.match("what is my volume 50"))
+
+    def test_no_match(self):
+        self.assertIsNone(self.match("tell me a joke"))
+
+    def test_classifier_skips_llm_on_fast_path(self):
+        brain = MagicMock()
+        classifier = CommandIntentClassifier(brain)
+        result = classifier.classify_intent("click the start button")
+        self.assertEqual(result[0]["intent"], "desktop_task")
+        brain.get_fast_llm.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.file_index import FileIndex
+from aria.file_search import tokenize, parse_query
+from aria.file_manager import FileManager
+
+
+def touch(path, age_days=0, size=10):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+
+
+class TestFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "Documents")
+        self.storage = os.path.join(self.tmp.name, "file_index.json")
+        touch(os.path.join(self.root, "Shreyas_Resume_Final.pdf"), age_days=1)
+        touch(os.path.join(self.root, "old", "resume_2019.docx"), age_days=400)
+        touch(os.path.join(self.root, "taxes", "invoice-march.pdf"), age_days=10)
+        touch(os.path.join(self.root, "node_modules", "resume.js"))
+        self.index = FileIndex([self.root], storage_path=self.storage, refresh_interval=3600)
+        self.index.refresh()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def names(self, *args, **kwargs):
+        return [hit["name"] for hit in self.index.search(*args, **kwargs)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Shreyas_ResumeFinal2024.pdf"), ["shreyas", "resume", "final", "2024", "pdf"])
+        self.assertEqual(parse_query("*.pdf invoice"), (["invoice"], {".pdf"}))
+
+    def test_ranked_prefix_and_word_order(self):
+        self.assertEqual(self.names("resume"), ["Shreyas_Resume_Final.pdf", "resume_2019.docx"])
+        self.assertEqual(self.names("final resume"), ["Shreyas_Resume_Final.pdf"])
+        self.assertEqual(self.names("inv"), ["invoice-march.pdf"])
+
+    def test_substring_fuzzy_and_extension(self):
+        self.assertEqual(self.names("voice"), ["invoice-march.pdf"])
+        self.assertEqual(self.names("resme"), ["Shreyas_Resume_Final.pdf", "resume_2019.docx"])
+        self.assertEqual(self.names("*.pdf"), ["Shreyas_Resume_Final.pdf", "invoice-march.pdf"])
+        self.assertEqual(self.names("resume", extensions=["docx"]), ["resume_2019.docx"])
+        self.assertEqual(self.names("resume", root=self.root, recursive=False), ["Shreyas_Resume_Final.pdf"])
+
+    def test_incremental_refresh_only_rescans_changed_folders(self):
+        self.assertEqual(self.index.refresh(), 0)
+        touch(os.path.join(self.root, "taxes", "receipt.pdf"))
+        os.remove(os.path.join(self.root, "old", "resume_2019.docx"))
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.names("receipt"), ["receipt.pdf"])
+        self.assertEqual(self.names("resume"), ["Shreyas_Resume_Final.pdf"])
+
+    def test_index_persists_across_restarts(self):
+        reloaded = FileIndex([self.root], storage_path=self.storage, refresh_interval=3600)
+        self.assertTrue(reloaded.ready.is_set())
+        self.assertEqual(reloaded.get_stats()["files"], 3)
+        # Different roots invalidate the saved index
+        other = FileIndex([self.tmp.name], storage_path=self.storage, refresh_interval=3600)
+        self.assertFalse(other.ready.is_set())
+
+    def test_file_manager_uses_index(self):
+        manager = FileManager()
+        manager.location_shortcuts["documents"] = self.root
+        self.assertIn("Shreyas_Resume_Final.pdf", manager.search_files("resume", "documents"))  # Disk walk
+        manager.file_index = self.index
+        result = manager.search_files("final resume", "documents")
+        self.assertIn("I found 1 file: Shreyas_Resume_Final.pdf (10.00 B)", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.file_search import FilenameIndex, trigrams
+
+NOW = 1_700_000_000.0
+DAY = 86400
+ROOT = os.path.abspath(os.path.join(os.sep, "home", "user", "Documents"))
+
+
+def folder(*files):
+    return {"mtime": 0, "files": [[name, 100, NOW - age * DAY] for name, age in files], "subdirs": []}
+
+
+class TestFilenameIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = FilenameIndex({
+            ROOT: folder(("Shreyas_Resume_Final.pdf", 2), ("ResumeTemplate.docx", 200), ("notes.txt", 1)),
+            os.path.join(ROOT, "Taxes 2023"): folder(("invoice-march.pdf", 60), ("receipt.jpg", 60)),
+            os.path.join(ROOT, "Work", "Invoices"): folder(("march.pdf", 5), ("final_report_v2.pdf", 3)),
+        }, roots=[ROOT])
+
+    def names(self, query, **kwargs):
+        return [hit["name"] for hit in self.index.search(query, now=NOW, **kwargs)]
+
+    def test_trigrams_are_padded(self):
+        self.assertEqual(trigrams("cat"), {"$ca", "cat", "at$"})
+
+    def test_word_order_and_typos(self):
+        self.assertEqual(self.names("resume final shreyas")[0], "Shreyas_Resume_Final.pdf")
+        self.assertEqual(self.names("shreyas resme fianl")[0], "Shreyas_Resume_Final.pdf")
+        self.assertEqual(self.names("reciept"), ["receipt.jpg"])
+
+    def test_partial_matches_only_when_nothing_matches_fully(self):
+        self.assertEqual(self.names("final resume"), ["Shreyas_Resume_Final.pdf"])
+        self.assertEqual(self.names("resume zzzz"), ["Shreyas_Resume_Final.pdf", "ResumeTemplate.docx"])
+
+    def test_folder_names_refine_results(self):
+        # "march" alone matches both; the folder name decides
+        self.assertEqual(self.names("work march"), ["march.pdf"])
+        self.assertEqual(self.names("taxes receipt"), ["receipt.jpg"])
+
+    def test_folder_name_alone_finds_its_files(self):
+        self.assertEqual(sorted(self.names("taxes")), ["invoice-march.pdf", "receipt.jpg"])
+        # Only the folder is called "invoices"; a file named "invoice" still ranks first
+        hits = self.names("invoices")
+        self.assertEqual(hits[0], "invoice-march.pdf")
+        self.assertEqual(sorted(hits[1:]), ["final_report_v2.pdf", "march.pdf"])
+        # Every folder below the root contributes its words
+        self.assertIn("march.pdf", self.names("work"))
+
+    def test_recency_breaks_ties(self):
+        hits = self.index.search("resume", now=NOW)
+        self.assertEqual(hits[0]["name"], "Shreyas_Resume_Final.pdf")
+        self.assertGreater(hits[0]["score"], hits[1]["score"])
+
+    def test_filters(self):
+        self.assertEqual(self.names("*.pdf march"), ["march.pdf", "invoice-march.pdf"])
+        self.assertEqual(self.names("", extensions=["jpg"]), ["receipt.jpg"])
+        self.assertEqual(self.names("march", root=os.path.join(ROOT, "Work")), ["march.pdf"])
+        self.assertEqual(self.names("pdf", root=ROOT, recursive=False), ["Shreyas_Resume_Final.pdf"])
+        self.assertEqual(self.index.search("march", now=NOW, limit=1)[0]["path"],
+                         os.path.join(ROOT, "Work", "Invoices", "march.pdf"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.folder_organizer import FolderOrganizer
+from aria.file_automation import FileAutomator
+
+EXTENSIONS = {"Images": [".jpg", ".PNG"], "Documents": [".pdf", ".txt"]}
+
+
+def touch(path, content=b"", age_days=0):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    if age_days:
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+
+
+def listing(folder):
+    found = set()
+    for root, _, files in os.walk(folder):
+        for name in files:
+            found.add(os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/"))
+    return found
+
+
+class TestFolderOrganizer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = os.path.join(self.tmp.name, "Downloads")
+        for name in ["photo.jpg", "scan.png", "report.pdf", "notes.txt", "setup.bin", ".hidden.pdf"]:
+            touch(os.path.join(self.folder, name), name.encode())
+        touch(os.path.join(self.folder, "Documents", "report.pdf"), b"existing")
+        touch(os.path.join(self.folder, "Documents", "Report_1.pdf"), b"existing")
+        os.makedirs(os.path.join(self.folder, "Subfolder"))
+        self.organizer = FolderOrganizer(EXTENSIONS, journal_path=os.path.join(self.tmp.name, "journal.jsonl"),
+                                         max_workers=4)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_dry_run_plans_without_touching_files(self):
+        before = listing(self.folder)
+        moves = self.organizer.plan_by_type(self.folder)
+        result = self.organizer.execute(self.folder, moves, dry_run=True)
+        self.assertTrue(result["dry_run"])
+        self.assertEqual(listing(self.folder), before)
+        planned = {os.path.basename(s): os.path.relpath(d, self.folder).replace(os.sep, "/") for s, d in moves}
+        self.assertEqual(planned, {
+            "photo.jpg": "Images/photo.jpg",
+            "scan.png": "Images/scan.png",
+            # Both report.pdf and (case-insensitively) Report_1.pdf are taken
+            "report.pdf": "Documents/report_2.pdf",
+            "notes.txt": "Documents/notes.txt",
+            "setup.bin": "Others/setup.bin",
+        })
+
+    def test_execute_and_undo(self):
+        before = listing(self.folder)
+        result = self.organizer.execute(self.folder, self.organizer.plan_by_type(self.folder))
+        self.assertEqual((result["moved"], result["failed"]), (5, []))
+        self.assertIn("Documents/report_2.pdf", listing(self.folder))
+        self.assertEqual(self.organizer.history()[-1]["files"], 5)
+
+        undone = self.organizer.undo()
+        self.assertEqual(undone["restored"], 5)
+        self.assertEqual(listing(self.folder), before)
+        # Folders the run created are removed again; pre-existing ones stay
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "Images")))
+        self.assertTrue(os.path.isdir(os.path.join(self.folder, "Documents")))
+        self.assertEqual(self.organizer.undo()["error"], "Nothing to undo")
+
+    def test_never_overwrites_files_created_after_planning(self):
+        moves = self.organizer.plan_by_type(self.folder)
+        touch(os.path.join(self.folder, "Images", "photo.jpg"), b"new")
+        result = self.organizer.execute(self.folder, moves)
+        self.assertEqual(len(result["failed"]), 1)
+        with open(os.path.join(self.folder, "Images", "photo.jpg"), "rb") as f:
+            self.assertEqual(f.read(), b"new")
+
+    def test_batches_run_in_parallel_pool(self):
+        for i in range(600):
+            touch(os.path.join(self.folder, "bulk", f"file{i}.txt"))
+        bulk = os.path.join(self.folder, "bulk")
+        result = self.organizer.execute(bulk, self.organizer.plan_by_type(bulk))
+        self.assertEqual(result["moved"], 600)
+        self.assertEqual(len(os.listdir(os.path.join(bulk, "Documents"))), 600)
+
+    def test_archive_plan_and_undo_removes_created_folders(self):
+        touch(os.path.join(self.folder, "old.pdf"), age_days=90)
+        moves = self.organizer.plan_archive(self.folder, days=30)
+        self.assertEqual([os.path.basename(s) for s, _ in moves], ["old.pdf"])
+        self.assertEqual(os.path.relpath(moves[0][1], self.folder).split(os.sep)[0], "Archive")
+        self.organizer.execute(self.folder, moves, action="archive")
+        self.organizer.undo()
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "Archive")))
+        self.assertTrue(os.path.exists(os.path.join(self.folder, "old.pdf")))
+
+    def test_file_automator_messages(self):
+        automator = FileAutomator()
+        automator.organizer = self.organizer
+        self.assertTrue(automator.organize_folder(self.folder, dry_run=True).startswith("I would move 5 files"))
+        self.assertEqual(automator.organize_folder(self.folder), f"Organized 5 files in {self.folder}.")
+        self.assertEqual(automator.undo_last_organize(), "Moved 5 files back where they were.")
+
+
+if __name__ == '__main__':
+    unittest.main()
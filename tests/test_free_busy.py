@@ -0,0 +1,120 @@
+import unittest
+import sys
+import os
+import datetime
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria import config
+from aria.calendar_cache import CalendarCache
+from aria.calendar_manager import CalendarManager
+from aria.free_busy import FreeBusy, merge_intervals, subtract, working_windows
+from aria.handlers.calendar_handler import CalendarHandler, parse_duration_minutes
+
+TZ = config.TIMEZONE
+
+
+def at(day, hour, minute=0):
+    return datetime.datetime(2030, 1, day, hour, minute, tzinfo=TZ)
+
+
+def make_event(event_id, start, end, **extra):
+    return dict({"id": event_id, "summary": event_id,
+                 "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}, **extra)
+
+
+class TestFreeBusyHelpers(unittest.TestCase):
+    def test_merge_intervals_with_buffer(self):
+        self.assertEqual(merge_intervals([(5, 7), (0, 2), (1, 3), (8, 9)]), [[0, 3], [5, 7], [8, 9]])
+        self.assertEqual(merge_intervals([(0, 2), (3, 4)], buffer=0.5), [[-0.5, 4.5]])
+
+    def test_subtract_across_windows(self):
+        windows = [(0, 10), (20, 30)]
+        busy = [[2, 4], [9, 22], [25, 26]]
+        self.assertEqual(subtract(windows, busy), [(0, 2), (4, 9), (22, 25), (26, 30)])
+        self.assertEqual(subtract(windows, busy, min_duration=4), [(4, 9), (26, 30)])
+        self.assertEqual(subtract(windows, busy, limit=1), [(0, 2)])
+
+    def test_working_windows_skip_non_workdays(self):
+        # 2030-01-04 is a Friday
+        windows = working_windows(at(4, 12), at(7, 10), hours=(9, 17), workdays=range(5))
+        self.assertEqual(windows, [(at(4, 12).timestamp(), at(4, 17).timestamp()),
+                                   (at(7, 9).timestamp(), at(7, 10).timestamp())])
+
+
+class TestFreeBusy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CalendarCache(lambda: None, storage_path=os.path.join(self.tmp.name, "cache.json"),
+                                   calendar_ids=["primary", "work"])
+        self.cache._install({
+            "primary": {"sync_token": "t", "full_sync": 0, "events": {
+                "a": make_event("a", at(1, 9), at(1, 10)),
+                "holiday": {"id": "holiday", "start": {"date": "2030-01-02"}, "end": {"date": "2030-01-03"}},
+                "lunch": make_event("lunch", at(1, 12), at(1, 13), transparency="transparent"),
+            }},
+            "work": {"sync_token": "t", "full_sync": 0, "events": {
+                "b": make_event("b", at(1, 9, 30), at(1, 11)),
+                "c": make_event("c", at(1, 15), at(1, 16), attendees=[{"self": True, "responseStatus": "declined"}]),
+                "d": make_event("d", at(2, 10), at(2, 16)),
+            }},
+        })
+        self.free_busy = FreeBusy(self.cache)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_busy_merges_calendars_and_skips_free_events(self):
+        busy = self.free_busy.busy(at(1, 0), at(2, 0))
+        self.assertEqual(busy, [[at(1, 9).timestamp(), at(1, 11).timestamp()]])
+
+    def test_multi_day_slots_with_min_duration_and_buffer(self):
+        slots = self.free_busy.free_slots(at(1, 0), at(2, 23), min_minutes=120, hours=(9, 17), buffer_minutes=30)
+        self.assertEqual(slots, [(at(1, 11, 30), at(1, 17))])
+        # All-day events only block time when asked to
+        slots = self.free_busy.free_slots(at(2, 0), at(2, 23), min_minutes=60, hours=(9, 17))
+        self.assertEqual(slots, [(at(2, 9), at(2, 10)), (at(2, 16), at(2, 17))])
+        self.assertEqual(self.free_busy.free_slots(at(2, 0), at(2, 23), hours=(9, 17), include_all_day=True), [])
+
+    def test_manager_find_free_time(self):
+        with patch.object(CalendarManager, "authenticate"):
+            manager = CalendarManager()
+        manager.cache = self.cache
+        manager.free_busy = self.free_busy
+        self.cache.ready.set()
+        self.cache.last_sync = float("inf")
+        result = manager.find_free_time(duration_minutes=90, start_date="2030-01-01", end_date="2030-01-02")
+        self.assertEqual(result, "Here are times you're free for 1 hour 30 minutes:\n"
+                                 "- Tue, Jan 01: 11:00 AM to 09:00 PM\n"
+                                 "- Wed, Jan 02: 04:00 PM to 09:00 PM\n")
+        self.assertEqual(manager.get_free_slots("2030-01-01", "morning"),
+                         "Here are your free slots for morning:\n- 06:00 AM to 09:00 AM\n- 11:00 AM to 12:00 PM\n")
+        self.assertIn("couldn't find a free 8 hours slot", manager.find_free_time(480, "2030-01-02", "2030-01-02"))
+
+
+
+class TestFreeTimeDuration(unittest.TestCase):
+    def test_llm_durations_are_parsed_defensively(self):
+        self.assertEqual(parse_duration_minutes(90), 90)
+        self.assertEqual(parse_duration_minutes("45"), 45)
+        self.assertEqual(parse_duration_minutes("2 hours"), 120)
+        self.assertEqual(parse_duration_minutes("1.5h"), 90)
+        self.assertEqual(parse_duration_minutes("30 min"), 30)
+        self.assertEqual(parse_duration_minutes("a while"), 30)
+        self.assertEqual(parse_duration_minutes(None), 30)
+
+    def test_handler_survives_unparseable_duration(self):
+        calendar = MagicMock()
+        calendar.find_free_time.return_value = "You're free at 2 PM."
+        handler = CalendarHandler(MagicMock(), calendar, None)
+        result = handler.handle("when am I free this week", "calendar_query",
+                                {"query_type": "free_time", "duration_minutes": "a couple of hours"})
+        self.assertEqual(result, "You're free at 2 PM.")
+        self.assertEqual(calendar.find_free_time.call_args.kwargs["duration_minutes"], 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import MagicMock
+import tempfile
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.intent_cache import IntentCache
+from aria.command_intent_classifier import CommandIntentClassifier
+
+
+def fake_embed(text):
+    """Bag-of-letters embedding: near-identical phrasings get near-identical vectors."""
+    vector = [0.0] * 26
+    for ch in text:
+        if 'a' <= ch <= 'z':
+            vector[ord(ch) - ord('a')] += 1.0
+    return vector
+
+
+class TestIntentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "intent_cache.json")
+        self.cache = IntentCache(storage_path=self.path, embed_fn=fake_embed, similarity_threshold=0.95)
+        self.result = [{"intent": "music_play", "confidence": 0.9, "parameters": {"song": "lofi"}}]
+
+    def tearDown(self):
+        self.cache.flush()
+        self.tmp_dir.cleanup()
+
+    def test_exact_hit_after_store(self):
+        self.assertTrue(self.cache.store("Play lofi!", self.result, llm_latency=1.2))
+        cached, _ = self.cache.lookup("play   LOFI")
+        self.assertEqual(cached, self.result)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["exact_hits"], 1)
+        self.assertAlmostEqual(stats["latency_saved_seconds"], 1.2)
+
+    def test_semantic_hit_requires_grounded_parameters(self):
+        self.cache.store("play lofi", self.result, llm_latency=1.0, embedding=fake_embed("play lofi"))
+        cached, _ = self.cache.lookup("lofi play")
+        self.assertEqual(cached, self.result)
+
+        # Same letters, but "lofi" is not in the utterance -> must not reuse the parameters
+        cached, _ = self.cache.lookup("play oifl")
+        self.assertIsNone(cached)
+
+    def test_relative_dates_and_history_references_are_skipped(self):
+        calendar = [{"intent": "calendar_query", "confidence": 0.9, "parameters": {}}]
+        self.assertFalse(self.cache.store("what's on my calendar tomorrow", calendar))
+        self.assertFalse(self.cache.store("no, make it 80", self.result))
+        dated = [{"intent": "calendar_query", "confidence": 0.9, "parameters": {"target_date": "2025-01-01"}}]
+        self.assertFalse(self.cache.store("what is on my calendar", dated))
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+
+    def test_persists_across_instances(self):
+        self.cache.store("play lofi", self.result, embedding=fake_embed("play lofi"))
+        self.cache.flush()
+        reloaded = IntentCache(storage_path=self.path, embed_fn=fake_embed, similarity_threshold=0.95)
+        cached, _ = reloaded.lookup("play lofi")
+        self.assertEqual(cached, self.result)
+        # Vectors are kept in the .npy file beside the JSON, not in it
+        with open(self.path, encoding="utf-8") as f:
+            self.assertNotIn("embedding", f.read())
+        cached, _ = reloaded.lookup("lofi play")
+        self.assertEqual(cached, self.result)
+        self.assertEqual(reloaded.get_stats()["semantic_hits"], 1)
+
+    def test_stores_are_saved_once_per_burst(self):
+        cache = IntentCache(storage_path=self.path, save_delay=0.1)
+        for song in ("lofi", "jazz", "rock"):
+            cache.store(f"play {song}", [{"intent": "music_play", "confidence": 0.9, "parameters": {"song": song}}])
+        self.assertFalse(os.path.exists(self.path))
+        time.sleep(0.3)
+        self.assertEqual(cache.get_stats()["saves"], 1)
+        self.assertEqual(len(IntentCache(storage_path=self.path).entries), 3)
+
+    def test_evicted_entries_lose_their_vectors(self):
+        cache = IntentCache(storage_path=self.path, embed_fn=fake_embed, max_entries=2, similarity_threshold=0.95)
+        for text in ("play lofi", "pause music", "open spotify"):
+            cache.store(text, self.result, embedding=fake_embed(text))
+        self.assertEqual(sorted(cache.vectors), ["open spotify", "pause music"])
+        cached, _ = cache.lookup("lofi play")
+        self.assertIsNone(cached)
+        cache.flush()
+
+    def test_expired_entries_miss(self):
+        cache = IntentCache(storage_path=self.path, ttl_seconds=0)
+        cache.store("play lofi", self.result)
+        cached, _ = cache.lookup("play lofi")
+        self.assertIsNone(cached)
+        cache.flush()
+
+
+class TestClassifierUsesCache(unittest.TestCase):
+    def test_second_call_skips_llm(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            brain = MagicMock()
+            brain.is_available.return_value = True
+            llm = brain.get_fast_llm.return_value
+            llm.invoke.return_value.content = '[{"intent": "music_play", "confidence": 0.9, "parameters": {"song": "lofi"}}]'
+
+            cache = IntentCache(storage_path=os.path.join(tmp_dir, "cache.json"))
+            classifier = CommandIntentClassifier(brain, cache=cache)
+
+            first = classifier.classify_intent("play lofi")
+            second = classifier.classify_intent("Play lofi.")
+
+            self.assertEqual(first, second)
+            self.assertEqual(llm.invoke.call_count, 1)
+            cache.flush()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import datetime
+import time
+from unittest.mock import MagicMock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.scheduler import Scheduler
+from aria.proactive_manager import ProactiveManager
+from aria.water_manager import WaterManager
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler().start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+
+    def test_jobs_run_in_due_order(self):
+        ran = []
+        now = time.time()
+        self.scheduler.schedule_at(now + 0.15, lambda: ran.append("late"), name="late")
+        self.scheduler.schedule_at(now + 0.05, lambda: ran.append("early"), name="early")
+        self.assertTrue(wait_for(lambda: len(ran) == 2))
+        self.assertEqual(ran, ["early", "late"])
+        self.assertEqual(self.scheduler.jobs(), [])
+
+    def test_same_name_replaces_and_cancel(self):
+        ran = []
+        self.scheduler.schedule_in(0.05, lambda: ran.append("old"), name="reminder")
+        self.scheduler.schedule_in(0.1, lambda: ran.append("new"), name="reminder")
+        self.scheduler.schedule_in(0.05, lambda: ran.append("cancelled"), name="other", owner="test")
+        self.assertEqual(self.scheduler.cancel_owner("test"), 1)
+        self.assertTrue(wait_for(lambda: ran))
+        time.sleep(0.1)
+        self.assertEqual(ran, ["new"])
+
+    def test_periodic_job_and_job_table(self):
+        count = []
+        self.scheduler.every(0.05, lambda: count.append(1), name="tick", owner="test")
+        self.assertTrue(wait_for(lambda: len(count) >= 3))
+        table = self.scheduler.jobs()
+        self.assertEqual(table[0]["name"], "tick")
+        self.assertEqual(table[0]["interval"], 0.05)
+        self.assertGreaterEqual(table[0]["runs"], 3)
+        self.scheduler.cancel("tick")
+
+    def test_idle_scheduler_does_not_wake(self):
+        self.scheduler.schedule_in(3600, lambda: None, name="far")
+        wakeups = self.scheduler.stats["wakeups"]
+        time.sleep(0.3)
+        self.assertLessEqual(self.scheduler.stats["wakeups"] - wakeups, 1)
+
+    def test_failing_job_is_recorded(self):
+        def fail():
+            raise RuntimeError("boom")
+        job = self.scheduler.schedule_in(0, fail, name="fail")
+        self.assertTrue(wait_for(lambda: job.runs == 1))
+        self.assertEqual(job.last_error, "boom")
+
+
+class TestSchedulerClients(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = Scheduler()  # Not started: only the job table is inspected
+
+    def event(self, event_id, summary, start_minutes, length=30):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        start = now + datetime.timedelta(minutes=start_minutes)
+        return {
+            "id": event_id, "summary": summary,
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + datetime.timedelta(minutes=length)).isoformat()},
+        }
+
+    def test_proactive_plan_schedules_absolute_triggers(self):
+        calendar = MagicMock()
+        calendar.get_upcoming_events_raw.return_value = [
+            self.event("standup", "Standup", 60),
+            self.event("review", "Review", 3),
+            self.event("focus", "Focus Time", 120, length=90),
+        ]
+        manager = ProactiveManager(calendar, MagicMock(), scheduler=self.scheduler)
+        self.scheduler.schedule_in(60, lambda: None, name="proactive:30min:deleted", owner="proactive")
+        manager.plan()
+
+        jobs = {job["name"]: job for job in self.scheduler.jobs(owner="proactive")}
+        self.assertEqual(set(jobs), {
+            "proactive:30min:standup", "proactive:5min:standup", "proactive:5min:review",
+            "proactive:30min:focus", "proactive:5min:focus", "proactive:focus_start:focus", "proactive:focus_end:focus",
+        })
+        self.assertAlmostEqual(jobs["proactive:30min:standup"]["due_in"], 30 * 60, delta=5)
+        self.assertAlmostEqual(jobs["proactive:5min:review"]["due_in"], 0, delta=5)
+
+    def test_proactive_start_registers_with_calendar_cache(self):
+        calendar = MagicMock()
+        calendar.get_upcoming_events_raw.return_value = []
+        manager = ProactiveManager(calendar, MagicMock(), scheduler=self.scheduler)
+        manager.start_monitoring()
+        calendar.cache.add_listener.assert_called_once_with(manager._replan_soon)
+        self.assertIsNotNone(self.scheduler.get("proactive:plan"))
+        self.assertIsNotNone(self.scheduler.get("proactive:morning_briefing"))
+        manager.stop_monitoring()
+        self.assertEqual(self.scheduler.jobs(owner="proactive"), [])
+
+    def test_water_reminder_is_one_timed_job(self):
+        manager = WaterManager(scheduler=self.scheduler)
+        manager.config_file = os.path.join(os.path.dirname(__file__), "water_config_test.json")
+        try:
+            manager.start_monitoring(interval_minutes=45)
+            job = self.scheduler.get("water:reminder")
+            self.assertAlmostEqual(job.due - time.time(), 45 * 60, delta=5)
+            manager.set_interval(20)
+            self.assertAlmostEqual(self.scheduler.get("water:reminder").due - time.time(), 20 * 60, delta=5)
+            manager.stop_monitoring()
+            self.assertIsNone(self.scheduler.get("water:reminder"))
+        finally:
+            if os.path.exists(manager.config_file):
+                os.remove(manager.config_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria import memory_manager as memory_module
+from aria.memory_manager import MemoryManager
+
+
+class FakeEmbedder:
+    name = "fake:test"
+    collection_name = "aria_conversations_test"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestMemoryBatching(unittest.TestCase):
+    def setUp(self):
+        self.embedder = FakeEmbedder()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        env = {
+            "MEMORY_BATCH_WAIT": "0.2",
+            "MEMORY_BATCH_SIZE": "32",
+            "MEMORY_JOURNAL_PATH": os.path.join(self.tmpdir.name, "journal.jsonl"),
+        }
+        with patch.dict(os.environ, env), \
+             patch.object(memory_module, "chromadb", MagicMock()), \
+             patch.object(MemoryManager, "_create_embedder", return_value=self.embedder):
+            self.memory = MemoryManager()
+        self.collection = self.memory.collection
+
+    def test_pending_messages_are_coalesced(self):
+        for i in range(5):
+            self.assertTrue(self.memory.add_message("conv-1", f"message {i}", "user"))
+        self.assertTrue(self.memory.flush())
+
+        self.assertEqual(len(self.embedder.calls), 1)
+        self.assertEqual(len(self.embedder.calls[0]), 5)
+        self.collection.upsert.assert_called_once()
+        ids = self.collection.upsert.call_args.kwargs["ids"]
+        self.assertEqual(len(set(ids)), 5)
+
+    def test_empty_messages_are_ignored(self):
+        self.assertFalse(self.memory.add_message("conv-1", "   ", "user"))
+        self.memory.flush()
+        self.assertEqual(self.embedder.calls, [])
+
+    def test_search_embeds_query_synchronously(self):
+        self.collection.query.return_value = {
+            "documents": [["hello"]],
+            "metadatas": [[{"conversation_id": "conv-2", "role": "user", "timestamp": "t"}]],
+            "distances": [[0.1]]
+        }
+        results = self.memory.search_relevant_context("hello")
+        self.assertEqual(results[0]["text"], "hello")
+        self.assertEqual(self.embedder.calls, [["hello"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria import memory_manager as memory_module
+from aria.memory_manager import MemoryManager
+from aria.memory_journal import MemoryJournal
+
+
+class FakeEmbedder:
+    name = "fake:test"
+    collection_name = "aria_conversations_test"
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise ConnectionError("offline")
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class TestMemoryJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "journal.jsonl")
+
+    def test_replay_returns_unacknowledged_records(self):
+        journal = MemoryJournal(self.path)
+        journal.append({"id": "a", "document": "one"})
+        journal.append({"id": "b", "document": "two"})
+        journal.ack(["a"])
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "add", "id": "c"') # Torn write
+        journal.close()
+
+        records = MemoryJournal(self.path).replay()
+        self.assertEqual([r["id"] for r in records], ["b"])
+
+    def test_compact_keeps_only_pending(self):
+        journal = MemoryJournal(self.path)
+        for i in range(10):
+            journal.append({"id": str(i), "document": "x"})
+        journal.ack([str(i) for i in range(9)])
+        journal.compact(journal.replay())
+        journal.append({"id": "10", "document": "y"})
+        self.assertEqual([r["id"] for r in journal.replay()], ["9", "10"])
+        with open(self.path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+
+class TestWriteBehindIngestion(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.journal_path = os.path.join(self.tmpdir.name, "journal.jsonl")
+
+    def make_memory(self, embedder):
+        env = {
+            "MEMORY_BATCH_WAIT": "0.05",
+            "MEMORY_JOURNAL_PATH": self.journal_path,
+        }
+        with patch.dict(os.environ, env), \
+             patch.object(memory_module, "chromadb", MagicMock()), \
+             patch.object(MemoryManager, "_create_embedder", return_value=embedder):
+            return MemoryManager()
+
+    def test_repeated_content_is_kept(self):
+        embedder = FakeEmbedder()
+        memory = self.make_memory(embedder)
+        self.assertTrue(memory.add_message("conv-1", "yes", "user"))
+        self.assertTrue(memory.add_message("conv-1", "yes", "user"))
+        self.assertTrue(memory.add_message("conv-2", "yes", "user"))
+        self.assertTrue(memory.flush())
+
+        stats = memory.get_ingestion_stats()
+        self.assertEqual(stats["written"], 3)
+        self.assertEqual(stats["deduplicated"], 0)
+
+    def test_duplicate_writes_of_one_message_are_collapsed(self):
+        embedder = FakeEmbedder()
+        memory = self.make_memory(embedder)
+        self.assertTrue(memory.add_message("conv-1", "What's the weather?", "user", message_id="m1"))
+        self.assertFalse(memory.add_message("conv-1", "What's the weather?", "user", message_id="m1"))
+        # Same ID in another conversation or role is a different message
+        self.assertTrue(memory.add_message("conv-2", "What's the weather?", "user", message_id="m1"))
+        self.assertTrue(memory.add_message("conv-1", "Sunny.", "assistant", message_id="m1"))
+        self.assertTrue(memory.flush())
+
+        stats = memory.get_ingestion_stats()
+        self.assertEqual(stats["written"], 3)
+        self.assertEqual(stats["deduplicated"], 1)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["lag_seconds"], 0.0)
+
+    def test_chat_route_collapses_a_repeated_turn(self):
+        from backend.routers import chat
+        memory = self.make_memory(FakeEmbedder())
+        store = AsyncMock()
+
+        async def save_turn(turn_id):
+            await chat._save_message(store, memory, "conv-1", "user", "What's the weather?", turn_id)
+            await chat._save_message(store, memory, "conv-1", "assistant", "Sunny.", turn_id)
+
+        asyncio.run(save_turn("turn-1"))
+        # A retried request carries the same message_id
+        asyncio.run(save_turn("turn-1"))
+        self.assertTrue(memory.flush())
+
+        stats = memory.get_ingestion_stats()
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(stats["deduplicated"], 2)
+
+    def test_unwritten_messages_are_replayed_on_startup(self):
+        offline = FakeEmbedder(fail=True)
+        memory = self.make_memory(offline)
+        memory.add_message("conv-1", "remember the milk", "user")
+        time.sleep(0.2)
+        stats = memory.get_ingestion_stats()
+        self.assertEqual(stats["queue_depth"], 1)
+        self.assertGreater(stats["lag_seconds"], 0)
+        self.assertGreaterEqual(stats["failed_batches"], 1)
+
+        # Simulated restart with a working backend
+        online = FakeEmbedder()
+        restarted = self.make_memory(online)
+        self.assertTrue(restarted.flush())
+        self.assertEqual(restarted.get_ingestion_stats()["replayed"], 1)
+        self.assertIn(["remember the milk"], online.calls)
+        self.assertEqual(restarted.journal.replay(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.metrics_store import MetricsStore, parse_duration
+
+# Small tiers keep the file tiny: 1 s x 60, 10 s x 30, 60 s x 60
+TIERS = ((1, 60), (10, 30), (60, 60))
+NOW = 1_700_000_000.0
+
+
+class TestMetricsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "metrics.mmap")
+        self.store = MetricsStore(self.path, metrics=("cpu", "ram"), tiers=TIERS)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_parse_duration(self):
+        self.assertEqual(parse_duration("90s"), 90)
+        self.assertEqual(parse_duration("5m"), 300)
+        self.assertEqual(parse_duration("24h"), 86400)
+        self.assertEqual(parse_duration("30d"), 30 * 86400)
+        self.assertEqual(parse_duration("15"), 15)
+        with self.assertRaises(ValueError):
+            parse_duration("soon")
+
+    def test_pick_tier(self):
+        self.assertEqual(self.store.pick_tier(30), 0)
+        self.assertEqual(self.store.pick_tier(30, 10), 1)
+        self.assertEqual(self.store.pick_tier(120), 1)
+        self.assertEqual(self.store.pick_tier(3600, 5), 2)    # Only the coarsest tier covers an hour
+        self.assertEqual(self.store.pick_tier(86400), 2)      # Beyond retention
+
+    def test_steps_aggregate_min_avg_max(self):
+        for i in range(30):
+            self.store.record(NOW - 30 + i, {"cpu": i, "ram": 50})
+
+        result = self.store.query("cpu", 30, 10, now=NOW - 1)
+        self.assertEqual((result["resolution"], result["step"]), (10, 10))
+        self.assertEqual([(p["min"], p["avg"], p["max"]) for p in result["points"]],
+                         [(0, 4.5, 9), (10, 14.5, 19), (20, 24.5, 29)])
+
+        # A step spanning several buckets merges them, weighting averages by sample count
+        merged = self.store.query("cpu", 30, 20, now=NOW - 1)
+        self.assertEqual(merged["step"], 20)
+        self.assertEqual([(p["t"], p["min"], p["avg"], p["max"]) for p in merged["points"]],
+                         [(NOW - 40, 0, 4.5, 9), (NOW - 20, 10, 19.5, 29)])
+
+        fine = self.store.query("cpu", 5, now=NOW - 1)
+        self.assertEqual(fine["resolution"], 1)
+        self.assertEqual([p["avg"] for p in fine["points"]], [25, 26, 27, 28, 29])
+
+    def test_expired_slots_are_reset(self):
+        self.store.record(NOW - 60, {"cpu": 99})  # Same 1 s slot as NOW, one lap earlier
+        self.store.record(NOW, {"cpu": 1})
+        point = self.store.query("cpu", 1, now=NOW)["points"][-1]
+        self.assertEqual((point["min"], point["avg"], point["max"]), (1, 1, 1))
+        # The stale bucket is not reported as history either
+        old = self.store.query("cpu", 60, now=NOW)["points"]
+        self.assertEqual([p["avg"] for p in old if p["avg"] is not None], [1])
+
+    def test_missing_values_are_skipped(self):
+        self.store.record(NOW, {"cpu": None, "ram": float("nan"), "unknown": 3})
+        self.store.record(NOW, {"cpu": 10})
+        self.assertEqual(self.store.query("cpu", 1, now=NOW)["points"][-1]["avg"], 10)
+        self.assertIsNone(self.store.query("ram", 1, now=NOW)["points"][-1]["avg"])
+        with self.assertRaises(ValueError):
+            self.store.query("gpu", 60, now=NOW)
+
+    def test_history_survives_reopen(self):
+        self.store.record(NOW, {"cpu": 42})
+        self.store.close()
+        self.store = MetricsStore(self.path, metrics=("cpu", "ram"), tiers=TIERS)
+        self.assertEqual(self.store.query("cpu", 1, now=NOW)["points"][-1]["max"], 42)
+
+    def test_layout_change_recreates_file(self):
+        self.store.record(NOW, {"cpu": 42})
+        self.store.close()
+        self.store = MetricsStore(self.path, metrics=("ram", "cpu"), tiers=TIERS)
+        self.assertIsNone(self.store.query("cpu", 1, now=NOW)["points"][-1]["max"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import MagicMock, AsyncMock
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import ServerSelectionTimeoutError, OperationFailure
+
+from aria.mongo_pool import MongoPool
+from aria.conversation_manager import ConversationManager
+from aria.conversation_store import AsyncConversationStore
+
+
+class FakeClient:
+    """Stands in for MongoClient; `down` makes every command fail like an unreachable server."""
+
+    def __init__(self, uri, **kwargs):
+        self.kwargs = kwargs
+        self.down = False
+        self.calls = 0
+        self.admin = MagicMock()
+        self.admin.command.side_effect = self._command
+        # Motor-style collection for the async store
+        self.collection = AsyncMock()
+        self.collection.find_one.side_effect = self._command
+
+    def _command(self, *args, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise ServerSelectionTimeoutError("localhost:27017: connection refused")
+        return {"ok": 1}
+
+    def __getitem__(self, name):
+        db = MagicMock()
+        db.conversations = self.collection
+        return db
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestMongoPool(unittest.TestCase):
+    def make_pool(self):
+        pool = MongoPool("mongodb://test", max_pool_size=7, health_interval=0.05, client_factory=FakeClient)
+        self.addCleanup(pool.breaker.stop)
+        return pool
+
+    def test_client_is_lazy_and_pooled(self):
+        pool = self.make_pool()
+        self.assertEqual(pool.client.kwargs["maxPoolSize"], 7)
+        self.assertFalse(pool.client.kwargs["connect"])
+        self.assertIs(MongoPool.shared("mongodb://shared-test"), MongoPool.shared("mongodb://shared-test"))
+
+    def test_store_traffic_uses_the_monitored_pool(self):
+        pool = MongoPool("mongodb://localhost:1", max_pool_size=7, min_pool_size=1, autostart=False)
+        store = AsyncConversationStore(pool=pool)
+        # One client per URI: the store's client is the one the listener and the ping watch
+        self.assertIs(store.client, pool.client)
+        options = pool.client.delegate.options
+        self.assertEqual(options.pool_options.max_pool_size, 7)
+        self.assertEqual(options.pool_options.min_pool_size, 1)
+        self.assertIn(pool.pool_listener, options.event_listeners)
+        pool.client.close()
+
+    def test_breaker_opens_on_connection_error_and_recovers(self):
+        pool = self.make_pool()
+        pool.client.down = True
+        self.assertTrue(pool.report_failure(ServerSelectionTimeoutError("down")))
+        self.assertFalse(pool.is_available)
+        self.assertEqual(pool.get_stats()["breaker"], "open")
+
+        pool.client.down = False
+        self.assertTrue(wait_for(lambda: pool.breaker.is_online))
+        self.assertEqual(pool.get_stats()["breaker"], "closed")
+
+    def test_query_errors_do_not_open_breaker(self):
+        pool = self.make_pool()
+        self.assertFalse(pool.report_failure(OperationFailure("bad query")))
+        self.assertTrue(pool.is_available)
+
+    def test_conversation_manager_skips_calls_while_open(self):
+        pool = self.make_pool()
+        manager = ConversationManager(store=AsyncConversationStore(client=pool.client, pool=pool))
+
+        pool.client.down = True
+        self.assertIsNone(manager.get_conversation("abc")) # Fails and opens the breaker
+
+        started = time.time()
+        self.assertFalse(manager.is_connected())
+        self.assertEqual(manager.get_recent_messages("abc"), [])
+        self.assertLess(time.time() - started, 0.05)
+        self.assertGreater(manager.get_stats()["rejected_calls"], 0)
+        # No operations were sent while open (only background pings)
+        self.assertEqual(pool.client.collection.find_one.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,250 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import MagicMock
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.notion_index import NotionIndex, BM25Index, tokenize
+from aria.notion_loader import NotionPageLoader, RateLimiter
+from aria.handlers.notion_handler import NotionHandler
+from aria.scheduler import Scheduler
+
+
+def page(page_id, title, edited, properties=None, archived=False):
+    props = {"Name": {"type": "title", "title": [{"plain_text": title}]}}
+    props.update(properties or {})
+    return {"object": "page", "id": page_id, "last_edited_time": edited, "url": f"https://notion.so/{page_id}",
+            "properties": props, "archived": archived, "icon": {"type": "emoji", "emoji": "📄"}}
+
+
+def paragraph(block_id, text):
+    return {"id": block_id, "type": "paragraph", "has_children": False,
+            "paragraph": {"rich_text": [{"plain_text": text}]}}
+
+
+class FakeWorkspace:
+    """Stands in for notion_client.Client: search (sorted by last_edited_time, paged) and block listing."""
+
+    def __init__(self):
+        self.objects = {}
+        self.blocks_by_page = {}
+        self.calls = []
+        self.blocks = self
+        self.children = self
+        self.pages = self
+        # Cleared to hold search calls, standing in for a long sync
+        self.gate = threading.Event()
+        self.gate.set()
+        self.waiting = threading.Event()
+
+    def put(self, obj, texts=()):
+        self.objects[obj["id"]] = obj
+        self.blocks_by_page[obj["id"]] = [paragraph(f"{obj['id']}-{i}", text) for i, text in enumerate(texts)]
+
+    def search(self, page_size=100, start_cursor=None, sort=None, **kwargs):
+        self.calls.append(("search", start_cursor))
+        if not self.gate.is_set():
+            self.waiting.set()
+            self.gate.wait(5)
+        ordered = sorted(self.objects.values(), key=lambda obj: obj["last_edited_time"], reverse=True)
+        offset = int(start_cursor or 0)
+        more = offset + page_size < len(ordered)
+        return {"results": ordered[offset:offset + page_size], "has_more": more,
+                "next_cursor": str(offset + page_size) if more else None}
+
+    def list(self, block_id, page_size=100, start_cursor=None):
+        self.calls.append(("list", block_id))
+        return {"results": self.blocks_by_page.get(block_id, []), "has_more": False, "next_cursor": None}
+
+    def retrieve(self, page_id):
+        self.calls.append(("retrieve", page_id))
+        return self.objects[page_id]
+
+
+CONCEPTS = [{"money", "budget", "spend", "cost"}, {"book", "reading", "novel"}, {"travel", "venue", "trip"}]
+
+
+def concept_embedding(text):
+    """Toy embedding: one dimension per concept, so synonyms land close together."""
+    tokens = set(tokenize(text))
+    return [float(len(tokens & concept)) for concept in CONCEPTS]
+
+
+class TestNotionIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "notion_index.json")
+        self.workspace = FakeWorkspace()
+        self.workspace.put(page("p1", "Quarterly Budget", "2026-01-03T10:00:00.000Z",
+                                {"Status": {"type": "select", "select": {"name": "Draft"}}}),
+                           ["Marketing spend is capped at 40k.", "Hiring plan for Q3."])
+        self.workspace.put(page("p2", "Team Offsite", "2026-01-02T10:00:00.000Z"),
+                           ["Venue shortlist and the budget for travel."])
+        self.workspace.put(page("p3", "Reading List", "2026-01-01T10:00:00.000Z"),
+                           ["Designing Data-Intensive Applications"])
+        self.workspace.put({"object": "database", "id": "db1", "last_edited_time": "2025-12-01T10:00:00.000Z",
+                            "title": [{"plain_text": "Tasks"}], "url": None})
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_index(self, **kwargs):
+        loader = NotionPageLoader(self.workspace, cache_path=os.path.join(self.test_dir, "blocks.json"),
+                                  rate_limiter=RateLimiter(rate=0))
+        return NotionIndex(self.workspace, loader=loader, storage_path=self.path, **kwargs)
+
+    def test_full_sync_indexes_titles_properties_and_content(self):
+        index = self.make_index()
+        self.assertTrue(index.sync())
+        self.assertTrue(index.ready.is_set())
+        self.assertEqual(index.get_stats()["pages"], 4)
+
+        # Only in block text, which Notion's title search can't see
+        results = index.search("marketing spend")
+        self.assertEqual(results[0]["id"], "p1")
+        self.assertIn("Marketing spend", results[0]["snippet"])
+        self.assertEqual(index.search("draft")[0]["id"], "p1")
+        self.assertEqual(index.search("tasks", object_type="database")[0]["id"], "db1")
+        self.assertEqual(index.search("designing applications")[0]["title"], "Reading List")
+
+    def test_title_match_outranks_body_match(self):
+        index = self.make_index()
+        index.sync()
+        self.assertEqual([r["id"] for r in index.search("budget")], ["p1", "p2"])
+        self.assertEqual([r["id"] for r in index.search("budget", titles_only=True)], ["p1"])
+
+    def test_incremental_sync_fetches_only_changed_pages(self):
+        index = self.make_index()
+        index.sync()
+
+        self.workspace.calls.clear()
+        saved = os.path.getmtime(self.path)
+        self.assertTrue(index.sync())
+        # Nothing changed: one search page, no block fetches, no rewrite
+        self.assertEqual(self.workspace.calls, [("search", None)])
+        self.assertEqual(os.path.getmtime(self.path), saved)
+
+        self.workspace.put(page("p2", "Team Offsite", "2026-01-05T10:00:00.000Z"), ["Lisbon in May."])
+        self.workspace.calls.clear()
+        index.sync()
+        self.assertEqual([c for c in self.workspace.calls if c[0] == "list"], [("list", "p2")])
+        self.assertEqual(index.search("lisbon")[0]["id"], "p2")
+        self.assertEqual([r["id"] for r in index.search("venue")], [])
+        self.assertEqual(index.recent(2)[0]["id"], "p2")
+
+    def test_archived_and_deleted_pages_are_dropped(self):
+        index = self.make_index()
+        index.sync()
+        self.workspace.put(page("p1", "Quarterly Budget", "2026-01-06T10:00:00.000Z", archived=True))
+        index.sync()
+        self.assertEqual([r["id"] for r in index.search("budget")], ["p2"])
+
+        del self.workspace.objects["p3"]
+        index.sync()
+        self.assertIn("p3", index.docs)
+        # The daily full enumeration notices pages that disappeared
+        index.sync(full=True)
+        self.assertNotIn("p3", index.docs)
+
+    def test_index_persists_across_restarts(self):
+        self.make_index().sync()
+        self.workspace.calls.clear()
+        index = self.make_index()
+        # Loaded off the startup path: the first sync job (or load()) reads the file
+        self.assertFalse(index.ready.is_set())
+        index.load()
+        self.assertTrue(index.ready.is_set())
+        self.assertEqual(index.search("hiring")[0]["id"], "p1")
+        self.assertEqual(self.workspace.calls, [])
+
+    def test_semantic_search_fuses_embeddings(self):
+        index = self.make_index(embed_fn=concept_embedding)
+        index.sync()
+        self.assertEqual(index.get_stats()["embedded"], 3)
+        results = index.search("budget cost", semantic=True)
+        self.assertEqual(results[0]["id"], "p1")
+        # No page contains "novel": lexical search finds nothing and falls back to embeddings
+        self.assertEqual(index.bm25.search(tokenize("novel")), [])
+        self.assertEqual(index.search("novel", limit=1)[0]["id"], "p3")
+
+    def test_embeddings_are_saved_outside_the_json(self):
+        self.make_index(embed_fn=concept_embedding).sync()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertNotIn("embedding", f.read())
+        index = self.make_index(embed_fn=concept_embedding)
+        index.load()
+        self.assertEqual(index.get_stats()["embedded"], 3)
+        self.assertEqual(index.search("novel", limit=1)[0]["id"], "p3")
+        self.assertEqual(index.search("cost", semantic=True, object_type="database"), [])
+
+    def test_long_sync_does_not_hold_a_scheduler_worker(self):
+        scheduler = Scheduler(workers=1).start()
+        index = self.make_index()
+        try:
+            self.workspace.gate.clear()
+            index.start(scheduler)
+            self.assertTrue(self.workspace.waiting.wait(5))
+            # The only job worker is free while the sync is stuck on Notion
+            ran = threading.Event()
+            scheduler.schedule_in(0, ran.set, name="reminder")
+            self.assertTrue(ran.wait(2))
+        finally:
+            self.workspace.gate.set()
+            index.stop()
+            scheduler.stop()
+
+    def test_request_during_sync_runs_once_afterwards(self):
+        index = self.make_index()
+        self.workspace.gate.clear()
+        index.sync_requested = True
+        worker = threading.Thread(target=index._background_sync)
+        worker.start()
+        self.assertTrue(self.workspace.waiting.wait(5))
+
+        # Two requests while the first sync is running return at once...
+        for _ in range(2):
+            index.sync_requested = True
+            index._background_sync()
+        self.assertEqual(index.stats["coalesced"], 2)
+        self.assertEqual(index.stats["syncs"], 0)
+
+        # ...and collapse into one more sync after it
+        self.workspace.gate.set()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(index.stats["syncs"], 2)
+        self.assertFalse(index.sync_requested)
+
+    def test_bm25_updates_in_place(self):
+        bm25 = BM25Index()
+        bm25.add("a", [("alpha beta", 1.0)])
+        bm25.add("b", [("beta gamma", 1.0)])
+        bm25.add("a", [("delta", 1.0)])
+        self.assertEqual(bm25.search(["alpha"]), [])
+        self.assertEqual([doc for _, doc in bm25.search(["beta"])], ["b"])
+        bm25.remove("b")
+        self.assertNotIn("gamma", bm25.postings)
+        self.assertEqual(bm25.total_length, 1.0)
+
+
+class TestNotionContentSearchHandler(unittest.TestCase):
+    def test_content_search_lists_pages_with_snippets(self):
+        notion = MagicMock()
+        notion.search_content.return_value = [
+            {"id": "p1", "title": "Quarterly Budget", "snippet": "Marketing spend is capped at 40k."}
+        ]
+        handler = NotionHandler(MagicMock(), notion, MagicMock())
+        result = handler.handle("find my notion notes that mention marketing spend", "notion_query", {})
+        notion.search_content.assert_called_with("marketing spend")
+        self.assertIn("Quarterly Budget", result)
+        self.assertIn("capped at 40k", result)
+        self.assertTrue(handler.has_pending_interaction())
+
+
+if __name__ == '__main__':
+    unittest.main()
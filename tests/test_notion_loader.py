@@ -0,0 +1,190 @@
+import unittest
+import sys
+import os
+import datetime
+import shutil
+import tempfile
+import threading
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.notion_loader import NotionPageLoader, RateLimiter, tree_text, count_blocks
+
+
+def paragraph(block_id, text, has_children=False, block_type="paragraph"):
+    return {"id": block_id, "type": block_type, "has_children": has_children,
+            block_type: {"rich_text": [{"plain_text": text}]}}
+
+
+class RateLimited(Exception):
+    status = 429
+    code = "rate_limited"
+    headers = {"retry-after": "0"}
+
+
+class FakeNotion:
+    """Stands in for notion_client.Client: pages.retrieve and paginated blocks.children.list."""
+
+    def __init__(self, children, edited="2026-01-01T00:00:00.000Z", delay=0.0):
+        self.tree = children          # block id -> list of child blocks
+        self.edited = edited
+        self.delay = delay
+        self.calls = []
+        self.fail_next = 0
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.pages = self
+        self.blocks = self
+        self.children = self
+        self.list = self._list_children
+
+    def retrieve(self, page_id):
+        self.calls.append(("retrieve", page_id))
+        return {"id": page_id, "last_edited_time": self.edited, "properties": {}}
+
+    def _list_children(self, block_id, page_size=100, start_cursor=None):
+        with self.lock:
+            self.calls.append(("list", block_id, start_cursor))
+            if self.fail_next:
+                self.fail_next -= 1
+                raise RateLimited()
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if block_id not in self.tree:
+            raise Exception("Could not find block")
+        items = self.tree[block_id]
+        offset = int(start_cursor or 0)
+        page = items[offset:offset + page_size]
+        more = offset + page_size < len(items)
+        return {"results": [dict(block) for block in page], "has_more": more,
+                "next_cursor": str(offset + page_size) if more else None}
+
+
+class TestNotionPageLoader(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.test_dir, "notion_blocks.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def make_loader(self, client, **kwargs):
+        return NotionPageLoader(client, cache_path=self.cache_path, rate_limiter=RateLimiter(rate=0), **kwargs)
+
+    def nested_page(self):
+        return {
+            "page": [
+                paragraph("a", "Intro"),
+                paragraph("toggle", "Details", has_children=True, block_type="toggle"),
+                {"id": "cols", "type": "column_list", "has_children": True, "column_list": {}},
+                {"id": "sync", "type": "synced_block", "has_children": True,
+                 "synced_block": {"synced_from": {"block_id": "original"}}},
+                {"id": "sub", "type": "child_page", "has_children": True, "child_page": {"title": "Sub"}},
+                paragraph("z", "Outro"),
+            ],
+            "toggle": [paragraph("t1", "Hidden in toggle")],
+            "cols": [{"id": "c1", "type": "column", "has_children": True, "column": {}}],
+            "c1": [paragraph("c1p", "Column text")],
+            "original": [paragraph("o1", "Synced text")],
+            "sub": [paragraph("s1", "Other page")],
+        }
+
+    def test_paginates_past_100_blocks(self):
+        client = FakeNotion({"page": [paragraph(f"b{i}", f"line {i}") for i in range(250)]})
+        blocks, cached = self.make_loader(client).load("page")
+        self.assertFalse(cached)
+        self.assertEqual(len(blocks), 250)
+        self.assertEqual([c[2] for c in client.calls if c[0] == "list"], [None, "100", "200"])
+
+    def test_recurses_into_nested_blocks_in_document_order(self):
+        client = FakeNotion(self.nested_page())
+        blocks, _ = self.make_loader(client).load("page")
+        self.assertEqual(tree_text(blocks),
+                         ["Intro", "Details", "Hidden in toggle", "Column text", "Synced text", "Outro"])
+        listed = {c[1] for c in client.calls if c[0] == "list"}
+        # Synced copies are read from the original; child pages are not descended
+        self.assertIn("original", listed)
+        self.assertNotIn("sync", listed)
+        self.assertNotIn("sub", listed)
+        self.assertEqual(count_blocks(blocks), 10)
+
+    def test_streams_text_in_order_while_loading(self):
+        client = FakeNotion(self.nested_page(), delay=0.01)
+        streamed = []
+        blocks, _ = self.make_loader(client).load("page", on_text=streamed.append)
+        self.assertEqual(streamed, tree_text(blocks))
+        self.assertEqual(list(self.make_loader(client).stream_text("page")), streamed)
+
+    def test_fetches_siblings_in_parallel_with_bounded_workers(self):
+        children = {"page": [paragraph(f"t{i}", f"toggle {i}", True, "toggle") for i in range(8)]}
+        for i in range(8):
+            children[f"t{i}"] = [paragraph(f"t{i}c", f"child {i}")]
+        client = FakeNotion(children, delay=0.05)
+        started = time.perf_counter()
+        blocks, _ = self.make_loader(client, max_workers=4).load("page")
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(tree_text(blocks)), 16)
+        self.assertLessEqual(client.max_active, 4)
+        self.assertGreater(client.max_active, 1)
+        self.assertLess(elapsed, 9 * 0.05)
+
+    def test_unchanged_page_costs_one_retrieve(self):
+        client = FakeNotion(self.nested_page())
+        self.make_loader(client).load("page")
+
+        # A fresh loader reads the tree back from disk
+        client.calls.clear()
+        loader = self.make_loader(client)
+        streamed = []
+        blocks, cached = loader.load("page", on_text=streamed.append)
+        self.assertTrue(cached)
+        self.assertEqual(client.calls, [("retrieve", "page")])
+        self.assertEqual(streamed[0], "Intro")
+
+        # An edit bumps last_edited_time and reloads the tree
+        client.edited = "2026-02-01T00:00:00.000Z"
+        client.calls.clear()
+        _, cached = loader.load("page")
+        self.assertFalse(cached)
+        self.assertGreater(len(client.calls), 1)
+
+    def test_tree_fetched_in_the_edit_minute_is_refetched(self):
+        # last_edited_time is rounded to the minute, so a same-minute edit keeps the same stamp
+        edited = datetime.datetime.now(datetime.timezone.utc).replace(second=0, microsecond=0)
+        client = FakeNotion(self.nested_page(), edited=edited.isoformat().replace("+00:00", ".000Z"))
+        loader = self.make_loader(client)
+        loader.load("page")
+        _, cached = loader.load("page")
+        self.assertFalse(cached)
+
+    def test_retries_rate_limited_requests(self):
+        client = FakeNotion({"page": [paragraph("a", "Hello")]})
+        client.fail_next = 2
+        loader = self.make_loader(client)
+        blocks, _ = loader.load("page")
+        self.assertEqual(tree_text(blocks), ["Hello"])
+        self.assertEqual(loader.stats["retries"], 2)
+
+    def test_missing_root_raises_but_missing_subtree_is_skipped(self):
+        client = FakeNotion({"page": [paragraph("t", "Toggle", True, "toggle")]})
+        blocks, _ = self.make_loader(client).load("page")
+        self.assertEqual(blocks[0]["children"], [])
+        with self.assertRaises(Exception):
+            self.make_loader(client).load("missing")
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(rate=50)
+        started = time.perf_counter()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.perf_counter() - started, 4 / 50 * 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
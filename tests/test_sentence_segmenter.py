@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.sentence_segmenter import SentenceSegmenter, iter_sentences
+
+
+def tokens(text, size=3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def segment(text, size=3, **kwargs):
+    return list(iter_sentences(tokens(text, size), **kwargs))
+
+
+class TestSentenceSegmenter(unittest.TestCase):
+    def test_splits_on_sentence_ends(self):
+        self.assertEqual(
+            segment("The weather is sunny today. Do you want the forecast? I can also check tomorrow!"),
+            ["The weather is sunny today.", "Do you want the forecast?", "I can also check tomorrow!"]
+        )
+
+    def test_abbreviations_decimals_and_initials_do_not_split(self):
+        text = "Dr. Smith measured 3.14 meters in the U.S. lab, e.g. near J. K. Rowling's house. Next one."
+        self.assertEqual(segment(text), [
+            "Dr. Smith measured 3.14 meters in the U.S. lab, e.g. near J. K. Rowling's house.",
+            "Next one."
+        ])
+
+    def test_numbered_list_and_newlines(self):
+        text = "Here is your shopping list:\n1. Milk and bread\n2. Eggs and cheese\n"
+        self.assertEqual(segment(text), ["Here is your shopping list:", "1. Milk and bread", "2. Eggs and cheese"])
+
+    def test_code_fence_is_kept_whole(self):
+        text = "Try this snippet below.\n```python\nx = 1. + 2.\nprint(x)\n```\nThat prints three."
+        self.assertEqual(segment(text), [
+            "Try this snippet below.",
+            "```python\nx = 1. + 2.\nprint(x)\n```",
+            "That prints three."
+        ])
+
+    def test_short_sentences_are_merged(self):
+        self.assertEqual(segment("Sure! Ok. Here is the answer you wanted.", min_chars=12),
+                         ["Sure! Ok. Here is the answer you wanted."])
+
+    def test_long_runs_are_split_at_soft_breaks(self):
+        text = "word " * 20 + "then a comma, " + "more " * 40
+        chunks = segment(text, max_chars=120)
+        self.assertTrue(all(len(chunk) <= 120 for chunk in chunks))
+        self.assertTrue(chunks[0].endswith("comma,"))
+        self.assertEqual(" ".join(chunks).split(), text.split())
+
+    def test_token_boundaries_do_not_matter(self):
+        text = "Prices rose 2.5% in Q3. Mr. Lee (the CFO) said \"growth is back.\" We'll see!"
+        expected = segment(text, size=len(text))
+        for size in (1, 2, 5, 7):
+            self.assertEqual(segment(text, size=size), expected)
+
+    def test_text_accumulates_every_token(self):
+        segmenter = SentenceSegmenter()
+        for token in tokens("Hello there. General Kenobi."):
+            segmenter.feed(token)
+        segmenter.flush()
+        self.assertEqual(segmenter.text, "Hello there. General Kenobi.")
+
+
+if __name__ == '__main__':
+    unittest.main()
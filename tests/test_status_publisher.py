@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.status_publisher import StatusPublisher
+
+
+class TestStatusPublisher(unittest.TestCase):
+    def setUp(self):
+        self.messages = []
+        self.publisher = StatusPublisher(self.messages.append, min_interval=0.05)
+        self.addCleanup(self.publisher.stop)
+
+    def wait_for(self, count, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline and len(self.messages) < count:
+            time.sleep(0.005)
+        return len(self.messages)
+
+    def test_first_update_sends_full_state_then_only_changes(self):
+        self.publisher.update("music", {"track": "A", "is_playing": True, "volume": 70})
+        self.assertEqual(self.messages[0], {
+            "type": "music_status",
+            "data": {"seq": 1, "base": 0, "delta": {"track": "A", "is_playing": True, "volume": 70}}
+        })
+
+        time.sleep(0.06)
+        self.publisher.update("music", {"track": "A", "is_playing": False, "volume": 70})
+        self.publisher.update("music", {"track": "A", "is_playing": False, "volume": 70}) # No change
+        self.assertEqual(self.wait_for(2), 2)
+        self.assertEqual(self.messages[1]["data"], {"seq": 2, "base": 1, "delta": {"is_playing": False}})
+
+    def test_bursts_are_debounced_into_one_trailing_delta(self):
+        self.publisher.update("music", {"volume": 10, "track": "A"})
+        for volume in range(11, 30):
+            self.publisher.update("music", {"volume": volume, "track": "A"})
+        self.assertEqual(len(self.messages), 1)
+
+        self.assertEqual(self.wait_for(2), 2)
+        time.sleep(0.1)
+        self.assertEqual(len(self.messages), 2)
+        self.assertEqual(self.messages[1]["data"]["delta"], {"volume": 29})
+
+    def test_tolerance_suppresses_small_numeric_changes(self):
+        tolerance = {"cpu": 5.0}
+        self.publisher.update("system", {"cpu": 20.0, "ram": 50.0}, tolerance=tolerance)
+        time.sleep(0.06)
+        self.publisher.update("system", {"cpu": 23.0, "ram": 50.0}, tolerance=tolerance)
+        time.sleep(0.1)
+        self.assertEqual(len(self.messages), 1)
+
+        self.publisher.update("system", {"cpu": 26.0, "ram": 50.0}, tolerance=tolerance)
+        self.assertEqual(self.wait_for(2), 2)
+        self.assertEqual(self.messages[1]["data"]["delta"], {"cpu": 26.0})
+
+    def test_snapshot_is_latest_state_with_seq(self):
+        self.assertIsNone(self.publisher.snapshot("system"))
+        self.publisher.update("system", {"cpu": 20.0}, tolerance={"cpu": 5.0})
+        self.publisher.update("system", {"cpu": 21.0}, tolerance={"cpu": 5.0})
+        self.assertEqual(self.publisher.snapshot("system"), {"cpu": 21.0, "seq": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
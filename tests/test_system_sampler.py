@@ -0,0 +1,122 @@
+import unittest
+from types import SimpleNamespace
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.system_sampler import SystemSampler, MetricRing, summarize
+from aria.system_monitor import SystemMonitor
+
+
+class FakePsutil:
+    """Scripted psutil: each cpu_percent() call returns the next value of `cpu`."""
+
+    def __init__(self, cpu=(10.0,), battery=None):
+        self.cpu = list(cpu)
+        self.battery = battery
+        self.disk_bytes = 0
+        self.blocking_calls = 0
+
+    def cpu_count(self):
+        return 2
+
+    def cpu_percent(self, interval=None, percpu=False):
+        if interval:
+            self.blocking_calls += 1
+        value = self.cpu[0] if len(self.cpu) == 1 else self.cpu.pop(0)
+        return [value, value] if percpu else value
+
+    def virtual_memory(self):
+        return SimpleNamespace(percent=40.0)
+
+    def swap_memory(self):
+        return SimpleNamespace(percent=5.0)
+
+    def disk_io_counters(self):
+        self.disk_bytes += 1000
+        return SimpleNamespace(read_bytes=self.disk_bytes, write_bytes=0)
+
+    def net_io_counters(self):
+        return None
+
+    def sensors_battery(self):
+        return self.battery
+
+
+class TestMetricRing(unittest.TestCase):
+    def test_ring_keeps_last_capacity_samples(self):
+        ring = MetricRing(5, ["cpu"])
+        for i in range(12):
+            ring.append(1000.0 + i, {"cpu": i})
+        points = ring.window("cpu", seconds=100, now=1011.0)
+        self.assertEqual([v for _, v in points], [7, 8, 9, 10, 11])
+        self.assertEqual([v for _, v in ring.window("cpu", seconds=2, now=1011.0)], [9, 10, 11])
+
+    def test_summarize(self):
+        points = [(float(t), float(t)) for t in range(0, 120, 6)] # rising 1 unit/s
+        stats = summarize(points)
+        self.assertEqual(stats["samples"], 20)
+        self.assertEqual(stats["max"], 114.0)
+        self.assertEqual(stats["p95"], 108.0)
+        self.assertAlmostEqual(stats["trend"], 60.0)
+        self.assertIsNone(summarize([])["avg"])
+
+
+class TestSystemSampler(unittest.TestCase):
+    def test_sample_records_rates_and_aggregates(self):
+        sampler = SystemSampler(interval=1.0, history_seconds=60, source=FakePsutil(cpu=[20.0, 30.0, 40.0, 50.0]))
+        sampler._last_counters = sampler._read_counters()
+        time.sleep(0.01)
+        sample = sampler.sample_once()
+        self.assertGreater(sample["disk_read_bps"], 0)
+        self.assertIsNone(sample["net_sent_bps"])
+        self.assertEqual(sample["per_core"], [20.0, 20.0])
+        sampler.sample_once()
+
+        stats = sampler.stats("cpu", 60)
+        self.assertEqual(stats["samples"], 2)
+        self.assertEqual(stats["min"], 30.0)
+        self.assertEqual(sampler.stats("core1", 60)["max"], 40.0)
+        self.assertEqual(sampler.stats("battery", 60)["samples"], 0)
+
+
+class TestSystemMonitorHealth(unittest.TestCase):
+    def make_monitor(self, source, samples):
+        monitor = SystemMonitor()
+        monitor.sampler = SystemSampler(interval=1.0, history_seconds=120, source=source)
+        for _ in range(samples):
+            monitor.sampler.sample_once()
+        return monitor
+
+    def test_readings_come_from_latest_sample(self):
+        source = FakePsutil(cpu=[55.0])
+        monitor = self.make_monitor(source, 1)
+        self.assertEqual(monitor.get_cpu_usage(), 55.0)
+        self.assertEqual(monitor.get_all_stats(), {"battery": None, "cpu": 55.0, "ram": 40.0})
+        self.assertEqual(source.blocking_calls, 0)
+
+    def test_alert_on_sustained_load_not_on_a_spike(self):
+        spike = self.make_monitor(FakePsutil(cpu=[99.0]), 1)
+        self.assertEqual(spike.check_health(), [])
+
+        sustained = self.make_monitor(FakePsutil(cpu=[95.0]), 40)
+        # All samples land within the same instant here; spread them across the window
+        ring = sustained.sampler.ring
+        now = time.time()
+        for i in range(ring.count):
+            ring.times[i] = now - i
+        alerts = sustained.check_health()
+        self.assertEqual(len(alerts), 1)
+        self.assertIn("averaged 95%", alerts[0])
+
+    def test_low_battery_alert_uses_sampled_battery(self):
+        battery = SimpleNamespace(percent=10, power_plugged=False)
+        monitor = self.make_monitor(FakePsutil(battery=battery), 1)
+        self.assertIn("battery is low at 10%", monitor.check_health()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.tts_cache import TTSAudioCache
+from aria.tts_manager import TTSManager
+
+VOICE = "en-US-AriaNeural"
+
+
+class TestTTSAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def make_cache(self, **kwargs):
+        return TTSAudioCache(cache_dir=self.tmpdir.name, **kwargs)
+
+    def test_hit_after_store_and_across_restarts(self):
+        cache = self.make_cache()
+        self.assertIsNone(cache.get(VOICE, "Volume increased."))
+        self.assertTrue(cache.put(VOICE, "Volume increased.", b"mp3-bytes"))
+
+        self.assertEqual(cache.get(VOICE, "  Volume   increased. "), b"mp3-bytes")
+        self.assertIsNone(cache.get("en-GB-SoniaNeural", "Volume increased."))
+
+        restarted = self.make_cache()
+        self.assertEqual(restarted.get(VOICE, "Volume increased."), b"mp3-bytes")
+        stats = restarted.get_stats()
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(restarted.get(VOICE, "Volume increased."), b"mp3-bytes")
+        self.assertEqual(restarted.get_stats()["memory_hits"], 1)
+
+    def test_disk_lru_eviction(self):
+        cache = self.make_cache(max_bytes=250)
+        cache.put(VOICE, "one", b"x" * 100)
+        cache.put(VOICE, "two", b"x" * 100)
+        cache.get(VOICE, "one") # "two" is now least recently used
+        cache.put(VOICE, "three", b"x" * 100)
+
+        self.assertTrue(cache.contains(VOICE, "one"))
+        self.assertFalse(cache.contains(VOICE, "two"))
+        self.assertTrue(cache.contains(VOICE, "three"))
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 2)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_long_text_is_not_cached(self):
+        cache = self.make_cache(max_phrase_chars=20)
+        self.assertFalse(cache.put(VOICE, "This sentence is far too long to be cached.", b"audio"))
+        self.assertEqual(cache.get_stats()["clips"], 0)
+
+
+class TestTTSManagerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = TTSAudioCache(cache_dir=self.tmpdir.name)
+
+    def test_cached_phrase_skips_synthesis(self):
+        self.cache.put(VOICE, "Turning it up.", b"cached-audio")
+        tts = TTSManager(audio_cache=self.cache)
+        with patch("aria.tts_manager.edge_tts.Communicate", side_effect=AssertionError("synthesized")):
+            future = asyncio.run_coroutine_threadsafe(tts._synthesize("Turning it up."), tts._loop)
+            self.assertEqual(future.result(timeout=5), b"cached-audio")
+
+    def test_warm_up_fills_cache(self):
+        async def fake_fetch(text):
+            return f"audio:{text}".encode()
+
+        with patch.object(TTSManager, "_fetch_audio", side_effect=fake_fetch):
+            TTSManager(audio_cache=self.cache, warm_phrases=["Goodnight.", "Sleeping now."])
+            deadline = time.time() + 5
+            while self.cache.get_stats()["clips"] < 2 and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(self.cache.get(VOICE, "Goodnight."), b"audio:Goodnight.")
+
+
+if __name__ == '__main__':
+    unittest.main()
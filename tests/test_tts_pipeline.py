@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import sys
+import os
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aria.tts_manager import TTSManager
+from aria.audio_stream import AudioStream
+
+
+class StubTTSManager(TTSManager):
+    """Stub synthesizer/player so the pipeline runs without network or audio."""
+
+    def __init__(self, synth_delay=0.05, play_delay=0.05, **kwargs):
+        self.synth_delay = synth_delay
+        self.play_delay = play_delay
+        self.synth_started = []
+        self.synth_cancelled = []
+        self.played = []
+        super().__init__(**kwargs)
+
+    async def _synthesize(self, text):
+        self.synth_started.append(text)
+        try:
+            await asyncio.sleep(self.synth_delay)
+        except asyncio.CancelledError:
+            self.synth_cancelled.append(text)
+            raise
+        return text
+
+    def _play_audio(self, audio, generation):
+        time.sleep(self.play_delay)
+        self.played.append(audio)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestTTSPipeline(unittest.TestCase):
+    def test_plays_in_order_with_prefetch(self):
+        tts = StubTTSManager(synth_delay=0.1, play_delay=0.1, prefetch=2)
+        sentences = [f"Sentence {i}." for i in range(5)]
+        for sentence in sentences:
+            tts.speak(sentence, print_text=False)
+
+        # While the first sentence plays, the next two are already being synthesized
+        self.assertTrue(wait_for(lambda: len(tts.played) == 1))
+        self.assertGreaterEqual(len(tts.synth_started), 3)
+
+        self.assertTrue(wait_for(lambda: len(tts.played) == 5))
+        self.assertEqual(tts.played, sentences)
+
+    def test_prefetch_window_is_bounded(self):
+        tts = StubTTSManager(synth_delay=0.01, play_delay=0.3, prefetch=1)
+        for i in range(6):
+            tts.speak(f"Sentence {i}.", print_text=False)
+        self.assertTrue(wait_for(lambda: len(tts.synth_started) >= 2))
+        time.sleep(0.1)
+        # One playing + one prefetched
+        self.assertEqual(len(tts.synth_started), 2)
+        tts.stop()
+
+    def test_stop_cancels_inflight_synthesis(self):
+        tts = StubTTSManager(synth_delay=2.0, prefetch=2)
+        for i in range(4):
+            tts.speak(f"Sentence {i}.", print_text=False)
+        self.assertTrue(wait_for(lambda: len(tts.synth_started) == 3))
+
+        tts.stop()
+        self.assertTrue(wait_for(lambda: len(tts.synth_cancelled) == 3))
+        time.sleep(0.1)
+        self.assertEqual(tts.played, [])
+
+        # The pipeline keeps working after an interrupt
+        tts.synth_delay = 0.01
+        tts.speak("After the interrupt.", print_text=False)
+        self.assertTrue(wait_for(lambda: tts.played == ["After the interrupt."]))
+
+
+class FakeCommunicate:
+    """Stands in for edge_tts.Communicate: two audio chunks 0.3s apart."""
+
+    def __init__(self, text, voice):
+        self.text = text
+
+    async def stream(self):
+        yield {"type": "audio", "data": b"first"}
+        await asyncio.sleep(0.3)
+        yield {"type": "WordBoundary"}
+        yield {"type": "audio", "data": b"second"}
+
+
+class TestEdgeStreaming(unittest.TestCase):
+    @patch("aria.tts_manager.edge_tts.Communicate", FakeCommunicate)
+    def test_stream_is_returned_on_first_chunk(self):
+        tts = TTSManager()
+        started = time.time()
+        future = asyncio.run_coroutine_threadsafe(tts._synthesize("Hello there."), tts._loop)
+        stream = future.result(timeout=5)
+
+        self.assertIsInstance(stream, AudioStream)
+        self.assertLess(time.time() - started, 0.25)
+        self.assertFalse(stream.finished)
+
+        self.assertTrue(wait_for(lambda: stream.finished))
+        self.assertEqual(stream.getvalue(), b"firstsecond")
+
+    @patch("aria.tts_manager.edge_tts.Communicate", FakeCommunicate)
+    def test_stop_aborts_live_stream(self):
+        tts = TTSManager()
+        future = asyncio.run_coroutine_threadsafe(tts._synthesize("Hello there."), tts._loop)
+        stream = future.result(timeout=5)
+        tts.stop()
+        self.assertTrue(wait_for(lambda: stream.aborted))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import asyncio
+import json
+import sys
+import os
+import threading
+import time
+
+# Add project root to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Records sent payloads; `delay` simulates a slow renderer, `gate` a stalled one."""
+
+    def __init__(self, delay=0.0, fail=False, gate=None):
+        self.delay = delay
+        self.fail = fail
+        self.gate = gate
+        self.sent = []
+        self.received_at = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionResetError("renderer went away")
+        self.sent.append(payload)
+        self.received_at.append(time.perf_counter())
+
+    async def close(self):
+        self.closed = True
+
+    def messages(self):
+        return [json.loads(payload) for payload in self.sent]
+
+
+async def settle(condition, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline and not condition():
+        await asyncio.sleep(0.005)
+    return condition()
+
+
+class TestWebSocketBroadcast(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = ConnectionManager(max_queue_size=8, send_timeout=1.0)
+
+    async def asyncTearDown(self):
+        for websocket in self.manager.active_connections:
+            self.manager.disconnect(websocket)
+
+    async def test_slow_client_does_not_delay_others(self):
+        slow = FakeWebSocket(delay=0.5)
+        fast = [FakeWebSocket() for _ in range(20)]
+        for websocket in [slow] + fast:
+            await self.manager.connect(websocket)
+
+        started = time.perf_counter()
+        await self.manager.broadcast({"type": "notification", "data": {"title": "hi"}})
+        self.assertLess(time.perf_counter() - started, 0.05)
+
+        self.assertTrue(await settle(lambda: all(ws.sent for ws in fast), timeout=0.2))
+        self.assertEqual(slow.sent, [])
+        # Serialized once and shared by every client
+        self.assertTrue(all(ws.sent[0] is fast[0].sent[0] for ws in fast))
+
+    async def test_failed_send_evicts_client(self):
+        dead, alive = FakeWebSocket(fail=True), FakeWebSocket()
+        await self.manager.connect(dead)
+        await self.manager.connect(alive)
+
+        await self.manager.broadcast({"type": "notification", "data": {}})
+        self.assertTrue(await settle(lambda: len(self.manager.active_connections) == 1))
+        self.assertTrue(dead.closed)
+        self.assertEqual(self.manager.get_stats()["evicted"], 1)
+
+        await self.manager.broadcast({"type": "notification", "data": {}})
+        self.assertTrue(await settle(lambda: len(alive.sent) == 2))
+
+    async def test_state_updates_are_coalesced_while_client_is_busy(self):
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate=gate)
+        await self.manager.connect(websocket)
+
+        await self.manager.broadcast({"type": "notification", "data": {"n": 0}})
+        await asyncio.sleep(0.01) # Writer is now blocked sending the first message
+        for i in range(10):
+            await self.manager.broadcast({"type": "music_status", "data": {"position": i}})
+            await self.manager.broadcast({"type": "desktop_progress", "data": {"step_index": i % 2, "status": i}})
+        await self.manager.broadcast({"type": "notification", "data": {"n": 1}})
+
+        gate.set()
+        self.assertTrue(await settle(lambda: len(websocket.sent) == 5))
+        messages = websocket.messages()
+        self.assertEqual(messages[1], {"type": "music_status", "data": {"position": 9}})
+        self.assertEqual([m["data"]["status"] for m in messages[2:4]], [8, 9])
+        self.assertEqual(messages[4]["data"], {"n": 1})
+
+    async def test_queued_status_deltas_are_merged(self):
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate=gate)
+        await self.manager.connect(websocket)
+
+        await self.manager.broadcast({"type": "notification", "data": {}})
+        await asyncio.sleep(0.01)
+        await self.manager.broadcast({"type": "music_status", "data": {"seq": 1, "base": 0, "delta": {"track": "A", "volume": 10}}})
+        await self.manager.broadcast({"type": "music_status", "data": {"seq": 2, "base": 1, "delta": {"volume": 20}}})
+
+        gate.set()
+        self.assertTrue(await settle(lambda: len(websocket.sent) == 2))
+        self.assertEqual(websocket.messages()[1]["data"], {"seq": 2, "base": 0, "delta": {"track": "A", "volume": 20}})
+
+    async def test_bounded_queue_drops_oldest(self):
+        gate = asyncio.Event()
+        websocket = FakeWebSocket(gate=gate)
+        await self.manager.connect(websocket)
+
+        for i in range(20):
+            await self.manager.broadcast({"type": "notification", "data": {"n": i}})
+        stats = self.manager.get_stats()["queues"][0]
+        self.assertEqual(stats["depth"], 8)
+        self.assertGreater(stats["dropped"], 0)
+
+        gate.set()
+        self.assertTrue(await settle(lambda: websocket.messages()[-1:] == [{"type": "notification", "data": {"n": 19}}]))
+
+    async def test_publish_from_worker_thread(self):
+        websocket = FakeWebSocket()
+        await self.manager.connect(websocket)
+
+        worker = threading.Thread(target=lambda: asyncio.run(self.manager.broadcast({"type": "shopping_status", "data": {}})))
+        worker.start()
+        worker.join()
+        self.assertTrue(await settle(lambda: len(websocket.sent) == 1))
+
+
+if __name__ == '__main__':
+    unittest.main()